@@ -0,0 +1,30 @@
+"""add holidays to studio configs
+
+Revision ID: 3f1a8e5c9d27
+Revises: 9d3e1c7a2b40
+Create Date: 2025-11-15 09:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1a8e5c9d27"
+down_revision: Union[str, None] = "9d3e1c7a2b40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "studio_configs",
+        sa.Column("holidays", sa.JSON(), nullable=False, server_default="[]"),
+    )
+    op.alter_column("studio_configs", "holidays", server_default=None)
+
+
+def downgrade() -> None:
+    op.drop_column("studio_configs", "holidays")
@@ -0,0 +1,39 @@
+"""widen call transcript turn seq
+
+Revision ID: 4e7b2c9d1f36
+Revises: d2f7a9c4e6b1
+Create Date: 2025-11-25 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4e7b2c9d1f36"
+down_revision: Union[str, None] = "d2f7a9c4e6b1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """seq now holds the turn's spoken-at timestamp in milliseconds."""
+    op.alter_column(
+        "call_transcript_turns",
+        "seq",
+        existing_type=sa.Integer(),
+        type_=sa.BigInteger(),
+        existing_nullable=False,
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "call_transcript_turns",
+        "seq",
+        existing_type=sa.BigInteger(),
+        type_=sa.Integer(),
+        existing_nullable=False,
+    )
@@ -0,0 +1,31 @@
+"""add custom functions to studio configs
+
+Revision ID: 5c2d8f4e1a93
+Revises: 8b3e5d1a7c42
+Create Date: 2025-11-26 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c2d8f4e1a93"
+down_revision: Union[str, None] = "8b3e5d1a7c42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Tenant-defined assistant functions."""
+    op.add_column(
+        "studio_configs",
+        sa.Column("custom_functions", sa.JSON(), nullable=False, server_default="[]"),
+    )
+    op.alter_column("studio_configs", "custom_functions", server_default=None)
+
+
+def downgrade() -> None:
+    op.drop_column("studio_configs", "custom_functions")
@@ -0,0 +1,41 @@
+"""add call transcript turns table
+
+Revision ID: 64ba740c5624
+Revises: bf5b6dc65d4c
+Create Date: 2025-11-14 10:12:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "64ba740c5624"
+down_revision: Union[str, None] = "bf5b6dc65d4c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Store live transcript turns flushed from the in-memory buffer."""
+    op.create_table(
+        "call_transcript_turns",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("call_id", sa.String(length=64), nullable=False),
+        sa.Column("seq", sa.Integer(), nullable=False),
+        sa.Column("role", sa.String(length=32), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("assistant_id", sa.String(length=64), nullable=True),
+        sa.Column("user_id", sa.String(length=36), nullable=True),
+        sa.Column("spoken_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("call_id", "seq", name="uq_call_transcript_turns_call_seq"),
+    )
+    op.create_index("ix_call_transcript_turns_call_id", "call_transcript_turns", ["call_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_call_transcript_turns_call_id", table_name="call_transcript_turns")
+    op.drop_table("call_transcript_turns")
@@ -0,0 +1,47 @@
+"""dedupe campaign contacts and share call pacing
+
+Revision ID: 8b3e5d1a7c42
+Revises: 4e7b2c9d1f36
+Create Date: 2025-11-25 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8b3e5d1a7c42"
+down_revision: Union[str, None] = "4e7b2c9d1f36"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """One contact per number and campaign; per-account call slots for all dialers."""
+    # Keep the first copy of contacts imported twice
+    op.execute(
+        """
+        DELETE FROM campaign_contacts AS duplicate
+        USING campaign_contacts AS original
+        WHERE duplicate.campaign_id = original.campaign_id
+          AND duplicate.phone_number = original.phone_number
+          AND duplicate.id > original.id
+        """
+    )
+    op.create_unique_constraint(
+        "uq_campaign_contacts_campaign_phone", "campaign_contacts", ["campaign_id", "phone_number"]
+    )
+
+    op.create_table(
+        "campaign_call_pacing",
+        sa.Column("account_sid", sa.String(length=64), nullable=False),
+        sa.Column("next_slot_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("account_sid"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("campaign_call_pacing")
+    op.drop_constraint("uq_campaign_contacts_campaign_phone", "campaign_contacts", type_="unique")
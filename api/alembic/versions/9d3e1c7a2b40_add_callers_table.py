@@ -0,0 +1,46 @@
+"""add callers table
+
+Revision ID: 9d3e1c7a2b40
+Revises: 64ba740c5624
+Create Date: 2025-11-14 15:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9d3e1c7a2b40"
+down_revision: Union[str, None] = "64ba740c5624"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Caller directory keyed by (tenant, phone number)."""
+    op.create_table(
+        "callers",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("phone_number", sa.String(length=32), nullable=False),
+        sa.Column("first_name", sa.String(length=100), nullable=True),
+        sa.Column("last_name", sa.String(length=100), nullable=True),
+        sa.Column("email", sa.String(length=255), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("first_seen_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_seen_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("call_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("tenant_id", "phone_number", name="uq_callers_tenant_phone"),
+    )
+    op.create_index("ix_callers_tenant_last_seen", "callers", ["tenant_id", "last_seen_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_callers_tenant_last_seen", table_name="callers")
+    op.drop_table("callers")
@@ -0,0 +1,31 @@
+"""add business hours enforced to studio configs
+
+Revision ID: a7d4e2b9c6f1
+Revises: 5c2d8f4e1a93
+Create Date: 2025-11-26 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7d4e2b9c6f1"
+down_revision: Union[str, None] = "5c2d8f4e1a93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Existing rows keep the never-enforced "09:00-18:00" default: route them as always open."""
+    op.add_column(
+        "studio_configs",
+        sa.Column("business_hours_enforced", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    op.alter_column("studio_configs", "business_hours_enforced", server_default=None)
+
+
+def downgrade() -> None:
+    op.drop_column("studio_configs", "business_hours_enforced")
@@ -0,0 +1,60 @@
+"""add call digest settings
+
+Revision ID: b4d9e2f6a1c8
+Revises: a7c2e4f81b93
+Create Date: 2025-11-18 10:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b4d9e2f6a1c8"
+down_revision: Union[str, None] = "a7c2e4f81b93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "studio_configs",
+        sa.Column("summary_mode", sa.String(length=16), nullable=False, server_default="immediate"),
+    )
+    op.add_column(
+        "studio_configs",
+        sa.Column("digest_interval_minutes", sa.Integer(), nullable=False, server_default="60"),
+    )
+    op.add_column(
+        "studio_configs",
+        sa.Column("digest_max_calls", sa.Integer(), nullable=False, server_default="25"),
+    )
+    op.add_column(
+        "studio_configs",
+        sa.Column("digest_last_sent_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.alter_column("studio_configs", "summary_mode", server_default=None)
+    op.alter_column("studio_configs", "digest_interval_minutes", server_default=None)
+    op.alter_column("studio_configs", "digest_max_calls", server_default=None)
+
+    op.add_column(
+        "calls",
+        sa.Column("summary_pending", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    op.create_index(
+        "ix_calls_summary_pending",
+        "calls",
+        ["tenant_id"],
+        postgresql_where=sa.text("summary_pending"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_calls_summary_pending", table_name="calls")
+    op.drop_column("calls", "summary_pending")
+    op.drop_column("studio_configs", "digest_last_sent_at")
+    op.drop_column("studio_configs", "digest_max_calls")
+    op.drop_column("studio_configs", "digest_interval_minutes")
+    op.drop_column("studio_configs", "summary_mode")
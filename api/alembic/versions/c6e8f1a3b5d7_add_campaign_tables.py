@@ -0,0 +1,71 @@
+"""add outbound campaign tables
+
+Revision ID: c6e8f1a3b5d7
+Revises: b4d9e2f6a1c8
+Create Date: 2025-11-20 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c6e8f1a3b5d7"
+down_revision: Union[str, None] = "b4d9e2f6a1c8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Outbound call campaigns and their contact lists."""
+    op.create_table(
+        "campaigns",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("from_number", sa.String(length=20), nullable=False),
+        sa.Column("twiml_url", sa.String(length=500), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("schedule", sa.Text(), nullable=True),
+        sa.Column("timezone", sa.String(length=64), nullable=False, server_default="UTC"),
+        sa.Column("max_concurrent_calls", sa.Integer(), nullable=False, server_default="5"),
+        sa.Column("max_attempts", sa.Integer(), nullable=False, server_default="3"),
+        sa.Column("retry_delay_seconds", sa.Integer(), nullable=False, server_default="900"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_campaigns_user_id", "campaigns", ["user_id"])
+
+    op.create_table(
+        "campaign_contacts",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("campaign_id", sa.String(length=36), nullable=False),
+        sa.Column("phone_number", sa.String(length=20), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=True),
+        sa.Column("meta", sa.JSON(), nullable=True),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("call_sid", sa.String(length=64), nullable=True),
+        sa.Column("last_call_status", sa.String(length=32), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["campaign_id"], ["campaigns.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_campaign_contacts_due", "campaign_contacts", ["campaign_id", "status", "next_attempt_at"]
+    )
+    op.create_index("ix_campaign_contacts_call_sid", "campaign_contacts", ["call_sid"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_campaign_contacts_call_sid", table_name="campaign_contacts")
+    op.drop_index("ix_campaign_contacts_due", table_name="campaign_contacts")
+    op.drop_table("campaign_contacts")
+    op.drop_index("ix_campaigns_user_id", table_name="campaigns")
+    op.drop_table("campaigns")
@@ -0,0 +1,44 @@
+"""add shared state tables
+
+Revision ID: d2f7a9c4e6b1
+Revises: c6e8f1a3b5d7
+Create Date: 2025-11-24 10:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d2f7a9c4e6b1"
+down_revision: Union[str, None] = "c6e8f1a3b5d7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Rate-limit counters and circuit-breaker states shared by API workers."""
+    op.create_table(
+        "shared_rate_counters",
+        sa.Column("key", sa.String(length=255), nullable=False),
+        sa.Column("window_start", sa.BigInteger(), nullable=False),
+        sa.Column("count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("key", "window_start"),
+    )
+    op.create_index("ix_shared_rate_counters_expires_at", "shared_rate_counters", ["expires_at"])
+    op.create_table(
+        "circuit_breaker_states",
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("state", sa.String(length=16), nullable=False),
+        sa.Column("changed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("circuit_breaker_states")
+    op.drop_index("ix_shared_rate_counters_expires_at", table_name="shared_rate_counters")
+    op.drop_table("shared_rate_counters")
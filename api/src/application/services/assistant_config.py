@@ -0,0 +1,387 @@
+"""
+Assistant configuration assembly and the precompiled `assistant-request` cache.
+
+Vapi sends `assistant-request` when an inbound call reaches a number that has
+no fixed assistant and waits (with a short deadline) for the assistant
+definition. Definitions are compiled from `StudioConfig`/`AvaProfile` ahead of
+time and cached per number as ready-to-send JSON bytes, so answering is a dict
+lookup. Config changes invalidate the tenant's numbers and recompile them in
+the background.
+
+Invalidations are also published through the shared state (when a shared
+backend is configured) so other workers drop their copies within one sync
+interval; otherwise the short TTL bounds how long they serve the old config.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.src.application.services.business_hours import number_override, schedule_for
+from api.src.application.services.realtime_session import ProfileLike, build_system_prompt
+from api.src.core.settings import get_settings
+from api.src.domain.entities.caller import normalize_phone_number
+from api.src.domain.value_objects.business_hours import BusinessSchedule
+from api.src.infrastructure.database.session import SessionLocal, run_read_only
+from api.src.infrastructure.external.vapi_client import build_assistant_payload
+from api.src.infrastructure.persistence.models.ava_profile import AvaProfile
+from api.src.infrastructure.persistence.models.studio_config import StudioConfig
+from api.src.infrastructure.persistence.models.user import User
+from api.src.infrastructure.shared_state import get_shared_state
+
+logger = logging.getLogger("ava.assistant_config")
+
+# Published invalidations are counted in aligned windows (longer than the TTL)
+_INVALIDATION_WINDOW = 3600
+
+NOT_CONFIGURED_BODY = json.dumps({"error": "No assistant configured for this number."}).encode()
+
+
+def build_assistant_prompt(
+    config: StudioConfig,
+    profile: Optional[ProfileLike] = None,
+    *,
+    closed_schedule: Optional[BusinessSchedule] = None,
+) -> str:
+    """System prompt sent to Vapi: base prompt plus caller-info instructions.
+
+    With `closed_schedule` the prompt also tells the assistant the office is
+    closed (used for the after-hours variant of `assistant-request`).
+    """
+
+    prompt = config.system_prompt or (build_system_prompt(profile) if profile is not None else "")
+
+    # 🔥 DIVINE: Anti-repetition instruction
+    prompt += "\n\n⚠️ CRITICAL: NEVER repeat yourself. If you already said something, move on to the next topic. Be concise and efficient."
+
+    if config.ask_for_name:
+        prompt += "\n\nCRITICAL INSTRUCTION: You MUST ask for the caller's name within the first 2 exchanges. This is mandatory."
+
+    if config.ask_for_email:
+        prompt += "\nIf appropriate for the conversation, politely ask for their email address."
+
+    if config.ask_for_phone:
+        prompt += "\nIf appropriate, ask for their phone number for follow-up."
+
+    if config.guidelines:
+        prompt += f"\n\nAdditional guidelines: {config.guidelines}"
+
+    if closed_schedule is not None:
+        prompt += (
+            f"\n\n🕒 The office is currently CLOSED (opening hours: {closed_schedule.describe()}, "
+            f"timezone {closed_schedule.tz.key}). Tell the caller, take a message (name, phone number, "
+            "reason for calling) and say the team will call back during opening hours."
+        )
+
+    return prompt
+
+
+def build_assistant_metadata(config: StudioConfig, user_id: str) -> dict:
+    """Metadata attached to the assistant so webhooks can resolve the tenant."""
+
+    return {
+        "user_id": user_id,
+        "organization": config.organization_name,
+        "persona": config.persona,
+        "tone": config.tone,
+        "language": config.language,
+        "voice_speed": config.voice_speed,
+        "ask_for_name": config.ask_for_name,
+        "ask_for_email": config.ask_for_email,
+        "ask_for_phone": config.ask_for_phone,
+    }
+
+
+def webhook_url() -> str:
+    settings = get_settings()
+    return f"{settings.backend_url.rstrip('/')}{settings.api_prefix}/webhooks/vapi"
+
+
+def build_assistant_definition(
+    config: StudioConfig,
+    profile: Optional[ProfileLike],
+    *,
+    user_id: str,
+    closed_schedule: Optional[BusinessSchedule] = None,
+) -> dict:
+    """Full transient assistant definition for an `assistant-request` response."""
+
+    return build_assistant_payload(
+        name=f"{config.organization_name} Assistant"[:40],
+        voice_provider=config.voice_provider,
+        voice_id=config.voice_id,
+        voice_speed=min(max(config.voice_speed or 1.0, 0.5), 1.2),
+        first_message=config.first_message or (profile.greeting if profile is not None else ""),
+        model_provider="openai",
+        model=config.ai_model,
+        temperature=config.ai_temperature,
+        max_tokens=config.ai_max_tokens,
+        system_prompt=build_assistant_prompt(config, profile, closed_schedule=closed_schedule),
+        transcriber_provider=config.transcriber_provider,
+        transcriber_model=config.transcriber_model,
+        transcriber_language=config.transcriber_language,
+        metadata=build_assistant_metadata(config, user_id),
+        server_url=webhook_url(),
+    )
+
+
+def compile_assistant_response(
+    config: StudioConfig,
+    profile: Optional[ProfileLike],
+    *,
+    user_id: str,
+    closed_schedule: Optional[BusinessSchedule] = None,
+) -> bytes:
+    """Serialize the `assistant-request` response body once, ahead of time."""
+
+    definition = build_assistant_definition(config, profile, user_id=user_id, closed_schedule=closed_schedule)
+    return json.dumps({"assistant": definition}).encode()
+
+
+@dataclass(frozen=True)
+class CompiledAssistant:
+    body: bytes
+    user_id: Optional[str]
+    expires_at: float
+    closed_body: Optional[bytes] = None
+    schedule: Optional[BusinessSchedule] = None
+
+    def body_at(self, at: Optional[datetime] = None) -> bytes:
+        """Open or after-hours variant depending on the business schedule."""
+        if self.closed_body is None or self.schedule is None or self.schedule.is_open(at):
+            return self.body
+        return self.closed_body
+
+
+async def _compile_for_number(number: str) -> CompiledAssistant:
+    # Read-only: retried on transient connection errors
+    return await run_read_only(lambda session: _compile_with_session(session, number))
+
+
+async def _compile_with_session(session: AsyncSession, number: str) -> CompiledAssistant:
+    ttl = get_settings().assistant_config_cache_ttl_seconds
+    user = (
+        await session.execute(select(User).where(User.twilio_phone_number == number))
+    ).scalars().first()
+    if user is not None:
+        config = (
+            await session.execute(select(StudioConfig).where(StudioConfig.user_id == user.id))
+        ).scalars().first()
+    else:
+        config = (
+            await session.execute(select(StudioConfig).where(StudioConfig.phone_number == number))
+        ).scalars().first()
+
+    if config is None:
+        return CompiledAssistant(NOT_CONFIGURED_BODY, str(user.id) if user else None, time.monotonic() + ttl)
+
+    profile = await session.get(AvaProfile, UUID(str(config.user_id)))
+    schedule = schedule_for(config, await number_override(session, number))
+    user_id = str(config.user_id)
+    body = compile_assistant_response(config, profile, user_id=user_id)
+    closed_body = (
+        None
+        if schedule.always_open
+        else compile_assistant_response(config, profile, user_id=user_id, closed_schedule=schedule)
+    )
+    return CompiledAssistant(body, user_id, time.monotonic() + ttl, closed_body=closed_body, schedule=schedule)
+
+
+class AssistantConfigCache:
+    """Per-number cache of compiled `assistant-request` responses.
+
+    Entries that expired less than one TTL ago are served while a background
+    refresh runs, so only the first request for a number (normally handled by
+    the startup warmup) or one idle for longer pays for the database and
+    prompt assembly. At most `max_entries` numbers (unconfigured ones
+    included) are kept; the least recently used are evicted.
+    """
+
+    def __init__(self, *, max_entries: int = 10_000) -> None:
+        self._entries: "OrderedDict[str, CompiledAssistant]" = OrderedDict()
+        self._max_entries = max_entries
+        self._by_user: Dict[str, Set[str]] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._generations: Dict[str, int] = {}
+        # Shared invalidation count of the entry's tenant when it was stored
+        self._seen_invalidations: Dict[str, tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, phone_number: Optional[str]) -> bytes:
+        number = normalize_phone_number(phone_number)
+        if not number:
+            return NOT_CONFIGURED_BODY
+
+        entry = self._entries.get(number)
+        if entry is not None and self._invalidated_elsewhere(number, entry):
+            self._entries.pop(number, None)
+            entry = None
+        if entry is not None:
+            self._entries.move_to_end(number)
+            now = time.monotonic()
+            if entry.expires_at <= now:
+                self._schedule_refresh(number)
+                if now - entry.expires_at < get_settings().assistant_config_cache_ttl_seconds:
+                    return entry.body_at()
+            else:
+                return entry.body_at()
+
+        compiled = await asyncio.shield(self._schedule_refresh(number))
+        return compiled.body_at() if compiled is not None else NOT_CONFIGURED_BODY
+
+    def store(self, number: str, compiled: CompiledAssistant) -> None:
+        previous = self._entries.get(number)
+        if previous is not None and previous.user_id and previous.user_id != compiled.user_id:
+            self._by_user.get(previous.user_id, set()).discard(number)
+        self._entries[number] = compiled
+        self._entries.move_to_end(number)
+        while len(self._entries) > self._max_entries:
+            self._evict(next(iter(self._entries)))
+        if compiled.user_id:
+            self._by_user.setdefault(compiled.user_id, set()).add(number)
+            window_start = _invalidation_window(time.time())
+            self._seen_invalidations[number] = (
+                window_start,
+                _published_invalidations(compiled.user_id, window_start),
+            )
+        else:
+            self._seen_invalidations.pop(number, None)
+
+    def invalidate_user(self, user_id: str, extra_numbers: Iterable[Optional[str]] = ()) -> None:
+        """Drop a tenant's compiled configs and recompile them in the background."""
+
+        numbers = self._by_user.pop(str(user_id), set())
+        numbers.update(n for n in (normalize_phone_number(x) for x in extra_numbers) if n)
+        shared_state = get_shared_state()
+        if shared_state is not None:
+            window_start = _invalidation_window(time.time())
+            shared_state.incr(_invalidation_key(str(user_id)), window_start, window_start + 2 * _INVALIDATION_WINDOW)
+        for number in numbers:
+            self._entries.pop(number, None)
+            self._generations[number] = self._generations.get(number, 0) + 1
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        for number in numbers:
+            self._schedule_refresh(number)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_user.clear()
+        self._seen_invalidations.clear()
+
+    def _evict(self, number: str) -> None:
+        entry = self._entries.pop(number)
+        self._seen_invalidations.pop(number, None)
+        if entry.user_id:
+            numbers = self._by_user.get(entry.user_id)
+            if numbers is not None:
+                numbers.discard(number)
+                if not numbers:
+                    del self._by_user[entry.user_id]
+
+    def _invalidated_elsewhere(self, number: str, entry: CompiledAssistant) -> bool:
+        """True when another worker invalidated the entry's tenant after it was stored."""
+        seen = self._seen_invalidations.get(number)
+        if seen is None or entry.user_id is None or get_shared_state() is None:
+            return False
+        seen_window, seen_count = seen
+        if _published_invalidations(entry.user_id, seen_window) > seen_count:
+            return True
+        current_window = _invalidation_window(time.time())
+        return current_window != seen_window and _published_invalidations(entry.user_id, current_window) > 0
+
+    def _schedule_refresh(self, number: str) -> asyncio.Task:
+        task = self._refreshing.get(number)
+        if task is None or task.done():
+            task = asyncio.create_task(self._refresh(number), name=f"assistant-config:{number}")
+            self._refreshing[number] = task
+        return task
+
+    async def _refresh(self, number: str) -> Optional[CompiledAssistant]:
+        try:
+            while True:
+                generation = self._generations.get(number, 0)
+                compiled = await _compile_for_number(number)
+                # Recompile if the tenant was invalidated while we were reading
+                if self._generations.get(number, 0) == generation:
+                    break
+            self.store(number, compiled)
+            return compiled
+        except Exception as exc:  # noqa: BLE001 - keep serving the previous entry
+            logger.warning("Failed to compile assistant config for %s: %s", number, exc)
+            return self._entries.get(number)
+        finally:
+            self._refreshing.pop(number, None)
+
+    async def warm(self) -> int:
+        """Compile configs for every known number (startup)."""
+
+        async with SessionLocal() as session:
+            rows = await session.execute(
+                select(User.twilio_phone_number).where(User.twilio_phone_number.is_not(None))
+            )
+            numbers = {n for n in (normalize_phone_number(r) for r in rows.scalars()) if n}
+            rows = await session.execute(
+                select(StudioConfig.phone_number).where(
+                    StudioConfig.phone_number.is_not(None),
+                    StudioConfig.phone_number != "",
+                )
+            )
+            numbers.update(n for n in (normalize_phone_number(r) for r in rows.scalars()) if n)
+
+        results = await asyncio.gather(*(self._schedule_refresh(n) for n in numbers))
+        return sum(1 for result in results if result is not None)
+
+
+def _invalidation_key(user_id: str) -> str:
+    return f"assistant-config:{user_id}"
+
+
+def _invalidation_window(now: float) -> int:
+    return int(now // _INVALIDATION_WINDOW * _INVALIDATION_WINDOW)
+
+
+def _published_invalidations(user_id: str, window_start: int) -> int:
+    shared_state = get_shared_state()
+    if shared_state is None:
+        return 0
+    return shared_state.count(_invalidation_key(user_id), window_start)
+
+
+assistant_configs = AssistantConfigCache(max_entries=get_settings().assistant_config_cache_max_entries)
+
+
+async def warm_assistant_configs() -> None:
+    try:
+        compiled = await assistant_configs.warm()
+        logger.info("Precompiled %s assistant configs", compiled)
+    except Exception as exc:  # noqa: BLE001 - warmup is best effort
+        logger.warning("Assistant config warmup failed: %s", exc)
+
+
+__all__ = [
+    "AssistantConfigCache",
+    "CompiledAssistant",
+    "assistant_configs",
+    "build_assistant_definition",
+    "build_assistant_metadata",
+    "build_assistant_prompt",
+    "compile_assistant_response",
+    "warm_assistant_configs",
+    "webhook_url",
+]
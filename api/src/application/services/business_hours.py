@@ -0,0 +1,54 @@
+"""
+Business hours resolution for tenants and their phone numbers.
+
+Schedules are compiled when tenant data is (re)loaded into the caches that
+serve webhooks, never per call.
+
+Every studio config was created with the "09:00-18:00" default, long before
+hours were enforced. A tenant's hours therefore only apply once it has saved
+hours or holidays (`business_hours_enforced`); until then it is treated as
+always open. A per-number override is always explicit and always applies.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.src.domain.value_objects.business_hours import BusinessHoursError, BusinessSchedule, compile_schedule
+from api.src.infrastructure.persistence.models.phone_number import PhoneNumber
+from api.src.infrastructure.persistence.models.studio_config import StudioConfig
+
+logger = logging.getLogger("ava.business_hours")
+
+
+def schedule_for(config: StudioConfig, override: Optional[dict[str, Any]] = None) -> BusinessSchedule:
+    """Compile the tenant schedule; a non-empty per-number override wins.
+
+    An unparsable schedule falls back to "always open" so calls are never
+    turned away because of a typo in the settings, and so does a tenant that
+    never saved its hours.
+    """
+
+    if not override and not config.business_hours_enforced:
+        return compile_schedule("24/7", timezone_name=config.timezone or "UTC")
+    hours: Any = override if override else config.business_hours
+    try:
+        return compile_schedule(hours, timezone_name=config.timezone, holidays=config.holidays or [])
+    except BusinessHoursError as exc:
+        logger.warning("Invalid business hours for user %s: %s", config.user_id, exc)
+        return compile_schedule("24/7", timezone_name="UTC")
+
+
+async def number_override(session: AsyncSession, phone_number: str) -> Optional[dict[str, Any]]:
+    """Per-number business hours stored on `PhoneNumber`, if any."""
+
+    result = await session.execute(select(PhoneNumber.business_hours).where(PhoneNumber.e164 == phone_number))
+    hours = result.scalar_one_or_none()
+    return hours or None
+
+
+__all__ = ["number_override", "schedule_for"]
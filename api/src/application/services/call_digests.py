@@ -0,0 +1,254 @@
+"""
+Call summary digests.
+
+Tenants in "digest" summary mode do not get one email per call: call.ended
+only flags the stored call as `summary_pending`. A background scheduler
+groups pending calls per tenant and sends one digest email once
+`digest_interval_minutes` have passed since the previous digest, or earlier
+once `digest_max_calls` calls are waiting. The digest is queued in the email
+outbox in the same transaction that clears the flags, so a call is never
+summarized twice or dropped. "immediate" mode (the default) is unchanged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Sequence
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import select
+
+from api.src.application.services.email_outbox import email_outbox, enqueue_email
+from api.src.core.settings import get_settings
+from api.src.infrastructure.database.session import SessionLocal
+from api.src.infrastructure.email.templating import render_template
+from api.src.infrastructure.persistence.models.call import CallRecord
+from api.src.infrastructure.persistence.models.studio_config import StudioConfig
+from api.src.infrastructure.persistence.models.user import User
+from api.src.infrastructure.persistence.repositories.call_repository import (
+    claim_pending_digest_calls,
+    get_pending_digest_counts,
+)
+
+logger = logging.getLogger("ava.call_digests")
+
+SUMMARY_MODE_IMMEDIATE = "immediate"
+SUMMARY_MODE_DIGEST = "digest"
+
+_EXCERPT_CHARS = 280
+
+
+def uses_digest(config: Optional[StudioConfig]) -> bool:
+    return config is not None and config.summary_mode == SUMMARY_MODE_DIGEST
+
+
+def digest_due(
+    *,
+    pending: int,
+    oldest_pending_at: Optional[datetime],
+    last_sent_at: Optional[datetime],
+    summary_mode: str,
+    interval_minutes: int,
+    max_calls: int,
+    now: datetime,
+) -> bool:
+    if pending <= 0:
+        return False
+    if summary_mode != SUMMARY_MODE_DIGEST:
+        return True  # switched back to immediate mode: flush what is left
+    if pending >= max_calls:
+        return True
+    since = last_sent_at or oldest_pending_at
+    return since is None or now - since >= timedelta(minutes=interval_minutes)
+
+
+def _zone(name: Optional[str]) -> ZoneInfo:
+    try:
+        return ZoneInfo(name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo("UTC")
+
+
+def _format_duration(seconds: Optional[int]) -> str:
+    minutes, seconds = divmod(seconds or 0, 60)
+    return f"{minutes}m {seconds}s" if minutes else f"{seconds}s"
+
+
+def _excerpt(transcript: Optional[str]) -> str:
+    text = (transcript or "").strip()
+    if len(text) <= _EXCERPT_CHARS:
+        return text
+    return text[:_EXCERPT_CHARS].rsplit(" ", 1)[0] + " …"
+
+
+def render_digest(
+    calls: Sequence[CallRecord],
+    *,
+    business_name: str,
+    timezone_name: Optional[str] = None,
+) -> tuple[str, str]:
+    """Return (subject, html) for a digest of `calls`."""
+
+    settings = get_settings()
+    tz = _zone(timezone_name)
+    rows = []
+    for call in calls:
+        meta = call.meta or {}
+        rows.append(
+            {
+                "caller_name": meta.get("caller_name") or "Unknown Caller",
+                "caller_phone": call.customer_number or "Unknown",
+                "started_at": call.started_at.astimezone(tz).strftime("%d/%m %H:%M") if call.started_at else "",
+                "duration": _format_duration(call.duration_seconds),
+                "excerpt": _excerpt(call.transcript),
+                "url": f"{settings.app_url}/dashboard/calls/{call.id}",
+            }
+        )
+
+    starts = [call.started_at for call in calls if call.started_at]
+    period = ""
+    if starts:
+        first, last = min(starts).astimezone(tz), max(starts).astimezone(tz)
+        period = f"{first:%d/%m/%Y %H:%M} – {last:%d/%m/%Y %H:%M}"
+
+    headline = "1 new call" if len(calls) == 1 else f"{len(calls)} new calls"
+    subject = f"📞 {headline} for {business_name}"
+    html = render_template(
+        "call_digest.html",
+        headline=headline,
+        period=period,
+        calls=rows,
+        business_name=business_name,
+        app_url=settings.app_url,
+    )
+    return subject, html
+
+
+class CallDigestScheduler:
+    """Background loop sending due call digests."""
+
+    def __init__(self, *, poll_interval: float = 60.0, max_calls_per_email: int = 200) -> None:
+        self._poll_interval = poll_interval
+        self._max_calls_per_email = max_calls_per_email
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="call-digests")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def notify(self) -> None:
+        """A call was flagged for a digest; re-check thresholds now."""
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                sent = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001 - keep the scheduler alive
+                logger.warning("Call digest run failed: %s", exc)
+                sent = 0
+
+            if sent:
+                continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_once(self) -> int:
+        """Send every digest that is due. Returns the number sent."""
+
+        now = datetime.now(timezone.utc)
+        async with SessionLocal() as session:
+            pending = await get_pending_digest_counts(session)
+            if not pending:
+                return 0
+            result = await session.execute(
+                select(StudioConfig).where(StudioConfig.user_id.in_([str(tenant_id) for tenant_id, _, _ in pending]))
+            )
+            configs = {config.user_id: config for config in result.scalars()}
+
+        sent = 0
+        for tenant_id, count, oldest in pending:
+            config = configs.get(str(tenant_id))
+            if config is None:
+                continue
+            due = digest_due(
+                pending=count,
+                oldest_pending_at=oldest,
+                last_sent_at=config.digest_last_sent_at,
+                summary_mode=config.summary_mode,
+                interval_minutes=config.digest_interval_minutes,
+                max_calls=config.digest_max_calls,
+                now=now,
+            )
+            if due and await self._send(str(tenant_id)):
+                sent += 1
+        return sent
+
+    async def _send(self, tenant_id: str) -> bool:
+        async with SessionLocal() as session:
+            # Another worker holding the row lock is already sending this digest
+            config = (
+                await session.execute(
+                    select(StudioConfig).where(StudioConfig.user_id == tenant_id).with_for_update(skip_locked=True)
+                )
+            ).scalars().first()
+            if config is None:
+                return False
+            calls = await claim_pending_digest_calls(session, tenant_id, limit=self._max_calls_per_email)
+            if not calls:
+                await session.rollback()
+                return False
+
+            user = await session.get(User, tenant_id)
+            recipient = config.fallback_email or config.summary_email or (user.email if user else None)
+            if recipient:
+                subject, html = render_digest(
+                    calls,
+                    business_name=config.organization_name,
+                    timezone_name=config.timezone,
+                )
+                enqueue_email(session, to=recipient, subject=subject, html=html, user_id=tenant_id)
+            else:
+                logger.warning("No recipient for call digest of tenant %s, dropping %s calls", tenant_id, len(calls))
+
+            for call in calls:
+                call.summary_pending = False
+            config.digest_last_sent_at = datetime.now(timezone.utc)
+            await session.commit()
+
+        email_outbox.notify()
+        logger.info("Queued call digest for tenant %s (%s calls)", tenant_id, len(calls))
+        return True
+
+
+_settings = get_settings()
+call_digests = CallDigestScheduler(
+    poll_interval=_settings.call_digest_poll_interval_seconds,
+    max_calls_per_email=_settings.call_digest_max_calls_per_email,
+)
+
+
+__all__ = [
+    "CallDigestScheduler",
+    "SUMMARY_MODE_DIGEST",
+    "SUMMARY_MODE_IMMEDIATE",
+    "call_digests",
+    "digest_due",
+    "render_digest",
+    "uses_digest",
+]
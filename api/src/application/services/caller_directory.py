@@ -0,0 +1,144 @@
+"""
+Caller directory: who is calling, answered from memory when possible.
+
+Lookups happen inside a function-call round trip while the caller is waiting
+on the line, so results (including "unknown number") are kept in a bounded
+per-process LRU keyed by (tenant, number). Writes go through the directory so
+the local cache always reflects this worker's latest upsert; other workers
+converge within the TTL.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.src.core.settings import get_settings
+from api.src.domain.entities.caller import Caller, normalize_phone_number
+from api.src.infrastructure.database.session import SessionLocal, run_read_only
+from api.src.infrastructure.persistence.repositories.caller_repository import get_caller, upsert_caller
+
+logger = logging.getLogger("ava.callers")
+
+CacheKey = Tuple[str, str]
+
+
+class CallerDirectory:
+    """LRU + TTL cache in front of the callers table."""
+
+    def __init__(self, *, max_entries: int = 10_000, ttl_seconds: float = 300) -> None:
+        self._entries: "OrderedDict[CacheKey, tuple[float, Optional[Caller]]]" = OrderedDict()
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(tenant_id: UUID | str, phone_number: str) -> CacheKey:
+        return (str(tenant_id), phone_number)
+
+    def peek(self, tenant_id: UUID | str, phone_number: str) -> tuple[bool, Optional[Caller]]:
+        """Return (hit, caller) without touching the database."""
+        key = self._key(tenant_id, phone_number)
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, caller = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, caller
+
+    def remember(self, tenant_id: UUID | str, phone_number: str, caller: Optional[Caller]) -> None:
+        key = self._key(tenant_id, phone_number)
+        self._entries[key] = (time.monotonic() + self._ttl, caller)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, tenant_id: UUID | str, phone_number: str) -> None:
+        self._entries.pop(self._key(tenant_id, phone_number), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def lookup(self, tenant_id: UUID, phone_number: Optional[str]) -> Optional[Caller]:
+        """Return the known caller for a number, or None for unknown numbers."""
+        number = normalize_phone_number(phone_number)
+        if not number:
+            return None
+
+        hit, caller = self.peek(tenant_id, number)
+        if hit:
+            return caller
+
+        record = await run_read_only(lambda session: get_caller(session, tenant_id, number))
+        caller = record.to_entity() if record else None
+        self.remember(tenant_id, number, caller)
+        return caller
+
+    async def record(
+        self,
+        tenant_id: UUID,
+        phone_number: Optional[str],
+        *,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None,
+        email: Optional[str] = None,
+        notes: Optional[str] = None,
+        seen_at: Optional[datetime] = None,
+        count_call: bool = False,
+        session: Optional[AsyncSession] = None,
+    ) -> Optional[Caller]:
+        """Upsert a caller.
+
+        Without `session`, a session is opened and committed here and the
+        cache is refreshed. With an explicit `session` the statement joins the
+        caller's transaction and the cache is left alone: the caller commits,
+        then passes the returned caller to `remember_caller()`, so a rolled
+        back upsert never reaches the cache.
+        """
+        number = normalize_phone_number(phone_number)
+        if not number:
+            return None
+
+        fields = dict(
+            tenant_id=tenant_id,
+            phone_number=number,
+            first_name=first_name or None,
+            last_name=last_name or None,
+            email=email or None,
+            notes=notes or None,
+            seen_at=seen_at,
+            count_call=count_call,
+        )
+        if session is not None:
+            return (await upsert_caller(session, **fields)).to_entity()
+
+        async with SessionLocal() as own_session:
+            caller = (await upsert_caller(own_session, **fields)).to_entity()
+            await own_session.commit()
+        self.remember(tenant_id, number, caller)
+        return caller
+
+    def remember_caller(self, tenant_id: UUID | str, caller: Caller) -> None:
+        """Cache a caller returned by `record(session=...)` once that transaction committed."""
+        self.remember(tenant_id, caller.phone_number, caller)
+
+
+_settings = get_settings()
+caller_directory = CallerDirectory(
+    max_entries=_settings.caller_cache_max_entries,
+    ttl_seconds=_settings.caller_cache_ttl_seconds,
+)
+
+
+__all__ = ["CallerDirectory", "caller_directory"]
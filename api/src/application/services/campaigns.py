@@ -0,0 +1,465 @@
+"""
+Outbound call campaigns.
+
+A running campaign's contacts are dialed by `CampaignDialer`, a background
+loop that:
+
+- only dials inside the campaign's calling windows (business hours syntax,
+  evaluated in the campaign's timezone);
+- caps calls in flight per campaign (`max_concurrent_calls`) and per tenant
+  across all of its campaigns; the tenant's row lock is held from counting
+  live calls to committing the claims, so dialers on several workers never
+  claim the same free slots;
+- spaces call placements per Twilio account to the account's
+  calls-per-second limit (`CallPacer`, slots reserved in the database so
+  every worker shares the budget);
+- retries busy / no-answer outcomes with exponential backoff, up to
+  `max_attempts` per contact; a call turned away before reaching Twilio
+  (open circuit, full bulkhead) goes back to the queue without using one.
+
+Calls are placed with a status callback pointing at the Twilio status
+webhook, which records each outcome through `record_campaign_call_status`
+and wakes the dialer when a slot frees up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import logging
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from twilio.base.exceptions import TwilioRestException
+
+from api.src.application.services.twilio import make_twilio_call_with_circuit_breaker, resolve_twilio_credentials
+from api.src.core.settings import get_settings
+from api.src.domain.entities.caller import normalize_phone_number
+from api.src.domain.value_objects.business_hours import BusinessHoursError, compile_schedule
+from api.src.infrastructure.database.session import SessionLocal
+from api.src.infrastructure.persistence.models.campaign import (
+    CONTACT_COMPLETED,
+    CONTACT_DIALING,
+    CONTACT_FAILED,
+    CONTACT_PENDING,
+    Campaign,
+    CampaignContact,
+)
+from api.src.infrastructure.persistence.models.user import User
+from api.src.infrastructure.persistence.repositories.campaign_repository import (
+    claim_campaign_contacts,
+    complete_campaign,
+    count_live_calls,
+    get_contact_for_status,
+    has_open_contacts,
+    list_running_campaigns,
+    lock_tenant_for_dialing,
+    mark_contact_dialed,
+    mark_contact_not_placed,
+    release_stale_contacts,
+    requeue_contact,
+    reserve_call_slot,
+)
+
+try:
+    from prometheus_client import Counter, Histogram
+
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+logger = logging.getLogger("ava.campaigns")
+
+RETRYABLE_CALL_STATUSES = frozenset({"busy", "no-answer"})
+FAILED_CALL_STATUSES = frozenset({"failed", "canceled"})
+MAX_RETRY_DELAY_SECONDS = 24 * 3600
+
+_E164_RE = re.compile(r"^\+[1-9]\d{6,14}$")
+_PHONE_COLUMNS = ("phone_number", "phone", "number", "telephone", "mobile")
+_NAME_COLUMNS = ("name", "full_name", "contact")
+
+if METRICS_AVAILABLE:
+    campaign_calls_placed_metric = Counter(
+        "campaign_calls_placed_total",
+        "Outbound campaign call placements by result",
+        ["result"],
+    )
+    campaign_call_outcomes_metric = Counter(
+        "campaign_call_outcomes_total",
+        "Final outcome of each campaign call attempt",
+        ["outcome"],
+    )
+    campaign_pacing_wait_metric = Histogram(
+        "campaign_pacing_wait_seconds",
+        "Time a call waited for its calls-per-second slot",
+        buckets=(0, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+    )
+else:
+    campaign_calls_placed_metric = None
+    campaign_call_outcomes_metric = None
+    campaign_pacing_wait_metric = None
+
+
+class ContactListError(ValueError):
+    """Raised when an uploaded contact list cannot be used."""
+
+
+def parse_contacts_csv(text: str) -> tuple[List[Dict[str, Any]], List[str]]:
+    """Parse a CSV contact list with a header row.
+
+    The phone column may be called phone_number, phone, number, telephone or
+    mobile; an optional name / full_name / contact column gives the name;
+    every other column is kept as contact metadata. Returns (contacts,
+    errors); invalid and duplicate numbers are reported, not imported.
+    """
+
+    reader = csv.DictReader(io.StringIO(text.lstrip("﻿")))
+    columns = {(name or "").strip().lower(): name for name in reader.fieldnames or ()}
+    phone_column = next((columns[name] for name in _PHONE_COLUMNS if name in columns), None)
+    if phone_column is None:
+        raise ContactListError(f"The contact list needs a phone column ({', '.join(_PHONE_COLUMNS)}).")
+    name_column = next((columns[name] for name in _NAME_COLUMNS if name in columns), None)
+
+    contacts: List[Dict[str, Any]] = []
+    errors: List[str] = []
+    seen: set[str] = set()
+    for line, row in enumerate(reader, start=2):
+        raw = (row.get(phone_column) or "").strip()
+        number = normalize_phone_number(re.sub(r"[\s().-]", "", raw))
+        if not number or not _E164_RE.match(number):
+            errors.append(f"line {line}: invalid phone number {raw!r}")
+            continue
+        if number in seen:
+            errors.append(f"line {line}: duplicate phone number {number}")
+            continue
+        seen.add(number)
+        meta = {
+            key.strip(): value.strip()
+            for key, value in row.items()
+            if key and key not in (phone_column, name_column) and isinstance(value, str) and value.strip()
+        }
+        name = (row.get(name_column) or "").strip() if name_column else ""
+        contacts.append({"phone_number": number, "name": name or None, "meta": meta})
+    return contacts, errors
+
+
+def in_calling_window(campaign: Campaign, at: datetime) -> bool:
+    """Whether `at` falls inside the campaign's calling windows (no schedule: always)."""
+
+    try:
+        schedule = compile_schedule(campaign.schedule, timezone_name=campaign.timezone)
+    except BusinessHoursError as exc:
+        logger.warning("Invalid schedule for campaign %s, not dialing: %s", campaign.id, exc)
+        return False
+    return schedule.is_open(at)
+
+
+def retry_delay(attempts: int, base_seconds: float) -> float:
+    """Exponential backoff after `attempts` unanswered attempts, capped at a day."""
+    return min(MAX_RETRY_DELAY_SECONDS, base_seconds * (2 ** max(attempts - 1, 0)))
+
+
+def apply_call_status(contact: CampaignContact, campaign: Campaign, call_status: str, *, now: datetime) -> Optional[str]:
+    """Update a dialing contact from a Twilio call status.
+
+    Returns the outcome once the call has ended ("completed", "retry" or
+    "failed"), None while it is still in progress or for a late callback.
+    """
+
+    contact.last_call_status = call_status
+    if contact.status != CONTACT_DIALING:
+        return None
+
+    if call_status == "completed":
+        contact.status = CONTACT_COMPLETED
+        outcome = "completed"
+    elif call_status in RETRYABLE_CALL_STATUSES:
+        if contact.attempts < campaign.max_attempts:
+            contact.status = CONTACT_PENDING
+            contact.next_attempt_at = now + timedelta(
+                seconds=retry_delay(contact.attempts, campaign.retry_delay_seconds)
+            )
+            outcome = "retry"
+        else:
+            contact.status = CONTACT_FAILED
+            outcome = "failed"
+    elif call_status in FAILED_CALL_STATUSES:
+        contact.status = CONTACT_FAILED
+        outcome = "failed"
+    else:
+        return None
+
+    contact.updated_at = now
+    if METRICS_AVAILABLE and campaign_call_outcomes_metric is not None:
+        campaign_call_outcomes_metric.labels(outcome=outcome).inc()
+    return outcome
+
+
+async def record_campaign_call_status(
+    session: AsyncSession,
+    *,
+    call_sid: str,
+    contact_id: Optional[int],
+    call_status: str,
+) -> Optional[str]:
+    """Apply a status callback to its campaign contact; the caller commits.
+
+    Returns the outcome when the call ended (see `apply_call_status`).
+    """
+
+    contact = await get_contact_for_status(session, contact_id=contact_id, call_sid=call_sid)
+    if contact is None:
+        return None
+    campaign = await session.get(Campaign, contact.campaign_id)
+    if campaign is None:
+        return None
+    contact.call_sid = contact.call_sid or call_sid
+    return apply_call_status(contact, campaign, call_status, now=datetime.now(timezone.utc))
+
+
+class CallPacer:
+    """Spaces call placements per Twilio account to a calls-per-second limit.
+
+    Each caller reserves the next free slot for its account before sleeping,
+    so concurrent callers are spread out instead of bursting together. With
+    `reserve`, slots come from state shared by all workers; this process's
+    own slots are the fallback when it fails.
+    """
+
+    def __init__(
+        self,
+        calls_per_second: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+        reserve: Optional[Callable[[str, float], Awaitable[float]]] = None,
+    ) -> None:
+        self._interval = 1.0 / calls_per_second
+        self._clock = clock
+        self._sleep = sleep
+        self._reserve = reserve
+        self._next_slot: Dict[str, float] = {}
+
+    async def wait(self, account: str) -> float:
+        """Wait for the account's next slot. Returns the time waited."""
+        if self._reserve is None:
+            delay = self._local_slot(account)
+        else:
+            try:
+                delay = await self._reserve(account, self._interval)
+            except Exception as exc:  # noqa: BLE001 - still pace this worker's calls
+                logger.warning("Shared call pacing unavailable, pacing locally: %s", exc)
+                delay = self._local_slot(account)
+        if delay > 0:
+            await self._sleep(delay)
+        return delay
+
+    def _local_slot(self, account: str) -> float:
+        now = self._clock()
+        slot = max(now, self._next_slot.get(account, now))
+        self._next_slot[account] = slot + self._interval
+        return slot - now
+
+
+async def reserve_shared_call_slot(account: str, interval: float) -> float:
+    """`CallPacer` reservation through the database, shared by all dialers."""
+    async with SessionLocal() as session:
+        delay = await reserve_call_slot(session, account, interval=interval)
+        await session.commit()
+    return delay
+
+
+class CampaignDialer:
+    """Background loop placing calls for running campaigns."""
+
+    def __init__(
+        self,
+        *,
+        poll_interval: float = 5.0,
+        calls_per_second: float = 1.0,
+        max_live_calls_per_tenant: int = 10,
+        stale_call_seconds: float = 3600.0,
+        status_callback_url: Optional[str] = None,
+    ) -> None:
+        self._poll_interval = poll_interval
+        self._max_live_calls_per_tenant = max_live_calls_per_tenant
+        self._stale_call_seconds = stale_call_seconds
+        self._status_callback_url = status_callback_url
+        self.pacer = CallPacer(calls_per_second, reserve=reserve_shared_call_slot)
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="campaign-dialer")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def notify(self) -> None:
+        """A campaign started or a call ended; look for contacts to dial now."""
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                placed = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001 - keep the dialer alive
+                logger.warning("Campaign dialer run failed: %s", exc)
+                placed = 0
+
+            if placed:
+                continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_once(self) -> int:
+        """Dial every running campaign once. Returns the number of calls placed."""
+
+        async with SessionLocal() as session:
+            campaigns = await list_running_campaigns(session)
+        by_tenant: Dict[str, List[Campaign]] = {}
+        for campaign in campaigns:
+            by_tenant.setdefault(campaign.user_id, []).append(campaign)
+
+        # Tenants dial in parallel; a tenant's campaigns share its call cap, so they go in turn
+        results = await asyncio.gather(
+            *(self._dial_tenant(user_id, tenant_campaigns) for user_id, tenant_campaigns in by_tenant.items()),
+            return_exceptions=True,
+        )
+        placed = 0
+        for user_id, result in zip(by_tenant, results):
+            if isinstance(result, Exception):
+                logger.warning("Dialing campaigns of user %s failed: %s", user_id, result)
+            else:
+                placed += result
+        return placed
+
+    async def _dial_tenant(self, user_id: str, campaigns: Sequence[Campaign]) -> int:
+        claimed: List[tuple[Campaign, CampaignContact]] = []
+        completed: List[str] = []
+        async with SessionLocal() as session:
+            # Held until the claims are committed; another worker dialing this tenant skips it
+            user = await lock_tenant_for_dialing(session, user_id)
+            if user is None:
+                return 0
+            try:
+                account_sid = resolve_twilio_credentials(user, allow_env_fallback=True).account_sid
+            except HTTPException:
+                logger.warning("Campaigns of user %s are running without Twilio credentials", user_id)
+                return 0
+            live = await count_live_calls(session, user_id, stale_after=self._stale_call_seconds)
+
+            now = datetime.now(timezone.utc)
+            free = self._max_live_calls_per_tenant - sum(live.values())
+            for campaign in campaigns:
+                if free <= 0:
+                    break
+                if not in_calling_window(campaign, now):
+                    continue
+                slots = min(free, campaign.max_concurrent_calls - live.get(campaign.id, 0))
+                if slots <= 0:
+                    continue
+
+                await release_stale_contacts(session, campaign.id, stale_after=self._stale_call_seconds)
+                contacts = await claim_campaign_contacts(session, campaign.id, limit=slots)
+                if not contacts and not await has_open_contacts(session, campaign.id):
+                    await complete_campaign(session, campaign.id)
+                    completed.append(campaign.id)
+                    continue
+                free -= len(contacts)
+                claimed.extend((campaign, contact) for contact in contacts)
+            await session.commit()
+
+        for campaign_id in completed:
+            logger.info("Campaign %s completed", campaign_id)
+        placed = 0
+        for campaign, contact in claimed:
+            if await self.place_call(campaign, contact, user, account_sid):
+                placed += 1
+        return placed
+
+    async def place_call(self, campaign: Campaign, contact: CampaignContact, user: User, account_sid: str) -> bool:
+        """Place one claimed contact's call, paced to the account's CPS limit."""
+
+        waited = await self.pacer.wait(account_sid)
+        if METRICS_AVAILABLE and campaign_pacing_wait_metric is not None:
+            campaign_pacing_wait_metric.observe(waited)
+
+        callback = f"{self._status_callback_url}?campaign_contact={contact.id}" if self._status_callback_url else None
+        try:
+            call = await make_twilio_call_with_circuit_breaker(
+                to=contact.phone_number,
+                from_=campaign.from_number,
+                url=campaign.twiml_url,
+                user=user,
+                status_callback=callback,
+            )
+        except HTTPException as exc:
+            # Open circuit or full bulkhead: Twilio never saw the call
+            _record_placement("deferred")
+            logger.info("Deferred contact %s of campaign %s: %s", contact.id, campaign.id, exc.detail)
+            async with SessionLocal() as session:
+                await requeue_contact(session, contact.id, error=str(exc.detail))
+            return False
+        except Exception as exc:  # noqa: BLE001 - recorded on the contact
+            _record_placement("error")
+            # Twilio rejects invalid numbers with a 400: retrying will not help
+            permanent = isinstance(exc, TwilioRestException) and exc.status == 400
+            retry_at = None
+            if not permanent and contact.attempts < campaign.max_attempts:
+                retry_at = datetime.now(timezone.utc) + timedelta(
+                    seconds=retry_delay(contact.attempts, campaign.retry_delay_seconds)
+                )
+            logger.warning("Could not call contact %s of campaign %s: %s", contact.id, campaign.id, exc)
+            async with SessionLocal() as session:
+                await mark_contact_not_placed(session, contact.id, error=str(exc), retry_at=retry_at)
+            return False
+
+        async with SessionLocal() as session:
+            await mark_contact_dialed(session, contact.id, call_sid=call["sid"])
+        _record_placement("placed")
+        return True
+
+
+def _record_placement(result: str) -> None:
+    if METRICS_AVAILABLE and campaign_calls_placed_metric is not None:
+        campaign_calls_placed_metric.labels(result=result).inc()
+
+
+_settings = get_settings()
+campaign_dialer = CampaignDialer(
+    poll_interval=_settings.campaign_poll_interval_seconds,
+    calls_per_second=_settings.campaign_calls_per_second,
+    max_live_calls_per_tenant=_settings.campaign_max_live_calls_per_tenant,
+    stale_call_seconds=_settings.campaign_stale_call_seconds,
+    status_callback_url=f"{_settings.backend_url}{_settings.api_prefix}/webhooks/twilio/status",
+)
+
+
+__all__ = [
+    "CallPacer",
+    "CampaignDialer",
+    "ContactListError",
+    "apply_call_status",
+    "campaign_dialer",
+    "in_calling_window",
+    "parse_contacts_csv",
+    "record_campaign_call_status",
+    "reserve_shared_call_slot",
+    "retry_delay",
+]
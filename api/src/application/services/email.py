@@ -1,11 +1,22 @@
-"""Application-level helpers for email delivery."""
+"""Application-level helpers for email delivery.
+
+`EmailService` instances are cached per tenant so sending an email does not
+re-resolve and Fernet-decrypt the tenant's SMTP password every time. Entries
+expire after `email_service_cache_ttl_seconds`, are dropped explicitly when a
+tenant changes their SMTP settings, and are rebuilt when the stored SMTP
+fields no longer match the ones the service was built from (settings changed
+through another worker).
+"""
 
 from __future__ import annotations
 
 import logging
+import time
+from collections import OrderedDict
 from typing import Optional
 
 from api.src.core.crypto import EncryptionError, get_smtp_encryptor
+from api.src.core.settings import get_settings
 from api.src.infrastructure.email import EmailService, get_email_service
 from api.src.infrastructure.email.smtp_client import SMTPConfig
 from api.src.infrastructure.persistence.models.studio_config import StudioConfig as StudioConfigModel
@@ -49,6 +60,64 @@ def resolve_smtp_config(config: Optional[StudioConfigModel]) -> Optional[SMTPCon
     )
 
 
+SMTPFingerprint = tuple[Optional[str], Optional[str], Optional[str], Optional[str]]
+
+
+def _smtp_fingerprint(config: StudioConfigModel) -> SMTPFingerprint:
+    return (config.smtp_server, str(config.smtp_port or ""), config.smtp_username, config.smtp_password_encrypted)
+
+
+class EmailServiceCache:
+    """Per-tenant LRU + TTL cache of ready-to-use `EmailService` instances."""
+
+    def __init__(self, *, max_entries: int = 1000, ttl_seconds: float = 600) -> None:
+        self._entries: "OrderedDict[str, tuple[float, SMTPFingerprint, EmailService]]" = OrderedDict()
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._default: Optional[EmailService] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, config: Optional[StudioConfigModel]) -> EmailService:
+        if config is None or not config.user_id:
+            if self._default is None:
+                self._default = get_email_service()
+            return self._default
+
+        key = str(config.user_id)
+        fingerprint = _smtp_fingerprint(config)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, cached_fingerprint, service = entry
+            if expires_at > time.monotonic() and cached_fingerprint == fingerprint:
+                self._entries.move_to_end(key)
+                return service
+
+        service = get_email_service(smtp_config=resolve_smtp_config(config))
+        self._entries[key] = (time.monotonic() + self._ttl, fingerprint, service)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return service
+
+    def invalidate_user(self, user_id: str) -> None:
+        self._entries.pop(str(user_id), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._default = None
+
+
+_settings = get_settings()
+email_services = EmailServiceCache(
+    max_entries=_settings.email_service_cache_max_entries,
+    ttl_seconds=_settings.email_service_cache_ttl_seconds,
+)
+
+
 def get_user_email_service(config: Optional[StudioConfigModel]) -> EmailService:
-    smtp_config = resolve_smtp_config(config)
-    return get_email_service(smtp_config=smtp_config)
+    return email_services.get(config)
+
+
+__all__ = ["EmailServiceCache", "email_services", "get_user_email_service", "resolve_smtp_config"]
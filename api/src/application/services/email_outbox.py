@@ -0,0 +1,351 @@
+"""
+Email outbox: request handlers enqueue, background workers deliver.
+
+Workers claim due rows with `SELECT ... FOR UPDATE SKIP LOCKED`, so several
+API processes can run them side by side. Each email is tried on the tenant's
+SMTP server first and fails over to Resend; per-provider semaphores bound how
+many deliveries run at once. Claimed emails with no SMTP route (call digests,
+retries after an SMTP outage, tenants without SMTP) go out together through
+Resend's batch endpoint. Failed emails are retried with exponential backoff
+and jitter, and dead-lettered after `email_outbox_max_attempts`. An SMTP
+connection lost after the message was written is neither failed over nor
+retried, since the server may already have delivered it: the email is
+dead-lettered for review instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Sequence
+
+from sqlalchemy import select
+
+from api.src.application.services.email import get_user_email_service
+from api.src.core.settings import get_settings
+from api.src.infrastructure.database.session import SessionLocal
+from api.src.infrastructure.email.email_service import EmailRequest, EmailService
+from api.src.infrastructure.email.resend_transport import ResendError, ResendRateLimited
+from api.src.infrastructure.email.smtp_pool import SMTPDeliveryUncertain
+from api.src.infrastructure.persistence.models.email_outbox import EmailOutbox
+from api.src.infrastructure.persistence.models.studio_config import StudioConfig
+from api.src.infrastructure.persistence.repositories.email_outbox_repository import (
+    add_outbox_email,
+    claim_due_emails,
+    mark_email_failed,
+    mark_email_sent,
+)
+
+try:
+    from prometheus_client import Counter, Histogram
+
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+logger = logging.getLogger("ava.email.outbox")
+
+if METRICS_AVAILABLE:
+    email_delivery_latency_metric = Histogram(
+        "email_delivery_latency_seconds",
+        "Time from enqueue to successful delivery",
+        ["provider"],
+        buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, 3600),
+    )
+    email_deliveries_metric = Counter(
+        "email_outbox_deliveries_total",
+        "Email delivery attempts by provider and outcome",
+        ["provider", "outcome"],
+    )
+    email_dead_letters_metric = Counter(
+        "email_outbox_dead_letters_total",
+        "Emails abandoned after exhausting retries",
+    )
+else:
+    email_delivery_latency_metric = None
+    email_deliveries_metric = None
+    email_dead_letters_metric = None
+
+
+def _record_attempt(provider: str, outcome: str) -> None:
+    if METRICS_AVAILABLE and email_deliveries_metric is not None:
+        email_deliveries_metric.labels(provider=provider, outcome=outcome).inc()
+
+
+def _rejected_by_resend(exc: Exception) -> bool:
+    """A 4xx other than 429: Resend refused the request's content."""
+    if not isinstance(exc, ResendError) or exc.status_code is None:
+        return False
+    return 400 <= exc.status_code < 500 and exc.status_code != 429
+
+
+class EmailOutboxWorker:
+    """Pool of background tasks draining the email outbox."""
+
+    def __init__(
+        self,
+        *,
+        workers: int = 2,
+        batch_size: int = 20,
+        poll_interval: float = 2.0,
+        lease_seconds: float = 300,
+        max_attempts: int = 6,
+        retry_base_seconds: float = 30,
+        retry_max_seconds: float = 3600,
+        smtp_concurrency: int = 5,
+        resend_concurrency: int = 10,
+        resend_batching: bool = True,
+    ) -> None:
+        self._workers = workers
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._lease_seconds = lease_seconds
+        self._max_attempts = max_attempts
+        self._retry_base = retry_base_seconds
+        self._retry_max = retry_max_seconds
+        self._resend_batching = resend_batching
+        self._limits = {
+            "smtp": asyncio.Semaphore(smtp_concurrency),
+            "resend": asyncio.Semaphore(resend_concurrency),
+        }
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    # ------------------------------------------------------------------ #
+    # Lifecycle
+    # ------------------------------------------------------------------ #
+
+    def start(self) -> None:
+        if any(not task.done() for task in self._tasks):
+            return
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"email-outbox-{index}") for index in range(self._workers)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Wake idle workers after an enqueue instead of waiting for the next poll."""
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                processed = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001 - keep the worker alive
+                logger.warning("Email outbox poll failed: %s", exc)
+                processed = 0
+
+            if processed:
+                continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    # ------------------------------------------------------------------ #
+    # Delivery
+    # ------------------------------------------------------------------ #
+
+    async def run_once(self) -> int:
+        """Claim and deliver one batch. Returns the number of emails processed."""
+        async with SessionLocal() as session:
+            emails = await claim_due_emails(session, limit=self._batch_size, lease_seconds=self._lease_seconds)
+        if not emails:
+            return 0
+
+        services = await asyncio.gather(
+            *(self._service_for(email.user_id) for email in emails), return_exceptions=True
+        )
+        batch: list[tuple[EmailOutbox, EmailService]] = []
+        pending = []
+        for email, service in zip(emails, services):
+            if isinstance(service, Exception):
+                pending.append(self._fail(email, service))
+            elif self._resend_batching and not service.smtp_enabled and service.resend_enabled:
+                batch.append((email, service))
+            else:
+                pending.append(self._process(email, service))
+
+        if len(batch) > 1:
+            pending.append(self._process_resend_batch(batch))
+        else:
+            pending.extend(self._process(email, service) for email, service in batch)
+        await asyncio.gather(*pending)
+        return len(emails)
+
+    async def _process(self, email: EmailOutbox, service: Optional[EmailService] = None) -> None:
+        try:
+            if service is None:
+                service = await self._service_for(email.user_id)
+            provider, message_id = await self.deliver(service, email)
+        except Exception as exc:  # noqa: BLE001 - recorded on the row
+            await self._fail(email, exc)
+            return
+
+        await self._sent(email, provider, message_id)
+
+    async def _process_resend_batch(self, batch: Sequence[tuple[EmailOutbox, EmailService]]) -> None:
+        """Deliver Resend-only emails with one batch request.
+
+        Resend validates the whole batch, so one malformed email fails it with
+        a 4xx; the emails are then sent one by one so only that one fails.
+        """
+        emails = [email for email, _ in batch]
+        service = batch[0][1]  # every service shares the process-wide Resend transport
+        try:
+            async with self._limits["resend"]:
+                results = await service.send_batch_via_resend([self._request(email) for email in emails])
+        except Exception as exc:  # noqa: BLE001 - recorded on each row
+            for _ in emails:
+                _record_attempt("resend", "failed")
+            if _rejected_by_resend(exc):
+                logger.warning("Resend batch of %s outbox emails rejected, sending one by one: %s", len(emails), exc)
+                await asyncio.gather(*(self._process(email, service) for email, service in batch))
+                return
+            logger.warning("Resend batch of %s outbox emails failed: %s", len(emails), exc)
+            await asyncio.gather(*(self._fail(email, exc) for email in emails))
+            return
+
+        for email, result in zip(emails, results):
+            _record_attempt("resend", "sent")
+            await self._sent(email, "resend", (result or {}).get("id"))
+
+    async def _sent(self, email: EmailOutbox, provider: str, message_id: Optional[str]) -> None:
+        async with SessionLocal() as session:
+            await mark_email_sent(session, email.id, provider=provider, message_id=message_id)
+
+        if METRICS_AVAILABLE and email_delivery_latency_metric is not None and email.created_at:
+            latency = (datetime.now(timezone.utc) - email.created_at).total_seconds()
+            email_delivery_latency_metric.labels(provider=provider).observe(max(latency, 0.0))
+
+    @staticmethod
+    def _request(email: EmailOutbox) -> EmailRequest:
+        return EmailRequest(
+            to=email.recipients,
+            subject=email.subject,
+            html=email.html,
+            sender=email.sender,
+            idempotency_key=f"email-outbox/{email.id}",
+        )
+
+    async def deliver(self, service: EmailService, email: EmailOutbox) -> tuple[str, Optional[str]]:
+        """Send via SMTP, failing over to Resend. Returns (provider, message id)."""
+        request = self._request(email)
+
+        error: Optional[Exception] = None
+        if service.smtp_enabled:
+            try:
+                async with self._limits["smtp"]:
+                    result = await service.send_via_smtp(request)
+                _record_attempt("smtp", "sent")
+                return "smtp", result.get("id")
+            except SMTPDeliveryUncertain:
+                _record_attempt("smtp", "uncertain")
+                raise
+            except Exception as exc:  # noqa: BLE001 - fail over to Resend
+                _record_attempt("smtp", "failed")
+                error = exc
+                logger.warning("SMTP delivery failed for outbox email %s: %s", email.id, exc)
+
+        if service.resend_enabled:
+            try:
+                async with self._limits["resend"]:
+                    result = await service.send_via_resend(request)
+            except Exception:
+                _record_attempt("resend", "failed")
+                raise
+            _record_attempt("resend", "sent")
+            return "resend", (result or {}).get("id")
+
+        raise error or RuntimeError("No email delivery backend is configured.")
+
+    async def _fail(self, email: EmailOutbox, exc: Exception) -> None:
+        retry_at: Optional[datetime] = None
+        if isinstance(exc, SMTPDeliveryUncertain):
+            logger.error("Outbox email %s may have been delivered, dead-lettering without retry: %s", email.id, exc)
+        elif email.attempts < self._max_attempts:
+            delay = self.retry_delay(email.attempts)
+            if isinstance(exc, ResendRateLimited) and exc.retry_after:
+                delay = max(delay, exc.retry_after)
+            retry_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+            logger.warning("Outbox email %s failed (attempt %s), retrying at %s: %s", email.id, email.attempts, retry_at, exc)
+        else:
+            logger.error("Outbox email %s dead-lettered after %s attempts: %s", email.id, email.attempts, exc)
+            if METRICS_AVAILABLE and email_dead_letters_metric is not None:
+                email_dead_letters_metric.inc()
+
+        async with SessionLocal() as session:
+            await mark_email_failed(session, email.id, error=str(exc), retry_at=retry_at)
+
+    def retry_delay(self, attempts: int) -> float:
+        """Exponential backoff with jitter: half fixed, half random."""
+        delay = min(self._retry_max, self._retry_base * (2 ** max(attempts - 1, 0)))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    @staticmethod
+    async def _service_for(user_id: Optional[str]) -> EmailService:
+        config = None
+        if user_id:
+            async with SessionLocal() as session:
+                result = await session.execute(select(StudioConfig).where(StudioConfig.user_id == user_id))
+                config = result.scalar_one_or_none()
+        return get_user_email_service(config)
+
+
+def enqueue_email(
+    session,
+    *,
+    to: Sequence[str] | str,
+    subject: str,
+    html: str,
+    user_id: Optional[str] = None,
+    sender: Optional[str] = None,
+) -> EmailOutbox:
+    """Stage an email in the caller's transaction; call `email_outbox.notify()` after commit."""
+    recipients = [to] if isinstance(to, str) else list(to)
+    return add_outbox_email(session, recipients=recipients, subject=subject, html=html, user_id=user_id, sender=sender)
+
+
+async def queue_email(
+    *,
+    to: Sequence[str] | str,
+    subject: str,
+    html: str,
+    user_id: Optional[str] = None,
+    sender: Optional[str] = None,
+) -> int:
+    """Enqueue an email in its own transaction. Returns the outbox ID."""
+    async with SessionLocal() as session:
+        email = enqueue_email(session, to=to, subject=subject, html=html, user_id=user_id, sender=sender)
+        await session.commit()
+        email_id = email.id
+    email_outbox.notify()
+    return email_id
+
+
+_settings = get_settings()
+email_outbox = EmailOutboxWorker(
+    workers=_settings.email_outbox_workers,
+    batch_size=_settings.email_outbox_batch_size,
+    poll_interval=_settings.email_outbox_poll_interval_seconds,
+    lease_seconds=_settings.email_outbox_lease_seconds,
+    max_attempts=_settings.email_outbox_max_attempts,
+    retry_base_seconds=_settings.email_outbox_retry_base_seconds,
+    retry_max_seconds=_settings.email_outbox_retry_max_seconds,
+    smtp_concurrency=_settings.email_smtp_max_concurrency,
+    resend_concurrency=_settings.email_resend_max_concurrency,
+    resend_batching=_settings.email_resend_batching,
+)
+
+
+__all__ = ["EmailOutboxWorker", "email_outbox", "enqueue_email", "queue_email"]
@@ -0,0 +1,501 @@
+"""
+Dispatch of Vapi `function-call` events.
+
+Function results are spoken back to the caller, so every handler runs under a
+deadline and a concurrency limit. When a handler is too slow, overloaded or
+fails, the caller hears the handler's fallback response instead of dead air.
+
+Tenant data needed by handlers (organisation, timezone, language...) is
+resolved once per assistant and cached, so a function call does not pay for
+the same lookups on every turn of the conversation. The cached context also
+carries the tenant's own functions from its studio config (`custom_functions`,
+each answering with a fixed result); saving the config invalidates it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+
+from api.src.application.services.business_hours import schedule_for
+from api.src.application.services.caller_directory import caller_directory
+from api.src.core.settings import get_settings
+from api.src.domain.value_objects.business_hours import BusinessSchedule
+from api.src.infrastructure.database.session import SessionLocal
+from api.src.infrastructure.persistence.models.studio_config import StudioConfig
+
+try:
+    from prometheus_client import Histogram
+
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+logger = logging.getLogger("ava.function_calls")
+
+if METRICS_AVAILABLE:
+    function_call_duration_metric = Histogram(
+        "vapi_function_call_duration_seconds",
+        "Latency of Vapi function-call handlers",
+        ["function", "outcome"],
+        buckets=(0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0),
+    )
+else:
+    function_call_duration_metric = None
+
+
+@dataclass(frozen=True)
+class TenantContext:
+    """Tenant data shared by every function call of an assistant."""
+
+    user_id: str
+    organization_name: str
+    timezone: str
+    language: str
+    admin_email: Optional[str] = None
+    schedule: Optional[BusinessSchedule] = None
+    functions: Dict[str, FunctionSpec] = field(default_factory=dict)  # From the studio config
+
+
+@dataclass
+class FunctionContext:
+    """Per-invocation context handed to function handlers."""
+
+    call_id: Optional[str]
+    assistant_id: Optional[str]
+    customer_number: Optional[str]
+    tenant: Optional[TenantContext]
+
+
+FunctionHandler = Callable[[Dict[str, Any], FunctionContext], Awaitable[Dict[str, Any]]]
+
+
+@dataclass
+class FunctionSpec:
+    """A registered function with its latency budget."""
+
+    name: str
+    handler: FunctionHandler
+    deadline_seconds: float
+    fallback: Dict[str, Any]
+    max_concurrency: int
+    semaphore: asyncio.Semaphore = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+
+
+DEFAULT_FALLBACK = {
+    "result": "Sorry, I can't do that right now. Someone from the team will follow up with you.",
+    "success": False,
+}
+
+
+class TenantContextCache:
+    """TTL cache of `TenantContext` keyed by user ID or assistant ID.
+
+    Misses are cached too (as None) so unknown assistants do not hit the
+    database on every function call, and concurrent misses for the same key
+    share a single lookup. The lookup runs in its own task, so a caller
+    cancelled by its deadline neither aborts it nor strands the others.
+    """
+
+    def __init__(self, *, ttl_seconds: float) -> None:
+        self._ttl = ttl_seconds
+        self._entries: Dict[str, tuple[float, Optional[TenantContext]]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def resolve(self, *, user_id: Optional[str], assistant_id: Optional[str]) -> Optional[TenantContext]:
+        key = f"user:{user_id}" if user_id else f"assistant:{assistant_id}" if assistant_id else None
+        if key is None:
+            return None
+
+        cached = self._entries.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, user_id=user_id, assistant_id=assistant_id))
+            task.add_done_callback(_retrieve_exception)  # Nobody may be left waiting
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _load(self, key: str, *, user_id: Optional[str], assistant_id: Optional[str]) -> Optional[TenantContext]:
+        try:
+            context = await _load_tenant_context(user_id=user_id, assistant_id=assistant_id)
+            self._entries[key] = (time.monotonic() + self._ttl, context)
+            return context
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate_user(self, user_id: str, assistant_id: Optional[str] = None) -> None:
+        self._entries.pop(f"user:{user_id}", None)
+        if assistant_id:
+            self._entries.pop(f"assistant:{assistant_id}", None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    if not task.cancelled():
+        task.exception()
+
+
+_pending_writes: set[asyncio.Task] = set()
+
+
+def _run_past_deadline(coro: Awaitable[Any], *, name: str) -> Awaitable[Any]:
+    """Run a write in its own task and wait for it through a shield.
+
+    A handler cancelled by its deadline then stops waiting, but the write
+    still completes (or fails and is logged) instead of being cancelled in
+    the middle of its transaction.
+    """
+    task = asyncio.ensure_future(coro)
+    _pending_writes.add(task)
+
+    def finished(done: asyncio.Task) -> None:
+        _pending_writes.discard(done)
+        if not done.cancelled() and done.exception() is not None:
+            logger.warning("Function %s write failed: %s", name, done.exception())
+
+    task.add_done_callback(finished)
+    return asyncio.shield(task)
+
+
+async def _load_tenant_context(*, user_id: Optional[str], assistant_id: Optional[str]) -> Optional[TenantContext]:
+    if user_id:
+        stmt = select(StudioConfig).where(StudioConfig.user_id == user_id)
+    else:
+        stmt = select(StudioConfig).where(StudioConfig.vapi_assistant_id == assistant_id)
+
+    async with SessionLocal() as session:
+        config = (await session.execute(stmt)).scalars().first()
+
+    if config is None:
+        return None
+    return TenantContext(
+        user_id=str(config.user_id),
+        organization_name=config.organization_name,
+        timezone=config.timezone,
+        language=config.language,
+        admin_email=config.admin_email,
+        schedule=schedule_for(config),
+        functions=_config_functions(config.custom_functions or []),
+    )
+
+
+def _config_functions(entries: list) -> Dict[str, FunctionSpec]:
+    """Specs for a studio config's `custom_functions`; malformed entries are skipped."""
+    settings = get_settings()
+    functions: Dict[str, FunctionSpec] = {}
+    for entry in entries:
+        name = entry.get("name") if isinstance(entry, dict) else None
+        result = entry.get("result") if isinstance(entry, dict) else None
+        if not name or not isinstance(result, str):
+            continue
+        functions[name] = FunctionSpec(
+            name=name,
+            handler=_fixed_result(result),
+            deadline_seconds=settings.function_call_default_deadline_seconds,
+            fallback=DEFAULT_FALLBACK,
+            max_concurrency=settings.function_call_max_concurrency,
+        )
+    return functions
+
+
+def _fixed_result(result: str) -> FunctionHandler:
+    async def handler(params: Dict[str, Any], context: FunctionContext) -> Dict[str, Any]:
+        return {"result": result, "success": True}
+
+    return handler
+
+
+class FunctionRegistry:
+    """Registry of function handlers, global or scoped to a tenant."""
+
+    def __init__(self, *, tenant_contexts: TenantContextCache) -> None:
+        self._global: Dict[str, FunctionSpec] = {}
+        self._tenant: Dict[tuple[str, str], FunctionSpec] = {}
+        self.tenant_contexts = tenant_contexts
+
+    def register(
+        self,
+        name: str,
+        handler: Optional[FunctionHandler] = None,
+        *,
+        deadline_seconds: Optional[float] = None,
+        fallback: Optional[Dict[str, Any]] = None,
+        max_concurrency: Optional[int] = None,
+        tenant_id: Optional[str] = None,
+    ):
+        """Register a handler, directly or as a decorator.
+
+        Handlers registered with `tenant_id` only answer calls of that tenant
+        and take precedence over the tenant's config functions and over a
+        global handler with the same name.
+        """
+
+        def decorator(func: FunctionHandler) -> FunctionHandler:
+            settings = get_settings()
+            spec = FunctionSpec(
+                name=name,
+                handler=func,
+                deadline_seconds=deadline_seconds or settings.function_call_default_deadline_seconds,
+                fallback=fallback or DEFAULT_FALLBACK,
+                max_concurrency=max_concurrency or settings.function_call_max_concurrency,
+            )
+            if tenant_id:
+                self._tenant[(str(tenant_id), name)] = spec
+            else:
+                self._global[name] = spec
+            return func
+
+        if handler is not None:
+            return decorator(handler)
+        return decorator
+
+    def unregister(self, name: str, *, tenant_id: Optional[str] = None) -> None:
+        if tenant_id:
+            self._tenant.pop((str(tenant_id), name), None)
+        else:
+            self._global.pop(name, None)
+
+    def get(
+        self,
+        name: str,
+        *,
+        tenant_id: Optional[str] = None,
+        tenant: Optional[TenantContext] = None,
+    ) -> Optional[FunctionSpec]:
+        tenant_id = tenant_id or (tenant.user_id if tenant else None)
+        if tenant_id:
+            spec = self._tenant.get((str(tenant_id), name))
+            if spec is not None:
+                return spec
+        if tenant is not None and name in tenant.functions:
+            return tenant.functions[name]
+        return self._global.get(name)
+
+    async def dispatch(
+        self,
+        name: Optional[str],
+        parameters: Dict[str, Any],
+        *,
+        call_data: Dict[str, Any],
+        metadata: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Run a function within its deadline and return the spoken result."""
+
+        start = time.perf_counter()
+        user_id = metadata.get("user_id") or metadata.get("userId")
+        assistant_id = call_data.get("assistantId")
+
+        global_spec = self._global.get(name or "")
+        budget = global_spec.deadline_seconds if global_spec else get_settings().function_call_default_deadline_seconds
+
+        try:
+            tenant = await asyncio.wait_for(
+                self.tenant_contexts.resolve(user_id=str(user_id) if user_id else None, assistant_id=assistant_id),
+                timeout=budget,
+            )
+        except Exception as exc:  # noqa: BLE001 - handlers cope without tenant data
+            logger.warning("Tenant context lookup failed for function %s: %s", name, exc)
+            tenant = None
+
+        spec = self.get(name or "", tenant=tenant)
+        if spec is None:
+            self._observe(name or "unknown", "unknown", start)
+            return {"result": f"Unknown function: {name}", "success": False}
+
+        context = FunctionContext(
+            call_id=call_data.get("id"),
+            assistant_id=assistant_id,
+            customer_number=(call_data.get("customer") or {}).get("number"),
+            tenant=tenant,
+        )
+        remaining = max(spec.deadline_seconds - (time.perf_counter() - start), 0.0)
+
+        if spec.semaphore.locked():
+            logger.warning("Function %s at concurrency limit (%s)", spec.name, spec.max_concurrency)
+            self._observe(spec.name, "rejected", start)
+            return spec.fallback
+
+        try:
+            async with spec.semaphore:
+                result = await asyncio.wait_for(spec.handler(parameters, context), timeout=remaining)
+        except asyncio.TimeoutError:
+            logger.warning("Function %s exceeded its %.2fs deadline", spec.name, spec.deadline_seconds)
+            self._observe(spec.name, "timeout", start)
+            return spec.fallback
+        except Exception as exc:  # noqa: BLE001 - never leave the caller without an answer
+            logger.exception("Function %s failed: %s", spec.name, exc)
+            self._observe(spec.name, "error", start)
+            return spec.fallback
+
+        self._observe(spec.name, "success", start)
+        return result
+
+    @staticmethod
+    def _observe(name: str, outcome: str, start: float) -> None:
+        if METRICS_AVAILABLE and function_call_duration_metric is not None:
+            function_call_duration_metric.labels(function=name, outcome=outcome).observe(time.perf_counter() - start)
+
+
+tenant_contexts = TenantContextCache(ttl_seconds=get_settings().function_context_ttl_seconds)
+function_registry = FunctionRegistry(tenant_contexts=tenant_contexts)
+
+
+def _tenant_uuid(context: FunctionContext) -> Optional[UUID]:
+    if context.tenant is None:
+        return None
+    try:
+        return UUID(context.tenant.user_id)
+    except ValueError:
+        return None
+
+
+@function_registry.register(
+    "lookup_caller",
+    deadline_seconds=0.5,
+    fallback={"result": "unknown", "success": False, "data": {"known": False}},
+)
+async def lookup_caller(params: Dict[str, Any], context: FunctionContext) -> Dict[str, Any]:
+    """
+    Look up the caller so AVA can greet returning callers by name.
+
+    Args:
+        params: {
+            "phoneNumber": str (optional, defaults to the calling number)
+        }
+    """
+    tenant_id = _tenant_uuid(context)
+    number = params.get("phoneNumber") or context.customer_number
+    caller = await caller_directory.lookup(tenant_id, number) if tenant_id else None
+
+    if caller is None or not (caller.first_name or caller.last_name):
+        return {"result": "unknown", "success": True, "data": {"known": False}}
+
+    return {
+        "result": caller.full_name,
+        "success": True,
+        "data": {
+            "known": True,
+            "first_name": caller.first_name,
+            "last_name": caller.last_name,
+            "email": caller.email,
+            "call_count": caller.call_count,
+        },
+    }
+
+
+@function_registry.register(
+    "save_caller_info",
+    fallback={
+        "result": "Thank you! I couldn't confirm your details were recorded, so the team will follow up with you.",
+        "success": False,
+    },
+)
+async def save_caller_info(params: Dict[str, Any], context: FunctionContext) -> Dict[str, Any]:
+    """
+    Save caller information provided during the conversation.
+
+    Args:
+        params: {
+            "firstName": str,
+            "lastName": str,
+            "email": str (optional),
+            "phoneNumber": str (optional, defaults to the calling number),
+            "notes": str (optional)
+        }
+    """
+    first_name = params.get("firstName")
+    last_name = params.get("lastName")
+    tenant_id = _tenant_uuid(context)
+    number = params.get("phoneNumber") or context.customer_number
+
+    caller = None
+    if tenant_id:
+        caller = await _run_past_deadline(
+            caller_directory.record(
+                tenant_id,
+                number,
+                first_name=first_name,
+                last_name=last_name,
+                email=params.get("email"),
+                notes=params.get("notes"),
+            ),
+            name="save_caller_info",
+        )
+
+    if caller is None:
+        logger.warning("Caller info not saved for call %s (tenant or number unknown)", context.call_id)
+        return {
+            "result": f"Thank you {first_name}. I couldn't save your details, but the team will follow up with you.",
+            "success": False,
+            "data": {"caller_name": f"{first_name} {last_name}", "saved": False},
+        }
+
+    return {
+        "result": f"Thank you {first_name}! I've saved your information.",
+        "success": True,
+        "data": {"caller_name": caller.full_name, "saved": True},
+    }
+
+
+@function_registry.register("check_business_hours", deadline_seconds=0.5)
+async def check_business_hours(params: Dict[str, Any], context: FunctionContext) -> Dict[str, Any]:
+    """Tell AVA whether the business is open now and when it opens next."""
+    schedule = context.tenant.schedule if context.tenant else None
+    if schedule is None:
+        return {"result": "Opening hours unknown", "success": False}
+
+    is_open = schedule.is_open()
+    next_open = None if is_open else schedule.next_open()
+    if is_open:
+        result = "The business is open right now."
+    elif next_open is not None:
+        result = f"The business is closed. It opens again on {next_open.strftime('%A %d %B at %H:%M')}."
+    else:
+        result = "The business is closed."
+
+    return {
+        "result": result,
+        "success": True,
+        "data": {
+            "open": is_open,
+            "next_open": next_open.isoformat() if next_open else None,
+            "hours": schedule.describe(),
+        },
+    }
+
+
+@function_registry.register("book_appointment")
+async def book_appointment(params: Dict[str, Any], context: FunctionContext) -> Dict[str, Any]:
+    """Create a calendar event (not implemented yet)."""
+    return {
+        "result": "Appointment booking not yet implemented",
+        "success": False,
+    }
+
+
+__all__ = [
+    "FunctionContext",
+    "FunctionRegistry",
+    "FunctionSpec",
+    "TenantContext",
+    "TenantContextCache",
+    "check_business_hours",
+    "function_registry",
+    "lookup_caller",
+    "save_caller_info",
+    "tenant_contexts",
+]
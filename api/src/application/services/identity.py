@@ -0,0 +1,104 @@
+"""
+Authenticated identity cache.
+
+`get_current_user` and `ensure_tenant_for_user` run on almost every request.
+Their rows are cached per process as detached snapshots keyed by the JWT
+subject (user id) and tenant id, and merged into the request session without
+a query (`merge(load=False)`), so routes still receive session-bound objects
+they can modify and commit.
+
+Routes that change a user call `identities.invalidate_user()` after
+committing; the TTL bounds how long other workers may serve the old row.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Optional, TypeVar
+from uuid import UUID
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from api.src.core.settings import get_settings
+from api.src.infrastructure.persistence.models.tenant import Tenant
+from api.src.infrastructure.persistence.models.user import User
+
+T = TypeVar("T")
+
+
+def _detached_copy(instance: T) -> Optional[T]:
+    """Clean detached copy of a loaded row, or None if some column is not loaded."""
+    state = inspect(instance)
+    loaded = state.dict
+    columns = [attr.key for attr in state.mapper.column_attrs]
+    if any(key not in loaded for key in columns):
+        return None
+    copy = state.mapper.class_manager.new_instance()
+    for key in columns:
+        set_committed_value(copy, key, loaded[key])
+    make_transient_to_detached(copy)
+    return copy
+
+
+class IdentityCache:
+    """Per-process LRU + TTL cache of users and tenants."""
+
+    def __init__(self, *, max_entries: int = 10_000, ttl_seconds: float = 30.0) -> None:
+        self._users: "OrderedDict[str, tuple[float, User]]" = OrderedDict()
+        self._tenants: "OrderedDict[UUID, tuple[float, Tenant]]" = OrderedDict()
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+
+    def get_user(self, user_id: str) -> Optional[User]:
+        return self._get(self._users, str(user_id))
+
+    def put_user(self, user: User) -> None:
+        self._put(self._users, str(user.id), user)
+
+    def get_tenant(self, tenant_id: UUID) -> Optional[Tenant]:
+        return self._get(self._tenants, tenant_id)
+
+    def put_tenant(self, tenant: Tenant) -> None:
+        self._put(self._tenants, tenant.id, tenant)
+
+    def invalidate_user(self, user_id: str) -> None:
+        self._users.pop(str(user_id), None)
+
+    def clear(self) -> None:
+        self._users.clear()
+        self._tenants.clear()
+
+    def _get(self, entries: OrderedDict, key) -> Optional[T]:
+        entry = entries.get(key)
+        if entry is None:
+            return None
+        expires_at, instance = entry
+        if expires_at <= time.monotonic():
+            del entries[key]
+            return None
+        entries.move_to_end(key)
+        return instance
+
+    def _put(self, entries: OrderedDict, key, instance) -> None:
+        if self._ttl <= 0:
+            return
+        snapshot = _detached_copy(instance)
+        if snapshot is None:
+            return
+        entries[key] = (time.monotonic() + self._ttl, snapshot)
+        entries.move_to_end(key)
+        while len(entries) > self._max_entries:
+            entries.popitem(last=False)
+
+
+_settings = get_settings()
+identities = IdentityCache(
+    max_entries=_settings.identity_cache_max_entries,
+    ttl_seconds=_settings.identity_cache_ttl_seconds,
+)
+
+
+__all__ = ["IdentityCache", "identities"]
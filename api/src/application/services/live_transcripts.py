@@ -0,0 +1,250 @@
+"""
+In-memory buffer of live call transcripts built from `transcript.update` events.
+
+Turns are appended as Vapi streams them, flushed periodically to Postgres so
+other workers (and the dashboard) can read them, and handed over to
+`handle_call_ended` so the final transcript does not have to be rebuilt from
+the large `call.ended` payload.
+
+A turn's `seq` is the millisecond timestamp it was spoken at (Vapi's event
+timestamp), not its position in this worker's list: each worker only sees the
+events delivered to it, and rows are written with ON CONFLICT DO NOTHING, so
+redelivered or re-flushed turns are harmless.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from api.src.core.settings import get_settings
+from api.src.infrastructure.database.session import SessionLocal
+from api.src.infrastructure.persistence.repositories.transcript_repository import add_transcript_turns
+
+logger = logging.getLogger("ava.transcripts")
+
+
+def speaker_label(role: str) -> str:
+    """Human readable speaker name used in formatted transcripts."""
+    if role == "assistant":
+        return "AVA"
+    if role == "user":
+        return "Caller"
+    return role.capitalize()
+
+
+@dataclass(frozen=True)
+class TranscriptEntry:
+    """One finalised speaker turn."""
+
+    seq: int
+    role: str
+    message: str
+    spoken_at: datetime
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "seq": self.seq,
+            "role": self.role,
+            "message": self.message,
+            "time": self.spoken_at.isoformat(),
+        }
+
+
+@dataclass
+class CallTranscript:
+    """Append-only transcript of a single call."""
+
+    call_id: str
+    assistant_id: Optional[str] = None
+    user_id: Optional[str] = None
+    turns: list[TranscriptEntry] = field(default_factory=list)
+    lines: list[str] = field(default_factory=list)
+    flushed: int = 0  # Turns handed to (or written by) the flusher
+    last_update: float = field(default_factory=time.monotonic)
+
+    @property
+    def text(self) -> str:
+        """Formatted transcript, identical to `format_transcript` output."""
+        return "\n\n".join(self.lines) if self.lines else "No transcript available"
+
+    def structured(self) -> list[dict[str, Any]]:
+        return [turn.to_dict() for turn in self.turns]
+
+
+class LiveTranscriptBuffer:
+    """Per-process transcript buffer keyed by Vapi call ID.
+
+    All mutations happen on the event loop without awaiting, so no locking is
+    required. Idle calls (no `call.ended` received) are evicted after a TTL and
+    the number of tracked calls is bounded.
+    """
+
+    def __init__(self, *, max_calls: int = 1000, idle_ttl_seconds: float = 3600) -> None:
+        self._calls: "OrderedDict[str, CallTranscript]" = OrderedDict()
+        self._max_calls = max_calls
+        self._idle_ttl = idle_ttl_seconds
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def append(
+        self,
+        call_id: str,
+        *,
+        role: str,
+        message: str,
+        assistant_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        spoken_at: Optional[datetime] = None,
+    ) -> TranscriptEntry:
+        transcript = self._calls.get(call_id)
+        if transcript is None:
+            transcript = CallTranscript(call_id=call_id, assistant_id=assistant_id, user_id=user_id)
+            self._calls[call_id] = transcript
+            self._enforce_capacity()
+        else:
+            self._calls.move_to_end(call_id)
+            transcript.assistant_id = transcript.assistant_id or assistant_id
+            transcript.user_id = transcript.user_id or user_id
+
+        spoken_at = spoken_at or datetime.now(timezone.utc)
+        seq = int(spoken_at.timestamp() * 1000)
+        if transcript.turns and seq <= transcript.turns[-1].seq:
+            seq = transcript.turns[-1].seq + 1  # Same millisecond or out-of-order delivery
+        entry = TranscriptEntry(seq=seq, role=role, message=message, spoken_at=spoken_at)
+        transcript.turns.append(entry)
+        transcript.lines.append(f"{speaker_label(role)}: {message}")
+        transcript.last_update = time.monotonic()
+        return entry
+
+    def get(self, call_id: str) -> Optional[CallTranscript]:
+        return self._calls.get(call_id)
+
+    def pop(self, call_id: str) -> Optional[CallTranscript]:
+        return self._calls.pop(call_id, None)
+
+    def pending(self) -> list[CallTranscript]:
+        """Transcripts with turns not yet handed to the flusher."""
+        return [transcript for transcript in self._calls.values() if transcript.flushed < len(transcript.turns)]
+
+    def evict_idle(self, *, now: Optional[float] = None) -> int:
+        now = time.monotonic() if now is None else now
+        expired = [call_id for call_id, t in self._calls.items() if now - t.last_update >= self._idle_ttl]
+        for call_id in expired:
+            del self._calls[call_id]
+        return len(expired)
+
+    def _enforce_capacity(self) -> None:
+        while len(self._calls) > self._max_calls:
+            call_id, _ = self._calls.popitem(last=False)
+            logger.warning("Live transcript buffer full, evicting call %s", call_id)
+
+
+def build_turn_rows(transcript: CallTranscript, entries: list[TranscriptEntry]) -> list[dict[str, Any]]:
+    """Convert buffered entries to `call_transcript_turns` rows."""
+    return [
+        {
+            "call_id": transcript.call_id,
+            "seq": entry.seq,
+            "role": entry.role,
+            "message": entry.message,
+            "assistant_id": transcript.assistant_id,
+            "user_id": transcript.user_id,
+            "spoken_at": entry.spoken_at,
+        }
+        for entry in entries
+    ]
+
+
+async def flush_live_transcripts(buffer: LiveTranscriptBuffer) -> int:
+    """Write unflushed turns to Postgres, one transaction per call.
+
+    Turns are reserved (`flushed` advanced) before awaiting, so a `call.ended`
+    handled meanwhile does not treat them as pending, and released again if
+    the write fails. A failing call does not hold back the others.
+    Returns the number of turns written.
+    """
+    pending = buffer.pending()
+    if not pending:
+        return 0
+
+    written = 0
+    async with SessionLocal() as session:
+        for transcript in pending:
+            start = transcript.flushed
+            entries = transcript.turns[start:]
+            transcript.flushed = start + len(entries)
+            try:
+                await add_transcript_turns(session, build_turn_rows(transcript, entries))
+                await session.commit()
+            except Exception as exc:  # noqa: BLE001 - retried on the next tick
+                await session.rollback()
+                transcript.flushed = min(transcript.flushed, start)
+                logger.warning("Live transcript flush failed for call %s: %s", transcript.call_id, exc)
+                continue
+            written += len(entries)
+    return written
+
+
+_settings = get_settings()
+live_transcripts = LiveTranscriptBuffer(
+    max_calls=_settings.transcript_buffer_max_calls,
+    idle_ttl_seconds=_settings.transcript_buffer_idle_ttl_seconds,
+)
+_flush_task: Optional[asyncio.Task] = None
+
+
+async def _flush_loop(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            written = await flush_live_transcripts(live_transcripts)
+            evicted = live_transcripts.evict_idle()
+            if written or evicted:
+                logger.debug("Live transcripts flushed=%s evicted=%s", written, evicted)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # noqa: BLE001 - keep buffering, retry next tick
+            logger.warning("Live transcript flush failed: %s", exc)
+
+
+def start_transcript_flusher() -> None:
+    global _flush_task
+    if _flush_task is None or _flush_task.done():
+        interval = get_settings().transcript_flush_interval_seconds
+        _flush_task = asyncio.create_task(_flush_loop(interval), name="live-transcript-flush")
+
+
+async def stop_transcript_flusher() -> None:
+    global _flush_task
+    if _flush_task is None:
+        return
+    _flush_task.cancel()
+    try:
+        await _flush_task
+    except asyncio.CancelledError:
+        pass
+    _flush_task = None
+    try:
+        await flush_live_transcripts(live_transcripts)
+    except Exception as exc:  # noqa: BLE001 - shutdown best effort
+        logger.warning("Final live transcript flush failed: %s", exc)
+
+
+__all__ = [
+    "CallTranscript",
+    "LiveTranscriptBuffer",
+    "TranscriptEntry",
+    "build_turn_rows",
+    "flush_live_transcripts",
+    "live_transcripts",
+    "speaker_label",
+    "start_transcript_flusher",
+    "stop_transcript_flusher",
+]
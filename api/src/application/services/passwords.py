@@ -0,0 +1,162 @@
+"""
+Password hashing off the event loop.
+
+bcrypt is deliberately slow (~250 ms at cost 12) and would block every other
+request on the worker if run inline. Hashes run in a dedicated thread pool
+(bcrypt releases the GIL, so threads use every core) sized to the CPU count.
+At most `workers + max_queue` hashes are accepted at once; during a login
+storm further attempts are shed with a 503 instead of queueing for seconds.
+
+Hashes made with another cost than `password_hash_rounds` are reported by
+`needs_rehash()`, so login can upgrade them transparently.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+import bcrypt
+from fastapi import HTTPException, status
+
+from api.src.core.settings import get_settings
+
+try:
+    from prometheus_client import Counter, Histogram
+
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+logger = logging.getLogger("ava.passwords")
+
+T = TypeVar("T")
+
+if METRICS_AVAILABLE:
+    password_hash_duration_metric = Histogram(
+        "password_hash_duration_seconds",
+        "Time from submitting a password hash to its result (queue wait included)",
+        ["operation"],
+        buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    )
+    password_hash_rejections_metric = Counter(
+        "password_hash_rejections_total",
+        "Password hashes shed because the hashing pool was full",
+        ["operation"],
+    )
+else:
+    password_hash_duration_metric = None
+    password_hash_rejections_metric = None
+
+
+class PasswordHasherBusyError(HTTPException):
+    """Raised when the hashing pool and its queue are full (503)."""
+
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in attempts. Please try again shortly.",
+            headers={"Retry-After": "1"},
+        )
+
+
+def _hash(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=rounds)).decode("utf-8")
+
+
+def _verify(password: str, hashed: str) -> bool:
+    try:
+        return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+    except ValueError:  # Not a bcrypt hash
+        return False
+
+
+def hash_rounds(hashed: str) -> Optional[int]:
+    """Cost factor of a bcrypt hash (`$2b$12$...` -> 12), None if unparsable."""
+    parts = hashed.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+class PasswordHasher:
+    """bcrypt in a bounded thread pool, with load shedding."""
+
+    def __init__(self, *, rounds: int = 12, workers: int = 0, max_queue: int = 64) -> None:
+        self.rounds = rounds
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0  # Submitted and not finished (running + queued)
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", _hash, password, self.rounds)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run("verify", _verify, password, hashed)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """True when `hashed` was made with another cost than the configured one."""
+        return hash_rounds(hashed) != self.rounds
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _run(self, operation: str, func: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                rejected = True
+            else:
+                rejected = False
+                self._pending += 1
+        if rejected:
+            logger.warning(
+                f"Password {operation} shed: hashing pool full",
+                extra={"operation": operation, "pending": self._pending},
+            )
+            if METRICS_AVAILABLE and password_hash_rejections_metric is not None:
+                password_hash_rejections_metric.labels(operation=operation).inc()
+            raise PasswordHasherBusyError()
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        started_at = time.perf_counter()
+        future = self._executor.submit(func, *args)
+        # Released when the job ends or is cancelled (a disconnected client frees its queue slot)
+        future.add_done_callback(self._release)
+        result = await asyncio.wrap_future(future)
+        if METRICS_AVAILABLE and password_hash_duration_metric is not None:
+            password_hash_duration_metric.labels(operation=operation).observe(time.perf_counter() - started_at)
+        return result
+
+    def _release(self, _future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+
+_settings = get_settings()
+password_hasher = PasswordHasher(
+    rounds=_settings.password_hash_rounds,
+    workers=_settings.password_hash_workers,
+    max_queue=_settings.password_hash_max_queue,
+)
+
+
+__all__ = [
+    "PasswordHasher",
+    "PasswordHasherBusyError",
+    "hash_rounds",
+    "password_hasher",
+]
@@ -9,6 +9,7 @@ from uuid import UUID, uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.src.application.services.identity import identities
 from api.src.infrastructure.persistence.models.tenant import Tenant
 from api.src.infrastructure.persistence.models.user import User
 
@@ -28,8 +29,13 @@ async def ensure_tenant_for_user(session: AsyncSession, user: User, *, name: Opt
     except ValueError:
         tenant_id = uuid4()
 
+    cached = identities.get_tenant(tenant_id)
+    if cached is not None:
+        return await session.merge(cached, load=False)
+
     tenant = await session.get(Tenant, tenant_id)
     if tenant:
+        identities.put_tenant(tenant)
         return tenant
 
     tenant = Tenant(id=tenant_id, name=name or user.name or user.email or "Ava Tenant")
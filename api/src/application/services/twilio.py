@@ -2,15 +2,22 @@
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from functools import lru_cache
 from typing import Any
 
+import httpx
 from fastapi import HTTPException, status
-from twilio.rest import Client as TwilioRestClient
+from twilio.base.exceptions import TwilioRestException
 
 from api.src.core.settings import get_settings
-from api.src.infrastructure.external.circuit_breaker import get_circuit_breaker
+from api.src.infrastructure.external.circuit_breaker import (
+    CircuitBreaker,
+    default_breaker_config,
+    get_circuit_breaker,
+)
+from api.src.infrastructure.external.twilio_client import AsyncTwilioClient
 from api.src.infrastructure.persistence.models.user import User
 
 
@@ -53,23 +60,22 @@ def resolve_twilio_credentials(
 
 
 @lru_cache(maxsize=128)
-def _get_cached_client(account_sid: str, auth_token: str) -> TwilioRestClient:
+def _get_cached_client(account_sid: str, auth_token: str) -> AsyncTwilioClient:
     """
-    Return cached Twilio client for connection pooling.
+    Return cached Twilio client for the given credentials.
     
-    LRU cache ensures we reuse clients for same credentials,
-    reducing connection overhead.
+    All clients share one process-wide HTTP connection pool.
     """
-    return TwilioRestClient(account_sid, auth_token)
+    return AsyncTwilioClient(account_sid, auth_token)
 
 
 def get_twilio_client(
     user: User | None = None,
     *,
     allow_env_fallback: bool = True,
-) -> TwilioRestClient:
+) -> AsyncTwilioClient:
     """
-    Get Twilio client with connection pooling.
+    Get async Twilio client with connection pooling.
     
     Resolves credentials and returns cached client instance.
     """
@@ -77,6 +83,25 @@ def get_twilio_client(
     return _get_cached_client(creds.account_sid, creds.auth_token)
 
 
+def _is_twilio_outage(exc: BaseException) -> bool:
+    """Rejected requests (4xx other than 429) say nothing about Twilio's health."""
+    if isinstance(exc, TwilioRestException):
+        return exc.status == 429 or exc.status >= 500
+    return isinstance(exc, (httpx.TransportError, asyncio.TimeoutError))
+
+
+def _twilio_breaker(user: User | None) -> CircuitBreaker:
+    """Breaker of the Twilio account the user's requests go to.
+
+    Keyed by account SID, so one tenant's suspended account or bad requests
+    do not trip the circuit for every other tenant.
+    """
+    creds = resolve_twilio_credentials(user, allow_env_fallback=True)
+    return get_circuit_breaker(
+        "twilio", default_breaker_config(is_failure=_is_twilio_outage), key=creds.account_sid
+    )
+
+
 async def make_twilio_call_with_circuit_breaker(
     to: str,
     from_: str,
@@ -84,6 +109,7 @@ async def make_twilio_call_with_circuit_breaker(
     *,
     user: User | None = None,
     method: str = "POST",
+    status_callback: str | None = None,
 ) -> Any:
     """
     Make a Twilio call with circuit breaker protection.
@@ -94,19 +120,21 @@ async def make_twilio_call_with_circuit_breaker(
         url: TwiML webhook URL
         user: Optional user for credential resolution
         method: HTTP method for webhook (default: POST)
+        status_callback: Optional URL receiving the call's status changes
         
     Returns:
-        Twilio call resource
+        Twilio call resource (JSON)
         
     Raises:
         HTTPException: If circuit is open or credentials invalid
     """
-    breaker = get_circuit_breaker("twilio", config=None)
+    breaker = _twilio_breaker(user)
     
     async def _make_call():
         client = get_twilio_client(user, allow_env_fallback=True)
-        # Note: Twilio SDK is synchronous, but we wrap it for circuit breaker compatibility
-        return client.calls.create(to=to, from_=from_, url=url, method=method)
+        return await client.create_call(
+            to=to, from_=from_, url=url, method=method, status_callback=status_callback
+        )
     
     return await breaker.call(_make_call)
 
@@ -128,16 +156,16 @@ async def send_twilio_sms_with_circuit_breaker(
         user: Optional user for credential resolution
         
     Returns:
-        Twilio message resource
+        Twilio message resource (JSON)
         
     Raises:
         HTTPException: If circuit is open or credentials invalid
     """
-    breaker = get_circuit_breaker("twilio", config=None)
+    breaker = _twilio_breaker(user)
     
     async def _send_sms():
         client = get_twilio_client(user, allow_env_fallback=True)
-        return client.messages.create(to=to, from_=from_, body=body)
+        return await client.create_message(to=to, from_=from_, body=body)
     
     return await breaker.call(_send_sms)
 
@@ -85,6 +85,52 @@ def create_app() -> FastAPI:
             print(f"⚠️  Database warmup failed (non-blocking): {e}", flush=True)
         sys.stdout.flush()
 
+    @app.on_event("startup")
+    async def start_background_workers() -> None:
+        import asyncio
+
+        from api.src.application.services.assistant_config import warm_assistant_configs
+        from api.src.application.services.call_digests import call_digests
+        from api.src.application.services.campaigns import campaign_dialer
+        from api.src.application.services.email_outbox import email_outbox
+        from api.src.application.services.live_transcripts import start_transcript_flusher
+        from api.src.infrastructure.email.templating import precompile_templates
+        from api.src.infrastructure.shared_state import start_shared_state_sync
+
+        precompile_templates()
+        start_shared_state_sync()
+        start_transcript_flusher()
+        email_outbox.start()
+        call_digests.start()
+        campaign_dialer.start()
+        app.state.assistant_config_warmup = asyncio.create_task(warm_assistant_configs())
+
+    @app.on_event("shutdown")
+    async def stop_background_workers() -> None:
+        from api.src.application.services.call_digests import call_digests
+        from api.src.application.services.campaigns import campaign_dialer
+        from api.src.application.services.email_outbox import email_outbox
+        from api.src.application.services.live_transcripts import stop_transcript_flusher
+        from api.src.application.services.passwords import password_hasher
+        from api.src.infrastructure.database.replica import close_read_engine
+        from api.src.infrastructure.database.session import engine
+        from api.src.infrastructure.email.resend_transport import close_resend_transport
+        from api.src.infrastructure.email.smtp_pool import get_smtp_pool
+        from api.src.infrastructure.external.twilio_client import close_twilio_http_client
+        from api.src.infrastructure.shared_state import stop_shared_state_sync
+
+        await campaign_dialer.stop()
+        await call_digests.stop()
+        await email_outbox.stop()
+        await stop_transcript_flusher()
+        password_hasher.shutdown()
+        await get_smtp_pool().close()
+        await close_resend_transport()
+        await close_twilio_http_client()
+        await stop_shared_state_sync()
+        await close_read_engine()
+        await engine.dispose()
+
     # Mount Prometheus metrics endpoint (Phase 2-4)
     if PROMETHEUS_AVAILABLE:
         metrics_app = make_asgi_app()
@@ -20,7 +20,20 @@ class JsonFormatter(logging.Formatter):
             "message": record.getMessage(),
         }
 
-        for field in ("request_id", "method", "path", "status", "duration_ms", "user_id"):
+        for field in (
+            "request_id",
+            "correlation_id",
+            "method",
+            "path",
+            "status",
+            "duration_ms",
+            "user_id",
+            "db_queries",
+            "db_time_ms",
+            "operation",
+            "parameters",
+            "plan",
+        ):
             value = getattr(record, field, None)
             if value is not None:
                 payload[field] = value
@@ -9,7 +9,6 @@ from starlette.middleware.cors import ALL_METHODS
 
 from api.src.core.settings import get_settings
 from api.src.core.middleware_observability import ObservabilityMiddleware
-from api.src.presentation.middleware.correlation import CorrelationIdMiddleware
 
 
 def _normalize_origin(origin: str | None) -> str | None:
@@ -55,9 +54,6 @@ def configure_middleware(app: FastAPI) -> None:
         print(f"  • {origin}", file=sys.stdout, flush=True)
     print("=" * 80, flush=True)
 
-    # Add correlation ID middleware FIRST (before CORS)
-    app.add_middleware(CorrelationIdMiddleware)
-
     app.add_middleware(
         CORSMiddleware,
         allow_origins=allowed_origins,
@@ -67,8 +63,12 @@ def configure_middleware(app: FastAPI) -> None:
         expose_headers=["*"],
     )
 
-    app.add_middleware(ObservabilityMiddleware)
+    # Outermost: request/correlation IDs, timing, timeout and logging in one pass
+    app.add_middleware(
+        ObservabilityMiddleware,
+        timeout_seconds=settings.request_timeout_seconds,
+        dedupe_ttl=settings.request_dedupe_ttl_seconds,
+    )
 
 
 __all__ = ["configure_middleware"]
-__all__ = ["configure_middleware"]
@@ -3,85 +3,271 @@
 from __future__ import annotations
 
 import asyncio
-import sys
+import json
 import time
-from typing import Callable
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any
 from uuid import uuid4
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from api.src.core.logging import request_logger
+from api.src.infrastructure.database.instrumentation import observe_request_queries, track_queries
 
+try:
+    from prometheus_client import Counter, Gauge, Histogram
 
-class RequestCorrelationMiddleware(BaseHTTPMiddleware):
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+_UNSAFE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+_METHODS = frozenset({"GET", "HEAD", "OPTIONS", *_UNSAFE_METHODS})
+UNMATCHED_PATH = "unmatched"  # 404s and other requests no route matched
+
+if METRICS_AVAILABLE:
+    http_requests_metric = Counter(
+        "http_requests_total",
+        "HTTP requests by route template and status",
+        ["method", "path", "status"],
+    )
+    http_request_duration_metric = Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by route template",
+        ["method", "path"],
+        buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20),
+    )
+    http_response_size_metric = Histogram(
+        "http_response_size_bytes",
+        "HTTP response body size by route template",
+        ["method", "path"],
+        buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+    )
+    http_requests_in_progress_metric = Gauge(
+        "http_requests_in_progress",
+        "HTTP requests currently being served",
+        ["method"],
+    )
+else:
+    http_requests_metric = None
+    http_request_duration_metric = None
+    http_response_size_metric = None
+    http_requests_in_progress_metric = None
+
+
+def route_template(scope: Scope, root_path: str = "") -> str:
+    """Route template the router matched (`/api/v1/calls/{call_id}`), never the raw path."""
+    route = scope.get("route")
+    if route is not None:
+        return getattr(route, "path_format", None) or route.path
+    mounted = scope.get("root_path", "")
+    if mounted != root_path:  # Mounted app such as /metrics
+        return mounted[len(root_path):] or "/"
+    return UNMATCHED_PATH
+
+
+# Label children are cached: `labels()` takes a lock and builds a key on every call
+@lru_cache(maxsize=2048)
+def _series(method: str, path: str) -> tuple[Any, Any]:
+    return (
+        http_request_duration_metric.labels(method=method, path=path),
+        http_response_size_metric.labels(method=method, path=path),
+    )
+
+
+@lru_cache(maxsize=4096)
+def _requests_counter(method: str, path: str, status: int) -> Any:
+    return http_requests_metric.labels(method=method, path=path, status=str(status))
+
+
+def observe_http_request(method: str, path: str, status: int, seconds: float, response_bytes: int) -> None:
+    if not METRICS_AVAILABLE or http_requests_metric is None:
+        return
+    duration, size = _series(method, path)
+    duration.observe(seconds)
+    size.observe(response_bytes)
+    _requests_counter(method, path, status).inc()
+
+
+class ObservabilityMiddleware:
     """
-    Injects a unique X-Request-ID into every request/response.
-    Sets request.state.request_id for downstream use.
-    Logs request start and end with duration.
-    🔥 DIVINE FIX: 20-second timeout (enough for cold Supabase database to wake up)
+    Request IDs, timing, timeout and logging in one pure ASGI layer.
+
+    - Reuses X-Request-ID / X-Correlation-ID from the request or generates
+      one ID for both, sets them on `request.state` and on the response.
+    - Logs a single line per request with duration and SQL query count.
+    - Exports `http_requests_total`, `http_request_duration_seconds` and
+      `http_response_size_bytes` by route template (bounded cardinality)
+      and `http_requests_in_progress` by method.
+    - Answers 504 when no response has started after `timeout_seconds`
+      (🔥 DIVINE FIX: 20 s by default, enough for a cold Supabase database).
+      Streaming bodies are not cut once headers are sent.
+    - With `dedupe_ttl`, a POST/PUT/PATCH/DELETE repeating a client-supplied
+      X-Request-ID within that many seconds is rejected with 409 (per process).
+
+    Runs in the request's own task and only looks at the size of body
+    chunks, so the body passes through unbuffered.
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        request_id = request.headers.get("x-request-id") or str(uuid4())
-        request.state.request_id = request_id
-
-        start_time = time.time()
-        request_logger.info(
-            "Request started: %s %s",
-            request.method,
-            request.url.path,
-            extra={"method": request.method, "path": request.url.path}
-        )
-
-        # 🔥 DIVINE FIX: 20-second timeout to handle cold database starts
-        try:
-            response = await asyncio.wait_for(call_next(request), timeout=20.0)
-            duration_ms = (time.time() - start_time) * 1000
-            request_logger.info(
-                "Request completed: %s %s - %s",
-                request.method,
-                request.url.path,
-                response.status_code,
-                extra={
-                    "method": request.method,
-                    "path": request.url.path,
-                }
-            )
-        except asyncio.TimeoutError:
-            duration_ms = (time.time() - start_time) * 1000
-            request_logger.error(
-                "Request timed out",
-                extra={
-                    "request_id": request_id,
-                    "method": request.method,
-                    "path": request.url.path,
-                    "duration_ms": duration_ms,
-                },
-            )
-            response = Response(
-                content='{"detail":"Request timeout"}',
-                status_code=504,
-                media_type="application/json",
-            )
-            sys.stdout.flush()
-        except Exception as exc:
-            duration_ms = (time.time() - start_time) * 1000
-            request_logger.error(
-                "Request failed with exception: %s",
-                exc,
-                extra={
-                    "request_id": request_id,
-                    "method": request.method,
-                    "path": request.url.path,
-                    "duration_ms": duration_ms,
-                },
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        timeout_seconds: float = 20.0,
+        dedupe_ttl: float = 0.0,
+        dedupe_max_entries: int = 10_000,
+    ) -> None:
+        self.app = app
+        self.timeout_seconds = timeout_seconds
+        self.dedupe_ttl = dedupe_ttl
+        self.dedupe_max_entries = dedupe_max_entries
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        supplied_request_id = correlation_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                supplied_request_id = value.decode("latin-1")
+            elif name == b"x-correlation-id":
+                correlation_id = value.decode("latin-1")
+        request_id = supplied_request_id or correlation_id or str(uuid4())
+        correlation_id = correlation_id or request_id
+
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
+        state["correlation_id"] = correlation_id
+        id_headers = [
+            (b"x-request-id", request_id.encode("latin-1")),
+            (b"x-correlation-id", correlation_id.encode("latin-1")),
+        ]
+        method = scope["method"]
+        path = scope["path"]
+        metric_method = method if method in _METHODS else "OTHER"
+        root_path = scope.get("root_path", "")
+
+        if supplied_request_id and method in _UNSAFE_METHODS and self._is_duplicate(supplied_request_id):
+            request_logger.warning(
+                "Duplicate request rejected: %s %s",
+                method,
+                path,
+                extra={"request_id": request_id, "method": method, "path": path, "status": 409},
             )
-            raise
+            await _send_json(send, 409, {"detail": "Duplicate request"}, id_headers)
+            return
+
+        status_code = 500
+        response_started = False
+        response_bytes = 0
+        timed_out = False
+
+        async def send_with_ids(message: Message) -> None:
+            nonlocal status_code, response_started, response_bytes
+            if message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            elif message["type"] == "http.response.start":
+                response_started = True
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                headers["X-Correlation-ID"] = correlation_id
+            await send(message)
+
+        task = asyncio.current_task()
+
+        def expire() -> None:
+            nonlocal timed_out
+            if not response_started:
+                timed_out = True
+                task.cancel()
+
+        start_time = time.perf_counter()
+        timer = asyncio.get_running_loop().call_later(self.timeout_seconds, expire)
+        if METRICS_AVAILABLE and http_requests_in_progress_metric is not None:
+            http_requests_in_progress_metric.labels(method=metric_method).inc()
+        with track_queries() as queries:
+            try:
+                await self.app(scope, receive, send_with_ids)
+            except asyncio.CancelledError:
+                if not timed_out:
+                    raise
+                if hasattr(task, "uncancel"):
+                    task.uncancel()
+                status_code = 504
+                await _send_json(send, 504, {"detail": "Request timeout"}, id_headers)
+            except Exception as exc:
+                request_logger.error(
+                    "Request failed with exception: %s",
+                    exc,
+                    extra=self._extra(request_id, correlation_id, method, path, 500, start_time, queries),
+                )
+                raise
+            finally:
+                timer.cancel()
+                if METRICS_AVAILABLE and http_requests_in_progress_metric is not None:
+                    http_requests_in_progress_metric.labels(method=metric_method).dec()
+                observe_http_request(
+                    metric_method,
+                    route_template(scope, root_path),
+                    status_code,
+                    time.perf_counter() - start_time,
+                    response_bytes,
+                )
+        observe_request_queries(queries)
+
+        extra = self._extra(request_id, correlation_id, method, path, status_code, start_time, queries)
+        if timed_out:
+            request_logger.error("Request timed out: %s %s", method, path, extra=extra)
+        else:
+            request_logger.info("Request completed: %s %s - %s", method, path, status_code, extra=extra)
+
+    def _is_duplicate(self, request_id: str) -> bool:
+        if self.dedupe_ttl <= 0:
+            return False
+        now = time.monotonic()
+        while self._seen and next(iter(self._seen.values())) <= now:
+            self._seen.popitem(last=False)
+        if request_id in self._seen:
+            return True
+        self._seen[request_id] = now + self.dedupe_ttl
+        while len(self._seen) > self.dedupe_max_entries:
+            self._seen.popitem(last=False)
+        return False
+
+    @staticmethod
+    def _extra(request_id, correlation_id, method, path, status_code, start_time, queries) -> dict:
+        return {
+            "request_id": request_id,
+            "correlation_id": correlation_id,
+            "method": method,
+            "path": path,
+            "status": status_code,
+            "duration_ms": round((time.perf_counter() - start_time) * 1000, 1),
+            "db_queries": queries.count,
+            "db_time_ms": round(queries.seconds * 1000, 1),
+        }
+
 
-        response.headers["X-Request-ID"] = request_id
-        return response
+async def _send_json(send: Send, status_code: int, payload: dict, headers: list[tuple[bytes, bytes]]) -> None:
+    body = json.dumps(payload).encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                *headers,
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
 
 
 # Alias for backward compatibility
-ObservabilityMiddleware = RequestCorrelationMiddleware
+RequestCorrelationMiddleware = ObservabilityMiddleware
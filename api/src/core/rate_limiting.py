@@ -6,10 +6,12 @@ from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from api.src.core.settings import get_settings
+from api.src.infrastructure.shared_state import rate_limit_storage_uri
 
 # Initialize rate limiter with remote address as key
-# This limits requests per IP address
-limiter = Limiter(key_func=get_remote_address)
+# This limits requests per IP address; with a shared state backend the
+# counts are shared by all workers instead of multiplied by their number.
+limiter = Limiter(key_func=get_remote_address, storage_uri=rate_limit_storage_uri())
 
 
 def get_rate_limit_string() -> str:
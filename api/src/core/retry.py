@@ -0,0 +1,174 @@
+"""
+Retry policies with jittered backoff and retry budgets (tenacity).
+
+Only idempotent work is retried: Vapi GETs and read-only database units of
+work. Delays use full jitter (`uniform(0, base * 2**n)`, capped) unless the
+error carries a `retry_after` (e.g. a 429's Retry-After), which is honoured
+as is; when it exceeds the cap the error is raised at once instead of being
+retried early. Each policy has a `RetryBudget`: retries may add at most
+`ratio` extra load over a sliding window (plus a small floor), so during an
+outage callers fail fast instead of multiplying traffic.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from tenacity import AsyncRetrying, RetryCallState
+
+try:
+    from prometheus_client import Counter
+
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+logger = logging.getLogger("ava.retry")
+
+T = TypeVar("T")
+
+if METRICS_AVAILABLE:
+    retry_attempts_metric = Counter(
+        "retry_attempts_total",
+        "Retries performed",
+        ["policy"],
+    )
+    retry_budget_exhausted_metric = Counter(
+        "retry_budget_exhausted_total",
+        "Retries skipped because the retry budget was spent",
+        ["policy"],
+    )
+    retry_giveups_metric = Counter(
+        "retry_giveups_total",
+        "Calls that still failed after their last retry",
+        ["policy"],
+    )
+else:
+    retry_attempts_metric = None
+    retry_budget_exhausted_metric = None
+    retry_giveups_metric = None
+
+
+class RetryBudget:
+    """
+    Caps retries to a share of recent first attempts.
+
+    Over the last `window_seconds`, retries may not exceed
+    `ratio * first attempts + min_per_second * window_seconds`.
+    """
+
+    def __init__(
+        self,
+        *,
+        ratio: float = 0.1,
+        min_per_second: float = 1.0,
+        window_seconds: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self._buckets: deque[list[int]] = deque()  # [second, first attempts, retries], oldest first
+
+    def record_request(self) -> None:
+        self._bucket()[1] += 1
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget; False when it is spent."""
+        bucket = self._bucket()
+        requests = sum(b[1] for b in self._buckets)
+        retries = sum(b[2] for b in self._buckets)
+        if retries + 1 > self.ratio * requests + self.min_per_second * self.window_seconds:
+            return False
+        bucket[2] += 1
+        return True
+
+    def _bucket(self) -> list[int]:
+        second = int(self._clock())
+        while self._buckets and self._buckets[0][0] <= second - self.window_seconds:
+            self._buckets.popleft()
+        if not self._buckets or self._buckets[-1][0] != second:
+            self._buckets.append([second, 0, 0])
+        return self._buckets[-1]
+
+
+@dataclass
+class RetryPolicy:
+    """When and how often to retry one kind of call."""
+
+    name: str
+    retry_on: Callable[[BaseException], bool]  # Transient errors worth another attempt
+    max_retries: int = 2
+    base_delay: float = 0.2  # Seconds; doubles per retry before jitter
+    max_delay: float = 5.0  # Caps backoff; a longer Retry-After is not retried
+    budget: Optional[RetryBudget] = None
+
+    async def call(self, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        if self.budget is not None:
+            self.budget.record_request()
+        retrying = AsyncRetrying(
+            retry=self._should_retry,
+            wait=self._delay,
+            before_sleep=self._before_sleep,
+            reraise=True,
+        )
+        return await retrying(func, *args, **kwargs)
+
+    def _should_retry(self, retry_state: RetryCallState) -> bool:
+        exc = retry_state.outcome.exception() if retry_state.outcome else None
+        if exc is None or not self.retry_on(exc):
+            return False
+        if retry_state.attempt_number > self.max_retries:
+            if METRICS_AVAILABLE and retry_giveups_metric is not None:
+                retry_giveups_metric.labels(policy=self.name).inc()
+            return False
+        retry_after = _retry_after(exc)
+        if retry_after is not None and retry_after > self.max_delay:
+            # Retrying sooner than the server asked would only be rejected again
+            logger.info(
+                f"Not retrying [{self.name}]: server asked to wait {retry_after:.1f}s",
+                extra={"policy": self.name, "retry_after": retry_after, "error": str(exc)},
+            )
+            return False
+        if self.budget is not None and not self.budget.try_spend():
+            logger.warning(
+                f"Retry budget [{self.name}] spent - not retrying",
+                extra={"policy": self.name, "error": str(exc)},
+            )
+            if METRICS_AVAILABLE and retry_budget_exhausted_metric is not None:
+                retry_budget_exhausted_metric.labels(policy=self.name).inc()
+            return False
+        return True
+
+    def _delay(self, retry_state: RetryCallState) -> float:
+        exc = retry_state.outcome.exception() if retry_state.outcome else None
+        retry_after = _retry_after(exc)
+        if retry_after is not None:
+            return retry_after  # At most max_delay, see _should_retry
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry_state.attempt_number - 1)))
+
+    def _before_sleep(self, retry_state: RetryCallState) -> None:
+        exc = retry_state.outcome.exception() if retry_state.outcome else None
+        delay = retry_state.next_action.sleep if retry_state.next_action else 0.0
+        logger.info(
+            f"Retrying [{self.name}] in {delay:.2f}s after attempt {retry_state.attempt_number}: {exc}",
+            extra={"policy": self.name, "attempt": retry_state.attempt_number, "delay": delay},
+        )
+        if METRICS_AVAILABLE and retry_attempts_metric is not None:
+            retry_attempts_metric.labels(policy=self.name).inc()
+
+
+def _retry_after(exc: Optional[BaseException]) -> Optional[float]:
+    retry_after = getattr(exc, "retry_after", None)
+    if retry_after is None:
+        return None
+    return max(float(retry_after), 0.0)
+
+
+__all__ = ["RetryBudget", "RetryPolicy"]
@@ -23,6 +23,10 @@ class Settings(BaseSettings):
     log_level: str = "INFO"
     vapi_base_url: str = "https://api.vapi.ai"
     vapi_api_key: Optional[str] = None
+    vapi_rate_limit_per_second: float = 10.0  # Starting client-side rate per API key
+    vapi_rate_limit_burst: int = 20
+    vapi_rate_limit_min_per_second: float = 0.5  # Floor after repeated 429s
+    vapi_rate_limit_max_wait_seconds: float = 5.0  # Longest a request queues for a token
     jwt_secret_key: str = "CHANGE_ME_IN_PRODUCTION_USE_ENV_VAR"
     twilio_account_sid: Optional[str] = None
     twilio_auth_token: Optional[str] = None
@@ -43,15 +47,135 @@ class Settings(BaseSettings):
     database_max_retries: int = 3  # Number of times to retry transient failures
     database_retry_backoff_seconds: float = 0.5  # Base backoff between retries (exponential)
     database_statement_timeout_ms: int = 15_000  # Applied via server_settings for safety
+
+    # Database connection pooling
+    database_pool_mode: str = "pgbouncer"  # pgbouncer (NullPool, no prepared statements) or queue (direct Postgres)
+    database_pool_size: int = 5  # queue: connections kept open per process
+    database_pool_max_overflow: int = 10  # queue: extra connections opened under load, closed when returned
+    database_pool_timeout_seconds: float = 10.0  # queue: longest wait for a free connection
+    database_pool_recycle_seconds: int = 1800  # queue: replace connections older than this
+    database_pool_pre_ping: bool = True  # queue: check a connection is alive before handing it out
+    database_statement_cache_size: int = 100  # queue: prepared statements cached per connection
+
+    # Read replica (analytics and call history reads)
+    database_read_replica_url: Optional[str] = None  # Unset: reads use the primary
+    database_replica_lag_window_seconds: float = 5.0  # A user's reads stay on the primary this long after they write
+
+    # SQL instrumentation
+    database_slow_query_ms: int = 500  # Statements slower than this are logged
+    database_slow_query_explain: bool = False  # Also log the plan of slow SELECTs (one extra round trip each)
     
     # Circuit breaker configuration (Phase 2-4)
     circuit_breaker_enabled: bool = True
     circuit_breaker_threshold: int = 3
     circuit_breaker_recovery_timeout: int = 30
+    circuit_breaker_window_size: int = 20  # Recent calls considered for failure/slow-call rates
+    circuit_breaker_minimum_calls: int = 10  # Calls in the window before rates can open a circuit
+    circuit_breaker_failure_rate_threshold: float = 0.5
+    circuit_breaker_slow_call_seconds: Optional[float] = 5.0  # None disables slow-call tracking
+    circuit_breaker_slow_call_rate_threshold: float = 0.8
+    circuit_breaker_half_open_max_calls: int = 1  # Concurrent recovery probes
+    circuit_breaker_max_keyed_breakers: int = 1000  # Per-tenant breakers kept in memory (LRU)
+
+    # Retries with jittered backoff (Vapi GETs; DB reads use database_max_retries)
+    vapi_max_retries: int = 2
+    retry_base_delay_seconds: float = 0.2  # Doubles per retry, full jitter
+    retry_max_delay_seconds: float = 5.0  # Also caps how long a Retry-After is honoured
+    retry_budget_ratio: float = 0.1  # Retries per first attempt, so retries add at most ~10% load
+    retry_budget_min_per_second: float = 1.0  # Retries always allowed at this rate
+    retry_budget_window_seconds: float = 10.0
+
+    # Shared state across workers (circuit breakers, rate-limit counters)
+    shared_state_backend: str = "local"  # local (per process), shm (one host) or postgres (several hosts)
+    shared_state_sync_interval_seconds: float = 1.0  # How stale another worker's view may be
+    shared_state_shm_path: str = "/dev/shm/ava-api-shared-state"
+    shared_state_shm_slots: int = 8192  # Rate-limit windows and breakers the segment can hold
     
+    # HTTP requests (ObservabilityMiddleware)
+    request_timeout_seconds: float = 20.0  # 504 when no response has started by then
+    request_dedupe_ttl_seconds: float = 0.0  # Reject a repeated X-Request-ID on writes with 409; 0 disables
+
     # Rate limiting configuration (Phase 2-4)
     rate_limit_per_minute: int = 10  # 30-60 recommended for production
 
+    # Live transcripts (transcript.update buffering)
+    transcript_flush_interval_seconds: float = 5.0  # How often buffered turns are written to Postgres
+    transcript_buffer_max_calls: int = 1000  # Oldest idle calls are evicted beyond this
+    transcript_buffer_idle_ttl_seconds: int = 3600  # Drop calls that never received call.ended
+
+    # Function calls (Vapi function-call events)
+    function_call_default_deadline_seconds: float = 2.0  # Fallback response is spoken after this
+    function_call_max_concurrency: int = 50  # Per function; extra calls get the fallback immediately
+    function_context_ttl_seconds: int = 300  # Cached tenant context used by function handlers
+
+    # Authenticated identity (users and tenants resolved per request)
+    identity_cache_max_entries: int = 10_000  # Users (and tenants) kept per worker
+    identity_cache_ttl_seconds: float = 30.0  # Bounds staleness across workers; 0 disables the cache
+
+    # Password hashing (bcrypt in a bounded thread pool)
+    password_hash_rounds: int = 12  # bcrypt cost; older hashes are upgraded on login
+    password_hash_workers: int = 0  # Hashing threads; 0 = one per CPU core
+    password_hash_max_queue: int = 64  # Hashes waiting for a thread; more are rejected with 503
+
+    # Caller directory
+    caller_cache_max_entries: int = 10_000  # (tenant, number) entries kept per worker
+    caller_cache_ttl_seconds: int = 300  # Bounds staleness across workers
+
+    # assistant-request (precompiled assistant configs per number)
+    assistant_config_cache_ttl_seconds: int = 30  # Bounds staleness across workers; served stale for one more TTL while recompiling
+    assistant_config_cache_max_entries: int = 10_000  # Numbers kept per worker (least recently used evicted)
+
+    # Email outbox
+    email_outbox_workers: int = 2  # Background tasks per process
+    email_outbox_batch_size: int = 20  # Emails claimed per poll
+    email_outbox_poll_interval_seconds: float = 2.0  # Idle poll interval (enqueue wakes workers immediately)
+    email_outbox_lease_seconds: int = 300  # Claimed emails are retried by others after this
+    email_outbox_max_attempts: int = 6  # Dead-letter after this many failed attempts
+    email_outbox_retry_base_seconds: float = 30.0  # Exponential backoff base
+    email_outbox_retry_max_seconds: float = 3600.0  # Backoff cap
+    email_smtp_max_concurrency: int = 5  # Concurrent SMTP deliveries per process
+    email_resend_max_concurrency: int = 10  # Concurrent Resend deliveries per process
+    email_resend_batching: bool = True  # Send Resend-only emails of a claimed batch in one batch request
+
+    # Email service cache
+    email_service_cache_ttl_seconds: float = 600.0  # Per-tenant EmailService (decrypted SMTP credentials)
+    email_service_cache_max_entries: int = 1000
+
+    # Call summary digests
+    call_digest_poll_interval_seconds: float = 60.0  # How often due digests are checked
+    call_digest_max_calls_per_email: int = 200  # Larger backlogs are split across digests
+
+    # SMTP connection pool
+    smtp_pool_enabled: bool = True  # Reuse authenticated SMTP sessions instead of connecting per email
+    smtp_pool_max_connections: int = 4  # Per SMTP configuration (server + credentials)
+    smtp_pool_idle_timeout_seconds: float = 60.0  # Close sessions idle for longer than this
+    smtp_pool_health_check_after_seconds: float = 15.0  # NOOP sessions idle for longer than this before reuse
+
+    # Resend HTTP transport
+    resend_api_base_url: str = "https://api.resend.com"
+    resend_timeout_seconds: float = 10.0  # Per request
+    resend_max_connections: int = 20  # Shared keep-alive pool for the process
+
+    # Twilio HTTP client
+    twilio_api_base_url: str = "https://api.twilio.com"
+    twilio_timeout_seconds: float = 15.0  # Per request
+    twilio_max_connections: int = 20  # Shared keep-alive pool for all Twilio accounts
+
+    # Outbound call campaigns
+    campaign_poll_interval_seconds: float = 5.0  # Idle poll interval (status callbacks wake the dialer)
+    campaign_calls_per_second: float = 1.0  # Twilio account CPS limit; calls are paced per account
+    campaign_max_live_calls_per_tenant: int = 10  # Across all running campaigns of a tenant
+    campaign_stale_call_seconds: float = 3600.0  # A call with no final status stops holding a slot after this
+
+    # Bulkheads (concurrent calls per external dependency, per process)
+    bulkhead_vapi_max_concurrent: int = 20
+    bulkhead_twilio_max_concurrent: int = 10
+    bulkhead_resend_max_concurrent: int = 10
+    bulkhead_smtp_max_concurrent: int = 8  # Also bounds worker threads used by unpooled SMTP sends
+    bulkhead_tts_max_concurrent: int = 4
+    bulkhead_max_queue: int = 50  # Calls waiting for a slot; more are rejected with 503
+    bulkhead_queue_timeout_seconds: float = 5.0  # Longest wait for a slot before a 503
+
     @field_validator("allowed_origins", mode="before")
     @classmethod
     def parse_origins(cls, v) -> List[str]:
@@ -6,10 +6,31 @@ Represents a person who has called the business.
 Stores contact information collected during calls.
 """
 
+import re
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
+_SEPARATORS_RE = re.compile(r"[\s().-]")
+_PHONE_RE = re.compile(r"^\+\d{6,15}$")
+
+
+def normalize_phone_number(number: Optional[str]) -> Optional[str]:
+    """Normalize a phone number to E.164-like form ("+" followed by digits).
+
+    Returns None for anything that is not a phone number, including the
+    placeholders used for withheld numbers ("Unknown", "anonymous"), so
+    such calls are never grouped under one shared caller.
+    """
+    if not number:
+        return None
+    number = _SEPARATORS_RE.sub("", number)
+    if number.startswith("00"):
+        number = f"+{number[2:]}"
+    elif number.isdigit():
+        number = f"+{number}"
+    return number if _PHONE_RE.match(number) else None
+
 
 @dataclass(frozen=True)
 class CallerId:
@@ -36,6 +57,8 @@ class Caller:
         notes: Additional notes about the caller
         created_at: When first call was received
         updated_at: Last update timestamp
+        last_seen_at: When the most recent call was received
+        call_count: Number of completed calls from this number
     """
     id: CallerId
     org_id: str
@@ -46,6 +69,8 @@ class Caller:
     notes: Optional[str] = None
     created_at: datetime = None
     updated_at: datetime = None
+    last_seen_at: Optional[datetime] = None
+    call_count: int = 0
 
     @property
     def full_name(self) -> str:
@@ -0,0 +1,243 @@
+"""
+Business hours schedule.
+
+Schedules are parsed once into per-weekday sorted interval tables so routing
+decisions ("are we open now?", "when do we open next?") are a bisect rather
+than string parsing on every call.
+
+Accepted inputs:
+- "09:00-18:00"                                   every day
+- "mon-fri 09:00-12:00,14:00-18:00; sat 10:00-13:00"
+- "lun-ven 9h-18h" (French day names and "9h30" times)
+- "22:00-02:00"                                   overnight, spills into next day
+- "24/7" or empty                                 always open; "closed" never open
+- dict / JSON: {"hours": <string or {"mon": ["09:00-18:00"], ...}>,
+                "timezone": "Europe/Paris", "holidays": ["2025-12-25"]}
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Iterable, Optional, Sequence
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+MINUTES_PER_DAY = 24 * 60
+
+_DAY_ALIASES = {
+    "mon": 0, "lun": 0,
+    "tue": 1, "mar": 1,
+    "wed": 2, "mer": 2,
+    "thu": 3, "jeu": 3,
+    "fri": 4, "ven": 4,
+    "sat": 5, "sam": 5,
+    "sun": 6, "dim": 6,
+}
+_DAY_NAMES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+_TIME_RE = re.compile(r"^(\d{1,2})(?:[:h](\d{2})?)?$")
+_ALWAYS_OPEN = {"", "24/7", "24h/24", "always"}
+_NEVER_OPEN = {"closed", "ferme", "fermé"}
+
+Interval = tuple[int, int]
+
+
+class BusinessHoursError(ValueError):
+    """Raised when a business hours definition cannot be parsed."""
+
+
+def _parse_time(value: str) -> int:
+    match = _TIME_RE.match(value.strip().lower())
+    if not match:
+        raise BusinessHoursError(f"Invalid time: {value!r}")
+    hours, minutes = int(match.group(1)), int(match.group(2) or 0)
+    if hours > 24 or minutes > 59 or (hours == 24 and minutes):
+        raise BusinessHoursError(f"Invalid time: {value!r}")
+    return hours * 60 + minutes
+
+
+def _parse_day(value: str) -> int:
+    day = _DAY_ALIASES.get(value.strip().lower()[:3])
+    if day is None:
+        raise BusinessHoursError(f"Invalid day: {value!r}")
+    return day
+
+
+def _parse_days(value: str) -> list[int]:
+    days: list[int] = []
+    for part in value.split(","):
+        if "-" in part:
+            start, end = (_parse_day(p) for p in part.split("-", 1))
+            span = (end - start) % 7
+            days.extend((start + offset) % 7 for offset in range(span + 1))
+        else:
+            days.append(_parse_day(part))
+    return days
+
+
+def _parse_ranges(value: str) -> list[Interval]:
+    ranges = []
+    for part in value.split(","):
+        if "-" not in part:
+            raise BusinessHoursError(f"Invalid time range: {part!r}")
+        start, end = (_parse_time(p) for p in part.split("-", 1))
+        ranges.append((start, end))
+    return ranges
+
+
+def _add_range(week: list[list[Interval]], day: int, start: int, end: int) -> None:
+    if start == end:
+        return
+    if end > start:
+        week[day].append((start, end))
+    else:  # overnight, e.g. 22:00-02:00
+        week[day].append((start, MINUTES_PER_DAY))
+        week[(day + 1) % 7].append((0, end))
+
+
+def _merge(intervals: Iterable[Interval]) -> tuple[Interval, ...]:
+    merged: list[list[int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return tuple((start, end) for start, end in merged)
+
+
+def _parse_text(value: str, week: list[list[Interval]]) -> None:
+    for segment in re.split(r"[;\n]", value):
+        segment = segment.strip()
+        if not segment:
+            continue
+        tokens = segment.split(None, 1)
+        if len(tokens) == 2 and not tokens[0][0].isdigit():
+            days, ranges = _parse_days(tokens[0]), tokens[1]
+        else:
+            days, ranges = list(range(7)), segment
+        for start, end in _parse_ranges(ranges.replace(" ", "")):
+            for day in days:
+                _add_range(week, day, start, end)
+
+
+@dataclass(frozen=True)
+class BusinessSchedule:
+    """Compiled weekly schedule evaluated in the business's timezone."""
+
+    tz: ZoneInfo
+    weekly: tuple[tuple[Interval, ...], ...]
+    holidays: frozenset[date] = frozenset()
+    always_open: bool = False
+    # Interval starts per weekday, precomputed for bisect lookups
+    _starts: tuple[tuple[int, ...], ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_starts", tuple(tuple(start for start, _ in day) for day in self.weekly))
+
+    def is_open(self, at: Optional[datetime] = None) -> bool:
+        if self.always_open:
+            return True
+        local = self._local(at)
+        if local.date() in self.holidays:
+            return False
+        intervals = self.weekly[local.weekday()]
+        minute = local.hour * 60 + local.minute
+        index = bisect_right(self._starts[local.weekday()], minute) - 1
+        return index >= 0 and minute < intervals[index][1]
+
+    def next_open(self, at: Optional[datetime] = None) -> Optional[datetime]:
+        """Start of the next opening at or after `at` (`at` itself when open)."""
+        if self.always_open:
+            return self._local(at)
+        if self.is_open(at):
+            return self._local(at)
+        local = self._local(at)
+        minute = local.hour * 60 + local.minute
+        for offset in range(0, 7 + len(self.holidays) + 1):
+            day = local.date() + timedelta(days=offset)
+            if day in self.holidays:
+                continue
+            for start, _ in self.weekly[day.weekday()]:
+                if offset == 0 and start <= minute:
+                    continue
+                return datetime.combine(day, time(0), tzinfo=self.tz) + timedelta(minutes=start)
+        return None
+
+    def describe(self) -> str:
+        """Compact human-readable form, e.g. "mon 09:00-18:00; tue 09:00-18:00"."""
+        if self.always_open:
+            return "24/7"
+        parts = []
+        for day, intervals in enumerate(self.weekly):
+            if intervals:
+                ranges = ",".join(f"{s // 60:02d}:{s % 60:02d}-{e // 60:02d}:{e % 60:02d}" for s, e in intervals)
+                parts.append(f"{_DAY_NAMES[day]} {ranges}")
+        return "; ".join(parts) or "closed"
+
+    def _local(self, at: Optional[datetime]) -> datetime:
+        at = at or datetime.now(timezone.utc)
+        if at.tzinfo is None:
+            at = at.replace(tzinfo=timezone.utc)
+        return at.astimezone(self.tz)
+
+
+def _zone(name: Optional[str]) -> ZoneInfo:
+    try:
+        return ZoneInfo(name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError) as exc:
+        raise BusinessHoursError(f"Unknown timezone: {name!r}") from exc
+
+
+def compile_schedule(
+    hours: Any,
+    *,
+    timezone_name: Optional[str] = None,
+    holidays: Optional[Sequence[str | date]] = None,
+) -> BusinessSchedule:
+    """Parse a business hours definition once into a `BusinessSchedule`."""
+
+    if isinstance(hours, str) and hours.strip().startswith("{"):
+        try:
+            hours = json.loads(hours)
+        except json.JSONDecodeError as exc:
+            raise BusinessHoursError("Invalid business hours JSON") from exc
+
+    if isinstance(hours, dict) and hours.keys() & {"hours", "weekly", "timezone", "holidays"}:
+        timezone_name = hours.get("timezone") or timezone_name
+        holidays = list(holidays or []) + list(hours.get("holidays") or [])
+        hours = hours.get("hours", hours.get("weekly"))
+
+    tz = _zone(timezone_name)
+    holiday_dates = frozenset(
+        day if isinstance(day, date) else _parse_date(day) for day in (holidays or [])
+    )
+
+    if hours is None or (isinstance(hours, str) and hours.strip().lower() in _ALWAYS_OPEN):
+        return BusinessSchedule(tz=tz, weekly=((),) * 7, holidays=holiday_dates, always_open=True)
+
+    week: list[list[Interval]] = [[] for _ in range(7)]
+    if isinstance(hours, dict):
+        for day_name, ranges in hours.items():
+            day = _parse_day(day_name)
+            for value in [ranges] if isinstance(ranges, str) else ranges:
+                for start, end in _parse_ranges(value.replace(" ", "")):
+                    _add_range(week, day, start, end)
+    elif isinstance(hours, str):
+        if hours.strip().lower() not in _NEVER_OPEN:
+            _parse_text(hours, week)
+    else:
+        raise BusinessHoursError(f"Unsupported business hours value: {type(hours).__name__}")
+
+    return BusinessSchedule(tz=tz, weekly=tuple(_merge(day) for day in week), holidays=holiday_dates)
+
+
+def _parse_date(value: str) -> date:
+    try:
+        return date.fromisoformat(str(value))
+    except ValueError as exc:
+        raise BusinessHoursError(f"Invalid holiday date: {value!r}") from exc
+
+
+__all__ = ["BusinessHoursError", "BusinessSchedule", "compile_schedule"]
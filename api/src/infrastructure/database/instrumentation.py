@@ -0,0 +1,207 @@
+"""
+SQL statement instrumentation.
+
+Engine events time every statement (`db_query_duration_seconds` by
+operation). Inside `track_queries()` — opened per request by the
+observability middleware — statements are also counted and their time
+summed, so each request reports how many queries it issued and how long it
+spent in the database. Statements slower than `database_slow_query_ms` are
+logged with the shape of their parameters (types, never values) and, when
+`database_slow_query_explain` is on, the plan of slow SELECTs.
+
+Tests use `assert_max_queries(n)` to pin the query count of an endpoint and
+catch N+1 regressions.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from api.src.core.settings import get_settings
+
+try:
+    from prometheus_client import Counter, Histogram
+
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+logger = logging.getLogger("ava.database")
+
+_settings = get_settings()
+
+_OPERATIONS = ("SELECT", "INSERT", "UPDATE", "DELETE")
+_MAX_LOGGED_STATEMENT = 2000
+
+if METRICS_AVAILABLE:
+    query_duration_metric = Histogram(
+        "db_query_duration_seconds",
+        "SQL statement latency",
+        ["operation"],
+        buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    )
+    slow_queries_metric = Counter(
+        "db_slow_queries_total",
+        "SQL statements slower than database_slow_query_ms",
+        ["operation"],
+    )
+    request_queries_metric = Histogram(
+        "db_queries_per_request",
+        "SQL statements issued while serving one request",
+        buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+    )
+    request_db_time_metric = Histogram(
+        "db_time_per_request_seconds",
+        "Time spent in SQL statements while serving one request",
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    )
+else:
+    query_duration_metric = None
+    slow_queries_metric = None
+    request_queries_metric = None
+    request_db_time_metric = None
+
+
+@dataclass
+class QueryStats:
+    """Statements run inside one `track_queries()` block."""
+
+    count: int = 0
+    seconds: float = 0.0
+    statements: list[str] = field(default_factory=list)  # Only filled when recording
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("ava_query_stats", default=None)
+_recording: ContextVar[bool] = ContextVar("ava_query_recording", default=False)
+
+
+@contextmanager
+def track_queries(*, record_statements: bool = False) -> Iterator[QueryStats]:
+    """Count the statements run in this context (and tasks it starts)."""
+    stats = QueryStats()
+    stats_token = _current_stats.set(stats)
+    recording_token = _recording.set(record_statements)
+    try:
+        yield stats
+    finally:
+        _recording.reset(recording_token)
+        _current_stats.reset(stats_token)
+
+
+def observe_request_queries(stats: QueryStats) -> None:
+    """Report a finished request's query count and database time."""
+    if METRICS_AVAILABLE and request_queries_metric is not None:
+        request_queries_metric.observe(stats.count)
+        request_db_time_metric.observe(stats.seconds)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """Fail when the block runs more than `limit` statements (test helper)."""
+    with track_queries(record_statements=True) as stats:
+        yield stats
+    if stats.count > limit:
+        listing = "\n".join(f"  {index}. {statement}" for index, statement in enumerate(stats.statements, 1))
+        raise AssertionError(f"Expected at most {limit} queries, {stats.count} were run:\n{listing}")
+
+
+def _operation(statement: str) -> str:
+    keyword = statement.lstrip(" (\n\t").split(None, 1)[0].upper() if statement.strip() else ""
+    return keyword if keyword in _OPERATIONS else "OTHER"
+
+
+def _parameter_shape(parameters: Any) -> Any:
+    """Types of the bound parameters, so slow-query logs never carry values."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"{len(parameters)} x {_parameter_shape(parameters[0])}"
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _explain(conn: Any, statement: str, parameters: Any) -> Optional[str]:
+    conn.info["ava_explaining"] = True
+    savepoint = None
+    try:
+        # A failed statement aborts the whole transaction on Postgres: keep the
+        # EXPLAIN in a savepoint so the request's own work survives it
+        savepoint = conn.begin_nested()
+        rows = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters).fetchall()
+        return "\n".join(str(row[0]) for row in rows)
+    except Exception as exc:  # noqa: BLE001 - diagnostics only
+        logger.debug("EXPLAIN of slow query failed: %s", exc)
+        return None
+    finally:
+        if savepoint is not None and savepoint.is_active:
+            try:
+                savepoint.rollback()
+            except Exception as exc:  # noqa: BLE001 - diagnostics only
+                logger.debug("Could not roll back the EXPLAIN savepoint: %s", exc)
+        conn.info.pop("ava_explaining", None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None:
+        context._ava_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started_at = getattr(context, "_ava_started_at", None)
+    if started_at is None or conn.info.get("ava_explaining"):
+        return
+    elapsed = time.perf_counter() - started_at
+    operation = _operation(statement)
+
+    if METRICS_AVAILABLE and query_duration_metric is not None:
+        query_duration_metric.labels(operation=operation).observe(elapsed)
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+        if _recording.get():
+            stats.statements.append(statement)
+
+    if elapsed * 1000 < _settings.database_slow_query_ms:
+        return
+    if METRICS_AVAILABLE and slow_queries_metric is not None:
+        slow_queries_metric.labels(operation=operation).inc()
+    plan = None
+    if _settings.database_slow_query_explain and operation == "SELECT" and not executemany:
+        plan = _explain(conn, statement, parameters)
+    logger.warning(
+        f"Slow {operation} ({elapsed * 1000:.0f} ms): {statement[:_MAX_LOGGED_STATEMENT]}",
+        extra={
+            "operation": operation,
+            "duration_ms": round(elapsed * 1000, 1),
+            "parameters": _parameter_shape(parameters),
+            "plan": plan,
+        },
+    )
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach the timing events to a (sync) engine; idempotent."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+__all__ = [
+    "QueryStats",
+    "assert_max_queries",
+    "instrument_engine",
+    "observe_request_queries",
+    "track_queries",
+]
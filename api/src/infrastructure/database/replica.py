@@ -0,0 +1,214 @@
+"""
+Read-replica routing for read-heavy endpoints.
+
+Analytics, call history and other dashboard reads take a session from
+`get_read_session`; when `database_read_replica_url` is set its queries run
+on the replica, so large scans do not compete with webhook ingestion on the
+primary.
+
+Replicas lag behind the primary. To keep read-your-writes, every committed
+write made while serving a user is recorded by `ReplicaLagGuard`, and that
+user's replica reads go to the primary for the next
+`database_replica_lag_window_seconds`. Writes are shared with the other
+workers through the shared state (when configured), so a follow-up request
+landing on another worker is routed the same way.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import AsyncGenerator
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+
+from fastapi import Depends
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from api.src.core.settings import get_settings
+from api.src.infrastructure.database.instrumentation import instrument_engine
+from api.src.infrastructure.database.session import engine, engine_options, get_session
+from api.src.infrastructure.shared_state import get_shared_state
+
+try:
+    from prometheus_client import Counter
+
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+_settings = get_settings()
+
+if METRICS_AVAILABLE:
+    read_routing_metric = Counter(
+        "db_read_routing_total",
+        "Read-session statements by target database",
+        ["target"],
+    )
+else:
+    read_routing_metric = None
+
+# User whose request is being served; writes and reads are keyed by it
+_request_user: ContextVar[Optional[str]] = ContextVar("ava_request_user", default=None)
+
+
+def bind_request_user(user_id: str) -> None:
+    """Key this request's writes and replica reads by `user_id`."""
+    _request_user.set(user_id)
+
+
+class ReplicaLagGuard:
+    """Remembers which users wrote within the last `window_seconds`."""
+
+    def __init__(
+        self,
+        window_seconds: float,
+        *,
+        max_keys: int = 10_000,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self._clock = clock
+        self._writes: OrderedDict[str, float] = OrderedDict()  # key -> last write, oldest first
+
+    def record_write(self, key: Optional[str]) -> None:
+        if key is None or self.window_seconds <= 0:
+            return
+        now = self._clock()
+        self._writes[key] = now
+        self._writes.move_to_end(key)
+        while len(self._writes) > self.max_keys:
+            self._writes.popitem(last=False)
+
+        shared_state = get_shared_state()
+        if shared_state is not None:
+            window_start = self._window_start(now)
+            shared_state.incr(_shared_key(key), window_start, window_start + 2 * self._window)
+
+    def recently_wrote(self, key: Optional[str]) -> bool:
+        if key is None or self.window_seconds <= 0:
+            return False
+        now = self._clock()
+        written_at = self._writes.get(key)
+        if written_at is not None:
+            if now - written_at < self.window_seconds:
+                return True
+            del self._writes[key]
+
+        shared_state = get_shared_state()
+        if shared_state is None:
+            return False
+        # Windows are aligned, so a write up to one window ago is in this one or the last
+        window_start = self._window_start(now)
+        return any(
+            shared_state.count(_shared_key(key), start) > 0
+            for start in (window_start, window_start - self._window)
+        )
+
+    @property
+    def _window(self) -> int:
+        return max(int(self.window_seconds), 1)
+
+    def _window_start(self, now: float) -> int:
+        return int(now // self._window * self._window)
+
+
+def _shared_key(key: str) -> str:
+    return f"replica-guard:{key}"
+
+
+replica_lag_guard = ReplicaLagGuard(_settings.database_replica_lag_window_seconds)
+
+if _settings.database_read_replica_url:
+    read_engine = create_async_engine(
+        _settings.database_read_replica_url,
+        echo=False,
+        future=True,
+        **engine_options(_settings),
+    )
+    instrument_engine(read_engine.sync_engine)
+else:
+    read_engine = engine
+
+
+class _ReplicaRoutingSession(Session):
+    """Runs each statement on the replica unless the request's user just wrote."""
+
+    def get_bind(self, mapper: Any = None, **kw: Any) -> Engine:
+        if replica_lag_guard.recently_wrote(_request_user.get()):
+            target = "primary"
+        else:
+            target = "replica"
+        if METRICS_AVAILABLE and read_routing_metric is not None:
+            read_routing_metric.labels(target=target).inc()
+        return engine.sync_engine if target == "primary" else read_engine.sync_engine
+
+
+ReadSessionLocal = async_sessionmaker(
+    expire_on_commit=False,
+    class_=AsyncSession,
+    sync_session_class=_ReplicaRoutingSession,
+)
+
+
+async def get_read_session(
+    session: AsyncSession = Depends(get_session),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Provide a read-only AsyncSession for FastAPI dependency injection.
+
+    Without a replica this is the request's primary session, so no extra
+    connection is opened. Never write through it: a replica rejects writes.
+    """
+    if read_engine is engine:
+        yield session
+        return
+    async with ReadSessionLocal() as read_session:
+        yield read_session
+
+
+# Write tracking: any session that commits changes while serving a user
+# records that user with the lag guard.
+
+
+@event.listens_for(Session, "before_flush")
+def _note_flush(session: Session, flush_context: Any, instances: Any) -> None:
+    if session.new or session.deleted or any(session.is_modified(obj) for obj in session.dirty):
+        session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_dml(orm_execute_state: Any) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _record_write(session: Session) -> None:
+    if session.info.pop("wrote", False):
+        replica_lag_guard.record_write(_request_user.get())
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_write(session: Session) -> None:
+    session.info.pop("wrote", None)
+
+
+async def close_read_engine() -> None:
+    if read_engine is not engine:
+        await read_engine.dispose()
+
+
+__all__ = [
+    "ReadSessionLocal",
+    "ReplicaLagGuard",
+    "bind_request_user",
+    "close_read_engine",
+    "get_read_session",
+    "read_engine",
+    "replica_lag_guard",
+]
@@ -7,46 +7,79 @@ supplied via the `DATABASE_URL` environment variable.
 
 from __future__ import annotations
 
-import asyncio
 import logging
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from typing import Any, TypeVar
 
-from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 try:  # pragma: no cover - optional dependency
     from asyncpg import exceptions as asyncpg_exceptions  # type: ignore
 except ImportError:  # pragma: no cover - fallback when asyncpg missing (tests)
     asyncpg_exceptions = None
 
-from api.src.core.settings import get_settings
+from api.src.core.retry import RetryBudget, RetryPolicy
+from api.src.core.settings import Settings, get_settings
+from api.src.infrastructure.database.instrumentation import instrument_engine
 
 logger = logging.getLogger("ava.database")
 
+T = TypeVar("T")
+
 settings = get_settings()
 
-# 🔥 DIVINE ARCHITECTURE: Render + PgBouncer (transaction pooling)
-# PgBouncer already multiplexes connections, so SQLAlchemy MUST avoid pooling.
-# Using NullPool prevents cached prepared statements from leaking across
-# logical connections and eliminates DuplicatePreparedStatementError.
-engine = create_async_engine(
-    settings.database_url,
-    echo=False,
-    future=True,
-    poolclass=NullPool,
-    connect_args={
-        "statement_cache_size": 0,  # 🔥 Disable asyncpg prepared statements (PgBouncer compat)
-        "prepared_statement_cache_size": 0,  # 🔥 Disable SQLAlchemy prepared statements (PgBouncer compat)
+POOL_MODES = ("pgbouncer", "queue")
+
+
+def engine_options(config: Settings) -> dict[str, Any]:
+    """
+    `create_async_engine` keyword arguments for `database_pool_mode`.
+
+    - pgbouncer: behind PgBouncer in transaction pooling mode (Render,
+      Supabase pooler). PgBouncer already multiplexes connections, so
+      SQLAlchemy MUST avoid pooling: NullPool, and prepared statements are
+      disabled so they never leak across logical connections
+      (DuplicatePreparedStatementError).
+    - queue: direct Postgres (docker-compose, Supabase direct connection).
+      Connections are kept in an `AsyncAdaptedQueuePool` and reuse their
+      prepared statements, so requests skip the connect/auth handshake.
+    """
+    if config.database_pool_mode not in POOL_MODES:
+        raise ValueError(f"Unknown database_pool_mode: {config.database_pool_mode!r}")
+
+    connect_args: dict[str, Any] = {
         "timeout": 10.0,  # 🔥 10-second connection timeout (give Supabase time to wake)
-        "command_timeout": settings.database_statement_timeout_ms / 1000,  # 🔥 Query timeout (seconds)
+        "command_timeout": config.database_statement_timeout_ms / 1000,  # 🔥 Query timeout (seconds)
         "server_settings": {
             "jit": "off",  # 🔥 Disable JIT for predictable performance
             "application_name": "ava-api-production",  # 🔥 Identify in PostgreSQL logs
-            "statement_timeout": f"{settings.database_statement_timeout_ms}ms",  # 🔥 DIVINE: Must include unit!
+            "statement_timeout": f"{config.database_statement_timeout_ms}ms",  # 🔥 DIVINE: Must include unit!
         },
-    },
-)
+    }
+    if config.database_pool_mode == "pgbouncer":
+        connect_args["statement_cache_size"] = 0  # 🔥 Disable asyncpg prepared statements (PgBouncer compat)
+        connect_args["prepared_statement_cache_size"] = 0  # 🔥 Disable SQLAlchemy prepared statements
+        return {"poolclass": NullPool, "connect_args": connect_args}
+
+    connect_args["statement_cache_size"] = config.database_statement_cache_size
+    connect_args["prepared_statement_cache_size"] = config.database_statement_cache_size
+    return {
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": config.database_pool_size,
+        "max_overflow": config.database_pool_max_overflow,
+        "pool_timeout": config.database_pool_timeout_seconds,
+        "pool_recycle": config.database_pool_recycle_seconds,
+        "pool_pre_ping": config.database_pool_pre_ping,
+        "connect_args": connect_args,
+    }
+
+
+# 🔥 DIVINE ARCHITECTURE: Render + PgBouncer (transaction pooling) by default;
+# see `engine_options` for direct connections.
+engine = create_async_engine(settings.database_url, echo=False, future=True, **engine_options(settings))
+instrument_engine(engine.sync_engine)
 SessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
 
 _ASYNC_PG_ERRORS: tuple[type[Exception], ...]
@@ -58,19 +91,88 @@ if asyncpg_exceptions:
 else:  # pragma: no cover - asyncpg not installed in some unit tests
     _ASYNC_PG_ERRORS = tuple()
 
+# Connection-level failures: dropped/reset PgBouncer connections, failovers,
+# server restarts. Query errors (constraints, syntax, timeouts) are not here.
+_TRANSIENT_ASYNCPG_ERRORS: tuple[type[Exception], ...]
+if asyncpg_exceptions:
+    _TRANSIENT_ASYNCPG_ERRORS = (
+        asyncpg_exceptions.PostgresConnectionError,  # type: ignore[attr-defined]
+        asyncpg_exceptions.CannotConnectNowError,  # type: ignore[attr-defined]
+        asyncpg_exceptions.TooManyConnectionsError,  # type: ignore[attr-defined]
+        asyncpg_exceptions.AdminShutdownError,  # type: ignore[attr-defined]
+    )
+else:  # pragma: no cover - asyncpg not installed in some unit tests
+    _TRANSIENT_ASYNCPG_ERRORS = tuple()
+
+
+def is_transient_db_error(exc: BaseException) -> bool:
+    """Whether a failed database call may succeed on a new connection."""
+    if isinstance(exc, DBAPIError) and exc.connection_invalidated:
+        return True
+    if isinstance(exc, (OperationalError, InterfaceError, ConnectionError)):
+        return True
+    # SQLAlchemy wraps the driver error; asyncpg's own error is its cause
+    cause = getattr(exc, "orig", None)
+    while cause is not None:
+        if isinstance(cause, _TRANSIENT_ASYNCPG_ERRORS + (ConnectionError,)):
+            return True
+        cause = cause.__cause__
+    return isinstance(exc, _TRANSIENT_ASYNCPG_ERRORS)
+
+
+_read_retry = RetryPolicy(
+    "database_read",
+    retry_on=is_transient_db_error,
+    max_retries=settings.database_max_retries,
+    base_delay=settings.database_retry_backoff_seconds,
+    max_delay=settings.retry_max_delay_seconds,
+    budget=RetryBudget(
+        ratio=settings.retry_budget_ratio,
+        min_per_second=settings.retry_budget_min_per_second,
+        window_seconds=settings.retry_budget_window_seconds,
+    ),
+)
+
+
+async def run_read_only(operation: Callable[[AsyncSession], Awaitable[T]]) -> T:
+    """
+    Run a read-only unit of work, retrying transient connection failures.
+
+    Every attempt gets a fresh session, so `operation` must only read: it may
+    run more than once. Retries back off with jitter
+    (`database_retry_backoff_seconds`, up to `database_max_retries` times)
+    within the shared retry budget.
+    """
+
+    async def attempt() -> T:
+        async with SessionLocal() as session:
+            return await operation(session)
+
+    return await _read_retry.call(attempt)
+
+
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """
     🔥 DIVINE: Provide an AsyncSession for FastAPI dependency injection.
     
-    Per-request sessions with NullPool (PgBouncer handles connection pooling).
+    Per-request sessions; connections come from PgBouncer (NullPool) or the
+    engine's queue pool, depending on `database_pool_mode`.
     Failures bubble up to FastAPI error handlers - let upstream retry logic
     handle transient errors instead of hiding them in generator loops.
     
-    Note: Retry configuration settings (database_max_retries, etc.) are
-    reserved for future middleware/decorator-based retry logic.
+    Request sessions may write, so they are never retried; read-only work
+    outside a request can use `run_read_only`.
     """
     async with SessionLocal() as session:
         yield session
 
 
-__all__ = ["SessionLocal", "engine", "get_session"]
+__all__ = [
+    "POOL_MODES",
+    "SessionLocal",
+    "engine",
+    "engine_options",
+    "get_session",
+    "is_transient_db_error",
+    "run_read_only",
+]
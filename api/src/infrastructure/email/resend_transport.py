@@ -0,0 +1,204 @@
+"""
+Async Resend transport on a shared, pooled HTTP client.
+
+Replaces `resend.Emails.send` run through `asyncio.to_thread`: requests go
+through one `httpx.AsyncClient` per process (keep-alive connections, no
+worker thread per send). `send_batch` uses Resend's batch endpoint (up to 100
+emails per request) for digests and outbox retries.
+
+Metrics:
+- `resend_request_duration_seconds{endpoint,status}`
+- `resend_rate_limited_total{endpoint}` (HTTP 429 responses)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+
+from api.src.core.settings import get_settings
+
+try:
+    from prometheus_client import Counter, Histogram
+
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+logger = logging.getLogger("ava.email.resend")
+
+BATCH_LIMIT = 100  # Resend accepts at most 100 emails per batch request
+
+if METRICS_AVAILABLE:
+    resend_request_duration_metric = Histogram(
+        "resend_request_duration_seconds",
+        "Resend API request latency",
+        ["endpoint", "status"],
+        buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    )
+    resend_rate_limited_metric = Counter(
+        "resend_rate_limited_total",
+        "Resend API requests rejected with HTTP 429",
+        ["endpoint"],
+    )
+else:
+    resend_request_duration_metric = None
+    resend_rate_limited_metric = None
+
+
+class ResendError(RuntimeError):
+    """Raised when the Resend API rejects a request."""
+
+    def __init__(self, message: str, *, status_code: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ResendRateLimited(ResendError):
+    """HTTP 429 from Resend; `retry_after` is in seconds when the API says."""
+
+    def __init__(self, message: str, *, retry_after: Optional[float] = None) -> None:
+        super().__init__(message, status_code=429)
+        self.retry_after = retry_after
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    for header in ("retry-after", "ratelimit-reset"):
+        value = response.headers.get(header)
+        if value:
+            try:
+                return float(value)
+            except ValueError:
+                continue
+    return None
+
+
+def batch_idempotency_key(keys: Sequence[str]) -> str:
+    """Deterministic Idempotency-Key for a batch: the same emails give the same key."""
+    digest = hashlib.sha256("\n".join(keys).encode()).hexdigest()
+    return f"batch/{digest}"
+
+
+class ResendTransport:
+    """Minimal async client for Resend's email endpoints."""
+
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        base_url: str = "https://api.resend.com",
+        timeout: float = 10.0,
+        max_connections: int = 20,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            headers={"Authorization": f"Bearer {api_key}"},
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            transport=transport,
+        )
+
+    async def send(self, email: Dict[str, Any], *, idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        """Send one email. Returns Resend's response (`{"id": ...}`)."""
+        return await self._post("/emails", email, endpoint="send", idempotency_key=idempotency_key)
+
+    async def send_batch(
+        self,
+        emails: Sequence[Dict[str, Any]],
+        *,
+        idempotency_keys: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Send emails through the batch endpoint, in chunks of `BATCH_LIMIT`.
+
+        With `idempotency_keys` (one per email), each chunk carries a key
+        derived from its emails' keys, so a retried chunk is not sent twice.
+        Returns one `{"id": ...}` per email, in order.
+        """
+        results: List[Dict[str, Any]] = []
+        for start in range(0, len(emails), BATCH_LIMIT):
+            chunk = list(emails[start : start + BATCH_LIMIT])
+            key = None
+            if idempotency_keys:
+                key = batch_idempotency_key(idempotency_keys[start : start + BATCH_LIMIT])
+            body = await self._post("/emails/batch", chunk, endpoint="batch", idempotency_key=key)
+            data = body.get("data", []) if isinstance(body, dict) else body
+            if len(data) != len(chunk):
+                raise ResendError(f"Resend batch returned {len(data)} results for {len(chunk)} emails")
+            results.extend(data)
+        return results
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def _post(
+        self,
+        path: str,
+        payload: Any,
+        *,
+        endpoint: str,
+        idempotency_key: Optional[str] = None,
+    ) -> Any:
+        headers = {"Idempotency-Key": idempotency_key} if idempotency_key else None
+        started_at = time.perf_counter()
+        status = "error"
+        try:
+            response = await self._client.post(path, json=payload, headers=headers)
+            status = str(response.status_code)
+        finally:
+            if METRICS_AVAILABLE and resend_request_duration_metric is not None:
+                resend_request_duration_metric.labels(endpoint=endpoint, status=status).observe(
+                    time.perf_counter() - started_at
+                )
+
+        if response.status_code == 429:
+            if METRICS_AVAILABLE and resend_rate_limited_metric is not None:
+                resend_rate_limited_metric.labels(endpoint=endpoint).inc()
+            retry_after = _retry_after(response)
+            logger.warning("Resend rate limit hit on %s (retry after %ss)", endpoint, retry_after)
+            raise ResendRateLimited("Resend rate limit exceeded", retry_after=retry_after)
+        if response.is_error:
+            try:
+                message = response.json().get("message") or response.text
+            except ValueError:
+                message = response.text
+            raise ResendError(f"Resend {endpoint} failed ({response.status_code}): {message}", status_code=response.status_code)
+        return response.json()
+
+
+@lru_cache
+def get_resend_transport() -> Optional[ResendTransport]:
+    """Process-wide transport, or None when no Resend API key is configured."""
+    settings = get_settings()
+    if not settings.resend_api_key:
+        return None
+    return ResendTransport(
+        settings.resend_api_key,
+        base_url=settings.resend_api_base_url,
+        timeout=settings.resend_timeout_seconds,
+        max_connections=settings.resend_max_connections,
+    )
+
+
+async def close_resend_transport() -> None:
+    if get_resend_transport.cache_info().currsize:
+        transport = get_resend_transport()
+        if transport is not None:
+            await transport.aclose()
+        get_resend_transport.cache_clear()
+
+
+__all__ = [
+    "BATCH_LIMIT",
+    "ResendError",
+    "ResendRateLimited",
+    "ResendTransport",
+    "batch_idempotency_key",
+    "close_resend_transport",
+    "get_resend_transport",
+]
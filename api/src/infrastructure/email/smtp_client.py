@@ -1,4 +1,9 @@
-"""Lightweight SMTP email client leveraging the Python stdlib."""
+"""Lightweight SMTP email client leveraging the Python stdlib.
+
+With a `SMTPConnectionPool`, messages go over pooled, already-authenticated
+asyncio sessions. Without one, each message opens its own blocking
+`smtplib` connection in a worker thread.
+"""
 
 from __future__ import annotations
 
@@ -7,10 +12,14 @@ import logging
 import smtplib
 import time
 from dataclasses import dataclass
+from email import policy
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from email.utils import make_msgid, parseaddr
 from typing import Iterable, Optional
 
+from api.src.infrastructure.email.smtp_pool import SMTPConnectionPool
+
 logger = logging.getLogger("ava.smtp")
 
 
@@ -27,8 +36,24 @@ class SMTPConfig:
         return all([self.server, self.port, self.username, self.password])
 
 
+def build_message(config: SMTPConfig, recipients: list[str], subject: str, html: str) -> MIMEMultipart:
+    sender = config.sender or config.username
+
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = subject
+    msg["From"] = sender
+    msg["To"] = ", ".join(recipients)
+    msg["Message-ID"] = make_msgid(domain=parseaddr(sender)[1].rpartition("@")[2] or None)
+
+    msg.attach(MIMEText(html, "html"))
+    return msg
+
+
 class SMTPClient:
-    """Blocking SMTP client executed inside a thread pool."""
+    """SMTP client using pooled asyncio sessions, or blocking sends in a thread pool."""
+
+    def __init__(self, pool: Optional[SMTPConnectionPool] = None):
+        self._pool = pool
 
     async def send_email(
         self,
@@ -40,30 +65,63 @@ class SMTPClient:
         if not config.is_complete():
             raise ValueError("Incomplete SMTP configuration.")
 
-        message_id = await asyncio.to_thread(
-            self._send_email_sync,
-            config,
-            list(recipients),
-            subject,
-            html,
-        )
-        return message_id
+        if self._pool is None:
+            return await asyncio.to_thread(
+                self._send_email_sync,
+                config,
+                list(recipients),
+                subject,
+                html,
+            )
+        return await self._send_email_pooled(config, list(recipients), subject, html)
 
-    def _send_email_sync(
+    async def _send_email_pooled(
         self,
         config: SMTPConfig,
         recipients: list[str],
         subject: str,
         html: str,
     ) -> str:
-        sender = config.sender or config.username
+        msg = build_message(config, recipients, subject, html)
+        sender = msg["From"]
+
+        try:
+            started_at = time.perf_counter()
+            await self._pool.send(
+                config,
+                parseaddr(sender)[1] or sender,
+                [parseaddr(recipient)[1] or recipient for recipient in recipients],
+                msg.as_bytes(policy=policy.SMTP),
+            )
+            duration_ms = (time.perf_counter() - started_at) * 1000
+            logger.info(
+                "SMTP email dispatched",
+                extra={
+                    "recipients": recipients,
+                    "sender": sender,
+                    "server": config.server,
+                    "duration_ms": round(duration_ms, 2),
+                    "pooled": True,
+                },
+            )
+        except smtplib.SMTPAuthenticationError as exc:
+            logger.error("SMTP authentication failed.", exc_info=exc)
+            raise
+        except smtplib.SMTPException as exc:
+            logger.error("SMTP send failed.", exc_info=exc)
+            raise
 
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = subject
-        msg["From"] = sender
-        msg["To"] = ", ".join(recipients)
+        return msg["Message-ID"]
 
-        msg.attach(MIMEText(html, "html"))
+    def _send_email_sync(
+        self,
+        config: SMTPConfig,
+        recipients: list[str],
+        subject: str,
+        html: str,
+    ) -> str:
+        msg = build_message(config, recipients, subject, html)
+        sender = msg["From"]
 
         try:
             started_at = time.perf_counter()
@@ -94,4 +152,4 @@ class SMTPClient:
         return msg.get("Message-ID", "")
 
 
-__all__ = ["SMTPClient", "SMTPConfig"]
+__all__ = ["SMTPClient", "SMTPConfig", "build_message"]
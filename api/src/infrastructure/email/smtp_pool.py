@@ -0,0 +1,318 @@
+"""
+Pooled asyncio SMTP sessions.
+
+Opening an SMTP session costs a TCP connect, EHLO, STARTTLS (a full TLS
+handshake), a second EHLO and AUTH: several round trips before the first byte
+of a message. `SMTPConnectionPool` keeps authenticated sessions per
+`SMTPConfig` and reuses them across sends on the event loop:
+
+- sessions idle for longer than `idle_timeout` are closed instead of reused;
+- sessions idle for longer than `health_check_after` are probed with NOOP;
+- a send on a reused session that the server has dropped is retried once on
+  a fresh session.
+
+Errors are raised as the stdlib `smtplib` exception types, so callers handle
+pooled and one-shot sends the same way. A connection lost after the message
+was written raises `SMTPDeliveryUncertain`: the server may already have
+queued it, so callers must not send it again through another route.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import logging
+import re
+import smtplib
+import socket
+import ssl
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from api.src.core.settings import get_settings
+
+if TYPE_CHECKING:
+    from api.src.infrastructure.email.smtp_client import SMTPConfig
+
+logger = logging.getLogger("ava.smtp.pool")
+
+_LEADING_DOT = re.compile(rb"^\.", re.MULTILINE)
+_TRANSPORT_ERRORS = (smtplib.SMTPServerDisconnected, OSError, asyncio.TimeoutError)
+
+
+class SMTPDeliveryUncertain(smtplib.SMTPServerDisconnected):
+    """The connection failed after the message was written; it may have been delivered."""
+
+
+@lru_cache
+def _local_hostname() -> str:
+    return socket.getfqdn()
+
+
+def _b64(value: str) -> str:
+    return base64.b64encode(value.encode()).decode()
+
+
+class SMTPSession:
+    """One authenticated SMTP connection driven with asyncio streams."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, *, timeout: float) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._timeout = timeout
+        self.extensions: Dict[str, str] = {}
+        self.last_used = time.monotonic()
+        self.data_sent = False  # Whether the last `send` got as far as writing the message
+
+    @classmethod
+    async def connect(cls, config: "SMTPConfig", *, timeout: float) -> "SMTPSession":
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(config.server, config.port), timeout)
+        session = cls(reader, writer, timeout=timeout)
+        try:
+            code, message = await session._read_reply()
+            if code != 220:
+                raise smtplib.SMTPConnectError(code, message)
+            await session._ehlo()
+            if config.use_starttls:
+                if "starttls" not in session.extensions:
+                    raise smtplib.SMTPNotSupportedError("STARTTLS extension not supported by server.")
+                await session._expect("STARTTLS", 220)
+                await writer.start_tls(ssl.create_default_context(), server_hostname=config.server)
+                await session._ehlo()
+            await session._login(config.username, config.password)
+        except BaseException:
+            session.abort()
+            raise
+        return session
+
+    async def send(self, sender: str, recipients: Sequence[str], message: bytes) -> Dict[str, Tuple[int, str]]:
+        """Send one message. Returns refused recipients, like `smtplib.SMTP.sendmail`."""
+
+        self.data_sent = False
+        await self._expect(f"MAIL FROM:<{sender}>", 250)
+        refused: Dict[str, Tuple[int, str]] = {}
+        for recipient in recipients:
+            code, reply = await self._command(f"RCPT TO:<{recipient}>")
+            if code not in (250, 251):
+                refused[recipient] = (code, reply)
+        if len(refused) == len(recipients):
+            await self.reset()
+            raise smtplib.SMTPRecipientsRefused(refused)
+
+        await self._expect("DATA", 354)
+        body = _LEADING_DOT.sub(b"..", message)
+        if not body.endswith(b"\r\n"):
+            body += b"\r\n"
+        self.data_sent = True
+        self._writer.write(body + b".\r\n")
+        await self._writer.drain()
+        code, reply = await self._read_reply()
+        if code != 250:
+            raise smtplib.SMTPDataError(code, reply)
+        self.last_used = time.monotonic()
+        return refused
+
+    async def noop(self) -> bool:
+        try:
+            code, _ = await self._command("NOOP")
+        except (smtplib.SMTPException, OSError, asyncio.TimeoutError):
+            return False
+        return code == 250
+
+    async def reset(self) -> bool:
+        try:
+            code, _ = await self._command("RSET")
+        except (smtplib.SMTPException, OSError, asyncio.TimeoutError):
+            return False
+        return code == 250
+
+    async def close(self) -> None:
+        """Politely QUIT, then close the socket."""
+        try:
+            await asyncio.wait_for(self._command("QUIT"), 1.0)
+        except (smtplib.SMTPException, OSError, asyncio.TimeoutError):
+            pass
+        self.abort()
+
+    def abort(self) -> None:
+        self._writer.close()
+
+    async def _ehlo(self) -> None:
+        code, reply = await self._command(f"EHLO {_local_hostname()}")
+        if code != 250:
+            raise smtplib.SMTPHeloError(code, reply)
+        self.extensions = {}
+        for line in reply.splitlines()[1:]:
+            keyword, _, params = line.partition(" ")
+            self.extensions[keyword.lower()] = params
+
+    async def _login(self, username: str, password: str) -> None:
+        mechanisms = self.extensions.get("auth", "").upper().split()
+        if "PLAIN" in mechanisms:
+            code, reply = await self._command(f"AUTH PLAIN {_b64(chr(0) + username + chr(0) + password)}")
+        elif "LOGIN" in mechanisms:
+            code, reply = await self._command("AUTH LOGIN")
+            if code == 334:
+                code, reply = await self._command(_b64(username))
+            if code == 334:
+                code, reply = await self._command(_b64(password))
+        else:
+            raise smtplib.SMTPNotSupportedError("No suitable authentication method found.")
+        if code not in (235, 503):
+            raise smtplib.SMTPAuthenticationError(code, reply)
+
+    async def _command(self, line: str) -> Tuple[int, str]:
+        self._writer.write(line.encode() + b"\r\n")
+        await self._writer.drain()
+        return await self._read_reply()
+
+    async def _expect(self, line: str, code: int) -> str:
+        received, reply = await self._command(line)
+        if received != code:
+            raise smtplib.SMTPResponseException(received, reply)
+        return reply
+
+    async def _read_reply(self) -> Tuple[int, str]:
+        lines: List[str] = []
+        while True:
+            raw = await asyncio.wait_for(self._reader.readline(), self._timeout)
+            if not raw:
+                raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+            text = raw.decode("utf-8", "replace").rstrip("\r\n")
+            try:
+                code = int(text[:3])
+            except ValueError:
+                raise smtplib.SMTPResponseException(-1, text) from None
+            lines.append(text[4:])
+            if text[3:4] != "-":
+                return code, "\n".join(lines)
+
+
+def _uncertain(exc: BaseException) -> SMTPDeliveryUncertain:
+    return SMTPDeliveryUncertain(f"Connection lost after the message was sent: {str(exc) or type(exc).__name__}")
+
+
+class SMTPConnectionPool:
+    """Authenticated SMTP sessions reused per `SMTPConfig`."""
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = 4,
+        idle_timeout: float = 60.0,
+        health_check_after: float = 15.0,
+        timeout: float = 10.0,
+    ) -> None:
+        self._max_connections = max_connections
+        self._idle_timeout = idle_timeout
+        self._health_check_after = health_check_after
+        self._timeout = timeout
+        self._idle: Dict["SMTPConfig", List[SMTPSession]] = {}
+        self._limits: Dict["SMTPConfig", asyncio.Semaphore] = {}
+        self._last_sweep = time.monotonic()
+
+    def idle_count(self, config: Optional["SMTPConfig"] = None) -> int:
+        if config is not None:
+            return len(self._idle.get(config, ()))
+        return sum(len(sessions) for sessions in self._idle.values())
+
+    async def send(
+        self,
+        config: "SMTPConfig",
+        sender: str,
+        recipients: Sequence[str],
+        message: bytes,
+    ) -> Dict[str, Tuple[int, str]]:
+        limit = self._limits.setdefault(config, asyncio.Semaphore(self._max_connections))
+        async with limit:
+            session, reused = await self._acquire(config)
+            try:
+                refused = await session.send(sender, recipients, message)
+            except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+                # The server answered with a rejection: the session itself is
+                # still usable and resending would only be rejected again.
+                if await session.reset():
+                    self._release(config, session)
+                else:
+                    session.abort()
+                raise
+            except _TRANSPORT_ERRORS as exc:
+                session.abort()
+                if session.data_sent:
+                    # Once the message is written the server may have queued
+                    # it; resending could deliver it twice.
+                    raise _uncertain(exc) from exc
+                if not reused:
+                    raise
+                # The server dropped an idle session; retry once on a fresh one.
+                logger.info("Pooled SMTP session to %s was closed, reconnecting", config.server)
+                session = await SMTPSession.connect(config, timeout=self._timeout)
+                try:
+                    refused = await session.send(sender, recipients, message)
+                except _TRANSPORT_ERRORS as retry_exc:
+                    session.abort()
+                    if session.data_sent:
+                        raise _uncertain(retry_exc) from retry_exc
+                    raise
+                except BaseException:
+                    session.abort()
+                    raise
+            except BaseException:
+                session.abort()
+                raise
+            self._release(config, session)
+            return refused
+
+    async def close(self) -> None:
+        sessions = [session for idle in self._idle.values() for session in idle]
+        self._idle.clear()
+        await asyncio.gather(*(session.close() for session in sessions), return_exceptions=True)
+
+    async def _acquire(self, config: "SMTPConfig") -> Tuple[SMTPSession, bool]:
+        now = time.monotonic()
+        if now - self._last_sweep > self._idle_timeout:
+            self._sweep(now)
+
+        idle = self._idle.get(config)
+        while idle:
+            session = idle.pop()
+            idle_for = now - session.last_used
+            if idle_for > self._idle_timeout:
+                session.abort()
+                continue
+            if idle_for > self._health_check_after and not await session.noop():
+                session.abort()
+                continue
+            return session, True
+        return await SMTPSession.connect(config, timeout=self._timeout), False
+
+    def _release(self, config: "SMTPConfig", session: SMTPSession) -> None:
+        session.last_used = time.monotonic()
+        self._idle.setdefault(config, []).append(session)
+
+    def _sweep(self, now: float) -> None:
+        """Close sessions that have been idle too long, for every config."""
+        self._last_sweep = now
+        for config, idle in list(self._idle.items()):
+            fresh = [s for s in idle if now - s.last_used <= self._idle_timeout]
+            for session in idle:
+                if session not in fresh:
+                    session.abort()
+            if fresh:
+                self._idle[config] = fresh
+            else:
+                del self._idle[config]
+
+
+@lru_cache
+def get_smtp_pool() -> SMTPConnectionPool:
+    settings = get_settings()
+    return SMTPConnectionPool(
+        max_connections=settings.smtp_pool_max_connections,
+        idle_timeout=settings.smtp_pool_idle_timeout_seconds,
+        health_check_after=settings.smtp_pool_health_check_after_seconds,
+    )
+
+
+__all__ = ["SMTPConnectionPool", "SMTPDeliveryUncertain", "SMTPSession", "get_smtp_pool"]
@@ -0,0 +1,187 @@
+"""
+Precompiled HTML email templates.
+
+Templates live in `templates/` next to this module and use a small syntax:
+
+    {{ caller.name }}            value, HTML-escaped
+    {{ transcript|nl2br }}       escaped, newlines turned into <br>
+    {{ footer_html|raw }}        inserted as-is (trusted markup only)
+    {% for turn in turns %}...{% endfor %}
+    {% if turn.is_assistant %}...{% else %}...{% endif %}   (`if not x` too)
+
+Each template is translated once into a Python function and compiled with
+`compile()`. Rendering appends fragments to a list and joins them once at the
+end, so the cost is linear in the output size, including for long
+transcripts. Missing values render as empty strings.
+"""
+
+from __future__ import annotations
+
+import html
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+
+_TOKEN_RE = re.compile(r"\{\{\s*(.+?)\s*\}\}|\{%\s*(.+?)\s*%\}", re.DOTALL)
+_PATH_RE = re.compile(r"^[A-Za-z_]\w*(\.[A-Za-z_]\w*)*$")
+_FOR_RE = re.compile(r"^for\s+([A-Za-z_]\w*)\s+in\s+(\S+)$")
+_IF_RE = re.compile(r"^if\s+(not\s+)?(\S+)$")
+
+
+class TemplateError(ValueError):
+    """Raised when a template cannot be parsed."""
+
+
+def _escape(value: Any) -> str:
+    return html.escape(str(value))
+
+
+def _nl2br(value: Any) -> str:
+    return _escape(value).replace("\r\n", "\n").replace("\n", "<br>")
+
+
+def _attr(value: Any, name: str) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, Mapping):
+        return value.get(name)
+    return getattr(value, name, None)
+
+
+_FILTERS: Mapping[str, Callable[[Any], str]] = {
+    "escape": _escape,
+    "nl2br": _nl2br,
+    "raw": str,
+}
+
+
+class _CodeBuilder:
+    """Translates template tokens into the source of a `render` function."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.lines: List[str] = ["def render(context, append):"]
+        self.constants: List[str] = []
+        self.depth = 1
+        self.loop_vars: List[str] = []
+        self.blocks: List[str] = []
+        self.block_sizes: List[int] = []
+
+    def emit(self, line: str) -> None:
+        self.lines.append("    " * self.depth + line)
+
+    def text(self, value: str) -> None:
+        self.constants.append(value)
+        self.emit(f"append(_c[{len(self.constants) - 1}])")
+
+    def value(self, path: str) -> str:
+        if not _PATH_RE.match(path):
+            raise TemplateError(f"{self.name}: invalid expression {path!r}")
+        head, *rest = path.split(".")
+        code = f"l_{head}" if head in self.loop_vars else f"context.get({head!r})"
+        for attribute in rest:
+            # Plain dicts are the common case; skip the generic lookup for them
+            code = f"(o.get({attribute!r}) if (o := {code}).__class__ is dict else _attr(o, {attribute!r}))"
+        return code
+
+    def expression(self, expression: str) -> None:
+        path, _, filter_name = (part.strip() for part in expression.partition("|"))
+        filter_name = filter_name or "escape"
+        if filter_name not in _FILTERS:
+            raise TemplateError(f"{self.name}: unknown filter {filter_name!r}")
+        self.emit(f"v = {self.value(path)}")
+        self.emit("if v is not None:")
+        self.emit(f"    append(_{filter_name}(v))")
+
+    def open_block(self, kind: str, header: str) -> None:
+        self.emit(header)
+        self.blocks.append(kind)
+        self.depth += 1
+        self.block_sizes.append(len(self.lines))
+
+    def close_block(self, kind: str) -> None:
+        if not self.blocks or self.blocks[-1] != kind:
+            raise TemplateError(f"{self.name}: unexpected end{kind}")
+        if len(self.lines) == self.block_sizes.pop():
+            self.emit("pass")
+        self.blocks.pop()
+        self.depth -= 1
+
+    def tag(self, tag: str) -> None:
+        if match := _FOR_RE.match(tag):
+            variable, source = match.groups()
+            self.open_block("for", f"for l_{variable} in {self.value(source)} or ():")
+            self.loop_vars.append(variable)
+        elif tag == "endfor":
+            self.close_block("for")
+            self.loop_vars.pop()
+        elif match := _IF_RE.match(tag):
+            negate = "not " if match.group(1) else ""
+            self.open_block("if", f"if {negate}{self.value(match.group(2))}:")
+        elif tag == "else":
+            self.close_block("if")
+            self.open_block("if", "else:")
+        elif tag == "endif":
+            self.close_block("if")
+        else:
+            raise TemplateError(f"{self.name}: unexpected {{% {tag} %}}")
+
+    def build(self) -> Callable[[Dict[str, Any], Callable[[str], None]], None]:
+        if self.blocks:
+            raise TemplateError(f"{self.name}: unclosed {{% {self.blocks[-1]} %}}")
+        if len(self.lines) == 1:
+            self.emit("pass")
+        namespace: Dict[str, Any] = {"_c": tuple(self.constants), "_attr": _attr}
+        namespace.update((f"_{name}", convert) for name, convert in _FILTERS.items())
+        exec(compile("\n".join(self.lines), f"<template {self.name}>", "exec"), namespace)
+        return namespace["render"]
+
+
+class Template:
+    """A template compiled once into a Python render function."""
+
+    def __init__(self, source: str, name: str = "<string>") -> None:
+        self.name = name
+        builder = _CodeBuilder(name)
+        position = 0
+        for match in _TOKEN_RE.finditer(source):
+            if match.start() > position:
+                builder.text(source[position : match.start()])
+            if match.group(1) is not None:
+                builder.expression(match.group(1))
+            else:
+                builder.tag(match.group(2))
+            position = match.end()
+        if position < len(source):
+            builder.text(source[position:])
+        self._render = builder.build()
+
+    def render(self, **context: Any) -> str:
+        parts: List[str] = []
+        self._render(context, parts.append)
+        return "".join(parts)
+
+
+@lru_cache(maxsize=None)
+def get_template(name: str) -> Template:
+    """Load and compile a template from `templates/` (cached for the process)."""
+    path = TEMPLATE_DIR / name
+    return Template(path.read_text(encoding="utf-8"), name=name)
+
+
+def render_template(name: str, **context: Any) -> str:
+    return get_template(name).render(**context)
+
+
+def precompile_templates(names: Optional[Iterable[str]] = None) -> int:
+    """Compile templates ahead of the first email (startup)."""
+    names = list(names) if names is not None else sorted(p.name for p in TEMPLATE_DIR.glob("*.html"))
+    for name in names:
+        get_template(name)
+    return len(names)
+
+
+__all__ = ["Template", "TemplateError", "get_template", "precompile_templates", "render_template"]
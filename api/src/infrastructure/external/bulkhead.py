@@ -0,0 +1,190 @@
+"""Bulkheads: bounded concurrency per external dependency."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Awaitable, TypeVar
+
+from fastapi import HTTPException, status
+
+from api.src.core.settings import get_settings
+
+try:
+    from prometheus_client import Counter, Gauge, Histogram
+
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+logger = logging.getLogger("ava.bulkhead")
+
+T = TypeVar("T")
+
+if METRICS_AVAILABLE:
+    bulkhead_queue_wait_metric = Histogram(
+        "bulkhead_queue_wait_seconds",
+        "Time calls waited for a bulkhead slot",
+        ["dependency"],
+        buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+    )
+    bulkhead_in_flight_metric = Gauge(
+        "bulkhead_in_flight",
+        "Calls currently holding a bulkhead slot",
+        ["dependency"],
+    )
+    bulkhead_queued_metric = Gauge(
+        "bulkhead_queued",
+        "Calls waiting for a bulkhead slot",
+        ["dependency"],
+    )
+    bulkhead_saturation_metric = Gauge(
+        "bulkhead_saturation",
+        "Share of bulkhead slots in use (1 = saturated)",
+        ["dependency"],
+    )
+    bulkhead_rejections_metric = Counter(
+        "bulkhead_rejections_total",
+        "Calls rejected by a bulkhead",
+        ["dependency", "reason"],
+    )
+else:
+    bulkhead_queue_wait_metric = None
+    bulkhead_in_flight_metric = None
+    bulkhead_queued_metric = None
+    bulkhead_saturation_metric = None
+    bulkhead_rejections_metric = None
+
+
+class BulkheadFullError(HTTPException):
+    """Raised when a dependency's bulkhead has no slot (503).
+
+    An HTTPException, so circuit breakers do not count it as a failure of
+    the dependency itself.
+    """
+
+    def __init__(self, name: str, reason: str) -> None:
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"{name} is busy. Please try again shortly.",
+        )
+        self.name = name
+        self.reason = reason
+
+
+@dataclass(frozen=True)
+class BulkheadConfig:
+    """Bulkhead limits."""
+
+    max_concurrent: int = 10  # Calls in flight
+    max_queue: int = 50  # Calls waiting for a slot; more are rejected at once
+    queue_timeout: float = 5.0  # Seconds a call may wait for a slot
+
+
+class Bulkhead:
+    """
+    Caps concurrent calls to one dependency.
+
+    Calls beyond `max_concurrent` wait in a bounded queue for at most
+    `queue_timeout` seconds, so a slow provider holds a fixed number of
+    connections and threads instead of all of them.
+    """
+
+    def __init__(self, name: str, config: BulkheadConfig | None = None) -> None:
+        self.name = name
+        self.config = config or BulkheadConfig()
+        self._semaphore = asyncio.Semaphore(self.config.max_concurrent)
+        self._in_flight = 0
+        self._queued = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the block."""
+        if self._in_flight >= self.config.max_concurrent and self._queued >= self.config.max_queue:
+            self._reject("queue_full")
+
+        started_at = time.perf_counter()
+        self._queued += 1
+        self._emit()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.config.queue_timeout)
+        except asyncio.TimeoutError:
+            self._reject("timeout")
+        finally:
+            self._queued -= 1
+
+        self._in_flight += 1
+        self._emit()
+        if METRICS_AVAILABLE and bulkhead_queue_wait_metric is not None:
+            bulkhead_queue_wait_metric.labels(dependency=self.name).observe(time.perf_counter() - started_at)
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+            self._emit()
+
+    async def call(self, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        async with self.acquire():
+            return await func(*args, **kwargs)
+
+    def _reject(self, reason: str) -> None:
+        logger.warning(
+            f"Bulkhead [{self.name}] rejected a call ({reason})",
+            extra={"bulkhead": self.name, "reason": reason, "in_flight": self._in_flight, "queued": self._queued},
+        )
+        self._emit()
+        if METRICS_AVAILABLE and bulkhead_rejections_metric is not None:
+            bulkhead_rejections_metric.labels(dependency=self.name, reason=reason).inc()
+        raise BulkheadFullError(self.name, reason)
+
+    def _emit(self) -> None:
+        if not METRICS_AVAILABLE or bulkhead_in_flight_metric is None:
+            return
+        bulkhead_in_flight_metric.labels(dependency=self.name).set(self._in_flight)
+        bulkhead_queued_metric.labels(dependency=self.name).set(self._queued)
+        bulkhead_saturation_metric.labels(dependency=self.name).set(self._in_flight / self.config.max_concurrent)
+
+
+# Global registry of bulkheads
+_bulkheads: dict[str, Bulkhead] = {}
+
+
+def _configured(name: str) -> BulkheadConfig:
+    settings = get_settings()
+    return BulkheadConfig(
+        max_concurrent=getattr(settings, f"bulkhead_{name}_max_concurrent", BulkheadConfig.max_concurrent),
+        max_queue=settings.bulkhead_max_queue,
+        queue_timeout=settings.bulkhead_queue_timeout_seconds,
+    )
+
+
+def get_bulkhead(name: str, config: BulkheadConfig | None = None) -> Bulkhead:
+    """
+    Get or create the bulkhead for a dependency.
+
+    Limits come from `Settings.bulkhead_<name>_max_concurrent` and the shared
+    queue settings unless `config` is given (only used on first creation).
+    """
+    if name not in _bulkheads:
+        _bulkheads[name] = Bulkhead(name, config or _configured(name))
+    return _bulkheads[name]
+
+
+__all__ = [
+    "Bulkhead",
+    "BulkheadConfig",
+    "BulkheadFullError",
+    "get_bulkhead",
+]
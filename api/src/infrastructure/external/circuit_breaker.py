@@ -2,15 +2,20 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import time
-from dataclasses import dataclass, field
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field, replace
 from enum import Enum
 from functools import wraps
-from typing import Any, Callable, TypeVar
+from typing import Any, Callable, Optional, TypeVar
 
 from fastapi import HTTPException, status
 
+from api.src.core.settings import get_settings
+from api.src.infrastructure.shared_state import get_shared_state
+
 try:
     from prometheus_client import Counter, Gauge
 
@@ -44,11 +49,25 @@ if METRICS_AVAILABLE:
         "Total times circuit breaker closed (recovered)",
         ["service"],
     )
+    circuit_breaker_slow_calls_metric = Counter(
+        "circuit_breaker_slow_calls_total",
+        "Calls slower than the configured slow-call duration",
+        ["service"],
+    )
+    circuit_breaker_open_keys_metric = Gauge(
+        "circuit_breaker_open_keys",
+        "Per-key breakers of a service that are not closed",
+        ["service"],
+    )
 else:
     circuit_breaker_state_metric = None
     circuit_breaker_failures_metric = None
     circuit_breaker_opens_metric = None
     circuit_breaker_closes_metric = None
+    circuit_breaker_slow_calls_metric = None
+    circuit_breaker_open_keys_metric = None
+
+_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
 
 
 class CircuitState(str, Enum):
@@ -66,6 +85,15 @@ class CircuitBreakerConfig:
     failure_threshold: int = 3  # Open circuit after N consecutive failures
     recovery_timeout: int = 30  # Seconds before attempting recovery (half-open)
     success_threshold: int = 2  # Close circuit after N successes in half-open state
+    window_size: int = 20  # Outcomes of the last N calls kept for rate checks
+    minimum_calls: int = 10  # Calls in the window before rates can open the circuit
+    failure_rate_threshold: float = 0.5  # Open when this share of windowed calls failed
+    slow_call_duration: Optional[float] = None  # Seconds; None disables slow-call tracking
+    slow_call_rate_threshold: float = 0.8  # Open when this share of windowed calls was slow
+    half_open_max_calls: int = 1  # Concurrent probe calls allowed while half-open
+    # Whether an exception is a failure of the service; others are ignored.
+    # HTTPException is never counted.
+    is_failure: Optional[Callable[[BaseException], bool]] = None
 
 
 @dataclass
@@ -75,14 +103,31 @@ class CircuitBreaker:
     
     Prevents cascading failures by opening circuit after threshold failures,
     then attempting recovery after timeout period.
+
+    Besides consecutive failures, the circuit opens when the failure rate or
+    slow-call rate over a sliding window of recent calls crosses its
+    threshold. While half-open only `half_open_max_calls` probes run at a
+    time; other calls are rejected until the probes settle.
+
+    With a shared state backend, open/close transitions are published to the
+    other workers and theirs are adopted, so an outage seen by one worker
+    opens the circuit everywhere.
     """
 
     name: str
     config: CircuitBreakerConfig = field(default_factory=CircuitBreakerConfig)
+    key: Optional[str] = None  # Set for per-key breakers (see get_circuit_breaker)
     _state: CircuitState = CircuitState.CLOSED
     _failure_count: int = 0
     _success_count: int = 0
     _last_failure_time: float = 0
+    _half_open_calls: int = 0
+    _changed_at: float = 0  # Last open/close transition, local or adopted
+    # (failed, slow) per recorded call, newest last
+    _window: deque = field(default_factory=deque, repr=False)
+
+    def __post_init__(self) -> None:
+        self._window = deque(self._window, maxlen=self.config.window_size)
 
     @property
     def state(self) -> CircuitState:
@@ -94,13 +139,14 @@ class CircuitBreaker:
         if not METRICS_AVAILABLE or circuit_breaker_state_metric is None:
             return
 
-        state_value = {
-            CircuitState.CLOSED: 0,
-            CircuitState.HALF_OPEN: 1,
-            CircuitState.OPEN: 2,
-        }[self._state]
+        if self.key is not None:
+            _emit_keyed_state(self.name)
+            return
+
+        circuit_breaker_state_metric.labels(service=self.name).set(_STATE_VALUES[self._state.value])
 
-        circuit_breaker_state_metric.labels(service=self.name).set(state_value)
+    def _label(self) -> str:
+        return self.name if self.key is None else f"{self.name}:{self.key}"
 
     def _should_attempt_reset(self) -> bool:
         """Check if enough time has passed to attempt recovery."""
@@ -125,21 +171,24 @@ class CircuitBreaker:
             HTTPException: If circuit is open (503)
             Exception: Original exception from func if circuit allows
         """
+        self._adopt_shared_state()
+
         # Check if we should transition to half-open
         if self._should_attempt_reset():
             logger.info(
-                f"Circuit breaker [{self.name}] transitioning to HALF_OPEN for recovery attempt",
+                f"Circuit breaker [{self._label()}] transitioning to HALF_OPEN for recovery attempt",
                 extra={"circuit": self.name, "state": "half_open"},
             )
             self._state = CircuitState.HALF_OPEN
             self._success_count = 0
+            self._half_open_calls = 0
             self._emit_state_metric()
 
         # Reject if circuit is open
         if self._state == CircuitState.OPEN:
-            wait_time = int(self.config.recovery_timeout - (time.time() - self._last_failure_time))
+            wait_time = max(int(self.config.recovery_timeout - (time.time() - self._last_failure_time)), 0)
             logger.warning(
-                f"Circuit breaker [{self.name}] is OPEN - rejecting request",
+                f"Circuit breaker [{self._label()}] is OPEN - rejecting request",
                 extra={
                     "circuit": self.name,
                     "state": "open",
@@ -151,27 +200,51 @@ class CircuitBreaker:
                 detail=f"{self.name} is temporarily unavailable. Please try again in {wait_time}s.",
             )
 
+        # Only a few probes at a time while recovering
+        probe = self._state == CircuitState.HALF_OPEN
+        if probe:
+            if self._half_open_calls >= self.config.half_open_max_calls:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=f"{self.name} is temporarily unavailable. Please try again in 1s.",
+                )
+            self._half_open_calls += 1
+
         # Attempt the call
+        started_at = time.monotonic()
         try:
             result = await func(*args, **kwargs)
-            self._on_success()
-            return result
         except HTTPException:
             # Don't count HTTP exceptions as circuit breaker failures
             raise
         except Exception as exc:
-            self._on_failure(exc)
+            if self.config.is_failure is None or self.config.is_failure(exc):
+                self._on_failure(exc)
             raise
+        else:
+            self._on_success(time.monotonic() - started_at)
+            return result
+        finally:
+            if probe:
+                self._half_open_calls = max(self._half_open_calls - 1, 0)
 
-    def _on_success(self) -> None:
+    def _on_success(self, duration: float = 0.0) -> None:
         """Handle successful call - reset failure count or close circuit."""
         self._failure_count = 0
+        slow = self.config.slow_call_duration is not None and duration >= self.config.slow_call_duration
+        if slow and METRICS_AVAILABLE and circuit_breaker_slow_calls_metric:
+            circuit_breaker_slow_calls_metric.labels(service=self.name).inc()
+        self._window.append((False, slow))
+
+        if self._state == CircuitState.CLOSED and slow and self._slow_rate_exceeded():
+            self._open(reason="slow call rate threshold reached")
+            return
 
         if self._state == CircuitState.HALF_OPEN:
             self._success_count += 1
             if self._success_count >= self.config.success_threshold:
                 logger.info(
-                    f"Circuit breaker [{self.name}] closing - recovery successful",
+                    f"Circuit breaker [{self._label()}] closing - recovery successful",
                     extra={
                         "circuit": self.name,
                         "state": "closed",
@@ -180,6 +253,8 @@ class CircuitBreaker:
                 )
                 self._state = CircuitState.CLOSED
                 self._success_count = 0
+                self._window.clear()
+                self._publish()
                 self._emit_state_metric()
                 if METRICS_AVAILABLE and circuit_breaker_closes_metric:
                     circuit_breaker_closes_metric.labels(service=self.name).inc()
@@ -193,47 +268,182 @@ class CircuitBreaker:
         if METRICS_AVAILABLE and circuit_breaker_failures_metric:
             circuit_breaker_failures_metric.labels(service=self.name).inc()
 
-        if self._failure_count >= self.config.failure_threshold:
-            logger.error(
-                f"Circuit breaker [{self.name}] opening - threshold reached",
-                extra={
-                    "circuit": self.name,
-                    "state": "open",
-                    "failure_count": self._failure_count,
-                    "threshold": self.config.failure_threshold,
-                    "error": str(exc),
-                },
+        self._window.append((True, False))
+
+        if self._state == CircuitState.HALF_OPEN:
+            self._open(reason="recovery probe failed", error=exc)
+        elif self._failure_count >= self.config.failure_threshold:
+            self._open(reason="threshold reached", error=exc)
+        elif self._failure_rate_exceeded():
+            self._open(reason="failure rate threshold reached", error=exc)
+
+    def _publish(self) -> None:
+        """Share an open/close transition with the other workers."""
+        self._changed_at = time.time()
+        shared_state = get_shared_state()
+        if shared_state is not None:
+            shared_state.record_breaker(self._label(), self._state.value, self._changed_at)
+
+    def _adopt_shared_state(self) -> None:
+        """Follow a newer transition made by another worker."""
+        shared_state = get_shared_state()
+        if shared_state is None:
+            return
+        record = shared_state.breaker(self._label())
+        if record is None or record.changed_at <= self._changed_at:
+            return
+
+        self._changed_at = record.changed_at
+        if record.state == CircuitState.OPEN.value:
+            if self._state == CircuitState.OPEN:
+                return
+            logger.warning(
+                f"Circuit breaker [{self._label()}] opened by another worker",
+                extra={"circuit": self.name, "state": "open"},
             )
             self._state = CircuitState.OPEN
-            self._emit_state_metric()
-            if METRICS_AVAILABLE and circuit_breaker_opens_metric:
-                circuit_breaker_opens_metric.labels(service=self.name).inc()
+            self._last_failure_time = record.changed_at
+        elif self._state != CircuitState.CLOSED:
+            logger.info(
+                f"Circuit breaker [{self._label()}] closed by another worker",
+                extra={"circuit": self.name, "state": "closed"},
+            )
+            self._state = CircuitState.CLOSED
+            self._failure_count = 0
+            self._success_count = 0
+            self._window.clear()
+        else:
+            return
+        self._emit_state_metric()
+
+    def _failure_rate_exceeded(self) -> bool:
+        if len(self._window) < self.config.minimum_calls:
+            return False
+        failures = sum(1 for failed, _ in self._window if failed)
+        return failures / len(self._window) >= self.config.failure_rate_threshold
+
+    def _slow_rate_exceeded(self) -> bool:
+        if len(self._window) < self.config.minimum_calls:
+            return False
+        slow = sum(1 for _, was_slow in self._window if was_slow)
+        return slow / len(self._window) >= self.config.slow_call_rate_threshold
+
+    def _open(self, *, reason: str, error: BaseException | None = None) -> None:
+        logger.error(
+            f"Circuit breaker [{self._label()}] opening - {reason}",
+            extra={
+                "circuit": self.name,
+                "state": "open",
+                "failure_count": self._failure_count,
+                "threshold": self.config.failure_threshold,
+                "window_calls": len(self._window),
+                "error": str(error) if error is not None else None,
+            },
+        )
+        self._state = CircuitState.OPEN
+        self._last_failure_time = time.time()
+        self._publish()
+        self._emit_state_metric()
+        if METRICS_AVAILABLE and circuit_breaker_opens_metric:
+            circuit_breaker_opens_metric.labels(service=self.name).inc()
 
 
 # Global registry of circuit breakers
 _breakers: dict[str, CircuitBreaker] = {}
+# Per-key breakers, least recently used first
+_keyed_breakers: OrderedDict[tuple[str, str], CircuitBreaker] = OrderedDict()
+
+
+def default_breaker_config(**overrides: Any) -> CircuitBreakerConfig:
+    """Breaker configuration from `Settings`, with optional field overrides."""
+    settings = get_settings()
+    config = CircuitBreakerConfig(
+        failure_threshold=settings.circuit_breaker_threshold,
+        recovery_timeout=settings.circuit_breaker_recovery_timeout,
+        window_size=settings.circuit_breaker_window_size,
+        minimum_calls=settings.circuit_breaker_minimum_calls,
+        failure_rate_threshold=settings.circuit_breaker_failure_rate_threshold,
+        slow_call_duration=settings.circuit_breaker_slow_call_seconds,
+        slow_call_rate_threshold=settings.circuit_breaker_slow_call_rate_threshold,
+        half_open_max_calls=settings.circuit_breaker_half_open_max_calls,
+    )
+    return replace(config, **overrides)
+
+
+def breaker_key(secret: str) -> str:
+    """Stable, non-reversible registry key for a credential such as an API token."""
+    return hashlib.sha256(secret.encode("utf-8")).hexdigest()[:16]
+
+
+def _emit_keyed_state(name: str) -> None:
+    """Report the worst state among a service's per-key breakers."""
+    states = [breaker._state for (service, _), breaker in _keyed_breakers.items() if service == name]
+    worst = max((_STATE_VALUES[state.value] for state in states), default=0)
+    circuit_breaker_state_metric.labels(service=name).set(worst)
+    circuit_breaker_open_keys_metric.labels(service=name).set(
+        sum(1 for state in states if state != CircuitState.CLOSED)
+    )
+
 
+def _evict_idle_breakers() -> None:
+    """Drop least recently used per-key breakers beyond the configured limit.
 
-def get_circuit_breaker(name: str, config: CircuitBreakerConfig | None = None) -> CircuitBreaker:
+    Closed breakers go first; an open one is only dropped when every breaker
+    is tripped, to keep the registry bounded.
+    """
+    limit = get_settings().circuit_breaker_max_keyed_breakers
+    while len(_keyed_breakers) > limit:
+        victim = next(
+            (key for key, breaker in _keyed_breakers.items() if breaker._state == CircuitState.CLOSED),
+            next(iter(_keyed_breakers)),
+        )
+        del _keyed_breakers[victim]
+
+
+def get_circuit_breaker(
+    name: str,
+    config: CircuitBreakerConfig | None = None,
+    *,
+    key: str | None = None,
+) -> CircuitBreaker:
     """
     Get or create a circuit breaker by name.
     
     Args:
         name: Unique identifier for this circuit breaker
         config: Optional configuration (only used on first creation)
+        key: Optional sub-key (e.g. a tenant credential, see `breaker_key`)
+             giving each key its own breaker; idle per-key breakers are
+             evicted least recently used first
         
     Returns:
         CircuitBreaker instance
     """
+    if key is not None:
+        registry_key = (name, key)
+        breaker = _keyed_breakers.get(registry_key)
+        if breaker is None:
+            breaker = CircuitBreaker(name=name, config=config or default_breaker_config(), key=key)
+            _keyed_breakers[registry_key] = breaker
+            _evict_idle_breakers()
+        else:
+            _keyed_breakers.move_to_end(registry_key)
+        return breaker
+
     if name not in _breakers:
         _breakers[name] = CircuitBreaker(
             name=name,
-            config=config or CircuitBreakerConfig(),
+            config=config or default_breaker_config(),
         )
     return _breakers[name]
 
 
-def with_circuit_breaker(name: str, config: CircuitBreakerConfig | None = None):
+def with_circuit_breaker(
+    name: str,
+    config: CircuitBreakerConfig | None = None,
+    *,
+    key: Callable[..., str | None] | None = None,
+):
     """
     Decorator to wrap async functions with circuit breaker protection.
     
@@ -241,12 +451,15 @@ def with_circuit_breaker(name: str, config: CircuitBreakerConfig | None = None):
         @with_circuit_breaker("vapi")
         async def call_vapi_api():
             ...
+
+    `key` receives the call's arguments and returns the per-key breaker to
+    use (None: the shared breaker for `name`).
     """
 
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> T:
-            breaker = get_circuit_breaker(name, config)
+            breaker = get_circuit_breaker(name, config, key=key(*args, **kwargs) if key else None)
             return await breaker.call(func, *args, **kwargs)
 
         return wrapper
@@ -258,6 +471,8 @@ __all__ = [
     "CircuitBreaker",
     "CircuitBreakerConfig",
     "CircuitState",
+    "breaker_key",
+    "default_breaker_config",
     "get_circuit_breaker",
     "with_circuit_breaker",
 ]
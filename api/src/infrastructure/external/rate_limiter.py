@@ -0,0 +1,186 @@
+"""Client-side adaptive rate limiting for external APIs."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Mapping, Optional
+
+try:
+    from prometheus_client import Counter, Histogram
+
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+logger = logging.getLogger("ava.rate_limiter")
+
+# Per-key limiters kept in memory; least recently used ones are dropped
+MAX_TRACKED_KEYS = 1000
+
+if METRICS_AVAILABLE:
+    throttle_wait_metric = Histogram(
+        "client_throttle_wait_seconds",
+        "Time requests waited for a client-side rate limit token",
+        ["service"],
+        buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    )
+    throttle_rejections_metric = Counter(
+        "client_throttle_rejections_total",
+        "Requests that would have waited longer than the allowed queueing time",
+        ["service"],
+    )
+    rate_adjustments_metric = Counter(
+        "client_rate_limit_adjustments_total",
+        "Client-side rate changes",
+        ["service", "direction"],
+    )
+else:
+    throttle_wait_metric = None
+    throttle_rejections_metric = None
+    rate_adjustments_metric = None
+
+
+class ThrottleTimeout(Exception):
+    """The wait for a token would exceed `max_wait`."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f"Rate limited locally; next slot in {retry_after:.2f}s")
+        self.retry_after = retry_after
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket whose rate follows the server's rate-limit signals.
+
+    Requests reserve a token and sleep until it is due, so bursts are
+    queued (up to `max_wait` seconds) instead of failing. A 429 halves the
+    rate and pauses the bucket for the Retry-After; rate-limit headers
+    announcing an exhausted quota pause it until the reset. Successful
+    responses raise the rate again additively (AIMD) up to `max_rate`.
+    """
+
+    def __init__(
+        self,
+        service: str,
+        *,
+        rate: float,
+        burst: int,
+        min_rate: float,
+        max_rate: Optional[float] = None,
+        max_wait: float = 5.0,
+        increase_per_success: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self.service = service
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate or rate
+        self.max_wait = max_wait
+        self.increase_per_success = increase_per_success
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated_at = clock()  # May lie in the future while paused
+
+    async def acquire(self) -> float:
+        """Wait for a token. Returns the seconds waited."""
+        now = self._clock()
+        self._refill(now)
+        self._tokens -= 1
+        wait = max(self._updated_at - now, 0.0) + max(-self._tokens, 0.0) / self.rate
+        if wait > self.max_wait:
+            self._tokens += 1
+            if METRICS_AVAILABLE and throttle_rejections_metric is not None:
+                throttle_rejections_metric.labels(service=self.service).inc()
+            raise ThrottleTimeout(wait)
+
+        if METRICS_AVAILABLE and throttle_wait_metric is not None:
+            throttle_wait_metric.labels(service=self.service).observe(wait)
+        if wait > 0:
+            await self._sleep(wait)
+        return wait
+
+    def observe(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Adapt to a response."""
+        now = self._clock()
+        if status_code == 429:
+            # Requests in flight when the limit hit answer 429 together: count it once
+            if self._updated_at <= now:
+                self._set_rate(max(self.min_rate, self.rate / 2), "down")
+            self._pause(now, _seconds(headers.get("retry-after")) or 1.0 / self.rate)
+            return
+
+        remaining = _seconds(headers.get("x-ratelimit-remaining"), epoch=False)
+        reset = _seconds(headers.get("x-ratelimit-reset"))
+        if remaining is not None and remaining < 1 and reset:
+            self._pause(now, reset)
+        elif status_code < 400 and self.rate < self.max_rate:
+            self._set_rate(min(self.max_rate, self.rate + self.increase_per_success), "up")
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated_at:
+            self._tokens = min(float(self.burst), self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+    def _pause(self, now: float, seconds: float) -> None:
+        self._refill(now)
+        self._tokens = min(self._tokens, 0.0)
+        self._updated_at = max(self._updated_at, now + seconds)
+
+    def _set_rate(self, rate: float, direction: str) -> None:
+        if rate == self.rate:
+            return
+        if direction == "down":
+            logger.warning(
+                f"Rate limit [{self.service}] lowered to {rate:.2f} req/s",
+                extra={"service": self.service, "rate": rate},
+            )
+        self.rate = rate
+        if METRICS_AVAILABLE and rate_adjustments_metric is not None:
+            rate_adjustments_metric.labels(service=self.service, direction=direction).inc()
+
+
+def _seconds(value: Optional[str], *, epoch: bool = True) -> Optional[float]:
+    """Parse a header holding seconds (or, for large values, an epoch timestamp)."""
+    try:
+        seconds = float(value) if value is not None else None
+    except ValueError:
+        return None
+    if seconds is None:
+        return None
+    if epoch and seconds > 1_000_000_000:
+        seconds -= time.time()
+    return max(seconds, 0.0)
+
+
+# Global registry of per-key limiters, least recently used first
+_limiters: OrderedDict[tuple[str, str], AdaptiveRateLimiter] = OrderedDict()
+
+
+def get_rate_limiter(
+    service: str,
+    key: str,
+    factory: Callable[[], AdaptiveRateLimiter],
+) -> AdaptiveRateLimiter:
+    """Get or create (with `factory`) the limiter of one API key."""
+    registry_key = (service, key)
+    limiter = _limiters.get(registry_key)
+    if limiter is None:
+        limiter = _limiters[registry_key] = factory()
+        while len(_limiters) > MAX_TRACKED_KEYS:
+            _limiters.popitem(last=False)
+    else:
+        _limiters.move_to_end(registry_key)
+    return limiter
+
+
+__all__ = [
+    "AdaptiveRateLimiter",
+    "ThrottleTimeout",
+    "get_rate_limiter",
+]
@@ -10,6 +10,8 @@ from typing import Optional
 
 import httpx
 
+from api.src.infrastructure.external.bulkhead import get_bulkhead
+
 logger = logging.getLogger(__name__)
 
 
@@ -48,12 +50,13 @@ async def synthesize_preview(
         "Content-Type": "application/json",
     }
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        response = await client.post(
-            "https://api.openai.com/v1/audio/speech",
-            json=payload,
-            headers=headers,
-        )
+    async with get_bulkhead("tts").acquire():
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.post(
+                "https://api.openai.com/v1/audio/speech",
+                json=payload,
+                headers=headers,
+            )
 
     if response.status_code != 200:
         logger.error("Voice preview request failed: %s", response.text)
@@ -0,0 +1,178 @@
+"""
+Async client for the Twilio REST endpoints used by the platform.
+
+The Twilio SDK performs blocking HTTP calls, which froze the event loop for
+the length of every Twilio request. This wrapper talks to the REST API with
+one shared `httpx.AsyncClient` (a keep-alive pool for the whole process);
+credentials are sent per request, so every tenant account shares the pool.
+
+Errors are raised as the SDK's `TwilioRestException`, so callers keep their
+existing error handling. Each request reports whether it reused a pooled
+connection (`twilio_connection_pool_hits`) or had to open one
+(`twilio_connection_pool_misses`).
+"""
+
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+from twilio.base.exceptions import TwilioRestException
+
+from api.src.core.settings import get_settings
+from api.src.infrastructure.external.bulkhead import get_bulkhead
+
+try:
+    from prometheus_client import Gauge
+
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+logger = logging.getLogger("ava.twilio")
+
+API_VERSION = "2010-04-01"
+
+# Gauges rather than Counters: the dashboard queries the bare names, and
+# Counters are exported with a `_total` suffix.
+if METRICS_AVAILABLE:
+    twilio_pool_hits_metric = Gauge(
+        "twilio_connection_pool_hits",
+        "Twilio API requests served on a reused pooled connection",
+    )
+    twilio_pool_misses_metric = Gauge(
+        "twilio_connection_pool_misses",
+        "Twilio API requests that had to open a new connection",
+    )
+else:
+    twilio_pool_hits_metric = None
+    twilio_pool_misses_metric = None
+
+
+class _ConnectionTrace:
+    """httpcore trace hook noting whether a request opened a new connection."""
+
+    __slots__ = ("connected",)
+
+    def __init__(self) -> None:
+        self.connected = False
+
+    async def __call__(self, event: str, info: Dict[str, Any]) -> None:
+        if event == "connection.connect_tcp.started":
+            self.connected = True
+
+
+def _record_pool_usage(trace: _ConnectionTrace) -> None:
+    if not METRICS_AVAILABLE or twilio_pool_hits_metric is None:
+        return
+    if trace.connected:
+        twilio_pool_misses_metric.inc()
+    else:
+        twilio_pool_hits_metric.inc()
+
+
+@lru_cache
+def get_twilio_http_client() -> httpx.AsyncClient:
+    """Process-wide connection pool for api.twilio.com."""
+    settings = get_settings()
+    return httpx.AsyncClient(
+        base_url=settings.twilio_api_base_url,
+        timeout=settings.twilio_timeout_seconds,
+        limits=httpx.Limits(
+            max_connections=settings.twilio_max_connections,
+            max_keepalive_connections=settings.twilio_max_connections,
+        ),
+    )
+
+
+async def close_twilio_http_client() -> None:
+    if get_twilio_http_client.cache_info().currsize:
+        await get_twilio_http_client().aclose()
+        get_twilio_http_client.cache_clear()
+
+
+class AsyncTwilioClient:
+    """Twilio REST calls for one account over the shared connection pool."""
+
+    def __init__(self, account_sid: str, auth_token: str, *, http: Optional[httpx.AsyncClient] = None) -> None:
+        self.account_sid = account_sid
+        self._auth = (account_sid, auth_token)
+        self._http = http
+
+    async def list_incoming_phone_numbers(
+        self,
+        *,
+        phone_number: Optional[str] = None,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        params: Dict[str, Any] = {"PageSize": limit}
+        if phone_number:
+            params["PhoneNumber"] = phone_number
+        payload = await self._request("GET", "IncomingPhoneNumbers.json", params=params)
+        return list(payload.get("incoming_phone_numbers") or [])[:limit]
+
+    async def create_call(
+        self,
+        *,
+        to: str,
+        from_: str,
+        url: str,
+        method: str = "POST",
+        status_callback: Optional[str] = None,
+        status_callback_events: Sequence[str] = ("initiated", "ringing", "answered", "completed"),
+    ) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"To": to, "From": from_, "Url": url, "Method": method}
+        if status_callback:
+            data["StatusCallback"] = status_callback
+            data["StatusCallbackMethod"] = "POST"
+            data["StatusCallbackEvent"] = list(status_callback_events)
+        return await self._request("POST", "Calls.json", data=data)
+
+    async def create_message(self, *, to: str, from_: str, body: str) -> Dict[str, Any]:
+        return await self._request("POST", "Messages.json", data={"To": to, "From": from_, "Body": body})
+
+    async def _request(
+        self,
+        method: str,
+        resource: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        http = self._http or get_twilio_http_client()
+        path = f"/{API_VERSION}/Accounts/{self.account_sid}/{resource}"
+        trace = _ConnectionTrace()
+        async with get_bulkhead("twilio").acquire():
+            response = await http.request(
+                method,
+                path,
+                params=params,
+                data=data,
+                auth=self._auth,
+                extensions={"trace": trace},
+            )
+        _record_pool_usage(trace)
+
+        if response.is_error:
+            try:
+                body = response.json()
+            except ValueError:
+                body = {}
+            raise TwilioRestException(
+                response.status_code,
+                str(response.url),
+                msg=body.get("message") or response.text,
+                code=body.get("code"),
+                method=method,
+                details=body.get("details"),
+            )
+        return response.json()
+
+
+__all__ = [
+    "AsyncTwilioClient",
+    "close_twilio_http_client",
+    "get_twilio_http_client",
+]
@@ -8,22 +8,156 @@ from typing import Any, Dict, Optional, Sequence
 
 import httpx
 
+from api.src.core.retry import RetryBudget, RetryPolicy
 from api.src.core.settings import get_settings
-from api.src.infrastructure.external.circuit_breaker import with_circuit_breaker
+from api.src.infrastructure.external.bulkhead import get_bulkhead
+from api.src.infrastructure.external.circuit_breaker import breaker_key, default_breaker_config, with_circuit_breaker
+from api.src.infrastructure.external.rate_limiter import AdaptiveRateLimiter, ThrottleTimeout, get_rate_limiter
 
 
 class VapiApiError(RuntimeError):
     """Raised when the Vapi API responds with an error."""
 
+    def __init__(self, message: str, *, status_code: int | None = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
 
 class VapiRateLimitError(VapiApiError):
     """Raised when Vapi API returns 429 Too Many Requests."""
 
+    def __init__(self, message: str, *, status_code: int | None = 429, retry_after: float | None = None) -> None:
+        super().__init__(message, status_code=status_code)
+        self.retry_after = retry_after  # Seconds, from the Retry-After header
+
 
 class VapiAuthError(VapiApiError):
     """Raised when Vapi API returns 401 Unauthorized."""
 
 
+def _is_vapi_outage(exc: BaseException) -> bool:
+    """Rejected requests (4xx other than 429) say nothing about Vapi's health."""
+    status_code = getattr(exc, "status_code", None)
+    return status_code is None or status_code == 429 or status_code >= 500
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, (VapiRateLimitError, httpx.TransportError)):
+        return True
+    return isinstance(exc, VapiApiError) and (exc.status_code or 0) >= 500
+
+
+def _retry_after_seconds(value: str | None) -> float | None:
+    try:
+        return max(float(value), 0.0) if value is not None else None
+    except ValueError:
+        return None
+
+
+_settings = get_settings()
+
+# GETs are idempotent and safe to repeat; writes are never retried here
+_read_retry = RetryPolicy(
+    "vapi_read",
+    retry_on=_is_retryable,
+    max_retries=_settings.vapi_max_retries,
+    base_delay=_settings.retry_base_delay_seconds,
+    max_delay=_settings.retry_max_delay_seconds,
+    budget=RetryBudget(
+        ratio=_settings.retry_budget_ratio,
+        min_per_second=_settings.retry_budget_min_per_second,
+        window_seconds=_settings.retry_budget_window_seconds,
+    ),
+)
+
+
+def _new_rate_limiter() -> AdaptiveRateLimiter:
+    return AdaptiveRateLimiter(
+        "vapi",
+        rate=_settings.vapi_rate_limit_per_second,
+        burst=_settings.vapi_rate_limit_burst,
+        min_rate=_settings.vapi_rate_limit_min_per_second,
+        max_wait=_settings.vapi_rate_limit_max_wait_seconds,
+    )
+
+
+def build_assistant_payload(
+    *,
+    name: str,
+    voice_provider: str,
+    voice_id: str,
+    first_message: str,
+    model_provider: str = "openai",
+    model: str = "gpt-3.5-turbo",
+    temperature: float = 0.7,
+    max_tokens: int = 250,
+    voice_speed: float = 1.0,
+    system_prompt: str | None = None,
+    metadata: dict | None = None,
+    functions: list[dict] | None = None,
+    transcriber_provider: str = "deepgram",
+    transcriber_model: str = "nova-2",
+    transcriber_language: str = "fr",
+    server_url: str | None = None,
+) -> dict:
+    """
+    Build a complete Vapi assistant definition.
+
+    Used both to create assistants and to answer `assistant-request` webhooks
+    with a transient assistant.
+    """
+    # Build voice config with speed
+    voice_config: dict = {
+        "provider": voice_provider,
+        "voiceId": voice_id,
+    }
+
+    # Add speed if supported by provider (11labs, azure, deepgram)
+    if voice_provider in ("11labs", "azure", "deepgram") and voice_speed != 1.0:
+        voice_config["speed"] = voice_speed
+
+    # Build model config
+    model_config: dict = {
+        "provider": model_provider,
+        "model": model,
+        "temperature": temperature,
+        "maxTokens": max_tokens,
+    }
+
+    # Add system prompt if provided
+    if system_prompt:
+        model_config["messages"] = [
+            {
+                "role": "system",
+                "content": system_prompt
+            }
+        ]
+
+    payload = {
+        "name": name,
+        "voice": voice_config,
+        "model": model_config,
+        "transcriber": {
+            "provider": transcriber_provider,
+            "model": transcriber_model,
+            "language": transcriber_language,
+        },
+        "firstMessage": first_message,
+    }
+
+    # 🔥 DIVINE: Add webhook URL (makes calls appear in app!)
+    if server_url:
+        payload["serverUrl"] = server_url
+
+    if metadata:
+        payload["metadata"] = metadata
+
+    if functions:
+        payload["functions"] = functions
+
+    return payload
+
+
 class VapiClient:
     """Lightweight wrapper around the Vapi REST endpoints used by the platform."""
 
@@ -35,12 +169,14 @@ class VapiClient:
         if not self._token:
             raise ValueError("VAPI API token is not configured.")
 
+        self._breaker_key = breaker_key(self._token)
+        # Shared by every client using this token, so bursts queue instead of hitting 429s
+        self._rate_limiter = get_rate_limiter("vapi", self._breaker_key, _new_rate_limiter)
         self._headers = {
             "Authorization": f"Bearer {self._token}",
             "Content-Type": "application/json",
         }
 
-    @with_circuit_breaker("vapi")
     async def _request(
         self,
         method: str,
@@ -48,18 +184,50 @@ class VapiClient:
         *,
         params: dict | None = None,
         json: Any | None = None,
+    ) -> Any:
+        if method == "GET":
+            # Each attempt goes through the breaker; an open circuit (503) is not retried
+            return await _read_retry.call(self._throttled_send, method, path, params=params)
+        return await self._throttled_send(method, path, params=params, json=json)
+
+    async def _throttled_send(self, method: str, path: str, **kwargs: Any) -> Any:
+        try:
+            await self._rate_limiter.acquire()
+        except ThrottleTimeout as exc:
+            raise VapiRateLimitError(str(exc), retry_after=exc.retry_after) from exc
+        return await self._send(method, path, **kwargs)
+
+    # One breaker per API token: a tenant with a broken key or quota cannot
+    # trip the circuit for everyone else.
+    @with_circuit_breaker(
+        "vapi",
+        default_breaker_config(is_failure=_is_vapi_outage),
+        key=lambda self, *args, **kwargs: self._breaker_key,
+    )
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: dict | None = None,
+        json: Any | None = None,
     ) -> Any:
         url = f"{self._base_url}{path}"
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.request(method, url, headers=self._headers, params=params, json=json)
+        async with get_bulkhead("vapi").acquire():
+            async with httpx.AsyncClient(timeout=10.0) as client:
+                response = await client.request(method, url, headers=self._headers, params=params, json=json)
+        self._rate_limiter.observe(response.status_code, response.headers)
 
         # Raise specific exceptions for better error handling
         if response.status_code == 429:
-            raise VapiRateLimitError(f"Vapi rate limit exceeded: {response.text}")
+            raise VapiRateLimitError(
+                f"Vapi rate limit exceeded: {response.text}",
+                retry_after=_retry_after_seconds(response.headers.get("retry-after")),
+            )
         if response.status_code == 401:
-            raise VapiAuthError(f"Vapi authentication failed: {response.text}")
+            raise VapiAuthError(f"Vapi authentication failed: {response.text}", status_code=401)
         if response.status_code >= 400:
-            raise VapiApiError(f"Vapi error {response.status_code}: {response.text}")
+            raise VapiApiError(f"Vapi error {response.status_code}: {response.text}", status_code=response.status_code)
             
         if response.headers.get("content-type", "").startswith("application/json"):
             return response.json()
@@ -127,55 +295,24 @@ class VapiClient:
         Returns:
             Assistant object with 'id' (UUID), 'name', 'voice', 'model', etc.
         """
-        # Build voice config with speed
-        voice_config: dict = {
-            "provider": voice_provider,
-            "voiceId": voice_id,
-        }
-
-        # Add speed if supported by provider (11labs, azure, deepgram)
-        if voice_provider in ("11labs", "azure", "deepgram") and voice_speed != 1.0:
-            voice_config["speed"] = voice_speed
-
-        # Build model config
-        model_config: dict = {
-            "provider": model_provider,
-            "model": model,
-            "temperature": temperature,
-            "maxTokens": max_tokens,
-        }
-
-        # Add system prompt if provided
-        if system_prompt:
-            model_config["messages"] = [
-                {
-                    "role": "system",
-                    "content": system_prompt
-                }
-            ]
-
-        payload = {
-            "name": name,
-            "voice": voice_config,
-            "model": model_config,
-            "transcriber": {
-                "provider": transcriber_provider,
-                "model": transcriber_model,
-                "language": transcriber_language,
-            },
-            "firstMessage": first_message,
-        }
-
-        # 🔥 DIVINE: Add webhook URL (makes calls appear in app!)
-        if server_url:
-            payload["serverUrl"] = server_url
-
-        if metadata:
-            payload["metadata"] = metadata
-
-        if functions:
-            payload["functions"] = functions
-
+        payload = build_assistant_payload(
+            name=name,
+            voice_provider=voice_provider,
+            voice_id=voice_id,
+            first_message=first_message,
+            model_provider=model_provider,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            voice_speed=voice_speed,
+            system_prompt=system_prompt,
+            metadata=metadata,
+            functions=functions,
+            transcriber_provider=transcriber_provider,
+            transcriber_model=transcriber_model,
+            transcriber_language=transcriber_language,
+            server_url=server_url,
+        )
         return await self._request("POST", "/assistant", json=payload)
 
     async def update_assistant(
@@ -462,4 +599,4 @@ class VapiClient:
         )
 
 
-__all__ = ["VapiClient", "VapiApiError"]
+__all__ = ["VapiClient", "VapiApiError", "build_assistant_payload"]
@@ -7,15 +7,28 @@ Exports all database models for easy import.
 from .ava_profile import AvaProfile
 from .base import Base
 from .call import CallRecord
+from .campaign import Campaign, CampaignCallPacing, CampaignContact
+from .caller import CallerRecord
+from .email_outbox import EmailOutbox
+from .shared_state import CircuitBreakerStateRecord, SharedRateCounter
 from .studio_config import StudioConfig
 from .tenant import Tenant
+from .transcript_turn import TranscriptTurn
 from .user import User
 
 __all__ = [
     "Base",
     "AvaProfile",
     "CallRecord",
+    "Campaign",
+    "CampaignCallPacing",
+    "CampaignContact",
+    "CallerRecord",
+    "CircuitBreakerStateRecord",
+    "EmailOutbox",
+    "SharedRateCounter",
     "StudioConfig",
     "Tenant",
+    "TranscriptTurn",
     "User",
 ]
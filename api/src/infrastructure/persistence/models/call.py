@@ -7,7 +7,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, JSON, String, Text
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, Integer, JSON, String, Text, false, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -18,6 +18,9 @@ class CallRecord(Base):
     """Represents a single call captured from Vapi."""
 
     __tablename__ = "calls"
+    __table_args__ = (
+        Index("ix_calls_summary_pending", "tenant_id", postgresql_where=text("summary_pending")),
+    )
 
     id: Mapped[str] = mapped_column(String(64), primary_key=True)
     assistant_id: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
@@ -30,6 +33,8 @@ class CallRecord(Base):
     cost: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     meta: Mapped[dict] = mapped_column(JSON, default=dict, nullable=False)
     transcript: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Waiting to be included in the tenant's next call digest email
+    summary_pending: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false(), nullable=False)
 
     def update_from_payload(self, payload: dict[str, object]) -> None:
         """Update the record using a Vapi call payload."""
@@ -0,0 +1,60 @@
+"""
+Caller persistence model.
+
+One row per (tenant, phone number) so returning callers can be recognised and
+the dashboard can list callers without scanning the calls table.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+from uuid import uuid4
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from api.src.domain.entities.caller import Caller, CallerId
+
+from .base import Base
+
+
+class CallerRecord(Base):
+    """A person who has called a tenant, keyed by E.164 number."""
+
+    __tablename__ = "callers"
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "phone_number", name="uq_callers_tenant_phone"),
+        Index("ix_callers_tenant_last_seen", "tenant_id", "last_seen_at"),
+    )
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
+    tenant_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False)
+    phone_number: Mapped[str] = mapped_column(String(32), nullable=False)
+    first_name: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    last_name: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    email: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    first_seen_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_seen_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    call_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    def to_entity(self) -> Caller:
+        return Caller(
+            id=CallerId(self.id),
+            org_id=str(self.tenant_id),
+            phone_number=self.phone_number,
+            first_name=self.first_name,
+            last_name=self.last_name,
+            email=self.email,
+            notes=self.notes,
+            created_at=self.first_seen_at,
+            updated_at=self.updated_at,
+            last_seen_at=self.last_seen_at,
+            call_count=self.call_count,
+        )
+
+
+__all__ = ["CallerRecord"]
@@ -0,0 +1,103 @@
+"""
+Outbound call campaign persistence models.
+
+A campaign owns a contact list; the dialer claims due contacts, places calls
+through Twilio and the status webhook records each call's outcome.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+from uuid import uuid4
+
+from sqlalchemy import JSON, BigInteger, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+CAMPAIGN_DRAFT = "draft"
+CAMPAIGN_RUNNING = "running"
+CAMPAIGN_PAUSED = "paused"
+CAMPAIGN_COMPLETED = "completed"
+
+CONTACT_PENDING = "pending"  # waiting for its (next) attempt
+CONTACT_DIALING = "dialing"  # call placed, no final status yet
+CONTACT_COMPLETED = "completed"
+CONTACT_FAILED = "failed"  # final: failed, canceled or out of retries
+
+CONTACT_LIVE_STATUSES = (CONTACT_DIALING,)
+
+
+class Campaign(Base):
+    """An outbound calling campaign."""
+
+    __tablename__ = "campaigns"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
+    user_id: Mapped[str] = mapped_column(String(36), nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(200), nullable=False)
+    from_number: Mapped[str] = mapped_column(String(20), nullable=False)
+    twiml_url: Mapped[str] = mapped_column(String(500), nullable=False, comment="TwiML fetched when a call connects")
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default=CAMPAIGN_DRAFT)
+    schedule: Mapped[Optional[str]] = mapped_column(
+        Text, nullable=True, comment="Calling windows, business hours syntax; NULL dials any time"
+    )
+    timezone: Mapped[str] = mapped_column(String(64), nullable=False, default="UTC")
+    max_concurrent_calls: Mapped[int] = mapped_column(Integer, nullable=False, default=5)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=3)
+    retry_delay_seconds: Mapped[int] = mapped_column(Integer, nullable=False, default=900)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class CampaignContact(Base):
+    """One number to call in a campaign, with its dialing state."""
+
+    __tablename__ = "campaign_contacts"
+    __table_args__ = (
+        Index("ix_campaign_contacts_due", "campaign_id", "status", "next_attempt_at"),
+        Index("ix_campaign_contacts_call_sid", "call_sid", unique=True),
+        UniqueConstraint("campaign_id", "phone_number", name="uq_campaign_contacts_campaign_phone"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    campaign_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False
+    )
+    phone_number: Mapped[str] = mapped_column(String(20), nullable=False)
+    name: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+    meta: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default=CONTACT_PENDING)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    call_sid: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    last_call_status: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class CampaignCallPacing(Base):
+    """Next free call slot of a Twilio account, shared by every dialer process."""
+
+    __tablename__ = "campaign_call_pacing"
+
+    account_sid: Mapped[str] = mapped_column(String(64), primary_key=True)
+    next_slot_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+__all__ = [
+    "CAMPAIGN_COMPLETED",
+    "CAMPAIGN_DRAFT",
+    "CAMPAIGN_PAUSED",
+    "CAMPAIGN_RUNNING",
+    "CONTACT_COMPLETED",
+    "CONTACT_DIALING",
+    "CONTACT_FAILED",
+    "CONTACT_LIVE_STATUSES",
+    "CONTACT_PENDING",
+    "Campaign",
+    "CampaignCallPacing",
+    "CampaignContact",
+]
@@ -0,0 +1,36 @@
+"""
+State shared between API workers on several hosts.
+
+Used by the Postgres shared-state backend: rate-limit counters per fixed
+window and the last circuit-breaker transition of each breaker.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class SharedRateCounter(Base):
+    """Requests counted by all workers for one rate-limit key and window."""
+
+    __tablename__ = "shared_rate_counters"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    window_start: Mapped[int] = mapped_column(BigInteger, primary_key=True)  # Epoch seconds
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+
+class CircuitBreakerStateRecord(Base):
+    """Last open/closed transition of a circuit breaker, as seen by any worker."""
+
+    __tablename__ = "circuit_breaker_states"
+
+    name: Mapped[str] = mapped_column(String(255), primary_key=True)
+    state: Mapped[str] = mapped_column(String(16), nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -11,7 +11,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import uuid4
 
-from sqlalchemy import Boolean, DateTime, Float, Integer, String, Text
+from sqlalchemy import JSON, Boolean, DateTime, Float, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
@@ -64,6 +64,24 @@ class StudioConfig(Base):
         default="09:00-18:00",
         nullable=False,
     )
+    business_hours_enforced: Mapped[bool] = mapped_column(
+        Boolean,
+        default=False,
+        nullable=False,
+        comment="Set once the tenant saves hours or holidays; until then calls are routed as always open",
+    )
+    holidays: Mapped[list] = mapped_column(
+        JSON,
+        default=list,
+        nullable=False,
+        comment="Closed dates (ISO YYYY-MM-DD) applied on top of business_hours",
+    )
+    custom_functions: Mapped[list] = mapped_column(
+        JSON,
+        default=list,
+        nullable=False,
+        comment="Tenant-defined assistant functions: [{name, result}], answered by the function-call webhook",
+    )
     fallback_email: Mapped[Optional[str]] = mapped_column(
         String(255),
         nullable=True,
@@ -72,6 +90,27 @@ class StudioConfig(Base):
         String(255),
         nullable=True,
     )
+    summary_mode: Mapped[str] = mapped_column(
+        String(16),
+        default="immediate",
+        nullable=False,
+        comment="'immediate' (one email per call) or 'digest' (batched call summaries)",
+    )
+    digest_interval_minutes: Mapped[int] = mapped_column(
+        Integer,
+        default=60,
+        nullable=False,
+    )
+    digest_max_calls: Mapped[int] = mapped_column(
+        Integer,
+        default=25,
+        nullable=False,
+        comment="Send the digest early once this many calls are pending",
+    )
+    digest_last_sent_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
     smtp_server: Mapped[str] = mapped_column(
         String(255),
         default="",
@@ -0,0 +1,44 @@
+"""
+Transcript turn persistence model.
+
+Stores individual conversation turns streamed by Vapi `transcript.update`
+events so live transcripts survive worker restarts and are visible to every
+API worker, not only the one that received the webhook.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, DateTime, String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class TranscriptTurn(Base):
+    """A single speaker turn of a (possibly still running) call."""
+
+    __tablename__ = "call_transcript_turns"
+    __table_args__ = (UniqueConstraint("call_id", "seq", name="uq_call_transcript_turns_call_seq"),)
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    call_id: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    seq: Mapped[int] = mapped_column(BigInteger, nullable=False)  # Spoken-at timestamp in ms
+    role: Mapped[str] = mapped_column(String(32), nullable=False)
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    assistant_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    user_id: Mapped[Optional[str]] = mapped_column(String(36), nullable=True)
+    spoken_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    def to_dict(self) -> dict:
+        return {
+            "seq": self.seq,
+            "role": self.role,
+            "message": self.message,
+            "time": self.spoken_at.isoformat() if self.spoken_at else None,
+        }
+
+
+__all__ = ["TranscriptTurn"]
@@ -9,7 +9,7 @@ from typing import Iterable, Optional, Sequence
 
 from uuid import UUID
 
-from sqlalchemy import Select, select
+from sqlalchemy import Select, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.src.infrastructure.persistence.models.call import CallRecord
@@ -157,6 +157,17 @@ async def scrub_transcript_if_expired(
     Returns True if the transcript was scrubbed.
     """
 
+    if transcript_expired(call, now=now, retention=retention):
+        call.transcript = None
+        await session.flush()
+        return True
+
+    return False
+
+
+def transcript_expired(call: CallRecord, *, now: datetime, retention: timedelta) -> bool:
+    """Whether the call still holds a transcript older than the retention window."""
+
     if not call.transcript or not call.started_at:
         return False
 
@@ -166,21 +177,53 @@ async def scrub_transcript_if_expired(
     else:
         started_at = started_at.astimezone(timezone.utc)
 
-    if started_at <= now - retention:
-        call.transcript = None
-        await session.flush()
-        return True
+    return started_at <= now - retention
 
-    return False
+
+async def clear_transcripts(session: AsyncSession, call_ids: Iterable[str]) -> None:
+    """Remove the transcripts of the given calls (caller commits)."""
+
+    ids = list(call_ids)
+    if ids:
+        await session.execute(update(CallRecord).where(CallRecord.id.in_(ids)).values(transcript=None))
+
+
+async def get_pending_digest_counts(session: AsyncSession) -> Sequence[tuple[UUID, int, datetime]]:
+    """Return (tenant_id, pending calls, oldest pending start) for calls awaiting a digest."""
+
+    result = await session.execute(
+        select(CallRecord.tenant_id, func.count(), func.min(CallRecord.started_at))
+        .where(CallRecord.summary_pending.is_(True))
+        .group_by(CallRecord.tenant_id)
+    )
+    return [tuple(row) for row in result.all()]
+
+
+async def claim_pending_digest_calls(session: AsyncSession, tenant_id, *, limit: int) -> Sequence[CallRecord]:
+    """Lock a tenant's oldest calls awaiting a digest (caller clears the flag and commits)."""
+
+    result = await session.execute(
+        select(CallRecord)
+        .where(CallRecord.tenant_id == _coerce_tenant_id(tenant_id))
+        .where(CallRecord.summary_pending.is_(True))
+        .order_by(CallRecord.started_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return result.scalars().all()
 
 
 __all__ = [
     "CallRecord",
+    "claim_pending_digest_calls",
+    "get_pending_digest_counts",
     "upsert_calls",
     "get_recent_calls",
     "get_calls_in_range",
     "get_call_by_id",
     "prune_old_calls",
     "delete_call_record",
+    "clear_transcripts",
     "scrub_transcript_if_expired",
+    "transcript_expired",
 ]
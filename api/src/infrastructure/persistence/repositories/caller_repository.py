@@ -0,0 +1,112 @@
+"""
+Repository functions for the caller directory.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Optional, Sequence
+from uuid import UUID, uuid4
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.src.infrastructure.persistence.models.caller import CallerRecord
+
+
+async def get_caller(session: AsyncSession, tenant_id: UUID, phone_number: str) -> Optional[CallerRecord]:
+    """Return the caller for a tenant and normalized phone number."""
+
+    result = await session.execute(
+        select(CallerRecord).where(
+            CallerRecord.tenant_id == tenant_id,
+            CallerRecord.phone_number == phone_number,
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+async def upsert_caller(
+    session: AsyncSession,
+    *,
+    tenant_id: UUID,
+    phone_number: str,
+    first_name: Optional[str] = None,
+    last_name: Optional[str] = None,
+    email: Optional[str] = None,
+    notes: Optional[str] = None,
+    seen_at: Optional[datetime] = None,
+    count_call: bool = False,
+) -> CallerRecord:
+    """Insert or update a caller in a single statement; the caller owns the commit.
+
+    Provided contact fields overwrite stored ones, missing fields keep their
+    stored value. `count_call` bumps `call_count` and `last_seen_at`.
+    """
+
+    now = datetime.now(timezone.utc)
+    seen_at = seen_at or now
+    stmt = insert(CallerRecord).values(
+        id=str(uuid4()),
+        tenant_id=tenant_id,
+        phone_number=phone_number,
+        first_name=first_name,
+        last_name=last_name,
+        email=email,
+        notes=notes,
+        first_seen_at=seen_at,
+        last_seen_at=seen_at,
+        call_count=1 if count_call else 0,
+        updated_at=now,
+    )
+    excluded = stmt.excluded
+    updates = {
+        "first_name": func.coalesce(excluded.first_name, CallerRecord.first_name),
+        "last_name": func.coalesce(excluded.last_name, CallerRecord.last_name),
+        "email": func.coalesce(excluded.email, CallerRecord.email),
+        "notes": func.coalesce(excluded.notes, CallerRecord.notes),
+        "updated_at": excluded.updated_at,
+    }
+    if count_call:
+        updates["call_count"] = CallerRecord.call_count + 1
+        updates["last_seen_at"] = func.greatest(CallerRecord.last_seen_at, excluded.last_seen_at)
+
+    stmt = stmt.on_conflict_do_update(constraint="uq_callers_tenant_phone", set_=updates).returning(CallerRecord)
+    result = await session.execute(stmt, execution_options={"populate_existing": True})
+    return result.scalar_one()
+
+
+async def list_callers(
+    session: AsyncSession,
+    tenant_id: UUID,
+    *,
+    search: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0,
+) -> Sequence[CallerRecord]:
+    """Return a tenant's callers, most recently seen first."""
+
+    query = (
+        select(CallerRecord)
+        .where(CallerRecord.tenant_id == tenant_id)
+        .order_by(CallerRecord.last_seen_at.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+    if search:
+        pattern = f"%{search}%"
+        query = query.where(
+            or_(
+                CallerRecord.phone_number.ilike(pattern),
+                CallerRecord.first_name.ilike(pattern),
+                CallerRecord.last_name.ilike(pattern),
+                CallerRecord.email.ilike(pattern),
+            )
+        )
+
+    result = await session.execute(query)
+    return result.scalars().all()
+
+
+__all__ = ["get_caller", "list_callers", "upsert_caller"]
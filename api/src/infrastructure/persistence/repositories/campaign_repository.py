@@ -0,0 +1,325 @@
+"""
+Repository functions for outbound call campaigns.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Mapping, Optional, Sequence
+
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.src.infrastructure.persistence.models.campaign import (
+    CAMPAIGN_COMPLETED,
+    CAMPAIGN_RUNNING,
+    CONTACT_DIALING,
+    CONTACT_FAILED,
+    CONTACT_PENDING,
+    Campaign,
+    CampaignCallPacing,
+    CampaignContact,
+)
+from api.src.infrastructure.persistence.models.user import User
+
+_INSERT_CHUNK = 1000  # Rows per INSERT, well under asyncpg's 32767 parameters
+
+
+async def add_campaign_contacts(
+    session: AsyncSession,
+    campaign_id: str,
+    contacts: Iterable[Mapping[str, Any]],
+) -> int:
+    """Bulk-insert contacts (`phone_number`, `name`, `meta`); the caller owns the commit.
+
+    Numbers already in the campaign are skipped. Returns the number of
+    contacts added.
+    """
+
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "campaign_id": campaign_id,
+            "phone_number": contact["phone_number"],
+            "name": contact.get("name"),
+            "meta": contact.get("meta") or None,
+            "status": CONTACT_PENDING,
+            "attempts": 0,
+            "next_attempt_at": now,
+            "updated_at": now,
+        }
+        for contact in contacts
+    ]
+    added = 0
+    for start in range(0, len(rows), _INSERT_CHUNK):
+        stmt = (
+            insert(CampaignContact)
+            .values(rows[start : start + _INSERT_CHUNK])
+            .on_conflict_do_nothing(constraint="uq_campaign_contacts_campaign_phone")
+            .returning(CampaignContact.id)
+        )
+        added += len((await session.execute(stmt)).all())
+    return added
+
+
+async def get_campaign(session: AsyncSession, user_id: str, campaign_id: str) -> Optional[Campaign]:
+    result = await session.execute(
+        select(Campaign).where(Campaign.id == campaign_id, Campaign.user_id == str(user_id))
+    )
+    return result.scalar_one_or_none()
+
+
+async def list_campaigns(session: AsyncSession, user_id: str) -> Sequence[Campaign]:
+    result = await session.execute(
+        select(Campaign).where(Campaign.user_id == str(user_id)).order_by(Campaign.created_at.desc())
+    )
+    return result.scalars().all()
+
+
+async def list_running_campaigns(session: AsyncSession) -> Sequence[Campaign]:
+    result = await session.execute(select(Campaign).where(Campaign.status == CAMPAIGN_RUNNING))
+    return result.scalars().all()
+
+
+async def get_campaign_progress(session: AsyncSession, campaign_id: str) -> dict[str, int]:
+    """Contact counts by status."""
+
+    result = await session.execute(
+        select(CampaignContact.status, func.count())
+        .where(CampaignContact.campaign_id == campaign_id)
+        .group_by(CampaignContact.status)
+    )
+    return {status: count for status, count in result.all()}
+
+
+async def lock_tenant_for_dialing(session: AsyncSession, user_id: str) -> Optional[User]:
+    """Lock the tenant's row until the caller commits, so one dialer at a time
+    counts its live calls and claims contacts.
+
+    Returns None when the user does not exist or another dialer holds the
+    lock (SKIP LOCKED).
+    """
+
+    result = await session.execute(
+        select(User).where(User.id == user_id).with_for_update(skip_locked=True, key_share=True)
+    )
+    return result.scalar_one_or_none()
+
+
+async def count_live_calls(
+    session: AsyncSession,
+    user_id: str,
+    *,
+    stale_after: float,
+) -> dict[str, int]:
+    """Calls in flight per running campaign of the tenant.
+
+    Contacts left "dialing" for longer than `stale_after` seconds (a lost
+    status callback) no longer hold a slot.
+    """
+
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=stale_after)
+    result = await session.execute(
+        select(CampaignContact.campaign_id, func.count())
+        .join(Campaign, Campaign.id == CampaignContact.campaign_id)
+        .where(
+            Campaign.user_id == str(user_id),
+            CampaignContact.status == CONTACT_DIALING,
+            CampaignContact.updated_at >= cutoff,
+        )
+        .group_by(CampaignContact.campaign_id)
+    )
+    return {campaign_id: count for campaign_id, count in result.all()}
+
+
+async def claim_campaign_contacts(session: AsyncSession, campaign_id: str, *, limit: int) -> Sequence[CampaignContact]:
+    """Lock due contacts and mark them "dialing"; the caller owns the commit.
+
+    Rows locked by another dialer are skipped (SKIP LOCKED).
+    """
+
+    now = datetime.now(timezone.utc)
+    result = await session.execute(
+        select(CampaignContact)
+        .where(
+            CampaignContact.campaign_id == campaign_id,
+            CampaignContact.status == CONTACT_PENDING,
+            CampaignContact.next_attempt_at <= now,
+        )
+        .order_by(CampaignContact.next_attempt_at, CampaignContact.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    contacts = result.scalars().all()
+    for contact in contacts:
+        contact.status = CONTACT_DIALING
+        contact.attempts += 1
+        contact.call_sid = None
+        contact.updated_at = now
+    return contacts
+
+
+async def has_open_contacts(session: AsyncSession, campaign_id: str) -> bool:
+    """Whether any contact is still waiting for an attempt or a call result."""
+
+    result = await session.execute(
+        select(CampaignContact.id)
+        .where(
+            CampaignContact.campaign_id == campaign_id,
+            CampaignContact.status.in_((CONTACT_PENDING, CONTACT_DIALING)),
+        )
+        .limit(1)
+    )
+    return result.first() is not None
+
+
+async def complete_campaign(session: AsyncSession, campaign_id: str) -> None:
+    """Mark a running campaign completed; the caller owns the commit."""
+
+    await session.execute(
+        update(Campaign)
+        .where(Campaign.id == campaign_id, Campaign.status == CAMPAIGN_RUNNING)
+        .values(status=CAMPAIGN_COMPLETED, completed_at=datetime.now(timezone.utc))
+    )
+
+
+async def reserve_call_slot(session: AsyncSession, account_sid: str, *, interval: float) -> float:
+    """Reserve the account's next call slot, `interval` seconds after the
+    previous one. Returns the seconds to wait for it; the caller owns the
+    commit (concurrent reservations wait on the row until then).
+    """
+
+    step = timedelta(seconds=interval)
+    stmt = insert(CampaignCallPacing).values(account_sid=account_sid, next_slot_at=func.now() + step)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CampaignCallPacing.account_sid],
+        set_={"next_slot_at": func.greatest(CampaignCallPacing.next_slot_at, func.now()) + step},
+    ).returning(func.extract("epoch", CampaignCallPacing.next_slot_at - func.now()))
+    until_next = (await session.execute(stmt)).scalar_one()
+    return max(float(until_next) - interval, 0.0)
+
+
+async def release_stale_contacts(session: AsyncSession, campaign_id: str, *, stale_after: float) -> None:
+    """Recover contacts stuck in "dialing" for longer than `stale_after` seconds.
+
+    A contact claimed but never placed (dialer crashed) goes back to pending;
+    a placed call whose final status never arrived is recorded as failed.
+    The caller owns the commit.
+    """
+
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=stale_after)
+    stale = and_(
+        CampaignContact.campaign_id == campaign_id,
+        CampaignContact.status == CONTACT_DIALING,
+        CampaignContact.updated_at < cutoff,
+    )
+    await session.execute(
+        update(CampaignContact)
+        .where(stale, CampaignContact.call_sid.is_(None))
+        .values(status=CONTACT_PENDING, attempts=CampaignContact.attempts - 1, next_attempt_at=func.now())
+    )
+    await session.execute(
+        update(CampaignContact)
+        .where(stale, CampaignContact.call_sid.is_not(None))
+        .values(status=CONTACT_FAILED, last_error="No final call status received")
+    )
+
+
+async def mark_contact_dialed(session: AsyncSession, contact_id: int, *, call_sid: str) -> None:
+    # Only the SID: a status callback may already have recorded the outcome
+    await session.execute(update(CampaignContact).where(CampaignContact.id == contact_id).values(call_sid=call_sid))
+    await session.commit()
+
+
+async def mark_contact_not_placed(
+    session: AsyncSession,
+    contact_id: int,
+    *,
+    error: str,
+    retry_at: Optional[datetime],
+) -> None:
+    """Record a call that could not be placed: retry at `retry_at`, or fail the contact when None."""
+
+    await session.execute(
+        update(CampaignContact)
+        .where(CampaignContact.id == contact_id)
+        .values(
+            status=CONTACT_PENDING if retry_at else CONTACT_FAILED,
+            next_attempt_at=retry_at or datetime.now(timezone.utc),
+            last_error=error[:2000],
+            updated_at=datetime.now(timezone.utc),
+        )
+    )
+    await session.commit()
+
+
+async def requeue_contact(session: AsyncSession, contact_id: int, *, error: str) -> None:
+    """Return a claimed contact whose call never reached Twilio, giving back its attempt."""
+
+    await session.execute(
+        update(CampaignContact)
+        .where(CampaignContact.id == contact_id)
+        .values(
+            status=CONTACT_PENDING,
+            attempts=CampaignContact.attempts - 1,
+            next_attempt_at=func.now(),
+            last_error=error[:2000],
+            updated_at=datetime.now(timezone.utc),
+        )
+    )
+    await session.commit()
+
+
+async def get_contact_for_status(
+    session: AsyncSession,
+    *,
+    contact_id: Optional[int],
+    call_sid: str,
+) -> Optional[CampaignContact]:
+    """Contact a status callback refers to, locked for the update.
+
+    The callback URL carries the contact ID, so callbacks arriving before the
+    SID was stored still match; the SID must agree once it is known.
+    """
+
+    if contact_id is not None:
+        query = select(CampaignContact).where(CampaignContact.id == contact_id)
+    else:
+        query = select(CampaignContact).where(CampaignContact.call_sid == call_sid)
+    contact = (await session.execute(query.with_for_update())).scalar_one_or_none()
+    if contact is not None and contact.call_sid not in (None, call_sid):
+        return None
+    return contact
+
+
+async def get_contact_owner(session: AsyncSession, contact_id: int) -> Optional[str]:
+    """User ID owning the campaign of a contact."""
+
+    result = await session.execute(
+        select(Campaign.user_id)
+        .join(CampaignContact, CampaignContact.campaign_id == Campaign.id)
+        .where(CampaignContact.id == contact_id)
+    )
+    return result.scalar_one_or_none()
+
+
+__all__ = [
+    "add_campaign_contacts",
+    "claim_campaign_contacts",
+    "complete_campaign",
+    "count_live_calls",
+    "get_campaign",
+    "get_campaign_progress",
+    "get_contact_for_status",
+    "get_contact_owner",
+    "has_open_contacts",
+    "list_campaigns",
+    "list_running_campaigns",
+    "lock_tenant_for_dialing",
+    "mark_contact_dialed",
+    "mark_contact_not_placed",
+    "release_stale_contacts",
+    "requeue_contact",
+    "reserve_call_slot",
+]
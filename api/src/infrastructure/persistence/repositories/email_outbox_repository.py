@@ -0,0 +1,117 @@
+"""
+Repository functions for the email outbox.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Sequence
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.src.infrastructure.persistence.models.email_outbox import (
+    OUTBOX_DEAD,
+    OUTBOX_PENDING,
+    OUTBOX_SENDING,
+    OUTBOX_SENT,
+    EmailOutbox,
+)
+
+
+def add_outbox_email(
+    session: AsyncSession,
+    *,
+    recipients: Sequence[str],
+    subject: str,
+    html: str,
+    user_id: Optional[str] = None,
+    sender: Optional[str] = None,
+) -> EmailOutbox:
+    """Stage an email for delivery; the caller owns the commit."""
+
+    now = datetime.now(timezone.utc)
+    email = EmailOutbox(
+        user_id=str(user_id) if user_id else None,
+        recipients=list(recipients),
+        subject=subject,
+        html=html,
+        sender=sender,
+        status=OUTBOX_PENDING,
+        attempts=0,
+        next_attempt_at=now,
+        created_at=now,
+    )
+    session.add(email)
+    return email
+
+
+async def claim_due_emails(session: AsyncSession, *, limit: int, lease_seconds: float) -> Sequence[EmailOutbox]:
+    """Lock due emails for this worker and commit the claim.
+
+    Rows locked by another worker are skipped (SKIP LOCKED). Rows stuck in
+    "sending" past their lease (crashed worker) are claimed again.
+    """
+
+    now = datetime.now(timezone.utc)
+    result = await session.execute(
+        select(EmailOutbox)
+        .where(
+            or_(
+                and_(EmailOutbox.status == OUTBOX_PENDING, EmailOutbox.next_attempt_at <= now),
+                and_(EmailOutbox.status == OUTBOX_SENDING, EmailOutbox.locked_until < now),
+            )
+        )
+        .order_by(EmailOutbox.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    emails = result.scalars().all()
+    locked_until = now + timedelta(seconds=lease_seconds)
+    for email in emails:
+        email.status = OUTBOX_SENDING
+        email.locked_until = locked_until
+        email.attempts += 1
+    await session.commit()
+    return emails
+
+
+async def mark_email_sent(session: AsyncSession, email_id: int, *, provider: str, message_id: Optional[str]) -> None:
+    await session.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id == email_id)
+        .values(
+            status=OUTBOX_SENT,
+            provider=provider,
+            provider_message_id=message_id,
+            sent_at=datetime.now(timezone.utc),
+            locked_until=None,
+            last_error=None,
+        )
+    )
+    await session.commit()
+
+
+async def mark_email_failed(
+    session: AsyncSession,
+    email_id: int,
+    *,
+    error: str,
+    retry_at: Optional[datetime],
+) -> None:
+    """Schedule a retry at `retry_at`, or dead-letter the email when None."""
+
+    await session.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id == email_id)
+        .values(
+            status=OUTBOX_PENDING if retry_at else OUTBOX_DEAD,
+            next_attempt_at=retry_at or datetime.now(timezone.utc),
+            locked_until=None,
+            last_error=error[:2000],
+        )
+    )
+    await session.commit()
+
+
+__all__ = ["add_outbox_email", "claim_due_emails", "mark_email_failed", "mark_email_sent"]
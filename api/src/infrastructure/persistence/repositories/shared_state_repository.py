@@ -0,0 +1,98 @@
+"""
+Repository functions for state shared between API workers.
+
+The caller owns the commit.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Collection, Mapping
+
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.src.infrastructure.persistence.models.shared_state import CircuitBreakerStateRecord, SharedRateCounter
+
+CounterKey = tuple[str, int]  # (rate-limit key, window start in epoch seconds)
+
+
+async def add_rate_counts(
+    session: AsyncSession,
+    deltas: Mapping[CounterKey, int],
+    *,
+    expires_at: Mapping[CounterKey, datetime],
+) -> dict[CounterKey, int]:
+    """Add per-window request counts and return the new totals."""
+
+    if not deltas:
+        return {}
+    stmt = insert(SharedRateCounter).values(
+        [
+            {"key": key, "window_start": window_start, "count": amount, "expires_at": expires_at[(key, window_start)]}
+            for (key, window_start), amount in deltas.items()
+        ]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SharedRateCounter.key, SharedRateCounter.window_start],
+        set_={"count": SharedRateCounter.count + stmt.excluded.count},
+    ).returning(SharedRateCounter.key, SharedRateCounter.window_start, SharedRateCounter.count)
+    result = await session.execute(stmt)
+    return {(key, window_start): count for key, window_start, count in result.all()}
+
+
+async def get_rate_counts(session: AsyncSession, keys: Collection[CounterKey]) -> dict[CounterKey, int]:
+    if not keys:
+        return {}
+    result = await session.execute(
+        select(SharedRateCounter.key, SharedRateCounter.window_start, SharedRateCounter.count).where(
+            tuple_(SharedRateCounter.key, SharedRateCounter.window_start).in_(list(keys))
+        )
+    )
+    return {(key, window_start): count for key, window_start, count in result.all()}
+
+
+async def delete_expired_rate_counts(session: AsyncSession) -> None:
+    await session.execute(delete(SharedRateCounter).where(SharedRateCounter.expires_at < func.now()))
+
+
+async def save_breaker_states(session: AsyncSession, states: Mapping[str, tuple[str, datetime]]) -> None:
+    """Store breaker transitions (`name -> (state, changed_at)`); older ones never overwrite newer."""
+
+    if not states:
+        return
+    stmt = insert(CircuitBreakerStateRecord).values(
+        [{"name": name, "state": state, "changed_at": changed_at} for name, (state, changed_at) in states.items()]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CircuitBreakerStateRecord.name],
+        set_={"state": stmt.excluded.state, "changed_at": stmt.excluded.changed_at},
+        where=CircuitBreakerStateRecord.changed_at < stmt.excluded.changed_at,
+    )
+    await session.execute(stmt)
+
+
+async def get_breaker_states(session: AsyncSession, names: Collection[str]) -> dict[str, tuple[str, datetime]]:
+    if not names:
+        return {}
+    result = await session.execute(
+        select(
+            CircuitBreakerStateRecord.name,
+            CircuitBreakerStateRecord.state,
+            CircuitBreakerStateRecord.changed_at,
+        ).where(CircuitBreakerStateRecord.name.in_(list(names)))
+    )
+    return {
+        name: (state, changed_at if changed_at.tzinfo else changed_at.replace(tzinfo=timezone.utc))
+        for name, state, changed_at in result.all()
+    }
+
+
+__all__ = [
+    "add_rate_counts",
+    "delete_expired_rate_counts",
+    "get_breaker_states",
+    "get_rate_counts",
+    "save_breaker_states",
+]
@@ -0,0 +1,38 @@
+"""
+Repository functions for live transcript turns.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Mapping, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.src.infrastructure.persistence.models.transcript_turn import TranscriptTurn
+
+
+async def add_transcript_turns(session: AsyncSession, turns: Sequence[Mapping[str, Any]]) -> None:
+    """Insert transcript turns, skipping (call_id, seq) pairs already stored.
+
+    Turns can be written twice (periodic flush racing `call.ended`, webhook
+    redelivery), so conflicts are ignored. The caller owns the commit.
+    """
+
+    if not turns:
+        return
+    stmt = insert(TranscriptTurn).values(list(turns))
+    await session.execute(stmt.on_conflict_do_nothing(constraint="uq_call_transcript_turns_call_seq"))
+
+
+async def get_transcript_turns(session: AsyncSession, call_id: str) -> Sequence[TranscriptTurn]:
+    """Return persisted turns for a call ordered by sequence number."""
+
+    result = await session.execute(
+        select(TranscriptTurn).where(TranscriptTurn.call_id == call_id).order_by(TranscriptTurn.seq)
+    )
+    return result.scalars().all()
+
+
+__all__ = ["add_transcript_turns", "get_transcript_turns"]
@@ -0,0 +1,25 @@
+"""
+State shared between API workers: circuit-breaker transitions and
+rate-limit counters.
+
+Selected with `Settings.shared_state_backend`: "local" (per process, the
+default), "shm" (shared memory, workers on one host) or "postgres" (workers
+on several hosts).
+"""
+
+from .backends import BreakerRecord, PostgresBackend, SharedMemoryBackend, SharedStateBackend
+from .cache import SharedStateCache, get_shared_state, start_shared_state_sync, stop_shared_state_sync
+from .rate_limit_storage import SharedRateLimitStorage, rate_limit_storage_uri
+
+__all__ = [
+    "BreakerRecord",
+    "PostgresBackend",
+    "SharedMemoryBackend",
+    "SharedRateLimitStorage",
+    "SharedStateBackend",
+    "SharedStateCache",
+    "get_shared_state",
+    "rate_limit_storage_uri",
+    "start_shared_state_sync",
+    "stop_shared_state_sync",
+]
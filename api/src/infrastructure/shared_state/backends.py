@@ -0,0 +1,248 @@
+"""
+Backends through which API workers exchange rate-limit counts and
+circuit-breaker transitions.
+
+`SharedMemoryBackend` keeps a fixed-size hash table in a memory-mapped file
+(e.g. under /dev/shm) for workers on one host; `PostgresBackend` uses the
+database for workers on several hosts. Both are only called by the
+background sync of `SharedStateCache`, never on the request path.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Collection, Iterator, Mapping, Optional
+
+from api.src.infrastructure.database.session import SessionLocal
+from api.src.infrastructure.persistence.repositories.shared_state_repository import (
+    add_rate_counts,
+    delete_expired_rate_counts,
+    get_breaker_states,
+    get_rate_counts,
+    save_breaker_states,
+)
+
+CounterKey = tuple[str, int]  # (rate-limit key, window start in epoch seconds)
+
+
+@dataclass(frozen=True)
+class BreakerRecord:
+    """A breaker transition: "open" or "closed" at `changed_at` (epoch seconds)."""
+
+    state: str
+    changed_at: float
+
+
+class SharedStateBackend:
+    """Store shared by all workers."""
+
+    name = "base"
+
+    async def sync_counters(
+        self,
+        deltas: Mapping[CounterKey, int],
+        watched: Mapping[CounterKey, float],
+    ) -> dict[CounterKey, int]:
+        """Add this worker's new counts (`deltas`) and return the totals of
+        every key in `deltas` or `watched` (key -> expiry, epoch seconds)."""
+        raise NotImplementedError
+
+    async def sync_breakers(
+        self,
+        transitions: Mapping[str, BreakerRecord],
+        names: Collection[str],
+    ) -> dict[str, BreakerRecord]:
+        """Publish transitions (newer wins) and return the latest record of `names`."""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        return None
+
+
+# Slot: key digest, kind, window start / changed at, count / state, expires at
+_SLOT = struct.Struct("<16sB7xdqd")
+_FREE, _COUNTER, _BREAKER = 0, 1, 2
+_BREAKER_STATES = ("closed", "open")
+_MAX_PROBES = 64
+
+
+class SharedMemoryBackend(SharedStateBackend):
+    """
+    Open-addressing hash table in a shared memory-mapped file.
+
+    Every worker on the host maps the same file; updates happen under an
+    exclusive `flock`, held for a few microseconds per sync. Expired counter
+    slots are reused. When the probe sequence for a key is full the key is
+    not shared (each worker keeps counting it locally).
+    """
+
+    name = "shm"
+
+    def __init__(self, path: str, *, slots: int = 8192) -> None:
+        self._slots = slots
+        size = slots * _SLOT.size
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size < size:
+                os.ftruncate(self._fd, size)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._map = mmap.mmap(self._fd, size)
+
+    async def sync_counters(
+        self,
+        deltas: Mapping[CounterKey, int],
+        watched: Mapping[CounterKey, float],
+    ) -> dict[CounterKey, int]:
+        now = time.time()
+        totals: dict[CounterKey, int] = {}
+        with self._locked():
+            for counter_key, amount in deltas.items():
+                digest = _digest("c", *counter_key)
+                index = self._find(digest, now=now, create=True)
+                if index is None:
+                    continue
+                slot = self._read(index)
+                count = slot[3] if slot[0] == digest and not _expired(slot, now) else 0
+                count += amount
+                self._write(index, digest, _COUNTER, float(counter_key[1]), count, watched.get(counter_key, now))
+                totals[counter_key] = count
+            for counter_key in watched.keys() - totals.keys():
+                index = self._find(_digest("c", *counter_key), now=now, create=False)
+                if index is not None:
+                    totals[counter_key] = self._read(index)[3]
+        return totals
+
+    async def sync_breakers(
+        self,
+        transitions: Mapping[str, BreakerRecord],
+        names: Collection[str],
+    ) -> dict[str, BreakerRecord]:
+        now = time.time()
+        records: dict[str, BreakerRecord] = {}
+        with self._locked():
+            for name, record in transitions.items():
+                digest = _digest("b", name)
+                index = self._find(digest, now=now, create=True)
+                if index is None:
+                    continue
+                found, kind, changed_at, _, _ = self._read(index)
+                if found != digest or kind != _BREAKER or changed_at < record.changed_at:
+                    self._write(
+                        index, digest, _BREAKER, record.changed_at, _BREAKER_STATES.index(record.state), 0.0
+                    )
+            for name in names:
+                index = self._find(_digest("b", name), now=now, create=False)
+                if index is not None:
+                    _, _, changed_at, state, _ = self._read(index)
+                    records[name] = BreakerRecord(_BREAKER_STATES[state], changed_at)
+        return records
+
+    async def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _read(self, index: int) -> tuple[bytes, int, float, int, float]:
+        return _SLOT.unpack_from(self._map, index * _SLOT.size)
+
+    def _write(self, index: int, digest: bytes, kind: int, a: float, b: int, expires_at: float) -> None:
+        _SLOT.pack_into(self._map, index * _SLOT.size, digest, kind, a, b, expires_at)
+
+    def _find(self, digest: bytes, *, now: float, create: bool) -> Optional[int]:
+        """Slot holding `digest`, or (with `create`) the first reusable slot on its probe path."""
+        start = int.from_bytes(digest[:8], "little") % self._slots
+        reusable: Optional[int] = None
+        for probe in range(min(_MAX_PROBES, self._slots)):
+            index = (start + probe) % self._slots
+            slot = self._read(index)
+            if slot[1] == _FREE:
+                if not create:
+                    return None
+                return reusable if reusable is not None else index
+            if slot[0] == digest:
+                return index
+            if reusable is None and _expired(slot, now):
+                reusable = index
+        return reusable if create else None
+
+
+def _digest(kind: str, *parts: object) -> bytes:
+    return hashlib.blake2b("\x00".join([kind, *map(str, parts)]).encode("utf-8"), digest_size=16).digest()
+
+
+def _expired(slot: tuple[bytes, int, float, int, float], now: float) -> bool:
+    return slot[1] == _COUNTER and slot[4] <= now
+
+
+class PostgresBackend(SharedStateBackend):
+    """Shared state in Postgres, for workers on several hosts."""
+
+    name = "postgres"
+
+    # Expired counters are purged at most this often
+    cleanup_interval = 60.0
+
+    def __init__(self) -> None:
+        self._last_cleanup = 0.0
+
+    async def sync_counters(
+        self,
+        deltas: Mapping[CounterKey, int],
+        watched: Mapping[CounterKey, float],
+    ) -> dict[CounterKey, int]:
+        now = time.time()
+        expires_at = {
+            counter_key: datetime.fromtimestamp(watched.get(counter_key, now), tz=timezone.utc)
+            for counter_key in deltas
+        }
+        async with SessionLocal() as session:
+            totals = await add_rate_counts(session, deltas, expires_at=expires_at)
+            totals.update(await get_rate_counts(session, watched.keys() - totals.keys()))
+            if now - self._last_cleanup >= self.cleanup_interval:
+                await delete_expired_rate_counts(session)
+                self._last_cleanup = now
+            await session.commit()
+        return totals
+
+    async def sync_breakers(
+        self,
+        transitions: Mapping[str, BreakerRecord],
+        names: Collection[str],
+    ) -> dict[str, BreakerRecord]:
+        async with SessionLocal() as session:
+            await save_breaker_states(
+                session,
+                {
+                    name: (record.state, datetime.fromtimestamp(record.changed_at, tz=timezone.utc))
+                    for name, record in transitions.items()
+                },
+            )
+            stored = await get_breaker_states(session, names)
+            await session.commit()
+        return {name: BreakerRecord(state, changed_at.timestamp()) for name, (state, changed_at) in stored.items()}
+
+
+__all__ = [
+    "BreakerRecord",
+    "CounterKey",
+    "PostgresBackend",
+    "SharedMemoryBackend",
+    "SharedStateBackend",
+]
@@ -0,0 +1,218 @@
+"""
+Worker-local cache of the shared state.
+
+Request handlers only touch in-process dictionaries: rate-limit hits are
+counted locally and added to the last known total of the other workers;
+breaker transitions are queued for publication. A background task exchanges
+both with the configured backend every `shared_state_sync_interval_seconds`,
+so limits and open circuits converge across workers within one interval.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from functools import lru_cache
+from typing import Optional
+
+from api.src.core.settings import get_settings
+from api.src.infrastructure.shared_state.backends import (
+    BreakerRecord,
+    CounterKey,
+    PostgresBackend,
+    SharedMemoryBackend,
+    SharedStateBackend,
+)
+
+try:
+    from prometheus_client import Counter, Histogram
+
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+logger = logging.getLogger("ava.shared_state")
+
+if METRICS_AVAILABLE:
+    shared_state_sync_duration_metric = Histogram(
+        "shared_state_sync_duration_seconds",
+        "Time to exchange rate-limit counts and breaker states with the shared backend",
+        ["backend"],
+    )
+    shared_state_sync_errors_metric = Counter(
+        "shared_state_sync_errors_total",
+        "Failed shared-state syncs",
+        ["backend"],
+    )
+else:
+    shared_state_sync_duration_metric = None
+    shared_state_sync_errors_metric = None
+
+
+class SharedStateCache:
+    """Local view of the shared counters and breaker states."""
+
+    def __init__(self, backend: SharedStateBackend, *, sync_interval: float = 1.0) -> None:
+        self.backend = backend
+        self.sync_interval = sync_interval
+        self._totals: dict[CounterKey, int] = {}  # Last known totals of all workers
+        self._deltas: dict[CounterKey, int] = {}  # Counted here since the last sync
+        self._flushing: dict[CounterKey, int] = {}  # Sent in the running sync
+        self._expiry: dict[CounterKey, float] = {}
+        self._breakers: dict[str, BreakerRecord] = {}
+        self._breaker_names: set[str] = set()
+        self._pending_breakers: dict[str, BreakerRecord] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    # Request path: dictionaries only, no I/O and no locks
+
+    def incr(self, key: str, window_start: int, expires_at: float, amount: int = 1) -> int:
+        counter_key = (key, window_start)
+        self._deltas[counter_key] = self._deltas.get(counter_key, 0) + amount
+        self._expiry[counter_key] = expires_at
+        return self.count(key, window_start)
+
+    def count(self, key: str, window_start: int) -> int:
+        counter_key = (key, window_start)
+        return (
+            self._totals.get(counter_key, 0)
+            + self._flushing.get(counter_key, 0)
+            + self._deltas.get(counter_key, 0)
+        )
+
+    def clear(self, key: str) -> None:
+        """Forget a key locally; other workers' counts return on the next sync."""
+        for store in (self._totals, self._deltas, self._expiry):
+            for counter_key in [counter_key for counter_key in store if counter_key[0] == key]:
+                del store[counter_key]
+
+    def reset(self) -> None:
+        self._totals.clear()
+        self._deltas.clear()
+        self._expiry.clear()
+
+    def breaker(self, name: str) -> Optional[BreakerRecord]:
+        """Latest known transition of a breaker; the name is synced from now on."""
+        self._breaker_names.add(name)
+        return self._breakers.get(name)
+
+    def record_breaker(self, name: str, state: str, changed_at: float) -> None:
+        record = BreakerRecord(state, changed_at)
+        self._breakers[name] = record
+        self._breaker_names.add(name)
+        self._pending_breakers[name] = record
+
+    # Background sync
+
+    async def sync(self) -> None:
+        started_at = time.perf_counter()
+        try:
+            await self._sync_counters()
+            await self._sync_breakers()
+        except Exception:
+            if METRICS_AVAILABLE and shared_state_sync_errors_metric is not None:
+                shared_state_sync_errors_metric.labels(backend=self.backend.name).inc()
+            raise
+        finally:
+            if METRICS_AVAILABLE and shared_state_sync_duration_metric is not None:
+                shared_state_sync_duration_metric.labels(backend=self.backend.name).observe(
+                    time.perf_counter() - started_at
+                )
+
+    async def _sync_counters(self) -> None:
+        now = time.time()
+        for counter_key in [counter_key for counter_key, expires_at in self._expiry.items() if expires_at <= now]:
+            self._expiry.pop(counter_key, None)
+            self._totals.pop(counter_key, None)
+            self._deltas.pop(counter_key, None)
+
+        self._flushing, self._deltas = self._deltas, {}
+        try:
+            totals = await self.backend.sync_counters(self._flushing, dict(self._expiry))
+        except Exception:
+            # Keep the counts for the next attempt
+            for counter_key, amount in self._flushing.items():
+                self._deltas[counter_key] = self._deltas.get(counter_key, 0) + amount
+            raise
+        else:
+            for counter_key, total in totals.items():
+                if counter_key in self._expiry:
+                    self._totals[counter_key] = total
+        finally:
+            self._flushing = {}
+
+    async def _sync_breakers(self) -> None:
+        pending, self._pending_breakers = self._pending_breakers, {}
+        try:
+            records = await self.backend.sync_breakers(pending, list(self._breaker_names))
+        except Exception:
+            for name, record in pending.items():
+                self._pending_breakers.setdefault(name, record)
+            raise
+        for name, record in records.items():
+            known = self._breakers.get(name)
+            if known is None or record.changed_at > known.changed_at:
+                self._breakers[name] = record
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="shared-state-sync")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.sync()
+        except Exception as exc:  # noqa: BLE001 - shutdown best effort
+            logger.warning("Final shared state sync failed: %s", exc)
+        await self.backend.close()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync()
+            except Exception as exc:  # noqa: BLE001 - keep syncing
+                logger.warning("Shared state sync with %s failed: %s", self.backend.name, exc)
+
+
+@lru_cache
+def get_shared_state() -> Optional[SharedStateCache]:
+    """The worker's shared-state cache, or None when state is per-process ("local")."""
+    settings = get_settings()
+    backend: SharedStateBackend
+    if settings.shared_state_backend == "local":
+        return None
+    if settings.shared_state_backend == "shm":
+        backend = SharedMemoryBackend(settings.shared_state_shm_path, slots=settings.shared_state_shm_slots)
+    elif settings.shared_state_backend == "postgres":
+        backend = PostgresBackend()
+    else:
+        raise ValueError(f"Unknown shared_state_backend: {settings.shared_state_backend!r}")
+    return SharedStateCache(backend, sync_interval=settings.shared_state_sync_interval_seconds)
+
+
+def start_shared_state_sync() -> None:
+    shared_state = get_shared_state()
+    if shared_state is not None:
+        shared_state.start()
+
+
+async def stop_shared_state_sync() -> None:
+    shared_state = get_shared_state()
+    if shared_state is not None:
+        await shared_state.stop()
+
+
+__all__ = [
+    "SharedStateCache",
+    "get_shared_state",
+    "start_shared_state_sync",
+    "stop_shared_state_sync",
+]
@@ -0,0 +1,73 @@
+"""
+`limits` storage counting rate-limit hits across workers.
+
+Registered for the `ava-shared://` scheme. Windows are aligned on the clock
+(`floor(now / expiry)`) so every worker counts the same window; counts come
+from the worker's `SharedStateCache`, so a hit never waits on the backend.
+"""
+
+from __future__ import annotations
+
+import time
+
+from limits.storage import Storage
+
+from api.src.infrastructure.shared_state.cache import get_shared_state
+
+STORAGE_URI = "ava-shared://"
+
+
+class SharedRateLimitStorage(Storage):
+    STORAGE_SCHEME = ["ava-shared"]
+
+    def __init__(self, uri: str | None = None, wrap_exceptions: bool = False, **options: float | str | bool) -> None:
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        shared_state = get_shared_state()
+        if shared_state is None:
+            raise ValueError("ava-shared:// rate limit storage needs a shared_state_backend other than 'local'")
+        self._state = shared_state
+        self._windows: dict[str, tuple[int, int]] = {}  # key -> (window start, expiry)
+
+    @property
+    def base_exceptions(self) -> type[Exception] | tuple[type[Exception], ...]:
+        return ValueError
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        expiry = max(int(expiry), 1)
+        window_start = int(time.time() // expiry * expiry)
+        self._windows[key] = (window_start, expiry)
+        return self._state.incr(key, window_start, window_start + expiry, amount)
+
+    def get(self, key: str) -> int:
+        window = self._current_window(key)
+        return self._state.count(key, window[0]) if window else 0
+
+    def get_expiry(self, key: str) -> float:
+        window = self._current_window(key)
+        return float(window[0] + window[1]) if window else time.time()
+
+    def check(self) -> bool:
+        return True
+
+    def reset(self) -> int | None:
+        self._windows.clear()
+        self._state.reset()
+        return None
+
+    def clear(self, key: str) -> None:
+        self._windows.pop(key, None)
+        self._state.clear(key)
+
+    def _current_window(self, key: str) -> tuple[int, int] | None:
+        window = self._windows.get(key)
+        if window is None or window[0] + window[1] <= time.time():
+            return None
+        return window
+
+
+def rate_limit_storage_uri() -> str:
+    """Storage for slowapi: shared across workers unless the backend is "local"."""
+    return STORAGE_URI if get_shared_state() is not None else "memory://"
+
+
+__all__ = ["STORAGE_URI", "SharedRateLimitStorage", "rate_limit_storage_uri"]
@@ -8,7 +8,9 @@ from api.src.presentation.api.v1.routes import (
     analytics,
     assistants,
     auth,
+    callers,
     calls,
+    campaigns,
     integrations,
     phone_numbers,
     runtime,
@@ -28,6 +30,8 @@ api_v1_router.include_router(runtime.router)
 api_v1_router.include_router(studio_config.router)
 api_v1_router.include_router(assistants.router)
 api_v1_router.include_router(calls.router)
+api_v1_router.include_router(callers.router)
+api_v1_router.include_router(campaigns.router)
 api_v1_router.include_router(analytics.router)
 api_v1_router.include_router(voices.router)
 api_v1_router.include_router(twilio.router)
@@ -19,9 +19,11 @@ from api.src.application.services.analytics import (
     recent_calls_with_transcripts,
     synchronise_calls_from_vapi,
 )
-from api.src.application.services.email import get_user_email_service
+from api.src.application.services.email_outbox import email_outbox, enqueue_email
 from api.src.application.services.tenant import ensure_tenant_for_user
+from api.src.infrastructure.email.templating import render_template
 from api.src.infrastructure.external.vapi_client import VapiApiError, VapiClient
+from api.src.infrastructure.database.replica import get_read_session
 from api.src.infrastructure.database.session import get_session
 from api.src.infrastructure.persistence.models.call import CallRecord
 from api.src.infrastructure.persistence.models.studio_config import StudioConfig as StudioConfigModel
@@ -59,18 +61,16 @@ async def _sync_calls(session: AsyncSession, tenant_id, client: VapiClient) -> N
 async def analytics_overview(
     user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
+    read_session: AsyncSession = Depends(get_read_session),
 ) -> dict[str, object]:
-    # 🔥 DIVINE FIX: Refresh user from DB to get latest vapi_api_key
-    await session.refresh(user)
-    
     client = _client(user)
     tenant = await ensure_tenant_for_user(session, user)
     tenant_id = tenant.id
     await _sync_calls(session, tenant_id, client)
 
-    overview = await compute_overview_metrics(session, tenant_id=tenant_id)
-    calls = await recent_calls_with_transcripts(session, tenant_id=tenant_id)
-    topics = await compute_trending_topics(session, tenant_id=tenant_id, limit=6)
+    overview = await compute_overview_metrics(read_session, tenant_id=tenant_id)
+    calls = await recent_calls_with_transcripts(read_session, tenant_id=tenant_id)
+    topics = await compute_trending_topics(read_session, tenant_id=tenant_id, limit=6)
 
     return {
         "overview": overview,
@@ -83,14 +83,12 @@ async def analytics_overview(
 async def analytics_timeseries(
     user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
+    read_session: AsyncSession = Depends(get_read_session),
 ) -> dict[str, object]:
-    # 🔥 DIVINE FIX: Refresh user from DB to get latest vapi_api_key
-    await session.refresh(user)
-    
     client = _client(user)
     tenant = await ensure_tenant_for_user(session, user)
     await _sync_calls(session, tenant.id, client)
-    series = await compute_time_series(session, tenant_id=tenant.id)
+    series = await compute_time_series(read_session, tenant_id=tenant.id)
     return {"series": series}
 
 
@@ -98,14 +96,12 @@ async def analytics_timeseries(
 async def analytics_topics(
     user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
+    read_session: AsyncSession = Depends(get_read_session),
 ) -> dict[str, object]:
-    # 🔥 DIVINE FIX: Refresh user from DB to get latest vapi_api_key
-    await session.refresh(user)
-    
     client = _client(user)
     tenant = await ensure_tenant_for_user(session, user)
     await _sync_calls(session, tenant.id, client)
-    topics = await compute_trending_topics(session, tenant_id=tenant.id)
+    topics = await compute_trending_topics(read_session, tenant_id=tenant.id)
     return {"topics": topics}
 
 
@@ -113,14 +109,12 @@ async def analytics_topics(
 async def analytics_anomalies(
     user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
+    read_session: AsyncSession = Depends(get_read_session),
 ) -> dict[str, object]:
-    # 🔥 DIVINE FIX: Refresh user from DB to get latest vapi_api_key
-    await session.refresh(user)
-    
     client = _client(user)
     tenant = await ensure_tenant_for_user(session, user)
     await _sync_calls(session, tenant.id, client)
-    anomalies = await detect_anomalies(session, tenant_id=tenant.id)
+    anomalies = await detect_anomalies(read_session, tenant_id=tenant.id)
     return {"anomalies": anomalies}
 
 
@@ -128,14 +122,12 @@ async def analytics_anomalies(
 async def analytics_heatmap(
     user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
+    read_session: AsyncSession = Depends(get_read_session),
 ) -> dict[str, object]:
-    # 🔥 DIVINE FIX: Refresh user from DB to get latest vapi_api_key
-    await session.refresh(user)
-    
     client = _client(user)
     tenant = await ensure_tenant_for_user(session, user)
     await _sync_calls(session, tenant.id, client)
-    heatmap = await compute_activity_heatmap(session, tenant_id=tenant.id)
+    heatmap = await compute_activity_heatmap(read_session, tenant_id=tenant.id)
     return {"heatmap": heatmap}
 
 
@@ -175,113 +167,30 @@ async def send_call_transcript_email(
 
     studio_config = await _load_studio_config(session, user.id)
 
-    # Parse transcript into lines
-    transcript_lines = []
+    # Parse transcript into turns
+    turns = []
     if call.transcript:
         for line in call.transcript.split('\n'):
             line = line.strip()
             if line.startswith('AI:'):
-                transcript_lines.append({
-                    'speaker': 'AI',
-                    'text': line[3:].strip()
-                })
+                turns.append({'is_assistant': True, 'text': line[3:].strip()})
             elif line.startswith('User:'):
-                transcript_lines.append({
-                    'speaker': 'User',
-                    'text': line[5:].strip()
-                })
-
-    # Build HTML email
-    html_content = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Call Transcript - AVA</title>
-</head>
-<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); min-height: 100vh;">
-    <div style="max-width: 800px; margin: 0 auto; padding: 40px 20px;">
-        <!-- Header -->
-        <div style="text-align: center; margin-bottom: 40px;">
-            <h1 style="color: white; font-size: 48px; font-weight: 800; margin: 0 0 16px 0; text-shadow: 0 2px 10px rgba(0,0,0,0.2);">
-                ✨ AVA
-            </h1>
-            <p style="color: rgba(255,255,255,0.9); font-size: 18px; margin: 0;">
-                Call Transcript
-            </p>
-        </div>
-
-        <!-- Card -->
-        <div style="background: rgba(255, 255, 255, 0.95); backdrop-filter: blur(10px); border-radius: 24px; box-shadow: 0 20px 60px rgba(0,0,0,0.3); padding: 40px; margin-bottom: 24px;">
-            <!-- Call Info -->
-            <div style="border-bottom: 1px solid rgba(0,0,0,0.1); padding-bottom: 24px; margin-bottom: 32px;">
-                <h2 style="margin: 0 0 16px 0; font-size: 24px; font-weight: 700; color: #1a202c;">
-                    📞 Call Details
-                </h2>
-                <div style="display: grid; gap: 12px; font-size: 14px; color: #4a5568;">
-                    <div><strong>Phone Number:</strong> {call.customer_number or 'N/A'}</div>
-                    <div><strong>Status:</strong> <span style="display: inline-block; padding: 4px 12px; background: #48bb78; color: white; border-radius: 12px; font-size: 12px; font-weight: 600;">{call.status}</span></div>
-                    <div><strong>Duration:</strong> {call.duration_seconds or 0}s</div>
-                    <div><strong>Cost:</strong> ${(call.cost if call.cost else 0):.4f}</div>
-                    <div><strong>Date:</strong> {call.started_at.strftime('%Y-%m-%d %H:%M:%S UTC') if call.started_at else 'N/A'}</div>
-                </div>
-            </div>
-
-            <!-- Transcript -->
-            <div>
-                <h2 style="margin: 0 0 24px 0; font-size: 24px; font-weight: 700; color: #1a202c;">
-                    💬 Conversation
-                </h2>
-                <div style="display: flex; flex-direction: column; gap: 20px;">
-"""
-
-    # Add transcript messages
-    for msg in transcript_lines:
-        if msg['speaker'] == 'AI':
-            html_content += f"""
-                    <div style="display: flex; align-items: start; gap: 12px;">
-                        <div style="flex-shrink: 0; width: 40px; height: 40px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 50%; display: flex; align-items: center; justify-content: center; color: white; font-weight: 600;">
-                            AI
-                        </div>
-                        <div style="flex: 1; background: #f7fafc; border: 1px solid #e2e8f0; border-radius: 16px; padding: 16px; max-width: 70%;">
-                            <div style="font-size: 12px; font-weight: 600; color: #667eea; margin-bottom: 8px;">AVA Assistant</div>
-                            <div style="font-size: 14px; color: #2d3748; line-height: 1.6;">{msg['text']}</div>
-                        </div>
-                    </div>
-"""
-        else:
-            html_content += f"""
-                    <div style="display: flex; align-items: start; gap: 12px; flex-direction: row-reverse;">
-                        <div style="flex-shrink: 0; width: 40px; height: 40px; background: linear-gradient(135deg, #4299e1 0%, #38b2ac 100%); border-radius: 50%; display: flex; align-items: center; justify-content: center; color: white; font-weight: 600;">
-                            U
-                        </div>
-                        <div style="flex: 1; background: #ebf8ff; border: 1px solid #bee3f8; border-radius: 16px; padding: 16px; max-width: 70%;">
-                            <div style="font-size: 12px; font-weight: 600; color: #4299e1; margin-bottom: 8px;">Customer</div>
-                            <div style="font-size: 14px; color: #2d3748; line-height: 1.6;">{msg['text']}</div>
-                        </div>
-                    </div>
-"""
-
-    html_content += """
-                </div>
-            </div>
-        </div>
-
-        <!-- Footer -->
-        <div style="text-align: center; color: rgba(255,255,255,0.8); font-size: 12px;">
-            <p style="margin: 0 0 8px 0;">Powered by AVA - AI Voice Assistant Platform</p>
-            <p style="margin: 0; opacity: 0.7;">This is an automated email. Please do not reply.</p>
-        </div>
-    </div>
-</body>
-</html>
-"""
-
-    # Send email
-    try:
-        email_service = get_user_email_service(studio_config)
+                turns.append({'is_assistant': False, 'text': line[5:].strip()})
+
+    html_content = render_template(
+        "call_transcript.html",
+        call={
+            "phone_number": call.customer_number or "N/A",
+            "status": call.status,
+            "duration_seconds": call.duration_seconds or 0,
+            "cost": f"{(call.cost if call.cost else 0):.4f}",
+            "started_at": call.started_at.strftime('%Y-%m-%d %H:%M:%S UTC') if call.started_at else "N/A",
+        },
+        turns=turns,
+    )
 
+    # Queue email (delivered by the email outbox workers)
+    try:
         recipient_email = (
             (studio_config.fallback_email or studio_config.summary_email) if studio_config else None
         ) or user.email
@@ -292,16 +201,20 @@ async def send_call_transcript_email(
                 detail="No recipient email configured for transcript delivery.",
             )
 
-        result = await email_service.send_email(
-            to=[recipient_email],
+        outbox_email = enqueue_email(
+            session,
+            to=recipient_email,
             subject=f"📞 Call Transcript - {call.customer_number or call_id[:8]}",
-            html=html_content
+            html=html_content,
+            user_id=str(user.id),
         )
+        await session.commit()
+        email_outbox.notify()
 
         return {
             "status": "success",
-            "message": f"Transcript sent to {recipient_email}",
-            "email_id": result.get('id', 'unknown')
+            "message": f"Transcript queued for {recipient_email}",
+            "email_id": f"outbox:{outbox_email.id}"
         }
 
     except Exception as exc:
@@ -11,9 +11,10 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, EmailStr, Field, validator
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-import bcrypt
 import jwt
 
+from api.src.application.services.identity import identities
+from api.src.application.services.passwords import PasswordHasherBusyError, password_hasher
 from api.src.core.settings import get_settings
 from api.src.infrastructure.database.session import get_session
 from api.src.infrastructure.persistence.repositories.user_repository import UserRepository
@@ -134,25 +135,6 @@ class UserUpdateRequest(BaseModel):
     )
 
 
-# ============================================================================
-# Password Hashing (bcrypt)
-# ============================================================================
-
-def hash_password(password: str) -> str:
-    """Hash password using bcrypt (cost=12 for security)"""
-    salt = bcrypt.gensalt(rounds=12)
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return hashed.decode('utf-8')
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify password against hash"""
-    return bcrypt.checkpw(
-        plain_password.encode('utf-8'),
-        hashed_password.encode('utf-8')
-    )
-
-
 async def seed_default_users(session: AsyncSession):
     """Seed default users for development (run once on startup)."""
     repository = UserRepository(session)
@@ -167,7 +149,7 @@ async def seed_default_users(session: AsyncSession):
         try:
             await repository.create(
                 email=fixture["email"],
-                password=hash_password(fixture["password"]),
+                password=await password_hasher.hash(fixture["password"]),
                 name=fixture.get("name"),
                 phone=fixture.get("phone"),
                 locale=fixture.get("locale", "en"),
@@ -252,8 +234,8 @@ async def signup(
             detail="Email already registered"
         )
 
-    # Hash password
-    hashed_pwd = hash_password(data.password)
+    # Hash password (bcrypt, off the event loop)
+    hashed_pwd = await password_hasher.hash(data.password)
 
     # Create user in database
     try:
@@ -325,13 +307,22 @@ async def login(
             detail="Invalid credentials"
         )
 
-    # Verify password
-    if not verify_password(data.password, user.password):
+    # Verify password (bcrypt, off the event loop)
+    if not await password_hasher.verify(data.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
         )
 
+    # Upgrade hashes made with another cost factor; never fail the login over it
+    if password_hasher.needs_rehash(user.password):
+        try:
+            user.password = await password_hasher.hash(data.password)
+            await session.commit()
+            identities.invalidate_user(user.id)
+        except PasswordHasherBusyError:
+            pass
+
     # Generate tokens
     access_token_expires = timedelta(days=30) if data.remember else timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
 
@@ -456,6 +447,7 @@ async def update_current_user_profile(
             detail="User not found",
         )
 
+    identities.invalidate_user(str(updated_user.id))
     return serialize_user(updated_user)
 
 
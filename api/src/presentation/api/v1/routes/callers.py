@@ -0,0 +1,69 @@
+"""Caller directory REST endpoints."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.src.domain.entities.caller import Caller, normalize_phone_number
+from api.src.infrastructure.database.session import get_session
+from api.src.infrastructure.persistence.models.user import User
+from api.src.infrastructure.persistence.repositories.caller_repository import get_caller, list_callers
+from api.src.presentation.dependencies.auth import get_current_user
+
+router = APIRouter(prefix="/callers", tags=["callers"])
+
+
+def _serialize(caller: Caller) -> dict:
+    return {
+        "id": caller.id.value,
+        "phoneNumber": caller.phone_number,
+        "firstName": caller.first_name,
+        "lastName": caller.last_name,
+        "fullName": caller.full_name,
+        "email": caller.email,
+        "notes": caller.notes,
+        "firstSeenAt": caller.created_at.isoformat() if caller.created_at else None,
+        "lastSeenAt": caller.last_seen_at.isoformat() if caller.last_seen_at else None,
+        "callCount": caller.call_count,
+    }
+
+
+@router.get("")
+async def list_tenant_callers(
+    search: Optional[str] = Query(None, max_length=100),
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    List callers who have called this account, most recent first.
+
+    Query params:
+    - search: Match on phone number, name or email
+    - limit / offset: Pagination
+    """
+
+    records = await list_callers(session, user.id, search=search, limit=limit, offset=offset)
+    return {"callers": [_serialize(record.to_entity()) for record in records], "count": len(records)}
+
+
+@router.get("/{phone_number}")
+async def get_tenant_caller(
+    phone_number: str,
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """Get a caller by phone number."""
+
+    number = normalize_phone_number(phone_number)
+    record = await get_caller(session, user.id, number) if number else None
+    if record is None:
+        raise HTTPException(status_code=404, detail="Caller not found")
+    return _serialize(record.to_entity())
+
+
+__all__ = ["router"]
@@ -6,17 +6,23 @@ from typing import Optional
 from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.src.application.services.live_transcripts import live_transcripts
+from api.src.infrastructure.database.replica import get_read_session
 from api.src.infrastructure.database.session import get_session
+from api.src.infrastructure.persistence.models.studio_config import StudioConfig
 from api.src.infrastructure.persistence.models.user import User
 from api.src.presentation.dependencies.auth import get_current_user
 from api.src.infrastructure.persistence.repositories.call_repository import (
+    clear_transcripts,
     delete_call_record,
     get_call_by_id,
     get_recent_calls,
-    scrub_transcript_if_expired,
+    transcript_expired,
 )
+from api.src.infrastructure.persistence.repositories.transcript_repository import get_transcript_turns
 
 router = APIRouter(prefix="/calls", tags=["calls"])
 TRANSCRIPT_RETENTION = timedelta(hours=24)
@@ -28,6 +34,7 @@ async def list_calls(
     status: Optional[str] = Query(None),
     user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
+    read_session: AsyncSession = Depends(get_read_session),
 ):
     """
     List recent calls with optional status filter.
@@ -37,18 +44,16 @@ async def list_calls(
     - status: Filter by status (in-progress, ended, failed)
     """
 
-    calls = await get_recent_calls(session, tenant_id=str(user.id), limit=limit)
+    calls = await get_recent_calls(read_session, tenant_id=str(user.id), limit=limit)
     now_utc = datetime.now(timezone.utc)
-    scrubbed = False
-    for call in calls:
-        scrubbed |= await scrub_transcript_if_expired(
-            session,
-            call,
-            now=now_utc,
-            retention=TRANSCRIPT_RETENTION,
-        )
-
-    if scrubbed:
+    expired = {
+        call.id
+        for call in calls
+        if transcript_expired(call, now=now_utc, retention=TRANSCRIPT_RETENTION)
+    }
+    if expired:
+        # Scrubbed on the primary; the replica catches up
+        await clear_transcripts(session, expired)
         await session.commit()
 
     if status:
@@ -65,7 +70,9 @@ async def list_calls(
                 "endedAt": call.ended_at.isoformat() if call.ended_at else None,
                 "durationSeconds": call.duration_seconds,
                 "cost": call.cost,
-                "transcriptPreview": call.transcript[:200] if call.transcript else None,
+                "transcriptPreview": (
+                    call.transcript[:200] if call.transcript and call.id not in expired else None
+                ),
             }
             for call in calls
         ],
@@ -78,22 +85,19 @@ async def get_call_detail(
     call_id: str,
     user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
+    read_session: AsyncSession = Depends(get_read_session),
 ):
     """
     Get full call details including transcript.
     """
 
-    call = await get_call_by_id(session, call_id)
+    call = await get_call_by_id(read_session, call_id)
     if not call or str(call.tenant_id) != str(user.id):
         raise HTTPException(status_code=404, detail="Call not found")
 
-    scrubbed = await scrub_transcript_if_expired(
-        session,
-        call,
-        now=datetime.now(timezone.utc),
-        retention=TRANSCRIPT_RETENTION,
-    )
-    if scrubbed:
+    expired = transcript_expired(call, now=datetime.now(timezone.utc), retention=TRANSCRIPT_RETENTION)
+    if expired:
+        await clear_transcripts(session, [call.id])
         await session.commit()
 
     return {
@@ -105,23 +109,75 @@ async def get_call_detail(
         "endedAt": call.ended_at.isoformat() if call.ended_at else None,
         "durationSeconds": call.duration_seconds,
         "cost": call.cost,
-        "transcript": call.transcript,
+        "transcript": None if expired else call.transcript,
         "metadata": call.meta,
         "recordingUrl": call.meta.get("recordingUrl") if isinstance(call.meta, dict) else None,
     }
 
 
+@router.get("/{call_id}/live")
+async def get_live_call_transcript(
+    call_id: str,
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Get the transcript of a call while it is still running.
+
+    Served from this worker's live buffer when available, otherwise from the
+    turns flushed to Postgres by any worker.
+    """
+
+    live = live_transcripts.get(call_id)
+    if live is not None:
+        user_id, assistant_id = live.user_id, live.assistant_id
+        turns = live.structured()
+    else:
+        rows = await get_transcript_turns(session, call_id)
+        if not rows:
+            raise HTTPException(status_code=404, detail="Call not found")
+        user_id, assistant_id = rows[-1].user_id, rows[-1].assistant_id
+        turns = [row.to_dict() for row in rows]
+
+    if not await _owns_live_call(session, user, user_id=user_id, assistant_id=assistant_id):
+        raise HTTPException(status_code=404, detail="Call not found")
+
+    return {
+        "id": call_id,
+        "assistantId": assistant_id,
+        "live": live is not None,
+        "turns": turns,
+    }
+
+
+async def _owns_live_call(
+    session: AsyncSession,
+    user: User,
+    *,
+    user_id: Optional[str],
+    assistant_id: Optional[str],
+) -> bool:
+    if user_id:
+        return str(user_id) == str(user.id)
+    if not assistant_id:
+        return False
+    result = await session.execute(
+        select(StudioConfig.vapi_assistant_id).where(StudioConfig.user_id == user.id)
+    )
+    return result.scalar_one_or_none() == assistant_id
+
+
 @router.get("/{call_id}/recording")
 async def get_call_recording(
     call_id: str,
     user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
+    read_session: AsyncSession = Depends(get_read_session),
 ):
     """
     Get recording URL for a call.
     """
 
-    call = await get_call_by_id(session, call_id)
+    call = await get_call_by_id(read_session, call_id)
     if not call or str(call.tenant_id) != str(user.id):
         raise HTTPException(status_code=404, detail="Call not found")
 
@@ -0,0 +1,198 @@
+"""Outbound call campaign endpoints."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.src.application.services.campaigns import ContactListError, campaign_dialer, parse_contacts_csv
+from api.src.domain.entities.caller import normalize_phone_number
+from api.src.domain.value_objects.business_hours import BusinessHoursError, compile_schedule
+from api.src.infrastructure.database.session import get_session
+from api.src.infrastructure.persistence.models.campaign import (
+    CAMPAIGN_COMPLETED,
+    CAMPAIGN_DRAFT,
+    CAMPAIGN_PAUSED,
+    CAMPAIGN_RUNNING,
+    Campaign,
+)
+from api.src.infrastructure.persistence.models.user import User
+from api.src.infrastructure.persistence.repositories.campaign_repository import (
+    add_campaign_contacts,
+    get_campaign,
+    get_campaign_progress,
+    list_campaigns,
+)
+from api.src.presentation.dependencies.auth import get_current_user
+
+router = APIRouter(prefix="/campaigns", tags=["campaigns"])
+
+
+class CreateCampaignRequest(BaseModel):
+    name: str = Field(..., min_length=1, max_length=200)
+    from_number: str = Field(..., description="Twilio number calls are placed from (E.164)")
+    twiml_url: str = Field(..., max_length=500, description="TwiML fetched when a call connects")
+    schedule: Optional[str] = Field(
+        None, description='Calling windows, e.g. "mon-fri 09:00-12:00,14:00-18:00". Empty: any time.'
+    )
+    timezone: str = Field("UTC", max_length=64)
+    max_concurrent_calls: int = Field(5, ge=1, le=100)
+    max_attempts: int = Field(3, ge=1, le=10)
+    retry_delay_minutes: int = Field(15, ge=1, le=24 * 60)
+
+
+class UploadContactsRequest(BaseModel):
+    csv: str = Field(..., description="CSV with a header row and a phone column")
+
+
+def _serialize(campaign: Campaign, progress: Optional[dict[str, int]] = None) -> dict:
+    data = {
+        "id": campaign.id,
+        "name": campaign.name,
+        "status": campaign.status,
+        "fromNumber": campaign.from_number,
+        "twimlUrl": campaign.twiml_url,
+        "schedule": campaign.schedule,
+        "timezone": campaign.timezone,
+        "maxConcurrentCalls": campaign.max_concurrent_calls,
+        "maxAttempts": campaign.max_attempts,
+        "retryDelayMinutes": campaign.retry_delay_seconds // 60,
+        "createdAt": campaign.created_at.isoformat() if campaign.created_at else None,
+        "startedAt": campaign.started_at.isoformat() if campaign.started_at else None,
+        "completedAt": campaign.completed_at.isoformat() if campaign.completed_at else None,
+    }
+    if progress is not None:
+        data["progress"] = {"total": sum(progress.values()), **progress}
+    return data
+
+
+async def _get_owned(session: AsyncSession, user: User, campaign_id: str) -> Campaign:
+    campaign = await get_campaign(session, user.id, campaign_id)
+    if campaign is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+    return campaign
+
+
+@router.post("", status_code=status.HTTP_201_CREATED)
+async def create_campaign(
+    request: CreateCampaignRequest,
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """Create a draft campaign; upload contacts, then start it."""
+
+    try:
+        compile_schedule(request.schedule, timezone_name=request.timezone)
+    except BusinessHoursError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+
+    from_number = normalize_phone_number(request.from_number)
+    if from_number is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid from number {request.from_number!r}",
+        )
+
+    campaign = Campaign(
+        user_id=str(user.id),
+        name=request.name,
+        from_number=from_number,
+        twiml_url=request.twiml_url,
+        status=CAMPAIGN_DRAFT,
+        schedule=(request.schedule or "").strip() or None,
+        timezone=request.timezone,
+        max_concurrent_calls=request.max_concurrent_calls,
+        max_attempts=request.max_attempts,
+        retry_delay_seconds=request.retry_delay_minutes * 60,
+        created_at=datetime.now(timezone.utc),
+    )
+    session.add(campaign)
+    await session.commit()
+    return _serialize(campaign, {})
+
+
+@router.get("")
+async def list_tenant_campaigns(
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    campaigns = await list_campaigns(session, user.id)
+    return {"campaigns": [_serialize(campaign) for campaign in campaigns]}
+
+
+@router.get("/{campaign_id}")
+async def get_campaign_detail(
+    campaign_id: str,
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """Campaign settings and dialing progress (contacts per status)."""
+
+    campaign = await _get_owned(session, user, campaign_id)
+    return _serialize(campaign, await get_campaign_progress(session, campaign.id))
+
+
+@router.post("/{campaign_id}/contacts")
+async def upload_contacts(
+    campaign_id: str,
+    request: UploadContactsRequest,
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """Add contacts from a CSV list. Invalid or duplicate rows are reported and skipped.
+
+    Numbers already in the campaign are not added again.
+    """
+
+    campaign = await _get_owned(session, user, campaign_id)
+    if campaign.status == CAMPAIGN_COMPLETED:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Campaign is completed")
+    try:
+        contacts, errors = parse_contacts_csv(request.csv)
+    except ContactListError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+
+    imported = await add_campaign_contacts(session, campaign.id, contacts)
+    await session.commit()
+    if campaign.status == CAMPAIGN_RUNNING:
+        campaign_dialer.notify()
+    return {"imported": imported, "errors": errors}
+
+
+@router.post("/{campaign_id}/start")
+async def start_campaign(
+    campaign_id: str,
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    campaign = await _get_owned(session, user, campaign_id)
+    if campaign.status not in (CAMPAIGN_DRAFT, CAMPAIGN_PAUSED):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Campaign is {campaign.status}")
+    campaign.status = CAMPAIGN_RUNNING
+    campaign.started_at = campaign.started_at or datetime.now(timezone.utc)
+    await session.commit()
+    campaign_dialer.notify()
+    return _serialize(campaign)
+
+
+@router.post("/{campaign_id}/pause")
+async def pause_campaign(
+    campaign_id: str,
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """Stop placing new calls; calls already in progress finish normally."""
+
+    campaign = await _get_owned(session, user, campaign_id)
+    if campaign.status != CAMPAIGN_RUNNING:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Campaign is {campaign.status}")
+    campaign.status = CAMPAIGN_PAUSED
+    await session.commit()
+    return _serialize(campaign)
+
+
+__all__ = ["router"]
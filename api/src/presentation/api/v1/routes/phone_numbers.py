@@ -4,14 +4,12 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field, field_validator
 from typing import Optional
 import logging
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.src.application.services.vapi import get_vapi_client_for_user
-from api.src.infrastructure.database.session import get_session
 from api.src.infrastructure.persistence.models.user import User
 from api.src.presentation.dependencies.auth import get_current_user
 from api.src.core.settings import get_settings
-from twilio.rest import Client as TwilioClient
+from api.src.infrastructure.external.twilio_client import AsyncTwilioClient
 
 router = APIRouter(prefix="/phone-numbers", tags=["phone"])
 logger = logging.getLogger(__name__)
@@ -76,7 +74,6 @@ def _get_vapi_client(user: User):
 async def create_us_number(
     request: CreateUSNumberRequest,
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_session),
 ):
     """
     Create a free US phone number via Vapi.
@@ -94,9 +91,6 @@ async def create_us_number(
             }
         }
     """
-    # 🔥 DIVINE FIX: Refresh user from DB to get latest vapi_api_key
-    await db.refresh(user)
-    
     try:
         vapi = _get_vapi_client(user)
 
@@ -152,7 +146,6 @@ async def create_us_number(
 async def import_twilio_number(
     request: ImportTwilioRequest,
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_session),
 ):
     """
     Import an existing Twilio number into Vapi.
@@ -179,9 +172,6 @@ async def import_twilio_number(
             "message": "Numéro importé avec succès"
         }
     """
-    # 🔥 DIVINE FIX: Refresh user from DB to get latest vapi_api_key + twilio credentials
-    await db.refresh(user)
-    
     try:
         # 🔥 DIVINE: Auto-liaison intelligente si pas d'assistant_id fourni
         assistant_id = request.assistant_id
@@ -214,10 +204,10 @@ async def import_twilio_number(
                 )
 
         # 1. Verify Twilio number exists
-        twilio = TwilioClient(request.twilio_account_sid, request.twilio_auth_token)
+        twilio = AsyncTwilioClient(request.twilio_account_sid, request.twilio_auth_token)
 
         try:
-            numbers = twilio.incoming_phone_numbers.list(
+            numbers = await twilio.list_incoming_phone_numbers(
                 phone_number=request.phone_number, limit=1
             )
 
@@ -323,10 +313,10 @@ async def verify_twilio_credentials(request: VerifyTwilioRequest):
         }
     """
     try:
-        client = TwilioClient(request.account_sid, request.auth_token)
+        client = AsyncTwilioClient(request.account_sid, request.auth_token)
 
         # Test: verify number exists in this account
-        numbers = client.incoming_phone_numbers.list(
+        numbers = await client.list_incoming_phone_numbers(
             phone_number=request.phone_number, limit=1
         )
 
@@ -339,10 +329,10 @@ async def verify_twilio_credentials(request: VerifyTwilioRequest):
         phone_obj = numbers[0]
 
         # Extract country code from E.164 number (e.g., +33 → FR, +972 → IL, +1 → US)
-        country_code = getattr(phone_obj, 'iso_country', None)
+        country_code = phone_obj.get('iso_country')
         if not country_code:
             # Fallback: extract from phone number
-            phone_str = phone_obj.phone_number
+            phone_str = phone_obj.get('phone_number') or ''
             if phone_str.startswith('+33'):
                 country_code = 'FR'
             elif phone_str.startswith('+972'):
@@ -354,7 +344,7 @@ async def verify_twilio_credentials(request: VerifyTwilioRequest):
 
         return {
             "valid": True,
-            "number": phone_obj.phone_number,
+            "number": phone_obj.get("phone_number"),
             "country": country_code,
         }
 
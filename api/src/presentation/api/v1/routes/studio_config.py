@@ -6,6 +6,14 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.src.application.services.assistant_config import (
+    assistant_configs,
+    build_assistant_metadata,
+    build_assistant_prompt,
+    webhook_url as assistant_webhook_url,
+)
+from api.src.application.services.email import email_services
+from api.src.application.services.function_calls import tenant_contexts
 from api.src.infrastructure.database.session import get_session
 from api.src.infrastructure.persistence.models.user import User
 from api.src.infrastructure.persistence.models.studio_config import StudioConfig as StudioConfigModel
@@ -18,6 +26,7 @@ from api.src.presentation.schemas.studio_config import (
 from api.src.infrastructure.external.vapi_client import VapiApiError, VapiClient
 from api.src.core.settings import get_settings
 from api.src.core.crypto import get_smtp_encryptor, EncryptionError
+from api.src.domain.value_objects.business_hours import BusinessHoursError, compile_schedule
 
 router = APIRouter(prefix="/studio", tags=["Studio"])
 
@@ -85,8 +94,14 @@ def db_to_schema(db_config: StudioConfigModel) -> StudioConfig:
         timezone=db_config.timezone,
         phoneNumber=db_config.phone_number,
         businessHours=db_config.business_hours,
+        businessHoursEnforced=bool(db_config.business_hours_enforced),
+        holidays=db_config.holidays or [],
+        customFunctions=db_config.custom_functions or [],
         fallbackEmail=db_config.fallback_email,
         summaryEmail=db_config.summary_email,
+        summaryMode=db_config.summary_mode or "immediate",
+        digestIntervalMinutes=db_config.digest_interval_minutes or 60,
+        digestMaxCalls=db_config.digest_max_calls or 25,
         smtpServer=db_config.smtp_server,
         smtpPort=db_config.smtp_port,
         smtpUsername=db_config.smtp_username,
@@ -168,8 +183,13 @@ async def update_studio_config(
         "timezone": "timezone",
         "phoneNumber": "phone_number",
         "businessHours": "business_hours",
+        "holidays": "holidays",
+        "customFunctions": "custom_functions",
         "fallbackEmail": "fallback_email",
         "summaryEmail": "summary_email",
+        "summaryMode": "summary_mode",
+        "digestIntervalMinutes": "digest_interval_minutes",
+        "digestMaxCalls": "digest_max_calls",
         "smtpServer": "smtp_server",
         "smtpPort": "smtp_port",
         "smtpUsername": "smtp_username",
@@ -194,6 +214,25 @@ async def update_studio_config(
         "askForPhone": "ask_for_phone",
     }
 
+    if {"businessHours", "timezone", "holidays"} & data.keys():
+        try:
+            compile_schedule(
+                data.get("businessHours", db_config.business_hours),
+                timezone_name=data.get("timezone", db_config.timezone),
+                holidays=data.get("holidays", db_config.holidays),
+            )
+        except BusinessHoursError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid business hours: {exc}",
+            ) from exc
+
+    # Hours are only enforced once the tenant has set them (see schedule_for)
+    if {"businessHours", "holidays"} & data.keys():
+        db_config.business_hours_enforced = True
+
+    smtp_changed = bool({"smtpServer", "smtpPort", "smtpUsername", "smtpPassword"} & data.keys())
+
     if "smtpPassword" in data:
         password_value = data.pop("smtpPassword") or ""
         encryptor = get_smtp_encryptor()
@@ -212,6 +251,10 @@ async def update_studio_config(
 
     await db.commit()
     await db.refresh(db_config)
+    tenant_contexts.invalidate_user(str(current_user.id), db_config.vapi_assistant_id)
+    assistant_configs.invalidate_user(str(current_user.id), [db_config.phone_number])
+    if smtp_changed:
+        email_services.invalidate_user(str(current_user.id))
 
     return db_to_schema(db_config)
 
@@ -231,33 +274,13 @@ async def sync_config_to_vapi(
 
     This is THE MAGIC that makes your settings actually work!
     """
-    # 🔥 DIVINE FIX: Refresh user from DB to get latest vapi_api_key
-    # Without this, user object has stale data from JWT token
-    await db.refresh(current_user)
-    
     client = _client(current_user)
     db_config = await get_or_create_user_config(db, current_user)
     config = db_to_schema(db_config)
-    settings = get_settings()
-    webhook_url = f"{settings.backend_url.rstrip('/')}{settings.api_prefix}/webhooks/vapi"
+    webhook_url = assistant_webhook_url()
 
     # Build enhanced system prompt with caller info collection
-    enhanced_prompt = config.systemPrompt
-
-    # 🔥 DIVINE: Anti-repetition instruction
-    enhanced_prompt += "\n\n⚠️ CRITICAL: NEVER repeat yourself. If you already said something, move on to the next topic. Be concise and efficient."
-
-    if config.askForName:
-        enhanced_prompt += "\n\nCRITICAL INSTRUCTION: You MUST ask for the caller's name within the first 2 exchanges. This is mandatory."
-
-    if config.askForEmail:
-        enhanced_prompt += "\nIf appropriate for the conversation, politely ask for their email address."
-
-    if config.askForPhone:
-        enhanced_prompt += "\nIf appropriate, ask for their phone number for follow-up."
-
-    if config.guidelines:
-        enhanced_prompt += f"\n\nAdditional guidelines: {config.guidelines}"
+    enhanced_prompt = build_assistant_prompt(db_config)
 
     print("🔥 DIVINE SYNC STARTING:")
     print(f"   👤 User: {current_user.email} (ID: {current_user.id})")
@@ -287,17 +310,7 @@ async def sync_config_to_vapi(
             transcriber_provider=config.transcriberProvider,  # 🎧 NEW: Speech-to-Text
             transcriber_model=config.transcriberModel,
             transcriber_language=config.transcriberLanguage,
-            metadata={
-                "user_id": current_user.id,
-                "organization": config.organizationName,
-                "persona": config.persona,
-                "tone": config.tone,
-                "language": config.language,
-                "voice_speed": config.voiceSpeed,
-                "ask_for_name": config.askForName,
-                "ask_for_email": config.askForEmail,
-                "ask_for_phone": config.askForPhone,
-            },
+            metadata=build_assistant_metadata(db_config, current_user.id),
             functions=None,  # Disabled for now - Vapi format investigation needed
             server_url=webhook_url,
         )
@@ -309,6 +322,8 @@ async def sync_config_to_vapi(
         db_config.vapi_assistant_id = assistant_id
         await db.commit()
         await db.refresh(db_config)
+        tenant_contexts.invalidate_user(str(current_user.id), assistant_id)
+        assistant_configs.invalidate_user(str(current_user.id))
 
         print(f"✅ DIVINE SYNC {'UPDATE' if was_update else 'CREATE'} SUCCESS!")
         print(f"   🆔 Assistant ID: {assistant_id}")
@@ -17,6 +17,7 @@ from api.src.infrastructure.persistence.models.user import User
 from api.src.presentation.dependencies.auth import get_current_user
 from api.src.presentation.schemas.ava_profile import AvaProfileIn, AvaProfileOut
 from api.src.infrastructure.persistence.models.ava_profile import AvaProfile
+from api.src.application.services.assistant_config import assistant_configs
 from api.src.application.services.realtime_session import (
     build_session_config,
     build_system_prompt,
@@ -93,6 +94,7 @@ async def update_ava_profile(
 
     await session.commit()
     await session.refresh(profile)
+    assistant_configs.invalidate_user(str(user.id))
     return AvaProfileOut.from_model(profile)
 
 
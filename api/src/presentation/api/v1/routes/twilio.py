@@ -17,17 +17,17 @@ async def list_numbers(user: User = Depends(get_current_user)) -> dict[str, obje
     """List Twilio phone numbers for the current user's credentials."""
     try:
         client = get_twilio_client(user, allow_env_fallback=True)
-        numbers = client.incoming_phone_numbers.list(limit=50)
+        numbers = await client.list_incoming_phone_numbers(limit=50)
     except TwilioRestException as exc:
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
 
     return {
         "numbers": [
             {
-                "sid": number.sid,
-                "phoneNumber": number.phone_number,
-                "friendlyName": number.friendly_name,
-                "capabilities": number.capabilities,
+                "sid": number.get("sid"),
+                "phoneNumber": number.get("phone_number"),
+                "friendlyName": number.get("friendly_name"),
+                "capabilities": number.get("capabilities"),
             }
             for number in numbers
         ]
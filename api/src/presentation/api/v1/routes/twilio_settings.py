@@ -17,6 +17,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.src.application.services.assistant_config import assistant_configs
+from api.src.application.services.identity import identities
 from api.src.infrastructure.external.vapi_client import VapiClient
 from api.src.infrastructure.persistence.models.user import User
 from api.src.presentation.dependencies.auth import get_current_user
@@ -127,6 +129,8 @@ async def update_twilio_settings(
 
     await db.commit()
     await db.refresh(user)
+    identities.invalidate_user(str(user.id))
+    assistant_configs.invalidate_user(str(user.id), [settings.phone_number])
 
     return TwilioSettingsResponse(
         has_twilio_credentials=True,
@@ -190,5 +194,7 @@ async def delete_twilio_settings(
     user.twilio_phone_number = None
 
     await db.commit()
+    identities.invalidate_user(str(user.id))
+    assistant_configs.invalidate_user(str(user.id))
 
     return None
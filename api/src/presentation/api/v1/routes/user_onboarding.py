@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
 
+from api.src.application.services.identity import identities
 from api.src.infrastructure.database.session import get_session
 from api.src.infrastructure.persistence.models.user import User
 from api.src.presentation.dependencies.auth import get_current_user
@@ -77,6 +78,7 @@ async def update_onboarding_flags(
 
     await db.commit()
     await db.refresh(current_user)
+    identities.invalidate_user(str(current_user.id))
 
     return OnboardingResponse(
         onboarding_vapi_skipped=current_user.onboarding_vapi_skipped or False,
@@ -128,6 +130,7 @@ async def update_user_profile(
 
     await db.commit()
     await db.refresh(current_user)
+    identities.invalidate_user(str(current_user.id))
 
     return UserProfileResponse(
         id=current_user.id,
@@ -163,6 +166,7 @@ async def complete_onboarding(
 
     await db.commit()
     await db.refresh(current_user)
+    identities.invalidate_user(str(current_user.id))
 
     return CompleteOnboardingResponse(
         success=True,
@@ -6,6 +6,7 @@ from pydantic import BaseModel, Field
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.src.application.services.identity import identities
 from api.src.infrastructure.persistence.models.user import User
 from api.src.presentation.dependencies.auth import get_current_user
 from api.src.infrastructure.database.session import get_session
@@ -86,6 +87,7 @@ async def update_vapi_key(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to save Vapi API key: {str(exc)}"
         ) from exc
+    identities.invalidate_user(str(user.id))
 
     # 🔥 DIVINE: Return proper response format
     preview = user.vapi_api_key[:8] + "..." if len(user.vapi_api_key) > 8 else "***"
@@ -120,6 +122,7 @@ async def delete_vapi_key(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete Vapi API key: {str(exc)}"
         ) from exc
+    identities.invalidate_user(str(user.id))
 
     # 🔥 DIVINE: Return proper response format
     return VapiSettingsResponse(
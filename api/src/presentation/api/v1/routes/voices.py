@@ -4,9 +4,7 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.src.infrastructure.database.session import get_session
 from api.src.infrastructure.external.vapi_client import VapiApiError, VapiClient
 from api.src.infrastructure.persistence.models.user import User
 from api.src.presentation.dependencies.auth import get_current_user
@@ -31,11 +29,7 @@ def _client(user: User) -> VapiClient:
 async def preview_voice(
     payload: VoicePreviewPayload,
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_session),
 ) -> dict[str, object]:
-    # 🔥 DIVINE FIX: Refresh user from DB to get latest vapi_api_key
-    await db.refresh(user)
-    
     client = _client(user)
     try:
         preview = await client.voice_preview(voice_id=payload.voiceId, text=payload.text)
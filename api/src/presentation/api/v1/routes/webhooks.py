@@ -4,16 +4,17 @@ DIVINE Level: 5/5
 
 Endpoints:
 - POST /webhooks/vapi - Receive Vapi.ai webhooks
-- Handles: call.ended, function-call, transcript.update
+- Handles: assistant-request, call.ended, function-call, transcript.update
 
 Events processed:
+0. assistant-request → Return the precompiled assistant for the called number
 1. call.ended → Save call to DB + Send email notification
 2. function-call → Execute actions (save_caller_info, etc.)
-3. transcript.update → Stream real-time updates (future)
+3. transcript.update → Buffer live transcript turns (flushed to Postgres)
 """
 
-from fastapi import APIRouter, Request, HTTPException, Header, status
-from datetime import datetime
+from fastapi import APIRouter, Request, HTTPException, Header, Response, status
+from datetime import datetime, timezone
 from typing import Optional, Dict, Any, Tuple
 from uuid import UUID, uuid4
 import hmac
@@ -22,14 +23,28 @@ import json
 from sqlalchemy import select
 from urllib.parse import parse_qs
 
+from api.src.application.services.assistant_config import assistant_configs
+from api.src.application.services.caller_directory import caller_directory
+from api.src.application.services.call_digests import call_digests, uses_digest
+from api.src.application.services.campaigns import campaign_dialer, record_campaign_call_status
 from api.src.application.services.email import get_user_email_service
+from api.src.application.services.email_outbox import queue_email
+from api.src.application.services.function_calls import function_registry
+from api.src.application.services.live_transcripts import (
+    build_turn_rows,
+    live_transcripts,
+    speaker_label,
+)
 from api.src.application.services.tenant import ensure_tenant_for_user
 from api.src.application.services.twilio import resolve_twilio_credentials
 from api.src.core.settings import get_settings
+from api.src.domain.entities.caller import normalize_phone_number
 from api.src.infrastructure.database.session import get_session
 from api.src.infrastructure.persistence.models.call import CallRecord
 from api.src.infrastructure.persistence.models.studio_config import StudioConfig as StudioConfigModel
 from api.src.infrastructure.persistence.models.user import User
+from api.src.infrastructure.persistence.repositories.campaign_repository import get_contact_owner
+from api.src.infrastructure.persistence.repositories.transcript_repository import add_transcript_turns
 from twilio.request_validator import RequestValidator
 
 router = APIRouter(prefix="/webhooks", tags=["webhooks"])
@@ -64,6 +79,7 @@ async def vapi_webhook(
     Main Vapi webhook endpoint.
 
     Receives events from Vapi.ai:
+    - assistant-request: Inbound call needs an assistant → precompiled config
     - call.started: Call initiated
     - call.ended: Call completed → SAVE + EMAIL
     - function-call: Execute custom functions
@@ -94,10 +110,17 @@ async def vapi_webhook(
             detail="Invalid JSON payload"
         )
 
+    # Server messages may be wrapped in {"message": {...}}
+    if "type" not in event and isinstance(event.get("message"), dict):
+        event = event["message"]
     event_type = event.get("type")
 
     # Route to appropriate handler
-    if event_type == "call.ended":
+    if event_type == "assistant-request":
+        body = await assistant_configs.get(_called_number(event))
+        return Response(content=body, media_type="application/json")
+
+    elif event_type == "call.ended":
         await handle_call_ended(event)
         return {"status": "success", "action": "call_saved_and_email_sent"}
 
@@ -106,12 +129,15 @@ async def vapi_webhook(
         return result
 
     elif event_type == "call.started":
-        # Just acknowledge for now
+        await warm_function_context(event)
         return {"status": "success", "action": "call_started_acknowledged"}
 
     elif event_type == "transcript.update":
-        # Future: Stream to frontend via websockets
-        return {"status": "success", "action": "transcript_update_acknowledged"}
+        buffered = handle_transcript_update(event)
+        return {
+            "status": "success",
+            "action": "transcript_update_buffered" if buffered else "transcript_update_acknowledged",
+        }
 
     else:
         # Unknown event type - log and ignore
@@ -119,6 +145,14 @@ async def vapi_webhook(
         return {"status": "success", "action": "unknown_event_ignored"}
 
 
+def _called_number(event: dict) -> Optional[str]:
+    """Number the caller dialled (our number) from an assistant-request event."""
+    for source in (event.get("phoneNumber"), (event.get("call") or {}).get("phoneNumber")):
+        if isinstance(source, dict) and source.get("number"):
+            return source["number"]
+    return None
+
+
 async def handle_call_ended(event: dict):
     """
     Process completed call.
@@ -127,7 +161,8 @@ async def handle_call_ended(event: dict):
     1. Extract call data from Vapi payload
     2. Get caller info (if exists in DB)
     3. Save call to database
-    4. Send email notification to org owner
+    4. Send email notification to org owner (or flag the call for the
+       tenant's next digest when the tenant uses digest mode)
 
     Args:
         event: Vapi call.ended event payload
@@ -148,14 +183,24 @@ async def handle_call_ended(event: dict):
     customer_data = call_data.get("customer", {})
     caller_phone = customer_data.get("number", "Unknown")
 
-    # Transcript
-    transcript_data = call_data.get("transcript", [])
-    transcript_text = format_transcript(transcript_data)
-
     # Assistant info (to find org)
     assistant_id = call_data.get("assistantId")
     metadata = _extract_call_metadata(call_data)
 
+    # Transcript: reuse turns buffered from transcript.update events when they
+    # cover the whole call, otherwise fall back to the call.ended payload.
+    transcript_data = call_data.get("transcript", [])
+    live = live_transcripts.pop(vapi_call_id) if vapi_call_id else None
+    if live and live.turns and (not isinstance(transcript_data, list) or len(live.turns) >= len(transcript_data)):
+        transcript_text = live.text
+        transcript_turns = live.structured()
+        # All turns: conflicts with ones the flusher already wrote are skipped
+        live_turn_rows = build_turn_rows(live, live.turns)
+    else:
+        transcript_text = format_transcript(transcript_data)
+        transcript_turns = None
+        live_turn_rows = []
+
     # Recording URL
     recording_url = call_data.get("recordingUrl")
 
@@ -174,6 +219,7 @@ async def handle_call_ended(event: dict):
     # Save call to database
     resolved_user: Optional[User] = None
     resolved_config: Optional[StudioConfigModel] = None
+    queued_for_digest = False
     try:
         async for db in get_session():
             user, config = await _resolve_user_and_config(db, assistant_id, metadata)
@@ -199,16 +245,42 @@ async def handle_call_ended(event: dict):
                 duration_seconds=duration,
                 cost=cost,
                 transcript=transcript_text,
+                summary_pending=uses_digest(config),
                 meta={
                     "caller_name": caller_name,
                     "recording_url": recording_url,
                     "assistant_id": assistant_id,
+                    "transcript_turns": transcript_turns,
                     "vapi": call_data,
                 },
             )
 
             db.add(new_call)
+            await add_transcript_turns(db, live_turn_rows)
+
+            # Update caller directory (first/last seen, call count)
+            known_caller = None
+            try:
+                async with db.begin_nested():
+                    known_caller = await caller_directory.record(
+                        tenant.id,
+                        caller_phone,
+                        seen_at=_parse_iso_datetime(started_at),
+                        count_call=True,
+                        session=db,
+                    )
+                if known_caller and known_caller.first_name and caller_name == "Unknown Caller":
+                    caller_name = known_caller.full_name
+                    new_call.meta = {**new_call.meta, "caller_name": caller_name}
+            except Exception as e:
+                print(f"   ⚠️  Failed to update caller directory: {e}")
+                known_caller = None
+
             await db.commit()
+            if known_caller is not None:
+                # Only once committed: a rolled back upsert must not reach the cache
+                caller_directory.remember_caller(tenant.id, known_caller)
+            queued_for_digest = new_call.summary_pending
 
             print(f"   ✅ Call saved to database (ID: {new_call.id})")
             break  # Exit async generator
@@ -218,7 +290,12 @@ async def handle_call_ended(event: dict):
         traceback.print_exc()
         # Continue with email even if DB save fails
 
-    # Send email notification
+    if queued_for_digest:
+        call_digests.notify()
+        print("   📬 Call summary deferred to the tenant's digest")
+        return
+
+    # Queue email notification (delivered by the email outbox workers)
     email_service = get_user_email_service(resolved_config)
     recipient_email = org_email
     if not recipient_email and resolved_user:
@@ -228,8 +305,7 @@ async def handle_call_ended(event: dict):
         print("   ⚠️  No recipient email configured, skipping summary email")
         return
 
-    email_sent = await email_service.send_call_summary(
-        to_email=recipient_email,
+    subject, html = email_service.render_call_summary(
         caller_name=caller_name,
         caller_phone=caller_phone,
         transcript=transcript_text,
@@ -239,10 +315,16 @@ async def handle_call_ended(event: dict):
         business_name=business_name
     )
 
-    if email_sent:
-        print(f"   ✅ Email sent to {recipient_email}")
-    else:
-        print(f"   ❌ Failed to send email")
+    try:
+        outbox_id = await queue_email(
+            to=recipient_email,
+            subject=subject,
+            html=html,
+            user_id=str(resolved_user.id) if resolved_user else None,
+        )
+        print(f"   ✅ Email to {recipient_email} queued (outbox ID: {outbox_id})")
+    except Exception as e:
+        print(f"   ❌ Failed to queue email: {e}")
 
     print("   ✅ Call processed successfully")
 
@@ -251,10 +333,9 @@ async def handle_function_call(event: dict) -> dict:
     """
     Execute custom function called by AVA during conversation.
 
-    Functions:
-    - save_caller_info: Save caller name/email to database
-    - book_appointment: Create calendar event
-    - send_sms: Send SMS to caller
+    Functions are looked up in the function registry (see
+    `application.services.function_calls`), which applies each function's
+    deadline, concurrency limit and fallback response.
 
     Args:
         event: Vapi function-call event
@@ -265,63 +346,76 @@ async def handle_function_call(event: dict) -> dict:
     function_call = event.get("functionCall", {})
     function_name = function_call.get("name")
     parameters = function_call.get("parameters", {})
+    call_data = event.get("call") or {}
 
     print(f"🔧 Function called: {function_name}")
-    print(f"   Parameters: {parameters}")
 
-    if function_name == "save_caller_info":
-        return await save_caller_info(parameters)
+    return await function_registry.dispatch(
+        function_name,
+        parameters,
+        call_data=call_data,
+        metadata=_extract_call_metadata(call_data),
+    )
 
-    elif function_name == "book_appointment":
-        # Future implementation
-        return {
-            "result": "Appointment booking not yet implemented",
-            "success": False
-        }
 
-    else:
-        return {
-            "result": f"Unknown function: {function_name}",
-            "success": False
-        }
+async def warm_function_context(event: dict) -> None:
+    """Resolve tenant context at call start so function calls hit the cache."""
+    call_data = event.get("call") or {}
+    metadata = _extract_call_metadata(call_data)
+    user_id = metadata.get("user_id") or metadata.get("userId")
+    try:
+        await function_registry.tenant_contexts.resolve(
+            user_id=str(user_id) if user_id else None,
+            assistant_id=call_data.get("assistantId"),
+        )
+    except Exception as e:
+        print(f"⚠️ Could not warm function context: {e}")
 
 
-async def save_caller_info(params: dict) -> dict:
+def handle_transcript_update(event: dict) -> bool:
     """
-    Save caller information to database.
+    Append a finalised transcript turn to the live buffer.
 
-    Called by AVA during conversation when caller provides their info.
-
-    Args:
-        params: {
-            "call_id": str,
-            "phone_number": str,
-            "first_name": str,
-            "last_name": str,
-            "email": str (optional)
-        }
+    Partial transcripts are superseded by the final one Vapi sends for the same
+    utterance, so only final turns are kept.
 
     Returns:
-        Success result
+        True if the turn was buffered
     """
-    first_name = params.get("firstName")
-    last_name = params.get("lastName")
-    email = params.get("email")
-    phone_number = params.get("phoneNumber")
-
-    print(f"   Saving caller: {first_name} {last_name}")
-
-    # TODO: Save to database
-    # For now, just acknowledge
-
-    return {
-        "result": f"Thank you {first_name}! I've saved your information.",
-        "success": True,
-        "data": {
-            "caller_name": f"{first_name} {last_name}",
-            "saved": True
-        }
-    }
+    if event.get("transcriptType", "final") != "final":
+        return False
+
+    call_data = event.get("call") or {}
+    call_id = call_data.get("id") or event.get("callId")
+    message = event.get("transcript") or event.get("message")
+    if not call_id or not isinstance(message, str) or not message.strip():
+        return False
+
+    metadata = _extract_call_metadata(call_data)
+    user_id = metadata.get("user_id") or metadata.get("userId")
+    live_transcripts.append(
+        call_id,
+        role=event.get("role", "unknown"),
+        message=message.strip(),
+        assistant_id=call_data.get("assistantId"),
+        user_id=str(user_id) if user_id else None,
+        spoken_at=_event_timestamp(event),
+    )
+    return True
+
+
+def _event_timestamp(event: dict) -> Optional[datetime]:
+    """When Vapi emitted the event (ms since epoch or ISO string), if given."""
+    value = event.get("timestamp")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return datetime.fromtimestamp(value / 1000, tz=timezone.utc)
+    if isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    return None
 
 
 def format_transcript(transcript_data: list) -> str:
@@ -345,33 +439,11 @@ def format_transcript(transcript_data: list) -> str:
     for entry in transcript_data:
         role = entry.get("role", "unknown")
         message = entry.get("message", "")
-
-        # Format role nicely
-        if role == "assistant":
-            speaker = "AVA"
-        elif role == "user":
-            speaker = "Caller"
-        else:
-            speaker = role.capitalize()
-
-        lines.append(f"{speaker}: {message}")
+        lines.append(f"{speaker_label(role)}: {message}")
 
     return "\n\n".join(lines)
 
 
-def _normalize_phone(number: Optional[str]) -> Optional[str]:
-    if not number:
-        return None
-    number = number.strip()
-    if not number:
-        return None
-    if number.startswith("00"):
-        number = f"+{number[2:]}"
-    if not number.startswith("+") and number.replace("+", "").lstrip("-").isdigit():
-        number = f"+{number}"
-    return number
-
-
 def _parse_twilio_timestamp(value: Optional[str]) -> datetime:
     if not value:
         return datetime.utcnow()
@@ -401,6 +473,13 @@ def _map_twilio_status(status_value: Optional[str]) -> str:
     return status_map.get((status_value or "").lower(), "unknown")
 
 
+def _twilio_customer_number(form_data: Dict[str, str], *, campaign_call: bool) -> Optional[str]:
+    """The customer's side of a call: the caller, or the callee of calls we placed."""
+    if campaign_call or form_data.get("Direction") == "outbound-api":
+        return normalize_phone_number(form_data.get("To") or form_data.get("Called"))
+    return normalize_phone_number(form_data.get("From"))
+
+
 def _extract_call_metadata(call_data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     if not isinstance(call_data, dict):
         return {}
@@ -500,15 +579,21 @@ async def twilio_status_webhook(request: Request):
     # Signature validation
     twilio_status = _map_twilio_status(form_data.get("CallStatus"))
     timestamp = _parse_twilio_timestamp(form_data.get("Timestamp") or form_data.get("CallTimestamp"))
-    from_number = _normalize_phone(form_data.get("From"))
-    to_number = _normalize_phone(form_data.get("To") or form_data.get("Called"))
+    to_number = normalize_phone_number(form_data.get("To") or form_data.get("Called"))
     duration_value = form_data.get("CallDuration") or form_data.get("DialCallDuration")
+    # Campaign calls carry their contact in the status callback URL
+    campaign_contact_id = _safe_int(request.query_params.get("campaign_contact"))
+    customer_number = _twilio_customer_number(form_data, campaign_call=campaign_contact_id is not None)
+    campaign_outcome = None
 
     async for db in get_session():
         user_for_number = None
         if to_number:
             result = await db.execute(select(User).where(User.twilio_phone_number == to_number))
             user_for_number = result.scalar_one_or_none()
+        if not user_for_number and campaign_contact_id is not None:
+            owner_id = await get_contact_owner(db, campaign_contact_id)
+            user_for_number = await db.get(User, owner_id) if owner_id else None
 
         signature = request.headers.get("X-Twilio-Signature")
         try:
@@ -545,7 +630,7 @@ async def twilio_status_webhook(request: Request):
                 id=call_sid,
                 assistant_id=form_data.get("CalledViaSid") or "twilio-status",
                 tenant_id=tenant.id,
-                customer_number=from_number,
+                customer_number=customer_number,
                 status=twilio_status,
                 started_at=timestamp,
                 ended_at=timestamp if twilio_status in {"completed", "failed", "busy", "no-answer", "canceled"} else None,
@@ -560,7 +645,7 @@ async def twilio_status_webhook(request: Request):
             db.add(record)
         else:
             record.status = twilio_status
-            record.customer_number = record.customer_number or from_number
+            record.customer_number = record.customer_number or customer_number
             if twilio_status in {"completed", "failed", "busy", "no-answer", "canceled"}:
                 record.ended_at = timestamp
             if not record.started_at or twilio_status in {"in-progress", "ringing"}:
@@ -580,7 +665,16 @@ async def twilio_status_webhook(request: Request):
                 "twilio_call_sid": call_sid,
             }
 
+        campaign_outcome = await record_campaign_call_status(
+            db,
+            call_sid=call_sid,
+            contact_id=campaign_contact_id,
+            call_status=twilio_status,
+        )
         await db.commit()
         break
 
+    if campaign_outcome:
+        campaign_dialer.notify()
+
     return {"status": "ok", "callSid": call_sid, "callStatus": twilio_status}
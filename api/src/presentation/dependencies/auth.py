@@ -15,8 +15,10 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ...application.services.identity import identities
 from ...core.settings import Settings, get_settings
 from ...infrastructure.persistence.models.user import User
+from ...infrastructure.database.replica import bind_request_user
 from ...infrastructure.database.session import get_session
 
 # Development mode: Optional auth for local testing
@@ -73,6 +75,7 @@ async def get_current_user(
             await session.commit()
             await session.refresh(user)
 
+        bind_request_user(str(user.id))
         return user
 
     # PRODUCTION: Require auth
@@ -85,6 +88,13 @@ async def get_current_user(
     if not user_id_raw:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
 
+    # Cached identity: attached to the request session without a query
+    cached = identities.get_user(str(user_id_raw))
+    if cached is not None:
+        user = await session.merge(cached, load=False)
+        bind_request_user(str(user.id))
+        return user
+
     # Query user by ID
     result = await session.execute(select(User).where(User.id == str(user_id_raw)))
     user = result.scalar_one_or_none()
@@ -92,4 +102,7 @@ async def get_current_user(
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
+    identities.put_user(user)
+
+    bind_request_user(str(user.id))
     return user
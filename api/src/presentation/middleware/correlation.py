@@ -1,65 +0,0 @@
-"""Correlation ID middleware for distributed request tracing."""
-
-from __future__ import annotations
-
-import logging
-import uuid
-
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
-
-logger = logging.getLogger("ava.correlation")
-
-
-class CorrelationIdMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware to add correlation IDs to all requests.
-    
-    - Extracts X-Correlation-ID from request headers or generates new UUID
-    - Adds correlation ID to request.state for access in route handlers
-    - Adds X-Correlation-ID to response headers for client tracing
-    - Logs correlation ID for all requests
-    """
-
-    async def dispatch(self, request: Request, call_next) -> Response:
-        # Extract or generate correlation ID
-        correlation_id = request.headers.get("X-Correlation-ID")
-        if not correlation_id:
-            correlation_id = str(uuid.uuid4())
-
-        # Store in request state for handler access
-        request.state.correlation_id = correlation_id
-
-        # Log request with correlation ID
-        logger.info(
-            f"Request started: {request.method} {request.url.path}",
-            extra={
-                "correlation_id": correlation_id,
-                "method": request.method,
-                "path": request.url.path,
-                "client": request.client.host if request.client else "unknown",
-            },
-        )
-
-        # Process request
-        response = await call_next(request)
-
-        # Add correlation ID to response headers
-        response.headers["X-Correlation-ID"] = correlation_id
-
-        # Log response with correlation ID
-        logger.info(
-            f"Request completed: {request.method} {request.url.path} - {response.status_code}",
-            extra={
-                "correlation_id": correlation_id,
-                "method": request.method,
-                "path": request.url.path,
-                "status_code": response.status_code,
-            },
-        )
-
-        return response
-
-
-__all__ = ["CorrelationIdMiddleware"]
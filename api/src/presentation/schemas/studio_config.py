@@ -2,11 +2,18 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseModel, EmailStr, Field
 
 
+class CustomFunction(BaseModel):
+    """A tenant-defined assistant function answering with a fixed result."""
+
+    name: str = Field(pattern=r"^[A-Za-z_][A-Za-z0-9_]{0,63}$", description="Function name the assistant calls")
+    result: str = Field(min_length=1, max_length=1000, description="What the assistant is told when it calls it")
+
+
 class StudioConfig(BaseModel):
     # Organization settings
     organizationName: str = Field(min_length=2)
@@ -18,8 +25,18 @@ class StudioConfig(BaseModel):
     guidelines: Optional[str] = None  # 🔥 FIX: Optional for DB compatibility
     phoneNumber: str = Field(default="", min_length=0)
     businessHours: str = Field(default="09:00-18:00")
+    businessHoursEnforced: bool = Field(
+        default=False, description="Read-only: calls follow businessHours once hours or holidays were saved"
+    )
+    holidays: list[str] = Field(default_factory=list, description="Closed dates (YYYY-MM-DD)")
+    customFunctions: list[CustomFunction] = Field(default_factory=list, description="Tenant-defined functions")
     fallbackEmail: Optional[EmailStr] = None  # 🔥 FIX: Optional for DB compatibility
     summaryEmail: Optional[EmailStr] = None  # 🔥 FIX: Optional for DB compatibility
+    summaryMode: Literal["immediate", "digest"] = Field(
+        default="immediate", description="Email every call, or batch call summaries into a digest"
+    )
+    digestIntervalMinutes: int = Field(default=60, ge=5, le=1440, description="Send the digest at most this often")
+    digestMaxCalls: int = Field(default=25, ge=2, le=200, description="Send the digest early after this many calls")
     smtpServer: str = Field(default="")
     smtpPort: str = Field(default="587")
     smtpUsername: str = Field(default="")
@@ -99,8 +116,13 @@ class StudioConfigUpdate(BaseModel):
     guidelines: Optional[str] = None
     phoneNumber: Optional[str] = None
     businessHours: Optional[str] = None
+    holidays: Optional[list[str]] = None
+    customFunctions: Optional[list[CustomFunction]] = None
     fallbackEmail: EmailStr | None = None
     summaryEmail: EmailStr | None = None
+    summaryMode: Optional[Literal["immediate", "digest"]] = None
+    digestIntervalMinutes: Optional[int] = Field(default=None, ge=5, le=1440)
+    digestMaxCalls: Optional[int] = Field(default=None, ge=2, le=200)
     smtpServer: Optional[str] = None
     smtpPort: Optional[str] = None
     smtpUsername: Optional[str] = None
@@ -200,6 +222,7 @@ DEFAULT_STUDIO_CONFIG = StudioConfig(
 
 
 __all__ = [
+    "CustomFunction",
     "StudioConfig",
     "StudioConfigUpdate",
     "DEFAULT_STUDIO_CONFIG",
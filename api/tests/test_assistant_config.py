@@ -0,0 +1,166 @@
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from api.src.application.services import assistant_config
+from api.src.application.services.assistant_config import (
+    AssistantConfigCache,
+    CompiledAssistant,
+    build_assistant_prompt,
+    compile_assistant_response,
+)
+from api.src.domain.value_objects.business_hours import compile_schedule
+from api.src.infrastructure.shared_state import SharedStateBackend, SharedStateCache
+
+
+def _studio_config(**overrides):
+    values = dict(
+        user_id="user-1",
+        organization_name="Cabinet Dupont",
+        system_prompt="Tu es AVA.",
+        ask_for_name=True,
+        ask_for_email=False,
+        ask_for_phone=True,
+        guidelines="Sois brève.",
+        voice_provider="11labs",
+        voice_id="voice-1",
+        voice_speed=1.5,
+        first_message="Bonjour !",
+        ai_model="gpt-4o-mini",
+        ai_temperature=0.5,
+        ai_max_tokens=200,
+        transcriber_provider="deepgram",
+        transcriber_model="nova-2",
+        transcriber_language="fr",
+        persona="secretary",
+        tone="warm",
+        language="fr",
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def test_prompt_contains_base_and_enabled_instructions():
+    prompt = build_assistant_prompt(_studio_config())
+    assert prompt.startswith("Tu es AVA.")
+    assert "caller's name" in prompt
+    assert "email address" not in prompt
+    assert prompt.endswith("Additional guidelines: Sois brève.")
+
+
+def test_compiled_response_is_a_complete_assistant():
+    body = json.loads(compile_assistant_response(_studio_config(), None, user_id="user-1"))
+    assistant = body["assistant"]
+    assert assistant["firstMessage"] == "Bonjour !"
+    assert assistant["voice"]["speed"] == 1.2
+    assert assistant["metadata"]["user_id"] == "user-1"
+    assert assistant["serverUrl"].endswith("/webhooks/vapi")
+
+
+@pytest.mark.asyncio
+async def test_cache_serves_compiled_body_and_recompiles_on_invalidation(monkeypatch):
+    compiled_for = []
+
+    async def fake_compile(number):
+        compiled_for.append(number)
+        return CompiledAssistant(f"v{len(compiled_for)}".encode(), "user-1", time.monotonic() + 60)
+
+    monkeypatch.setattr(assistant_config, "_compile_for_number", fake_compile)
+    cache = AssistantConfigCache()
+
+    assert await cache.get("0033100000000") == b"v1"
+    assert await cache.get("+33100000000") == b"v1"
+    assert compiled_for == ["+33100000000"]
+
+    cache.invalidate_user("user-1")
+    assert len(cache) == 0
+    await asyncio.sleep(0)
+    assert await cache.get("+33100000000") == b"v2"
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_compile_is_not_lost(monkeypatch):
+    cache = AssistantConfigCache()
+    calls = 0
+
+    async def fake_compile(number):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            cache.invalidate_user("user-1", [number])
+        return CompiledAssistant(f"v{calls}".encode(), "user-1", time.monotonic() + 60)
+
+    monkeypatch.setattr(assistant_config, "_compile_for_number", fake_compile)
+    assert await cache.get("+33100000000") == b"v2"
+
+
+@pytest.mark.asyncio
+async def test_invalidation_reaches_other_workers_through_shared_state(monkeypatch):
+    shared_state = SharedStateCache(SharedStateBackend())  # Already "synced" between both workers
+    monkeypatch.setattr(assistant_config, "get_shared_state", lambda: shared_state)
+    version = 0
+
+    async def fake_compile(number):
+        return CompiledAssistant(f"v{version}".encode(), "user-1", time.monotonic() + 60)
+
+    monkeypatch.setattr(assistant_config, "_compile_for_number", fake_compile)
+    worker_a, worker_b = AssistantConfigCache(), AssistantConfigCache()
+    assert await worker_b.get("+33100000000") == b"v0"
+
+    version = 1
+    worker_a.invalidate_user("user-1")
+    assert await worker_b.get("+33100000000") == b"v1"
+    assert await worker_b.get("+33100000000") == b"v1"
+
+
+@pytest.mark.asyncio
+async def test_long_expired_entries_are_recompiled_before_answering(monkeypatch):
+    monkeypatch.setattr(assistant_config.get_settings(), "assistant_config_cache_ttl_seconds", 30)
+    version = 0
+
+    async def fake_compile(number):
+        return CompiledAssistant(f"v{version}".encode(), "user-1", time.monotonic() + 30)
+
+    monkeypatch.setattr(assistant_config, "_compile_for_number", fake_compile)
+    cache = AssistantConfigCache()
+    cache.store("+33100000000", CompiledAssistant(b"old", "user-1", time.monotonic() - 10))
+    version = 1
+    assert await cache.get("+33100000000") == b"old"  # Recently expired: served while refreshing
+    await asyncio.sleep(0)
+    assert await cache.get("+33100000000") == b"v1"
+
+    cache.store("+33100000000", CompiledAssistant(b"old", "user-1", time.monotonic() - 31))
+    version = 2
+    assert await cache.get("+33100000000") == b"v2"
+
+
+@pytest.mark.asyncio
+async def test_cache_evicts_least_recently_used_numbers():
+    cache = AssistantConfigCache(max_entries=2)
+    expires_at = time.monotonic() + 60
+    cache.store("+33100000001", CompiledAssistant(b"a", "user-1", expires_at))
+    cache.store("+33100000002", CompiledAssistant(assistant_config.NOT_CONFIGURED_BODY, None, expires_at))
+    assert await cache.get("+33100000001") == b"a"
+
+    cache.store("+33100000003", CompiledAssistant(b"c", "user-1", expires_at))
+    assert len(cache) == 2
+    assert "+33100000002" not in cache._entries
+    assert cache._by_user["user-1"] == {"+33100000001", "+33100000003"}
+
+    cache.store("+33100000004", CompiledAssistant(b"d", "user-2", expires_at))
+    assert set(cache._entries) == {"+33100000003", "+33100000004"}
+    assert cache._by_user["user-1"] == {"+33100000003"}
+
+
+def test_compiled_assistant_picks_after_hours_variant():
+    schedule = compile_schedule("mon-fri 09:00-18:00", timezone_name="UTC")
+    compiled = CompiledAssistant(b"open", "user-1", time.monotonic() + 60, closed_body=b"closed", schedule=schedule)
+    assert compiled.body_at(datetime(2025, 1, 6, 10, tzinfo=timezone.utc)) == b"open"
+    assert compiled.body_at(datetime(2025, 1, 5, 10, tzinfo=timezone.utc)) == b"closed"
+
+    prompt = build_assistant_prompt(_studio_config(), closed_schedule=schedule)
+    assert "currently CLOSED" in prompt and "mon 09:00-18:00" in prompt
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from api.src.infrastructure.external.bulkhead import Bulkhead, BulkheadConfig, BulkheadFullError, get_bulkhead
+
+
+@pytest.mark.asyncio
+async def test_bulkhead_caps_concurrency():
+    bulkhead = Bulkhead("test-cap", BulkheadConfig(max_concurrent=2, max_queue=10, queue_timeout=1.0))
+    running = 0
+    peak = 0
+
+    async def work():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return "ok"
+
+    results = await asyncio.gather(*(bulkhead.call(work) for _ in range(6)))
+
+    assert results == ["ok"] * 6
+    assert peak == 2
+    assert bulkhead.in_flight == 0
+    assert bulkhead.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_bulkhead_rejects_when_queue_is_full():
+    bulkhead = Bulkhead("test-queue", BulkheadConfig(max_concurrent=1, max_queue=1, queue_timeout=1.0))
+    release = asyncio.Event()
+
+    async def hold():
+        async with bulkhead.acquire():
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    waiter = asyncio.create_task(hold())
+    await asyncio.sleep(0.01)
+    assert bulkhead.in_flight == 1
+    assert bulkhead.queued == 1
+
+    with pytest.raises(BulkheadFullError) as exc_info:
+        async with bulkhead.acquire():
+            pass
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.reason == "queue_full"
+
+    release.set()
+    await asyncio.gather(holder, waiter)
+    assert bulkhead.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_bulkhead_times_out_waiting_for_a_slot():
+    bulkhead = Bulkhead("test-timeout", BulkheadConfig(max_concurrent=1, max_queue=5, queue_timeout=0.01))
+    release = asyncio.Event()
+
+    async def hold():
+        async with bulkhead.acquire():
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(BulkheadFullError) as exc_info:
+        await bulkhead.call(asyncio.sleep, 0)
+    assert exc_info.value.reason == "timeout"
+    assert bulkhead.queued == 0
+
+    release.set()
+    await holder
+    # The slot is free again once the holder finishes
+    assert await bulkhead.call(asyncio.sleep, 0, result="done") == "done"
+
+
+@pytest.mark.asyncio
+async def test_bulkhead_releases_slot_on_error():
+    bulkhead = Bulkhead("test-error", BulkheadConfig(max_concurrent=1, max_queue=0, queue_timeout=0.01))
+
+    async def boom():
+        raise ValueError("provider down")
+
+    with pytest.raises(ValueError):
+        await bulkhead.call(boom)
+    assert bulkhead.in_flight == 0
+    assert await bulkhead.call(asyncio.sleep, 0, result=1) == 1
+
+
+def test_get_bulkhead_reads_limits_from_settings():
+    bulkhead = get_bulkhead("smtp")
+
+    assert bulkhead is get_bulkhead("smtp")
+    assert bulkhead.config.max_concurrent == 8
+    assert bulkhead.config.max_queue == 50
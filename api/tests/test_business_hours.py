@@ -0,0 +1,64 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from api.src.application.services.business_hours import schedule_for
+from api.src.domain.value_objects.business_hours import BusinessHoursError, compile_schedule
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_legacy_range_applies_every_day_in_tenant_timezone():
+    schedule = compile_schedule("09:00-18:00", timezone_name="Europe/Paris")
+    assert schedule.is_open(_utc(2025, 1, 5, 8, 30))  # Sunday 09:30 Paris
+    assert not schedule.is_open(_utc(2025, 1, 5, 17, 0))  # 18:00 Paris, closing time
+    assert schedule.next_open(_utc(2025, 1, 5, 17, 0)) == datetime.fromisoformat("2025-01-06T09:00:00+01:00")
+
+
+def test_weekly_intervals_holidays_and_french_days():
+    schedule = compile_schedule(
+        "lun-ven 9h-12h,14h-18h; sam 10:00-13:00",
+        timezone_name="Europe/Paris",
+        holidays=["2025-12-25"],
+    )
+    assert schedule.is_open(_utc(2025, 12, 24, 9, 0))  # Wed 10:00
+    assert not schedule.is_open(_utc(2025, 12, 24, 12, 0))  # lunch break
+    assert not schedule.is_open(_utc(2025, 12, 25, 9, 0))  # holiday
+    assert not schedule.is_open(_utc(2025, 12, 28, 9, 0))  # Sunday
+    assert schedule.next_open(_utc(2025, 12, 24, 18, 0)) == datetime.fromisoformat("2025-12-26T09:00:00+01:00")
+
+
+def test_overnight_ranges_and_json_override():
+    night = compile_schedule("fri 22:00-02:00")
+    assert night.is_open(_utc(2025, 1, 4, 1, 0))  # Saturday 01:00
+    assert not night.is_open(_utc(2025, 1, 4, 3, 0))
+
+    override = compile_schedule('{"hours": {"mon": ["08:00-09:00"]}, "timezone": "America/New_York"}')
+    assert override.is_open(_utc(2025, 1, 6, 13, 30))
+    assert override.describe() == "mon 08:00-09:00"
+
+
+def test_always_open_closed_and_invalid_values():
+    assert compile_schedule("24/7").is_open()
+    assert compile_schedule("").always_open
+    assert compile_schedule("closed").next_open() is None
+    with pytest.raises(BusinessHoursError):
+        compile_schedule("9-")
+    with pytest.raises(BusinessHoursError):
+        compile_schedule("09:00-18:00", timezone_name="Mars/Olympus")
+
+
+def test_schedule_for_ignores_hours_the_tenant_never_saved():
+    config = SimpleNamespace(
+        user_id="u1", timezone="Europe/Paris", business_hours="09:00-18:00", holidays=[], business_hours_enforced=False
+    )
+    night = _utc(2025, 1, 5, 23, 0)
+    assert schedule_for(config).is_open(night)
+    assert not schedule_for(config, {"sun": "09:00-12:00"}).is_open(night)
+
+    config.business_hours_enforced = True
+    assert not schedule_for(config).is_open(night)
+    assert schedule_for(config).is_open(_utc(2025, 1, 6, 9, 0))
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from api.src.application.services.call_digests import digest_due, render_digest
+
+NOW = datetime(2025, 11, 18, 12, 0, tzinfo=timezone.utc)
+
+
+def _due(**overrides):
+    params = dict(
+        pending=3,
+        oldest_pending_at=NOW - timedelta(minutes=10),
+        last_sent_at=NOW - timedelta(minutes=30),
+        summary_mode="digest",
+        interval_minutes=60,
+        max_calls=25,
+        now=NOW,
+    )
+    params.update(overrides)
+    return digest_due(**params)
+
+
+def test_digest_waits_for_interval_or_call_threshold():
+    assert not _due()
+    assert _due(last_sent_at=NOW - timedelta(minutes=61))
+    assert _due(pending=25)
+    assert not _due(pending=0, last_sent_at=None)
+
+
+def test_first_digest_counts_from_oldest_pending_call():
+    assert not _due(last_sent_at=None, oldest_pending_at=NOW - timedelta(minutes=5))
+    assert _due(last_sent_at=None, oldest_pending_at=NOW - timedelta(hours=2))
+
+
+def test_pending_calls_are_flushed_after_switching_back_to_immediate():
+    assert _due(summary_mode="immediate")
+
+
+def test_render_digest_lists_calls_in_tenant_timezone():
+    calls = [
+        SimpleNamespace(
+            id=f"call-{index}",
+            customer_number="+33612345678",
+            started_at=NOW + timedelta(minutes=index),
+            duration_seconds=95,
+            transcript="AI: Bonjour\nUser: <script>alert(1)</script>",
+            meta={"caller_name": "Marie"},
+        )
+        for index in range(2)
+    ]
+
+    subject, html = render_digest(calls, business_name="Plomberie Cohen", timezone_name="Europe/Paris")
+
+    assert subject == "📞 2 new calls for Plomberie Cohen"
+    assert html.count("View call") == 2
+    assert "18/11 13:00" in html
+    assert "1m 35s" in html
+    assert "&lt;script&gt;" in html and "<script>" not in html
@@ -0,0 +1,125 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from api.src.application.services.caller_directory import CallerDirectory
+from api.src.domain.entities.caller import Caller, CallerId, normalize_phone_number
+
+
+def _caller(tenant_id, number, first_name="Marie"):
+    return Caller(id=CallerId(str(uuid4())), org_id=str(tenant_id), phone_number=number, first_name=first_name)
+
+
+def test_normalize_phone_number():
+    assert normalize_phone_number(" 0033612345678 ") == "+33612345678"
+    assert normalize_phone_number("33612345678") == "+33612345678"
+    assert normalize_phone_number("") is None
+    assert normalize_phone_number("+33 6 12-34-56-78") == "+33612345678"
+    for placeholder in ("Unknown", "anonymous", "+", "12345", "+33abc"):
+        assert normalize_phone_number(placeholder) is None
+
+
+@pytest.mark.asyncio
+async def test_placeholder_numbers_are_never_recorded_or_looked_up(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("placeholder numbers must not reach the database")
+
+    monkeypatch.setattr("api.src.application.services.caller_directory.upsert_caller", fail)
+    monkeypatch.setattr("api.src.application.services.caller_directory.run_read_only", fail)
+    directory = CallerDirectory(max_entries=10, ttl_seconds=60)
+
+    for placeholder in ("Unknown", "anonymous"):
+        assert await directory.record(uuid4(), placeholder, first_name="Marie", count_call=True) is None
+        assert await directory.lookup(uuid4(), placeholder) is None
+    assert len(directory) == 0
+
+
+def test_directory_caches_known_and_unknown_numbers():
+    tenant_id = uuid4()
+    directory = CallerDirectory(max_entries=10, ttl_seconds=60)
+
+    assert directory.peek(tenant_id, "+33612345678") == (False, None)
+    directory.remember(tenant_id, "+33612345678", None)
+    assert directory.peek(tenant_id, "+33612345678") == (True, None)
+
+    caller = _caller(tenant_id, "+33612345678")
+    directory.remember(tenant_id, "+33612345678", caller)
+    assert directory.peek(str(tenant_id), "+33612345678") == (True, caller)
+    assert directory.peek(uuid4(), "+33612345678") == (False, None)
+
+
+def test_directory_evicts_least_recently_used_and_expired():
+    tenant_id = uuid4()
+    directory = CallerDirectory(max_entries=2, ttl_seconds=60)
+    directory.remember(tenant_id, "+1", None)
+    directory.remember(tenant_id, "+2", None)
+    directory.peek(tenant_id, "+1")
+    directory.remember(tenant_id, "+3", None)
+    assert directory.peek(tenant_id, "+2") == (False, None)
+    assert directory.peek(tenant_id, "+1")[0] is True
+
+    expired = CallerDirectory(ttl_seconds=0)
+    expired.remember(tenant_id, "+1", None)
+    assert expired.peek(tenant_id, "+1") == (False, None)
+    assert len(expired) == 0
+
+
+@pytest.mark.asyncio
+async def test_lookup_uses_cache_without_database():
+    tenant_id = uuid4()
+    directory = CallerDirectory()
+    caller = _caller(tenant_id, "+33612345678")
+    directory.remember(tenant_id, "+33612345678", caller)
+
+    assert await directory.lookup(tenant_id, "0033612345678") is caller
+    assert await directory.lookup(tenant_id, None) is None
+
+
+@pytest.mark.asyncio
+async def test_upsert_caller_is_a_single_on_conflict_statement():
+    from api.src.infrastructure.persistence.repositories.caller_repository import upsert_caller
+
+    class RecordingSession:
+        statements = []
+
+        async def execute(self, stmt, **kwargs):
+            self.statements.append(stmt)
+
+            class Result:
+                @staticmethod
+                def scalar_one():
+                    return "row"
+
+            return Result()
+
+    session = RecordingSession()
+    assert await upsert_caller(session, tenant_id=uuid4(), phone_number="+1", count_call=True) == "row"
+
+    sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert len(session.statements) == 1
+    assert "ON CONFLICT ON CONSTRAINT uq_callers_tenant_phone DO UPDATE" in sql
+    assert "call_count = (callers.call_count + " in sql
+
+
+@pytest.mark.asyncio
+async def test_record_in_callers_transaction_leaves_cache_until_commit(monkeypatch):
+    tenant_id = uuid4()
+    caller = _caller(tenant_id, "+33612345678")
+
+    class Row:
+        @staticmethod
+        def to_entity():
+            return caller
+
+    async def upsert(session, **fields):
+        return Row()
+
+    monkeypatch.setattr("api.src.application.services.caller_directory.upsert_caller", upsert)
+    directory = CallerDirectory()
+
+    assert await directory.record(tenant_id, "+33612345678", count_call=True, session=object()) is caller
+    assert directory.peek(tenant_id, "+33612345678") == (False, None)  # The transaction may still roll back
+
+    directory.remember_caller(tenant_id, caller)
+    assert directory.peek(tenant_id, "+33612345678") == (True, caller)
@@ -0,0 +1,324 @@
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+from api.src.application.services import campaigns as campaigns_module
+from api.src.application.services.campaigns import (
+    CallPacer,
+    CampaignDialer,
+    ContactListError,
+    apply_call_status,
+    parse_contacts_csv,
+)
+from api.src.infrastructure.external import circuit_breaker as circuit_breaker_module
+from api.src.infrastructure.external import twilio_client as twilio_client_module
+from api.src.infrastructure.external.circuit_breaker import CircuitState, get_circuit_breaker
+from api.src.presentation.api.v1.routes.webhooks import _twilio_customer_number
+
+
+class FakeTwilio:
+    """Local stand-in for the Twilio Calls API."""
+
+    def __init__(self, *, invalid_numbers=()):
+        self.invalid_numbers = set(invalid_numbers)
+        self.calls = []
+
+    def handler(self, request):
+        assert request.url.path.endswith("/Calls.json")
+        form = {key: values if len(values) > 1 else values[0] for key, values in parse_qs(request.content.decode()).items()}
+        if form["To"] in self.invalid_numbers:
+            return httpx.Response(400, json={"code": 21211, "message": f"Invalid 'To' Phone Number: {form['To']}"})
+        self.calls.append(form)
+        return httpx.Response(201, json={"sid": f"CA{len(self.calls):03d}", "status": "queued"})
+
+    def http_client(self):
+        return httpx.AsyncClient(base_url="https://twilio.test", transport=httpx.MockTransport(self.handler))
+
+
+def _campaign(**overrides):
+    values = dict(
+        id="camp-1",
+        user_id="user-1",
+        from_number="+33100000000",
+        twiml_url="https://example.com/twiml",
+        schedule=None,
+        timezone="UTC",
+        max_concurrent_calls=2,
+        max_attempts=3,
+        retry_delay_seconds=600,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def _contact(id, number, *, attempts=1, status="dialing"):
+    return SimpleNamespace(
+        id=id,
+        phone_number=number,
+        attempts=attempts,
+        status=status,
+        last_call_status=None,
+        next_attempt_at=None,
+        updated_at=None,
+    )
+
+
+def test_parse_contacts_csv_normalizes_and_reports_bad_rows():
+    contacts, errors = parse_contacts_csv(
+        "Name,Phone,Company\n"
+        "Alice,+33 6 12 34 56 78,Acme\n"
+        "Bob,0033612345678,\n"
+        "Carol,not-a-number,Beta\n"
+        "Dan,+1 (415) 555-0100,\n"
+    )
+
+    assert contacts == [
+        {"phone_number": "+33612345678", "name": "Alice", "meta": {"Company": "Acme"}},
+        {"phone_number": "+14155550100", "name": "Dan", "meta": {}},
+    ]
+    assert errors == [
+        "line 3: duplicate phone number +33612345678",
+        "line 4: invalid phone number 'not-a-number'",
+    ]
+
+
+def test_parse_contacts_csv_requires_phone_column():
+    with pytest.raises(ContactListError):
+        parse_contacts_csv("name,email\nAlice,a@example.com\n")
+
+
+@pytest.mark.asyncio
+async def test_pacer_spaces_calls_per_account():
+    now = [100.0]
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    pacer = CallPacer(2.0, clock=lambda: now[0], sleep=fake_sleep)
+
+    assert [await pacer.wait("AC1") for _ in range(3)] == [0.0, 0.5, 1.0]
+    assert await pacer.wait("AC2") == 0.0  # other accounts have their own budget
+    now[0] += 5
+    assert await pacer.wait("AC1") == 0.0
+    assert sleeps == [0.5, 1.0]
+
+
+@pytest.mark.asyncio
+async def test_pacer_takes_slots_from_shared_state_and_falls_back_locally():
+    reserved = []
+    sleeps = []
+
+    async def reserve(account, interval):
+        reserved.append((account, interval))
+        if len(reserved) > 1:
+            raise ConnectionError("database unavailable")
+        return 0.75  # Another worker holds the next slots
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    pacer = CallPacer(2.0, clock=lambda: 100.0, sleep=fake_sleep, reserve=reserve)
+
+    assert await pacer.wait("AC1") == 0.75
+    assert [await pacer.wait("AC1") for _ in range(2)] == [0.0, 0.5]
+    assert reserved == [("AC1", 0.5)] * 3
+    assert sleeps == [0.75, 0.5]
+
+
+def test_busy_and_no_answer_are_retried_with_backoff_until_max_attempts():
+    now = datetime(2025, 11, 20, 10, 0, tzinfo=timezone.utc)
+    campaign = _campaign(max_attempts=3, retry_delay_seconds=600)
+
+    contact = _contact(1, "+33612345678", attempts=2)
+    assert apply_call_status(contact, campaign, "busy", now=now) == "retry"
+    assert contact.status == "pending"
+    assert contact.next_attempt_at == now + timedelta(seconds=1200)
+
+    contact = _contact(1, "+33612345678", attempts=3)
+    assert apply_call_status(contact, campaign, "no-answer", now=now) == "failed"
+    assert contact.status == "failed"
+
+
+def test_in_progress_and_late_callbacks_do_not_end_the_call():
+    now = datetime.now(timezone.utc)
+    campaign = _campaign()
+
+    contact = _contact(1, "+33612345678")
+    assert apply_call_status(contact, campaign, "ringing", now=now) is None
+    assert contact.status == "dialing"
+    assert apply_call_status(contact, campaign, "completed", now=now) == "completed"
+    # A duplicate final callback is ignored
+    assert apply_call_status(contact, campaign, "busy", now=now) is None
+    assert contact.status == "completed"
+
+
+@pytest.fixture
+def dialer_env(monkeypatch):
+    state = {"claimed": [], "dialed": {}, "not_placed": {}, "requeued": {}, "live": {}, "completed": [], "commits": 0, "locked": False}
+    twilio = FakeTwilio(invalid_numbers={"+33699999999"})
+    http = twilio.http_client()
+    user = SimpleNamespace(id="user-1", twilio_account_sid="AC1", twilio_auth_token="token")
+
+    class FakeSession:
+        async def get(self, model, key):
+            return user
+
+        async def commit(self):
+            state["commits"] += 1
+
+    @asynccontextmanager
+    async def fake_session():
+        yield FakeSession()
+
+    async def lock_tenant_for_dialing(session, user_id):
+        return None if state["locked"] else user
+
+    async def count_live_calls(session, user_id, *, stale_after):
+        return state["live"]
+
+    async def release_stale_contacts(session, campaign_id, *, stale_after):
+        return None
+
+    async def claim_campaign_contacts(session, campaign_id, *, limit):
+        claimed, state["claimed"] = state["claimed"][:limit], state["claimed"][limit:]
+        return claimed
+
+    async def has_open_contacts(session, campaign_id):
+        return bool(state["claimed"])
+
+    async def complete_campaign(session, campaign_id):
+        state["completed"].append(campaign_id)
+
+    async def mark_contact_dialed(session, contact_id, *, call_sid):
+        assert state["commits"], "claims are committed before calls are placed"
+        state["dialed"][contact_id] = call_sid
+
+    async def mark_contact_not_placed(session, contact_id, *, error, retry_at):
+        state["not_placed"][contact_id] = (error, retry_at)
+
+    async def requeue_contact(session, contact_id, *, error):
+        state["requeued"][contact_id] = error
+
+    for name, value in {
+        "SessionLocal": fake_session,
+        "lock_tenant_for_dialing": lock_tenant_for_dialing,
+        "count_live_calls": count_live_calls,
+        "release_stale_contacts": release_stale_contacts,
+        "claim_campaign_contacts": claim_campaign_contacts,
+        "has_open_contacts": has_open_contacts,
+        "complete_campaign": complete_campaign,
+        "mark_contact_dialed": mark_contact_dialed,
+        "mark_contact_not_placed": mark_contact_not_placed,
+        "requeue_contact": requeue_contact,
+    }.items():
+        monkeypatch.setattr(campaigns_module, name, value)
+    monkeypatch.setattr(twilio_client_module, "get_twilio_http_client", lambda: http)
+
+    monkeypatch.setattr(circuit_breaker_module, "_keyed_breakers", circuit_breaker_module.OrderedDict())
+
+    yield SimpleNamespace(state=state, twilio=twilio, user=user)
+
+
+@pytest.mark.asyncio
+async def test_dialer_places_calls_within_concurrency_limits(dialer_env):
+    state = dialer_env.state
+    state["claimed"] = [_contact(1, "+33611111111"), _contact(2, "+33622222222"), _contact(3, "+33633333333")]
+    state["live"] = {"camp-1": 1}
+    dialer = CampaignDialer(max_live_calls_per_tenant=10, status_callback_url="https://api.test/status")
+    dialer.pacer = CallPacer(1000)
+
+    placed = await dialer._dial_tenant("user-1", [_campaign(max_concurrent_calls=2)])
+
+    # One call already live: only one more slot in this campaign
+    assert placed == 1
+    assert state["dialed"] == {1: "CA001"}
+    call = dialer_env.twilio.calls[0]
+    assert (call["To"], call["From"], call["Url"]) == ("+33611111111", "+33100000000", "https://example.com/twiml")
+    assert call["StatusCallback"] == "https://api.test/status?campaign_contact=1"
+
+
+@pytest.mark.asyncio
+async def test_dialer_respects_tenant_cap_and_calling_window(dialer_env):
+    state = dialer_env.state
+    state["claimed"] = [_contact(1, "+33611111111")]
+    dialer = CampaignDialer(max_live_calls_per_tenant=3)
+    dialer.pacer = CallPacer(1000)
+
+    state["live"] = {"camp-1": 1, "camp-2": 2}
+    assert await dialer._dial_tenant("user-1", [_campaign(max_concurrent_calls=5)]) == 0
+
+    state["live"] = {}
+    closed = _campaign(schedule="closed")
+    assert await dialer._dial_tenant("user-1", [closed]) == 0
+    assert dialer_env.twilio.calls == []
+
+
+@pytest.mark.asyncio
+async def test_rejected_numbers_fail_without_retry_and_campaign_completes(dialer_env):
+    state = dialer_env.state
+    state["claimed"] = [_contact(1, "+33699999999")]
+    dialer = CampaignDialer()
+    dialer.pacer = CallPacer(1000)
+
+    assert await dialer._dial_tenant("user-1", [_campaign()]) == 0
+    error, retry_at = state["not_placed"][1]
+    assert "Invalid 'To' Phone Number" in error
+    assert retry_at is None
+
+    await dialer._dial_tenant("user-1", [_campaign()])
+    assert state["completed"] == ["camp-1"]
+
+
+@pytest.mark.asyncio
+async def test_rejected_numbers_do_not_open_the_twilio_circuit(dialer_env):
+    state = dialer_env.state
+    state["claimed"] = [_contact(i, "+33699999999") for i in range(1, 5)] + [_contact(5, "+33611111111")]
+    dialer = CampaignDialer()
+    dialer.pacer = CallPacer(1000)
+
+    assert await dialer._dial_tenant("user-1", [_campaign(max_concurrent_calls=10)]) == 1
+    assert len(state["not_placed"]) == 4
+    assert state["dialed"] == {5: "CA001"}
+
+
+@pytest.mark.asyncio
+async def test_call_rejected_by_open_circuit_is_requeued_without_an_attempt(dialer_env):
+    state = dialer_env.state
+    state["claimed"] = [_contact(1, "+33611111111")]
+    breaker = get_circuit_breaker("twilio", key="AC1")
+    breaker._state = CircuitState.OPEN
+    breaker._last_failure_time = time.time()
+    dialer = CampaignDialer()
+    dialer.pacer = CallPacer(1000)
+
+    assert await dialer._dial_tenant("user-1", [_campaign()]) == 0
+    assert "temporarily unavailable" in state["requeued"][1]
+    assert state["not_placed"] == {}
+    assert dialer_env.twilio.calls == []
+    assert get_circuit_breaker("twilio", key="AC2").state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_tenant_dialed_by_another_worker_is_skipped(dialer_env):
+    state = dialer_env.state
+    state["claimed"] = [_contact(1, "+33611111111")]
+    state["locked"] = True
+    dialer = CampaignDialer()
+    dialer.pacer = CallPacer(1000)
+
+    assert await dialer._dial_tenant("user-1", [_campaign()]) == 0
+    assert len(state["claimed"]) == 1
+    assert dialer_env.twilio.calls == []
+
+
+def test_status_callback_customer_is_the_callee_of_outbound_calls():
+    form = {"From": "+33100000000", "To": "+33611111111", "Direction": "outbound-api"}
+    assert _twilio_customer_number(form, campaign_call=False) == "+33611111111"
+    assert _twilio_customer_number({**form, "Direction": None}, campaign_call=True) == "+33611111111"
+    assert _twilio_customer_number({**form, "Direction": "inbound"}, campaign_call=False) == "+33100000000"
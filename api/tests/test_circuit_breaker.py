@@ -0,0 +1,171 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from api.src.infrastructure.external import circuit_breaker as circuit_breaker_module
+from api.src.infrastructure.external.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitState,
+    breaker_key,
+    get_circuit_breaker,
+)
+from api.src.infrastructure.external.vapi_client import VapiApiError, VapiAuthError, _is_vapi_outage
+
+
+async def _fail():
+    raise RuntimeError("provider down")
+
+
+async def _ok():
+    return "ok"
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_on_failure_rate_without_consecutive_failures():
+    breaker = CircuitBreaker(
+        name="test-rate",
+        config=CircuitBreakerConfig(failure_threshold=100, window_size=10, minimum_calls=6, failure_rate_threshold=0.5),
+    )
+
+    # Alternating results never reach the consecutive threshold
+    for _ in range(2):
+        await breaker.call(_ok)
+        with pytest.raises(RuntimeError):
+            await breaker.call(_fail)
+    assert breaker.state == CircuitState.CLOSED  # Below minimum_calls
+
+    await breaker.call(_ok)
+    with pytest.raises(RuntimeError):
+        await breaker.call(_fail)
+
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(HTTPException) as exc_info:
+        await breaker.call(_ok)
+    assert exc_info.value.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_on_slow_call_rate():
+    breaker = CircuitBreaker(
+        name="test-slow",
+        config=CircuitBreakerConfig(
+            window_size=4, minimum_calls=4, slow_call_duration=0.01, slow_call_rate_threshold=0.75
+        ),
+    )
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "late"
+
+    await breaker.call(_ok)
+    for _ in range(3):
+        assert await breaker.call(slow) == "late"
+
+    assert breaker.state == CircuitState.OPEN
+
+
+@pytest.mark.asyncio
+async def test_half_open_allows_limited_concurrent_probes():
+    breaker = CircuitBreaker(
+        name="test-probes",
+        config=CircuitBreakerConfig(failure_threshold=1, recovery_timeout=1, half_open_max_calls=1, success_threshold=1),
+    )
+    with pytest.raises(RuntimeError):
+        await breaker.call(_fail)
+    breaker._last_failure_time = time.time() - 2
+
+    release = asyncio.Event()
+
+    async def probe():
+        await release.wait()
+        return "probe"
+
+    first = asyncio.create_task(breaker.call(probe))
+    await asyncio.sleep(0)
+    assert breaker.state == CircuitState.HALF_OPEN
+
+    with pytest.raises(HTTPException) as exc_info:
+        await breaker.call(_ok)
+    assert exc_info.value.status_code == 503
+
+    release.set()
+    assert await first == "probe"
+    assert breaker.state == CircuitState.CLOSED
+    assert await breaker.call(_ok) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_failed_probe_reopens_circuit():
+    breaker = CircuitBreaker(
+        name="test-probe-fail",
+        config=CircuitBreakerConfig(failure_threshold=5, recovery_timeout=1),
+    )
+    breaker._state = CircuitState.OPEN
+    breaker._last_failure_time = time.time() - 2
+
+    with pytest.raises(RuntimeError):
+        await breaker.call(_fail)
+
+    assert breaker.state == CircuitState.OPEN
+    assert breaker._half_open_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_unclassified_exceptions_do_not_count():
+    breaker = CircuitBreaker(
+        name="test-classify",
+        config=CircuitBreakerConfig(failure_threshold=1, is_failure=_is_vapi_outage),
+    )
+
+    async def unauthorized():
+        raise VapiAuthError("revoked", status_code=401)
+
+    async def server_error():
+        raise VapiApiError("boom", status_code=502)
+
+    with pytest.raises(VapiAuthError):
+        await breaker.call(unauthorized)
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker._failure_count == 0
+
+    with pytest.raises(VapiApiError):
+        await breaker.call(server_error)
+    assert breaker.state == CircuitState.OPEN
+
+
+@pytest.mark.asyncio
+async def test_keyed_breakers_are_isolated():
+    config = CircuitBreakerConfig(failure_threshold=1)
+    broken = get_circuit_breaker("test-keyed", config, key=breaker_key("tenant-a-token"))
+    healthy = get_circuit_breaker("test-keyed", config, key=breaker_key("tenant-b-token"))
+
+    with pytest.raises(RuntimeError):
+        await broken.call(_fail)
+
+    assert broken.state == CircuitState.OPEN
+    assert healthy.state == CircuitState.CLOSED
+    assert await healthy.call(_ok) == "ok"
+    assert get_circuit_breaker("test-keyed", key=breaker_key("tenant-a-token")) is broken
+
+
+def test_keyed_breakers_evict_least_recently_used_closed(monkeypatch):
+    monkeypatch.setattr(circuit_breaker_module, "_keyed_breakers", circuit_breaker_module.OrderedDict())
+    monkeypatch.setattr(
+        circuit_breaker_module,
+        "get_settings",
+        lambda: type("S", (), {"circuit_breaker_max_keyed_breakers": 2})(),
+    )
+    config = CircuitBreakerConfig()
+
+    tripped = get_circuit_breaker("svc", config, key="a")
+    tripped._state = CircuitState.OPEN
+    idle = get_circuit_breaker("svc", config, key="b")
+    get_circuit_breaker("svc", config, key="c")
+
+    registry = circuit_breaker_module._keyed_breakers
+    assert ("svc", "a") in registry  # Open breakers survive while closed ones can go
+    assert ("svc", "b") not in registry
+    assert get_circuit_breaker("svc", config, key="b") is not idle
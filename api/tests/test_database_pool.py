@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+from api.src.core.settings import get_settings
+from api.src.infrastructure.database.session import engine_options
+
+
+def _config(**overrides):
+    return get_settings().model_copy(update=overrides)
+
+
+def test_pgbouncer_mode_disables_pooling_and_prepared_statements():
+    options = engine_options(_config(database_pool_mode="pgbouncer"))
+
+    assert options["poolclass"] is NullPool
+    assert options["connect_args"]["statement_cache_size"] == 0
+    assert options["connect_args"]["prepared_statement_cache_size"] == 0
+    assert "pool_size" not in options
+
+
+def test_queue_mode_pools_connections_and_caches_statements():
+    options = engine_options(
+        _config(
+            database_pool_mode="queue",
+            database_pool_size=3,
+            database_pool_max_overflow=2,
+            database_pool_recycle_seconds=60,
+            database_pool_pre_ping=True,
+            database_statement_cache_size=50,
+            database_statement_timeout_ms=5000,
+        )
+    )
+
+    assert options["poolclass"] is AsyncAdaptedQueuePool
+    assert options["pool_size"] == 3
+    assert options["max_overflow"] == 2
+    assert options["pool_recycle"] == 60
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"]["statement_cache_size"] == 50
+    assert options["connect_args"]["prepared_statement_cache_size"] == 50
+    assert options["connect_args"]["server_settings"]["statement_timeout"] == "5000ms"
+
+    engine = create_async_engine(get_settings().database_url, **options)
+    assert isinstance(engine.pool, AsyncAdaptedQueuePool)
+    assert engine.pool.size() == 3
+
+
+def test_unknown_pool_mode_is_rejected():
+    with pytest.raises(ValueError, match="database_pool_mode"):
+        engine_options(_config(database_pool_mode="session"))
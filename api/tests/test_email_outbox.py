@@ -0,0 +1,208 @@
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from api.src.application.services import email_outbox as outbox_module
+from api.src.application.services.email_outbox import EmailOutboxWorker
+from api.src.infrastructure.email.smtp_pool import SMTPDeliveryUncertain
+
+
+class FakeEmailService:
+    def __init__(self, *, smtp=None, resend=None):
+        self.smtp_enabled = smtp is not None
+        self.resend_enabled = resend is not None
+        self._smtp = smtp
+        self._resend = resend
+        self.calls = []
+
+    async def send_via_smtp(self, request):
+        self.calls.append("smtp")
+        if isinstance(self._smtp, Exception):
+            raise self._smtp
+        return {"id": self._smtp}
+
+    async def send_via_resend(self, request):
+        self.calls.append("resend")
+        if isinstance(self._resend, Exception):
+            raise self._resend
+        return {"id": self._resend}
+
+    async def send_batch_via_resend(self, requests):
+        self.calls.append(("batch", [request.idempotency_key for request in requests]))
+        if isinstance(self._resend, Exception):
+            raise self._resend
+        return [{"id": f"{self._resend}-{index}"} for index in range(len(requests))]
+
+
+def _email(attempts=1, id=7):
+    return SimpleNamespace(
+        id=id,
+        user_id=None,
+        recipients=["owner@example.com"],
+        subject="Hello",
+        html="<p>Hi</p>",
+        sender=None,
+        attempts=attempts,
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    calls = {}
+
+    @asynccontextmanager
+    async def fake_session():
+        yield None
+
+    async def fake_sent(session, email_id, *, provider, message_id):
+        calls["sent"] = (email_id, provider, message_id)
+        calls.setdefault("all_sent", []).append((email_id, provider, message_id))
+
+    async def fake_failed(session, email_id, *, error, retry_at):
+        calls["failed"] = (email_id, error, retry_at)
+        calls.setdefault("all_failed", []).append(email_id)
+
+    async def fake_claim(session, *, limit, lease_seconds):
+        return calls.pop("claim", [])
+
+    monkeypatch.setattr(outbox_module, "SessionLocal", fake_session)
+    monkeypatch.setattr(outbox_module, "claim_due_emails", fake_claim)
+    monkeypatch.setattr(outbox_module, "mark_email_sent", fake_sent)
+    monkeypatch.setattr(outbox_module, "mark_email_failed", fake_failed)
+    return calls
+
+
+def test_retry_delay_grows_exponentially_and_is_capped():
+    worker = EmailOutboxWorker(retry_base_seconds=10, retry_max_seconds=60)
+
+    assert 5 <= worker.retry_delay(1) <= 10
+    assert 10 <= worker.retry_delay(2) <= 20
+    assert 20 <= worker.retry_delay(3) <= 40
+    assert 30 <= worker.retry_delay(10) <= 60
+
+
+@pytest.mark.asyncio
+async def test_deliver_fails_over_from_smtp_to_resend():
+    worker = EmailOutboxWorker()
+    service = FakeEmailService(smtp=ConnectionError("smtp down"), resend="re_123")
+
+    assert await worker.deliver(service, _email()) == ("resend", "re_123")
+    assert service.calls == ["smtp", "resend"]
+
+
+@pytest.mark.asyncio
+async def test_connection_lost_after_data_is_not_sent_again(recorded, monkeypatch):
+    worker = EmailOutboxWorker(max_attempts=3)
+    service = FakeEmailService(smtp=SMTPDeliveryUncertain("Connection unexpectedly closed"), resend="re_123")
+
+    async def service_for(user_id):
+        return service
+
+    monkeypatch.setattr(worker, "_service_for", service_for)
+    await worker._process(_email(attempts=1))
+
+    assert service.calls == ["smtp"]
+    assert "sent" not in recorded
+    assert recorded["failed"][2] is None
+
+
+@pytest.mark.asyncio
+async def test_successful_delivery_marks_email_sent(recorded, monkeypatch):
+    worker = EmailOutboxWorker()
+    service = FakeEmailService(smtp="smtp-1")
+
+    async def service_for(user_id):
+        return service
+
+    monkeypatch.setattr(worker, "_service_for", service_for)
+    await worker._process(_email())
+
+    assert recorded["sent"] == (7, "smtp", "smtp-1")
+    assert "failed" not in recorded
+
+
+@pytest.mark.asyncio
+async def test_failed_delivery_is_retried_then_dead_lettered(recorded, monkeypatch):
+    worker = EmailOutboxWorker(max_attempts=3)
+    service = FakeEmailService(resend=RuntimeError("rate limited"))
+
+    async def service_for(user_id):
+        return service
+
+    monkeypatch.setattr(worker, "_service_for", service_for)
+
+    await worker._process(_email(attempts=1))
+    email_id, error, retry_at = recorded["failed"]
+    assert (email_id, error) == (7, "rate limited")
+    assert retry_at > datetime.now(timezone.utc)
+
+    await worker._process(_email(attempts=3))
+    assert recorded["failed"][2] is None
+
+
+@pytest.mark.asyncio
+async def test_resend_only_emails_are_sent_as_one_batch(recorded, monkeypatch):
+    worker = EmailOutboxWorker()
+    service = FakeEmailService(resend="re")
+
+    async def service_for(user_id):
+        return service
+
+    monkeypatch.setattr(worker, "_service_for", service_for)
+    recorded["claim"] = [_email(id=1), _email(id=2), _email(id=3)]
+
+    assert await worker.run_once() == 3
+    assert service.calls == [("batch", ["email-outbox/1", "email-outbox/2", "email-outbox/3"])]
+    assert recorded["all_sent"] == [(1, "resend", "re-0"), (2, "resend", "re-1"), (3, "resend", "re-2")]
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_batch_is_retried_no_earlier_than_retry_after(recorded, monkeypatch):
+    from api.src.infrastructure.email.resend_transport import ResendRateLimited
+
+    worker = EmailOutboxWorker(retry_base_seconds=1, retry_max_seconds=1)
+    service = FakeEmailService(resend=ResendRateLimited("slow down", retry_after=120))
+
+    async def service_for(user_id):
+        return service
+
+    monkeypatch.setattr(worker, "_service_for", service_for)
+    recorded["claim"] = [_email(id=1), _email(id=2)]
+
+    await worker.run_once()
+    assert sorted(recorded["all_failed"]) == [1, 2]
+    assert (recorded["failed"][2] - datetime.now(timezone.utc)).total_seconds() > 100
+
+
+@pytest.mark.asyncio
+async def test_rejected_batch_falls_back_to_single_sends(recorded, monkeypatch):
+    from api.src.infrastructure.email.resend_transport import ResendError
+
+    worker = EmailOutboxWorker()
+    service = FakeEmailService(resend="re")
+
+    async def send_batch_via_resend(requests):
+        service.calls.append("batch")
+        raise ResendError("Invalid `to` field", status_code=422)
+
+    async def send_via_resend(request):
+        service.calls.append(request.idempotency_key)
+        if request.idempotency_key == "email-outbox/2":
+            raise ResendError("Invalid `to` field", status_code=422)
+        return {"id": f"re-{request.idempotency_key}"}
+
+    async def service_for(user_id):
+        return service
+
+    monkeypatch.setattr(service, "send_batch_via_resend", send_batch_via_resend)
+    monkeypatch.setattr(service, "send_via_resend", send_via_resend)
+    monkeypatch.setattr(worker, "_service_for", service_for)
+    recorded["claim"] = [_email(id=1), _email(id=2), _email(id=3)]
+
+    await worker.run_once()
+    assert service.calls[0] == "batch"
+    assert sorted(email_id for email_id, _, _ in recorded["all_sent"]) == [1, 3]
+    assert recorded["all_failed"] == [2]
@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+
+from api.src.application.services import email as email_module
+from api.src.application.services.email import EmailServiceCache
+
+
+def _config(user_id="user-1", password="token-1"):
+    return SimpleNamespace(
+        user_id=user_id,
+        smtp_server="smtp.test",
+        smtp_port="587",
+        smtp_username="owner@test",
+        smtp_password_encrypted=password,
+    )
+
+
+def _count_resolves(monkeypatch):
+    calls = []
+
+    def fake_resolve(config):
+        calls.append(config.smtp_password_encrypted)
+        return None
+
+    monkeypatch.setattr(email_module, "resolve_smtp_config", fake_resolve)
+    return calls
+
+
+def test_service_is_built_once_per_tenant(monkeypatch):
+    resolves = _count_resolves(monkeypatch)
+    cache = EmailServiceCache(ttl_seconds=60)
+
+    first = cache.get(_config())
+    assert cache.get(_config()) is first
+    assert cache.get(_config(user_id="user-2")) is not first
+    assert resolves == ["token-1", "token-1"]
+
+
+def test_changed_smtp_settings_or_invalidation_rebuild_service(monkeypatch):
+    resolves = _count_resolves(monkeypatch)
+    cache = EmailServiceCache(ttl_seconds=60)
+
+    first = cache.get(_config())
+    rotated = cache.get(_config(password="token-2"))
+    assert rotated is not first
+
+    cache.invalidate_user("user-1")
+    assert cache.get(_config(password="token-2")) is not rotated
+    assert resolves == ["token-1", "token-2", "token-2"]
+
+
+def test_cache_is_bounded_and_expires(monkeypatch):
+    _count_resolves(monkeypatch)
+    cache = EmailServiceCache(max_entries=2, ttl_seconds=0)
+
+    first = cache.get(_config("a"))
+    cache.get(_config("b"))
+    cache.get(_config("c"))
+
+    assert len(cache) == 2
+    assert cache.get(_config("a")) is not first
+    assert cache.get(None) is cache.get(None)
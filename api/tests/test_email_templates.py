@@ -0,0 +1,43 @@
+import pytest
+
+from api.src.infrastructure.email.templating import Template, TemplateError, precompile_templates, render_template
+
+
+def test_values_are_escaped_unless_marked_raw():
+    template = Template("<p>{{ name }}</p>{{ note|nl2br }}{{ footer|raw }}")
+
+    html = template.render(name="<script>x</script>", note="a & b\nc", footer="<hr>")
+
+    assert html == "<p>&lt;script&gt;x&lt;/script&gt;</p>a &amp; b<br>c<hr>"
+
+
+def test_loops_conditionals_and_dotted_lookups():
+    template = Template(
+        "{% for turn in turns %}{% if turn.is_assistant %}A:{% else %}U:{% endif %}{{ turn.text }};{% endfor %}"
+        "{% if not call.cost %}free{% endif %}"
+    )
+
+    html = template.render(
+        turns=[{"is_assistant": True, "text": "Hi"}, {"is_assistant": False, "text": "Bye"}],
+        call={"cost": 0},
+    )
+
+    assert html == "A:Hi;U:Bye;free"
+
+
+def test_malformed_templates_fail_at_compile_time():
+    with pytest.raises(TemplateError):
+        Template("{% for turn in turns %}never closed")
+    with pytest.raises(TemplateError):
+        Template("{{ name|shout }}")
+
+
+def test_bundled_templates_compile_and_render_long_transcripts():
+    assert precompile_templates() >= 2
+
+    turns = [{"is_assistant": index % 2 == 0, "text": f"<b>turn {index}</b>"} for index in range(500)]
+    html = render_template("call_transcript.html", call={"phone_number": "+33612345678"}, turns=turns)
+
+    assert html.count("AVA Assistant") == 250
+    assert "&lt;b&gt;turn 499&lt;/b&gt;" in html
+    assert "<b>turn" not in html
@@ -0,0 +1,206 @@
+import asyncio
+
+import pytest
+
+from api.src.application.services.function_calls import (
+    FunctionRegistry,
+    TenantContext,
+    TenantContextCache,
+)
+
+
+class StaticTenantContexts(TenantContextCache):
+    def __init__(self, context=None):
+        super().__init__(ttl_seconds=60)
+        self.context = context
+
+    async def resolve(self, *, user_id, assistant_id):
+        return self.context
+
+
+def _registry(context=None) -> FunctionRegistry:
+    return FunctionRegistry(tenant_contexts=StaticTenantContexts(context))
+
+
+async def _dispatch(registry, name, params=None):
+    return await registry.dispatch(name, params or {}, call_data={"id": "call-1"}, metadata={})
+
+
+@pytest.mark.asyncio
+async def test_dispatch_runs_handler_with_context():
+    registry = _registry()
+
+    @registry.register("echo")
+    async def echo(params, context):
+        return {"result": params["text"], "call": context.call_id, "success": True}
+
+    assert await _dispatch(registry, "echo", {"text": "hi"}) == {"result": "hi", "call": "call-1", "success": True}
+
+
+@pytest.mark.asyncio
+async def test_dispatch_returns_fallback_on_deadline_and_error():
+    registry = _registry()
+    fallback = {"result": "later", "success": False}
+
+    @registry.register("slow", deadline_seconds=0.01, fallback=fallback)
+    async def slow(params, context):
+        await asyncio.sleep(1)
+
+    @registry.register("broken", fallback=fallback)
+    async def broken(params, context):
+        raise RuntimeError("boom")
+
+    assert await _dispatch(registry, "slow") == fallback
+    assert await _dispatch(registry, "broken") == fallback
+
+
+@pytest.mark.asyncio
+async def test_dispatch_sheds_load_beyond_concurrency_limit():
+    registry = _registry()
+    release = asyncio.Event()
+    fallback = {"result": "busy", "success": False}
+
+    @registry.register("limited", max_concurrency=1, fallback=fallback)
+    async def limited(params, context):
+        await release.wait()
+        return {"result": "done", "success": True}
+
+    first = asyncio.create_task(_dispatch(registry, "limited"))
+    await asyncio.sleep(0)
+    assert await _dispatch(registry, "limited") == fallback
+    release.set()
+    assert (await first)["result"] == "done"
+
+
+@pytest.mark.asyncio
+async def test_tenant_handler_overrides_global_and_unknown_function():
+    tenant = TenantContext(user_id="u1", organization_name="Acme", timezone="Europe/Paris", language="fr")
+    registry = _registry(tenant)
+
+    @registry.register("greet")
+    async def greet(params, context):
+        return {"result": "global"}
+
+    @registry.register("greet", tenant_id="u1")
+    async def greet_acme(params, context):
+        return {"result": context.tenant.organization_name}
+
+    assert await _dispatch(registry, "greet") == {"result": "Acme"}
+    assert (await _dispatch(registry, "missing"))["success"] is False
+
+
+@pytest.mark.asyncio
+async def test_cancelled_lookup_does_not_strand_concurrent_callers(monkeypatch):
+    release = asyncio.Event()
+    loads = []
+
+    async def load(*, user_id, assistant_id):
+        loads.append(user_id)
+        await release.wait()
+        return TenantContext(user_id=user_id, organization_name="Acme", timezone="UTC", language="en")
+
+    monkeypatch.setattr("api.src.application.services.function_calls._load_tenant_context", load)
+    cache = TenantContextCache(ttl_seconds=60)
+
+    leader = asyncio.create_task(cache.resolve(user_id="u1", assistant_id=None))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(cache.resolve(user_id="u1", assistant_id=None))
+    await asyncio.sleep(0)
+
+    leader.cancel()  # e.g. its dispatch deadline expired
+    await asyncio.sleep(0)
+    release.set()
+
+    context = await asyncio.wait_for(follower, timeout=1)
+    assert context.organization_name == "Acme"
+    assert loads == ["u1"]
+    assert await cache.resolve(user_id="u1", assistant_id=None) is context
+
+
+@pytest.mark.asyncio
+async def test_save_caller_info_write_outlives_the_deadline(monkeypatch):
+    from api.src.application.services import function_calls as module
+
+    tenant = TenantContext(
+        user_id="00000000-0000-0000-0000-000000000001", organization_name="Acme", timezone="UTC", language="en"
+    )
+    registry = _registry(tenant)
+    spec = module.function_registry.get("save_caller_info")
+    saved = []
+
+    class SlowDirectory:
+        async def record(self, tenant_id, number, **fields):
+            await asyncio.sleep(0.05)
+            saved.append(number)
+            return None
+
+    monkeypatch.setattr(module, "caller_directory", SlowDirectory())
+    registry.register("save_caller_info", spec.handler, deadline_seconds=0.01, fallback=spec.fallback)
+
+    result = await registry.dispatch(
+        "save_caller_info",
+        {"firstName": "Ana"},
+        call_data={"id": "call-1", "customer": {"number": "+33612345678"}},
+        metadata={},
+    )
+    assert result == spec.fallback
+    assert "recorded" in result["result"] and "noted" not in result["result"]
+    await asyncio.sleep(0.1)
+    assert saved == ["+33612345678"]
+
+
+@pytest.mark.asyncio
+async def test_save_caller_info_reports_unsaved_details():
+    from api.src.application.services.function_calls import FunctionContext, save_caller_info
+
+    context = FunctionContext(call_id="call-1", assistant_id=None, customer_number=None, tenant=None)
+    result = await save_caller_info({"firstName": "Ana", "lastName": "Lima"}, context)
+
+    assert result["success"] is False
+    assert result["data"]["saved"] is False
+    assert "saved your information" not in result["result"]
+
+
+@pytest.mark.asyncio
+async def test_tenant_functions_from_studio_config(monkeypatch):
+    from types import SimpleNamespace
+
+    from api.src.application.services import function_calls as module
+
+    config = SimpleNamespace(
+        user_id="u1",
+        organization_name="Acme",
+        timezone="UTC",
+        language="en",
+        admin_email=None,
+        business_hours="",
+        holidays=[],
+        custom_functions=[{"name": "parking_info", "result": "Free parking behind the shop."}, {"name": "broken"}],
+    )
+
+    class FakeSession:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def execute(self, stmt):
+            return SimpleNamespace(scalars=lambda: SimpleNamespace(first=lambda: config))
+
+    monkeypatch.setattr(module, "SessionLocal", FakeSession)
+    monkeypatch.setattr(module, "schedule_for", lambda config: None)
+    cache = TenantContextCache(ttl_seconds=60)
+    registry = FunctionRegistry(tenant_contexts=cache)
+
+    async def dispatch(name):
+        return await registry.dispatch(name, {}, call_data={"id": "call-1"}, metadata={"user_id": "u1"})
+
+    assert await dispatch("parking_info") == {"result": "Free parking behind the shop.", "success": True}
+    assert (await dispatch("broken"))["success"] is False  # Malformed entries are skipped
+
+    # Saving the studio config invalidates the context and its functions
+    config.custom_functions = []
+    assert (await dispatch("parking_info"))["result"] == "Free parking behind the shop."
+    cache.invalidate_user("u1")
+    assert (await dispatch("parking_info"))["result"] == "Unknown function: parking_info"
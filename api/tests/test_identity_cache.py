@@ -0,0 +1,129 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from api.src.application.services import identity as identity_module
+from api.src.application.services.identity import IdentityCache
+from api.src.application.services.tenant import ensure_tenant_for_user
+from api.src.core.settings import get_settings
+from api.src.infrastructure.persistence.models.tenant import Tenant
+from api.src.infrastructure.persistence.models.user import User
+from api.src.presentation.dependencies.auth import get_current_user
+
+
+def _loaded_user(**overrides) -> User:
+    """A User as if just loaded from the database."""
+    now = datetime.now(timezone.utc)
+    fields = dict(
+        id=str(uuid4()),
+        email="owner@example.com",
+        phone=None,
+        password=None,
+        name="Owner",
+        image=None,
+        locale="en",
+        phone_verified=False,
+        two_fa_enabled=False,
+        vapi_api_key="vapi-key",
+        twilio_account_sid=None,
+        twilio_auth_token=None,
+        twilio_phone_number=None,
+        onboarding_completed=True,
+        onboarding_step=9,
+        onboarding_vapi_skipped=False,
+        onboarding_twilio_skipped=False,
+        onboarding_assistant_created=True,
+        created_at=now,
+        updated_at=now,
+    )
+    fields.update(overrides)
+    user = User(**fields)
+    make_transient_to_detached(user)
+    return user
+
+
+@pytest.fixture
+def identities(monkeypatch):
+    cache = IdentityCache(ttl_seconds=30)
+    monkeypatch.setattr(identity_module, "identities", cache)
+    monkeypatch.setattr("api.src.presentation.dependencies.auth.identities", cache)
+    monkeypatch.setattr("api.src.application.services.tenant.identities", cache)
+    return cache
+
+
+def test_cache_stores_detached_snapshots(identities):
+    user = _loaded_user()
+    identities.put_user(user)
+
+    cached = identities.get_user(user.id)
+    assert cached is not user
+    assert cached.vapi_api_key == "vapi-key"
+    assert inspect(cached).detached
+
+    user.vapi_api_key = "changed-after-caching"
+    assert identities.get_user(user.id).vapi_api_key == "vapi-key"
+
+    identities.invalidate_user(user.id)
+    assert identities.get_user(user.id) is None
+
+
+def test_partially_loaded_rows_are_not_cached(identities):
+    user = _loaded_user()
+    inspect(user).dict.pop("vapi_api_key")
+
+    identities.put_user(user)
+    assert identities.get_user(user.id) is None
+
+
+def test_entries_expire_and_are_bounded(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(identity_module.time, "monotonic", lambda: clock[0])
+    cache = IdentityCache(max_entries=2, ttl_seconds=30)
+    users = [_loaded_user(email=f"user{i}@example.com") for i in range(3)]
+    for user in users:
+        cache.put_user(user)
+
+    assert cache.get_user(users[0].id) is None
+    assert cache.get_user(users[2].id) is not None
+
+    clock[0] += 30
+    assert cache.get_user(users[2].id) is None
+
+
+@pytest.mark.asyncio
+async def test_current_user_is_served_without_a_query(identities):
+    user = _loaded_user()
+    identities.put_user(user)
+    settings = get_settings().model_copy(update={"jwt_secret_key": "test-secret"})
+    token = jwt.encode({"sub": user.id}, "test-secret", algorithm="HS256")
+
+    # No bind: any query would raise
+    async with AsyncSession() as session:
+        current = await get_current_user(
+            credentials=HTTPAuthorizationCredentials(scheme="Bearer", credentials=token),
+            session=session,
+            settings=settings,
+        )
+
+        assert current in session
+        assert current.vapi_api_key == "vapi-key"
+        current.name = "Renamed"
+        assert current in session.dirty
+
+
+@pytest.mark.asyncio
+async def test_tenants_are_served_from_the_cache(identities):
+    tenant = Tenant(id=uuid4(), name="Owner", created_at=datetime.now(timezone.utc))
+    make_transient_to_detached(tenant)
+    identities.put_tenant(tenant)
+
+    async with AsyncSession() as session:
+        resolved = await ensure_tenant_for_user(session, _loaded_user(id=str(tenant.id)))
+        assert resolved.id == tenant.id
+        assert resolved in session
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from api.src.application.services import live_transcripts as live_module
+from api.src.application.services.live_transcripts import (
+    LiveTranscriptBuffer,
+    build_turn_rows,
+    flush_live_transcripts,
+)
+from api.src.presentation.api.v1.routes.webhooks import _event_timestamp, format_transcript
+
+
+def test_buffer_text_matches_format_transcript():
+    payload = [
+        {"role": "assistant", "message": "Bonjour, ici AVA."},
+        {"role": "user", "message": "Je voudrais un rendez-vous."},
+        {"role": "system", "message": "note"},
+    ]
+    buffer = LiveTranscriptBuffer()
+    for turn in payload:
+        buffer.append("call-1", role=turn["role"], message=turn["message"])
+
+    transcript = buffer.get("call-1")
+    assert transcript.text == format_transcript(payload)
+    seqs = [turn["seq"] for turn in transcript.structured()]
+    assert seqs == sorted(set(seqs))
+
+
+def test_seq_is_the_spoken_at_timestamp():
+    spoken_at = datetime(2025, 11, 24, 9, 0, tzinfo=timezone.utc)
+    buffer = LiveTranscriptBuffer()
+    first = buffer.append("call-1", role="assistant", message="Hi", spoken_at=spoken_at)
+    same_ms = buffer.append("call-1", role="user", message="Hello", spoken_at=spoken_at)
+    earlier = buffer.append("call-1", role="user", message="Late", spoken_at=spoken_at - timedelta(seconds=1))
+
+    assert first.seq == int(spoken_at.timestamp() * 1000)
+    assert same_ms.seq == first.seq + 1
+    assert earlier.seq == first.seq + 2
+
+    # Another worker seeing the same event computes the same seq
+    other = LiveTranscriptBuffer().append("call-1", role="assistant", message="Hi", spoken_at=spoken_at)
+    assert other.seq == first.seq
+
+
+def test_event_timestamp_parsing():
+    assert _event_timestamp({"timestamp": 1_700_000_000_000}) == datetime.fromtimestamp(1_700_000_000, tz=timezone.utc)
+    assert _event_timestamp({"timestamp": "2025-11-24T09:00:00Z"}) == datetime(2025, 11, 24, 9, tzinfo=timezone.utc)
+    assert _event_timestamp({"timestamp": "soon"}) is None
+    assert _event_timestamp({}) is None
+
+
+class _FakeSession:
+    def __init__(self, failing_call_id=None):
+        self.failing_call_id = failing_call_id
+        self.staged = []
+        self.committed = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def commit(self):
+        if any(row["call_id"] == self.failing_call_id for row in self.staged):
+            raise RuntimeError("insert failed")
+        self.committed.extend(self.staged)
+        self.staged = []
+
+    async def rollback(self):
+        self.staged = []
+
+
+@pytest.mark.asyncio
+async def test_flush_reserves_turns_and_isolates_failing_calls(monkeypatch):
+    session = _FakeSession(failing_call_id="bad")
+
+    async def add_turns(_session, rows):
+        # A call.ended handled while the flush awaits sees these turns as taken
+        transcript = buffer.get(rows[0]["call_id"])
+        assert transcript.flushed == len(transcript.turns)
+        session.staged.extend(rows)
+
+    monkeypatch.setattr(live_module, "SessionLocal", lambda: session)
+    monkeypatch.setattr(live_module, "add_transcript_turns", add_turns)
+
+    buffer = LiveTranscriptBuffer()
+    buffer.append("bad", role="user", message="1")
+    buffer.append("good", role="assistant", message="Hi", assistant_id="asst", user_id="u1")
+    buffer.append("good", role="user", message="Hello")
+
+    assert await flush_live_transcripts(buffer) == 2
+    assert [(row["call_id"], row["assistant_id"]) for row in session.committed] == [("good", "asst")] * 2
+
+    # The failed call is released for the next tick, the flushed one is not re-sent
+    assert [transcript.call_id for transcript in buffer.pending()] == ["bad"]
+
+    buffer.append("good", role="assistant", message="Anything else?")
+    (transcript,) = [t for t in buffer.pending() if t.call_id == "good"]
+    rows = build_turn_rows(transcript, transcript.turns[transcript.flushed:])
+    assert [row["message"] for row in rows] == ["Anything else?"]
+
+
+def test_buffer_evicts_idle_and_oldest_calls():
+    buffer = LiveTranscriptBuffer(max_calls=2, idle_ttl_seconds=60)
+    buffer.append("a", role="user", message="1")
+    buffer.append("b", role="user", message="2")
+    buffer.append("c", role="user", message="3")
+    assert buffer.get("a") is None
+    assert len(buffer) == 2
+
+    evicted = buffer.evict_idle(now=buffer.get("c").last_update + 61)
+    assert evicted == 2
+    assert len(buffer) == 0
@@ -1,7 +1,12 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
 from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
 
-from api.src.core.middleware_observability import ObservabilityMiddleware
+from api.src.core.middleware_observability import ObservabilityMiddleware, route_template
 
 
 app = FastAPI()
@@ -13,6 +18,11 @@ async def echo():
     return {"status": "ok"}
 
 
+@app.get("/echo-get")
+async def echo_get():
+    return {"status": "ok"}
+
+
 client = TestClient(app)
 
 
@@ -30,3 +40,96 @@ def test_request_id_header_returned():
     response = client.post("/echo")
     assert response.status_code == 200
     assert "X-Request-ID" in response.headers
+
+
+slow_app = FastAPI()
+slow_app.add_middleware(ObservabilityMiddleware, timeout_seconds=0.05)
+
+
+@slow_app.get("/slow")
+async def slow():
+    await asyncio.sleep(1)
+    return {"status": "late"}
+
+
+@slow_app.get("/ids")
+async def ids(request: Request):
+    return {"request_id": request.state.request_id, "correlation_id": request.state.correlation_id}
+
+
+@slow_app.get("/stream")
+async def stream():
+    async def chunks():
+        for _ in range(3):
+            await asyncio.sleep(0.03)
+            yield b"chunk;"
+
+    return StreamingResponse(chunks())
+
+
+slow_client = TestClient(slow_app)
+
+
+def test_request_without_response_times_out():
+    response = slow_client.get("/slow", headers={"X-Request-ID": "slow-1"})
+    assert response.status_code == 504
+    assert response.json()["detail"] == "Request timeout"
+    assert response.headers["X-Request-ID"] == "slow-1"
+
+
+def test_started_streams_are_not_cut_by_the_timeout():
+    response = slow_client.get("/stream")
+    assert response.status_code == 200
+    assert response.content == b"chunk;" * 3
+
+
+def test_correlation_id_is_reused_and_exposed_to_routes():
+    response = slow_client.get("/ids", headers={"X-Correlation-ID": "corr-1"})
+    assert response.json() == {"request_id": "corr-1", "correlation_id": "corr-1"}
+    assert response.headers["X-Correlation-ID"] == "corr-1"
+
+
+def test_only_writes_are_deduplicated():
+    headers = {"X-Request-ID": "read-twice"}
+    assert client.get("/echo-get", headers=headers).status_code == 200
+    assert client.get("/echo-get", headers=headers).status_code == 200
+
+
+def test_one_log_line_per_request(caplog):
+    with caplog.at_level(logging.INFO, logger="ava.request"):
+        slow_client.get("/ids")
+    records = [record for record in caplog.records if record.name == "ava.request"]
+    assert len(records) == 1
+    assert records[0].status == 200
+    assert records[0].db_queries == 0
+
+
+@slow_app.get("/calls/{call_id}")
+async def call_detail(call_id: int):
+    return {"id": call_id}
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_metrics_are_labelled_by_route_template():
+    labels = {"method": "GET", "path": "/calls/{call_id}"}
+    before = _sample("http_requests_total", status="200", **labels)
+    sizes_before = _sample("http_response_size_bytes_sum", **labels)
+
+    for call_id in (1, 2, 3):
+        assert slow_client.get(f"/calls/{call_id}").status_code == 200
+    slow_client.get("/does-not-exist/42")
+
+    assert _sample("http_requests_total", status="200", **labels) == before + 3
+    assert _sample("http_request_duration_seconds_count", **labels) >= 3
+    assert _sample("http_response_size_bytes_sum", **labels) == sizes_before + len(b'{"id":1}') * 3
+    assert _sample("http_requests_total", method="GET", path="/calls/1", status="200") == 0
+    assert _sample("http_requests_total", method="GET", path="unmatched", status="404") >= 1
+    assert _sample("http_requests_in_progress", method="GET") == 0
+
+
+def test_route_template_of_mounted_apps():
+    assert route_template({"root_path": "/metrics"}) == "/metrics"
+    assert route_template({"root_path": "/api"}, root_path="/api") == "unmatched"
@@ -0,0 +1,66 @@
+import asyncio
+import threading
+
+import pytest
+
+from api.src.application.services.passwords import (
+    PasswordHasher,
+    PasswordHasherBusyError,
+    hash_rounds,
+)
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_run_in_the_pool():
+    hasher = PasswordHasher(rounds=4, workers=2)
+    try:
+        hashed = await hasher.hash("Divine123!")
+
+        assert hash_rounds(hashed) == 4
+        assert await hasher.verify("Divine123!", hashed)
+        assert not await hasher.verify("wrong-password", hashed)
+        assert not await hasher.verify("Divine123!", "not-a-bcrypt-hash")
+        assert hasher.pending == 0
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hashes_with_another_cost_need_rehash():
+    old = PasswordHasher(rounds=4)
+    current = PasswordHasher(rounds=5)
+    try:
+        hashed = await old.hash("Divine123!")
+
+        assert current.needs_rehash(hashed)
+        assert not old.needs_rehash(hashed)
+        assert current.needs_rehash("legacy-plaintext")
+        assert await current.verify("Divine123!", hashed)
+    finally:
+        old.shutdown()
+        current.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_full_pool_sheds_load(monkeypatch):
+    hasher = PasswordHasher(rounds=4, workers=1, max_queue=1)
+    release = threading.Event()
+    monkeypatch.setattr(
+        "api.src.application.services.passwords._verify",
+        lambda password, hashed: release.wait(5),
+    )
+    try:
+        running = asyncio.create_task(hasher.verify("a", "x"))
+        queued = asyncio.create_task(hasher.verify("b", "x"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(PasswordHasherBusyError) as excinfo:
+            await hasher.verify("c", "x")
+        assert excinfo.value.status_code == 503
+
+        release.set()
+        assert await running and await queued
+        assert hasher.pending == 0
+    finally:
+        release.set()
+        hasher.shutdown()
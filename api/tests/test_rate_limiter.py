@@ -0,0 +1,84 @@
+import pytest
+
+from api.src.infrastructure.external.rate_limiter import AdaptiveRateLimiter, ThrottleTimeout
+from api.src.infrastructure.external.vapi_client import VapiClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.slept.append(seconds)
+
+
+def _limiter(clock, **kwargs):
+    kwargs.setdefault("rate", 2.0)
+    kwargs.setdefault("burst", 2)
+    kwargs.setdefault("min_rate", 0.5)
+    return AdaptiveRateLimiter("test", clock=clock, sleep=clock.sleep, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_bursts_queue_for_tokens_instead_of_failing():
+    clock = FakeClock()
+    limiter = _limiter(clock)
+
+    waits = [await limiter.acquire() for _ in range(4)]
+
+    assert waits == [0.0, 0.0, 0.5, 1.0]
+    assert clock.slept == [0.5, 1.0]
+
+
+@pytest.mark.asyncio
+async def test_wait_beyond_max_wait_is_rejected():
+    clock = FakeClock()
+    limiter = _limiter(clock, burst=1, max_wait=0.6)
+
+    await limiter.acquire()
+    await limiter.acquire()  # 0.5s
+    with pytest.raises(ThrottleTimeout) as exc_info:
+        await limiter.acquire()  # Would be 1.0s
+    assert exc_info.value.retry_after == pytest.approx(1.0)
+
+    clock.now += 1.0
+    assert await limiter.acquire() == 0.0  # The rejected request did not keep its reservation
+
+
+@pytest.mark.asyncio
+async def test_429_halves_rate_and_pauses_for_retry_after():
+    clock = FakeClock()
+    limiter = _limiter(clock, rate=4.0, burst=4)
+
+    limiter.observe(429, {"retry-after": "3"})
+    limiter.observe(429, {"retry-after": "3"})  # Same burst: counted once
+
+    assert limiter.rate == 2.0
+    assert await limiter.acquire() == pytest.approx(3.5)
+
+
+@pytest.mark.asyncio
+async def test_exhausted_quota_header_pauses_and_successes_recover_rate():
+    clock = FakeClock()
+    limiter = _limiter(clock, rate=1.0, max_rate=1.2, increase_per_success=0.1)
+    limiter.rate = 0.5
+
+    limiter.observe(200, {"x-ratelimit-remaining": "0", "x-ratelimit-reset": "2"})
+    assert await limiter.acquire() == pytest.approx(4.0)  # 2s pause, then one token at 0.5/s
+
+    for _ in range(10):
+        limiter.observe(200, {})
+    assert limiter.rate == pytest.approx(1.2)
+
+
+def test_clients_sharing_a_token_share_a_limiter():
+    first = VapiClient(token="token-a")
+    second = VapiClient(token="token-a")
+    other = VapiClient(token="token-b")
+
+    assert first._rate_limiter is second._rate_limiter
+    assert first._rate_limiter is not other._rate_limiter
@@ -0,0 +1,119 @@
+import contextvars
+
+import pytest
+from sqlalchemy import Integer, String, create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from api.src.core.settings import get_settings
+from api.src.infrastructure.database import replica
+from api.src.infrastructure.database.replica import ReplicaLagGuard, bind_request_user
+from api.src.infrastructure.database.session import engine
+from api.src.infrastructure.shared_state.backends import SharedStateBackend
+from api.src.infrastructure.shared_state.cache import SharedStateCache
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Note(Base):
+    __tablename__ = "replica_test_notes"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    text: Mapped[str] = mapped_column(String)
+
+
+@pytest.fixture
+def guard(monkeypatch):
+    guard = ReplicaLagGuard(5.0, clock=FakeClock())
+    monkeypatch.setattr(replica, "replica_lag_guard", guard)
+    monkeypatch.setattr(replica, "get_shared_state", lambda: None)
+    return guard
+
+
+def _in_request(user_id, func):
+    """Run `func` in its own context, as FastAPI does per request."""
+
+    def run():
+        bind_request_user(user_id)
+        return func()
+
+    return contextvars.copy_context().run(run)
+
+
+def test_guard_routes_recent_writers_to_primary(guard):
+    guard.record_write("user-1")
+
+    assert guard.recently_wrote("user-1")
+    assert not guard.recently_wrote("user-2")
+    assert not guard.recently_wrote(None)
+
+    guard._clock.now += 5.0
+    assert not guard.recently_wrote("user-1")
+
+
+def test_guard_is_bounded(guard):
+    guard.max_keys = 2
+    for key in ("a", "b", "c"):
+        guard.record_write(key)
+
+    assert not guard.recently_wrote("a")
+    assert guard.recently_wrote("c")
+
+
+def test_guard_shares_writes_across_workers(monkeypatch):
+    shared_state = SharedStateCache(SharedStateBackend())
+    monkeypatch.setattr(replica, "get_shared_state", lambda: shared_state)
+    clock = FakeClock()
+    writer = ReplicaLagGuard(5.0, clock=clock)
+    other_worker = ReplicaLagGuard(5.0, clock=clock)
+
+    writer.record_write("user-1")
+    assert other_worker.recently_wrote("user-1")
+
+    clock.now += 11.0
+    assert not other_worker.recently_wrote("user-1")
+
+
+def test_read_sessions_use_the_replica_until_the_user_writes(guard, monkeypatch):
+    replica_engine = create_async_engine(get_settings().database_url.replace("localhost", "replica.local"))
+    monkeypatch.setattr(replica, "read_engine", replica_engine)
+
+    def bind():
+        return replica.ReadSessionLocal().sync_session.get_bind()
+
+    assert _in_request("user-1", bind) is replica_engine.sync_engine
+
+    guard.record_write("user-1")
+    assert _in_request("user-1", bind) is engine.sync_engine
+    assert _in_request("user-2", bind) is replica_engine.sync_engine
+
+
+def test_commits_with_changes_record_the_request_user(guard):
+    sqlite = create_engine("sqlite://")
+    Base.metadata.create_all(sqlite)
+
+    def read_only():
+        with Session(sqlite) as session:
+            session.get(Note, 1)
+            session.commit()
+
+    def write():
+        with Session(sqlite) as session:
+            session.add(Note(id=1, text="hello"))
+            session.commit()
+
+    _in_request("reader", read_only)
+    _in_request("writer", write)
+
+    assert not guard.recently_wrote("reader")
+    assert guard.recently_wrote("writer")
@@ -0,0 +1,106 @@
+import json
+
+import httpx
+import pytest
+
+from api.src.infrastructure.email.resend_transport import (
+    BATCH_LIMIT,
+    ResendError,
+    ResendRateLimited,
+    ResendTransport,
+    batch_idempotency_key,
+)
+
+
+def _transport(handler):
+    return ResendTransport("re_test", base_url="https://resend.test", transport=httpx.MockTransport(handler))
+
+
+def _email(index=0):
+    return {"from": "AVA <a@b.c>", "to": ["owner@example.com"], "subject": f"#{index}", "html": "<p>Hi</p>"}
+
+
+@pytest.mark.asyncio
+async def test_send_posts_email_with_auth_and_idempotency_key():
+    seen = {}
+
+    def handler(request):
+        seen["path"] = request.url.path
+        seen["auth"] = request.headers["authorization"]
+        seen["key"] = request.headers.get("idempotency-key")
+        seen["body"] = json.loads(request.content)
+        return httpx.Response(200, json={"id": "re_1"})
+
+    transport = _transport(handler)
+    result = await transport.send(_email(), idempotency_key="email-outbox/7")
+    await transport.aclose()
+
+    assert result == {"id": "re_1"}
+    assert seen["path"] == "/emails"
+    assert seen["auth"] == "Bearer re_test"
+    assert seen["key"] == "email-outbox/7"
+    assert seen["body"]["subject"] == "#0"
+
+
+@pytest.mark.asyncio
+async def test_send_batch_splits_into_chunks_and_keeps_order():
+    chunks = []
+
+    def handler(request):
+        assert request.url.path == "/emails/batch"
+        body = json.loads(request.content)
+        chunks.append(len(body))
+        return httpx.Response(200, json={"data": [{"id": f"re_{email['subject']}"} for email in body]})
+
+    transport = _transport(handler)
+    results = await transport.send_batch([_email(index) for index in range(BATCH_LIMIT + 5)])
+    await transport.aclose()
+
+    assert chunks == [BATCH_LIMIT, 5]
+    assert [result["id"] for result in results[:2]] == ["re_#0", "re_#1"]
+    assert results[-1]["id"] == f"re_#{BATCH_LIMIT + 4}"
+
+
+@pytest.mark.asyncio
+async def test_send_batch_sends_a_deterministic_idempotency_key_per_chunk():
+    keys = []
+
+    def handler(request):
+        keys.append(request.headers.get("idempotency-key"))
+        return httpx.Response(200, json={"data": [{"id": "re"} for _ in json.loads(request.content)]})
+
+    transport = _transport(handler)
+    emails = [_email(index) for index in range(BATCH_LIMIT + 1)]
+    outbox_keys = [f"email-outbox/{index}" for index in range(BATCH_LIMIT + 1)]
+    await transport.send_batch(emails, idempotency_keys=outbox_keys)
+    await transport.send_batch(emails, idempotency_keys=outbox_keys)
+    await transport.send_batch(emails[:2])
+    await transport.aclose()
+
+    first = batch_idempotency_key(outbox_keys[:BATCH_LIMIT])
+    second = batch_idempotency_key(outbox_keys[BATCH_LIMIT:])
+    assert first != second
+    assert keys == [first, second, first, second, None]
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_raises_with_retry_after():
+    transport = _transport(lambda request: httpx.Response(429, headers={"retry-after": "3"}, json={}))
+
+    with pytest.raises(ResendRateLimited) as excinfo:
+        await transport.send(_email())
+    await transport.aclose()
+
+    assert excinfo.value.status_code == 429
+    assert excinfo.value.retry_after == 3.0
+
+
+@pytest.mark.asyncio
+async def test_api_error_carries_status_and_message():
+    transport = _transport(lambda request: httpx.Response(422, json={"message": "Invalid `to` field"}))
+
+    with pytest.raises(ResendError, match="Invalid `to` field") as excinfo:
+        await transport.send(_email())
+    await transport.aclose()
+
+    assert excinfo.value.status_code == 422
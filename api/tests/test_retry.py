@@ -0,0 +1,146 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from api.src.core.retry import RetryBudget, RetryPolicy
+from api.src.infrastructure.database import session as session_module
+from api.src.infrastructure.database.session import is_transient_db_error, run_read_only
+from api.src.infrastructure.external import vapi_client as vapi_client_module
+from api.src.infrastructure.external.vapi_client import VapiApiError, VapiAuthError, VapiClient, VapiRateLimitError
+
+
+class Flaky:
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def __call__(self, *args, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def _policy(**kwargs):
+    kwargs.setdefault("retry_on", lambda exc: isinstance(exc, ConnectionError))
+    return RetryPolicy("test", base_delay=0, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_policy_retries_transient_errors():
+    func = Flaky(ConnectionError("reset"), ConnectionError("reset"))
+
+    assert await _policy(max_retries=2).call(func) == "ok"
+    assert func.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_policy_gives_up_after_max_retries_and_skips_other_errors():
+    func = Flaky(*[ConnectionError("reset")] * 5)
+    with pytest.raises(ConnectionError):
+        await _policy(max_retries=2).call(func)
+    assert func.calls == 3
+
+    func = Flaky(ValueError("bad input"))
+    with pytest.raises(ValueError):
+        await _policy(max_retries=2).call(func)
+    assert func.calls == 1
+
+
+def test_delay_honours_retry_after():
+    policy = _policy(max_delay=5.0)
+
+    class State:
+        attempt_number = 1
+
+        class outcome:
+            @staticmethod
+            def exception():
+                return VapiRateLimitError("slow down", retry_after=2.5)
+
+    assert policy._delay(State) == 2.5
+    State.outcome.exception = staticmethod(lambda: ConnectionError())
+    State.attempt_number = 3
+    assert 0 <= policy._delay(State) <= 5.0
+
+
+@pytest.mark.asyncio
+async def test_retry_after_beyond_the_cap_is_not_retried():
+    policy = _policy(max_delay=5.0, retry_on=lambda exc: isinstance(exc, VapiRateLimitError))
+    func = Flaky(VapiRateLimitError("slow down", retry_after=60))
+
+    with pytest.raises(VapiRateLimitError):
+        await policy.call(func)
+    assert func.calls == 1
+
+
+def test_budget_limits_retries_to_a_share_of_requests():
+    now = [1000.0]
+    budget = RetryBudget(ratio=0.5, min_per_second=0, window_seconds=10, clock=lambda: now[0])
+
+    for _ in range(4):
+        budget.record_request()
+    assert [budget.try_spend() for _ in range(3)] == [True, True, False]
+
+    now[0] += 11  # Window moved on: earlier requests and retries no longer count
+    budget.record_request()
+    budget.record_request()
+    assert budget.try_spend() is True
+
+
+@pytest.mark.asyncio
+async def test_spent_budget_stops_retrying():
+    budget = RetryBudget(ratio=0, min_per_second=0, window_seconds=10)
+    func = Flaky(ConnectionError("reset"))
+
+    with pytest.raises(ConnectionError):
+        await _policy(max_retries=3, budget=budget).call(func)
+    assert func.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_vapi_retries_gets_only(monkeypatch):
+    monkeypatch.setattr(vapi_client_module._read_retry, "budget", None)
+    client = VapiClient(token="test-token")
+
+    client._send = Flaky(VapiRateLimitError("slow down", retry_after=0), VapiApiError("bad gateway", status_code=502))
+    assert await client.get_call("call-1") == "ok"
+    assert client._send.calls == 3
+
+    client._send = Flaky(VapiAuthError("revoked", status_code=401))
+    with pytest.raises(VapiAuthError):
+        await client.get_call("call-1")
+    assert client._send.calls == 1
+
+    client._send = Flaky(VapiApiError("bad gateway", status_code=502))
+    with pytest.raises(VapiApiError):
+        await client._request("POST", "/assistant", json={})
+    assert client._send.calls == 1
+
+
+def test_transient_db_errors():
+    assert is_transient_db_error(OperationalError("SELECT 1", {}, ConnectionResetError()))
+    assert is_transient_db_error(ConnectionResetError())
+    assert not is_transient_db_error(IntegrityError("INSERT", {}, Exception("duplicate key")))
+    assert not is_transient_db_error(ValueError())
+    # A query that timed out would most likely time out again
+    assert not is_transient_db_error(asyncio.TimeoutError())
+
+
+@pytest.mark.asyncio
+async def test_read_only_query_timeout_is_not_retried(monkeypatch):
+    @asynccontextmanager
+    async def fake_session():
+        yield object()
+
+    monkeypatch.setattr(session_module, "SessionLocal", fake_session)
+    operation = Flaky(asyncio.TimeoutError())
+    with pytest.raises(asyncio.TimeoutError):
+        await run_read_only(operation)
+    assert operation.calls == 1
+
+    operation = Flaky(OperationalError("SELECT 1", {}, ConnectionResetError()))
+    assert await run_read_only(operation) == "ok"
+    assert operation.calls == 2
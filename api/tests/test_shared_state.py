@@ -0,0 +1,126 @@
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from api.src.infrastructure.external import circuit_breaker as circuit_breaker_module
+from api.src.infrastructure.external.circuit_breaker import CircuitBreaker, CircuitBreakerConfig, CircuitState
+from api.src.infrastructure.shared_state import rate_limit_storage as rate_limit_storage_module
+from api.src.infrastructure.shared_state import BreakerRecord, SharedMemoryBackend, SharedStateCache
+from api.src.infrastructure.shared_state.rate_limit_storage import SharedRateLimitStorage
+
+
+@pytest.fixture
+def workers(tmp_path):
+    """Two workers' caches sharing one memory segment."""
+    path = str(tmp_path / "shared-state")
+    return (
+        SharedStateCache(SharedMemoryBackend(path, slots=64)),
+        SharedStateCache(SharedMemoryBackend(path, slots=64)),
+    )
+
+
+@pytest.mark.asyncio
+async def test_rate_counts_are_shared_between_workers(workers):
+    first, second = workers
+    expires_at = time.time() + 60
+
+    first.incr("ip:1", 1000, expires_at, 3)
+    assert second.incr("ip:1", 1000, expires_at) == 1  # Not synced yet
+
+    await first.sync()
+    await second.sync()
+    await first.sync()
+
+    assert first.count("ip:1", 1000) == 4
+    assert second.count("ip:1", 1000) == 4
+    assert first.incr("ip:1", 1000, expires_at) == 5
+    assert first.count("ip:1", 1060) == 0  # Another window
+
+
+@pytest.mark.asyncio
+async def test_expired_windows_are_dropped_and_slots_reused(tmp_path):
+    backend = SharedMemoryBackend(str(tmp_path / "shared-state"), slots=4)
+    cache = SharedStateCache(backend)
+
+    for window in range(4):
+        cache.incr("ip:1", window, time.time() - 1)
+    await cache.sync()
+    assert cache.count("ip:1", 0) == 0
+
+    # Every slot is expired: new windows still find room
+    for window in range(10, 14):
+        cache.incr("ip:2", window, time.time() + 60)
+    await cache.sync()
+    assert [cache.count("ip:2", window) for window in range(10, 14)] == [1, 1, 1, 1]
+
+
+@pytest.mark.asyncio
+async def test_newer_breaker_transition_wins(workers):
+    first, second = workers
+
+    first.record_breaker("vapi", "open", 200.0)
+    await first.sync()
+    second.record_breaker("vapi", "closed", 100.0)  # Older: ignored
+    await second.sync()
+
+    assert second.breaker("vapi") == BreakerRecord("open", 200.0)
+
+
+@pytest.mark.asyncio
+async def test_failed_sync_keeps_local_counts(workers):
+    first, _ = workers
+
+    async def broken(*args, **kwargs):
+        raise OSError("segment unavailable")
+
+    first.backend.sync_counters = broken
+    first.incr("ip:1", 1000, time.time() + 60, 2)
+    with pytest.raises(OSError):
+        await first.sync()
+
+    assert first.count("ip:1", 1000) == 2
+
+
+@pytest.mark.asyncio
+async def test_breaker_opened_by_one_worker_opens_everywhere(workers, monkeypatch):
+    first, second = workers
+    config = CircuitBreakerConfig(failure_threshold=1, recovery_timeout=30)
+    worker_a = CircuitBreaker(name="shared-svc", config=config)
+    worker_b = CircuitBreaker(name="shared-svc", config=config)
+
+    async def fail():
+        raise RuntimeError("down")
+
+    async def ok():
+        return "ok"
+
+    monkeypatch.setattr(circuit_breaker_module, "get_shared_state", lambda: first)
+    with pytest.raises(RuntimeError):
+        await worker_a.call(fail)
+    assert worker_a.state == CircuitState.OPEN
+    await first.sync()
+
+    monkeypatch.setattr(circuit_breaker_module, "get_shared_state", lambda: second)
+    assert await worker_b.call(ok) == "ok"  # Name registered, not synced yet
+    await second.sync()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await worker_b.call(ok)
+    assert exc_info.value.status_code == 503
+    assert worker_b.state == CircuitState.OPEN
+
+
+def test_rate_limit_storage_counts_clock_aligned_windows(workers, monkeypatch):
+    first, _ = workers
+    monkeypatch.setattr(rate_limit_storage_module, "get_shared_state", lambda: first)
+    storage = SharedRateLimitStorage()
+
+    assert storage.incr("LIMITER/1.2.3.4/route", 60) == 1
+    assert storage.incr("LIMITER/1.2.3.4/route", 60) == 2
+    assert storage.get("LIMITER/1.2.3.4/route") == 2
+    expiry = storage.get_expiry("LIMITER/1.2.3.4/route")
+    assert expiry % 60 == 0 and time.time() < expiry <= time.time() + 60
+
+    storage.clear("LIMITER/1.2.3.4/route")
+    assert storage.get("LIMITER/1.2.3.4/route") == 0
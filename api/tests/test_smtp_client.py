@@ -1,8 +1,12 @@
+import asyncio
+import smtplib
 from unittest.mock import MagicMock, patch
 
 import pytest
+import pytest_asyncio
 
 from api.src.infrastructure.email.smtp_client import SMTPClient, SMTPConfig
+from api.src.infrastructure.email.smtp_pool import SMTPConnectionPool, SMTPDeliveryUncertain
 
 
 @pytest.mark.asyncio
@@ -26,3 +30,144 @@ async def test_smtp_client_validates_configuration():
 
     with pytest.raises(ValueError):
         await client.send_email(config, ["dest@test"], "Subject", "<p>Hello</p>")
+
+
+class FakeSMTPServer:
+    """Minimal SMTP stand-in speaking just enough of the protocol for the pool."""
+
+    def __init__(self):
+        self.connections = 0
+        self.messages = []
+        self.reject_data = False
+        self.drop_after_data = False
+        self._writers = []
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        self._writers.append(writer)
+        writer.write(b"220 fake ESMTP\r\n")
+        while line := await reader.readline():
+            command = line.decode().strip().upper()
+            if command.startswith("EHLO"):
+                writer.write(b"250-fake\r\n250 AUTH PLAIN LOGIN\r\n")
+            elif command.startswith("DATA"):
+                writer.write(b"354 go ahead\r\n")
+                await writer.drain()
+                body = b""
+                while (chunk := await reader.readline()) != b".\r\n":
+                    body += chunk
+                if self.drop_after_data:
+                    self.messages.append(body)
+                    break
+                if self.reject_data:
+                    writer.write(b"550 content rejected\r\n")
+                else:
+                    self.messages.append(body)
+                    writer.write(b"250 queued\r\n")
+            elif command.startswith("QUIT"):
+                writer.write(b"221 bye\r\n")
+                await writer.drain()
+                break
+            elif command.startswith("AUTH"):
+                writer.write(b"235 authenticated\r\n")
+            else:
+                writer.write(b"250 ok\r\n")
+            await writer.drain()
+        writer.close()
+
+    def drop_connections(self):
+        for writer in self._writers:
+            writer.close()
+
+
+@pytest_asyncio.fixture
+async def smtp_server():
+    fake = FakeSMTPServer()
+    server = await asyncio.start_server(fake.handle, "127.0.0.1", 0)
+    fake.port = server.sockets[0].getsockname()[1]
+    yield fake
+    server.close()
+
+
+def _local_config(port):
+    return SMTPConfig(server="127.0.0.1", port=port, username="user@test", password="secret", use_starttls=False)
+
+
+@pytest.mark.asyncio
+async def test_pooled_client_reuses_authenticated_session(smtp_server):
+    pool = SMTPConnectionPool()
+    client = SMTPClient(pool=pool)
+    config = _local_config(smtp_server.port)
+
+    for index in range(3):
+        message_id = await client.send_email(config, ["dest@test"], f"Subject {index}", "<p>.hidden</p>")
+        assert message_id.startswith("<")
+
+    assert smtp_server.connections == 1
+    assert len(smtp_server.messages) == 3
+    assert pool.idle_count(config) == 1
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pooled_client_reconnects_after_server_drops_session(smtp_server):
+    pool = SMTPConnectionPool()
+    client = SMTPClient(pool=pool)
+    config = _local_config(smtp_server.port)
+
+    await client.send_email(config, ["dest@test"], "First", "<p>Hello</p>")
+    smtp_server.drop_connections()
+    await asyncio.sleep(0.01)
+    await client.send_email(config, ["dest@test"], "Second", "<p>Hello</p>")
+
+    assert smtp_server.connections == 2
+    assert len(smtp_server.messages) == 2
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_discards_sessions_past_idle_timeout(smtp_server):
+    pool = SMTPConnectionPool(idle_timeout=0)
+    client = SMTPClient(pool=pool)
+    config = _local_config(smtp_server.port)
+
+    await client.send_email(config, ["dest@test"], "First", "<p>Hello</p>")
+    await asyncio.sleep(0.01)
+    await client.send_email(config, ["dest@test"], "Second", "<p>Hello</p>")
+
+    assert smtp_server.connections == 2
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_keeps_session_and_does_not_resend_on_rejection(smtp_server):
+    pool = SMTPConnectionPool()
+    client = SMTPClient(pool=pool)
+    config = _local_config(smtp_server.port)
+
+    await client.send_email(config, ["dest@test"], "First", "<p>Hello</p>")
+    smtp_server.reject_data = True
+    with pytest.raises(smtplib.SMTPDataError):
+        await client.send_email(config, ["dest@test"], "Rejected", "<p>Hello</p>")
+
+    assert smtp_server.connections == 1
+    assert len(smtp_server.messages) == 1
+    assert pool.idle_count(config) == 1
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_does_not_resend_after_data_was_written(smtp_server):
+    pool = SMTPConnectionPool()
+    client = SMTPClient(pool=pool)
+    config = _local_config(smtp_server.port)
+
+    await client.send_email(config, ["dest@test"], "First", "<p>Hello</p>")
+    smtp_server.drop_after_data = True
+    with pytest.raises(SMTPDeliveryUncertain):
+        await client.send_email(config, ["dest@test"], "Second", "<p>Hello</p>")
+
+    assert smtp_server.connections == 1
+    assert len(smtp_server.messages) == 2
+    assert pool.idle_count(config) == 0
+    await pool.close()
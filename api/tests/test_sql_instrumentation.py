@@ -0,0 +1,131 @@
+import asyncio
+import logging
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from api.src.infrastructure.database import instrumentation
+from api.src.infrastructure.database.instrumentation import (
+    _operation,
+    _parameter_shape,
+    assert_max_queries,
+    instrument_engine,
+    track_queries,
+)
+
+
+@pytest.fixture
+def sqlite():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    instrument_engine(engine)  # Idempotent
+    with engine.connect() as conn:
+        conn.execute(text("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)"))
+        conn.commit()
+    return engine
+
+
+def test_track_queries_counts_statements_and_time(sqlite):
+    with track_queries() as stats:
+        with sqlite.connect() as conn:
+            for index in range(3):
+                conn.execute(text("INSERT INTO notes (id, body) VALUES (:id, 'x')"), {"id": index})
+            conn.execute(text("SELECT * FROM notes")).fetchall()
+
+    assert stats.count == 4
+    assert stats.seconds > 0
+    assert stats.statements == []
+
+    with sqlite.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    assert stats.count == 4
+
+
+@pytest.mark.asyncio
+async def test_track_queries_follows_tasks_started_inside():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+
+    def query():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    async def handler():
+        query()
+
+    with track_queries() as stats:
+        await asyncio.create_task(handler())
+
+    assert stats.count == 1
+
+
+def test_assert_max_queries_lists_statements_over_the_limit(sqlite):
+    with assert_max_queries(2):
+        with sqlite.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    with pytest.raises(AssertionError, match="at most 1 queries, 2 were run") as excinfo:
+        with assert_max_queries(1):
+            with sqlite.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT body FROM notes"))
+    assert "SELECT body FROM notes" in str(excinfo.value)
+
+
+def test_slow_statements_are_logged_without_parameter_values(sqlite, monkeypatch, caplog):
+    monkeypatch.setattr(instrumentation._settings, "database_slow_query_ms", 0)
+    monkeypatch.setattr(instrumentation._settings, "database_slow_query_explain", False)
+
+    with caplog.at_level(logging.WARNING, logger="ava.database"):
+        with sqlite.connect() as conn:
+            conn.execute(text("SELECT * FROM notes WHERE body = :body"), {"body": "secret@example.com"})
+
+    record = next(record for record in caplog.records if record.message.startswith("Slow SELECT"))
+    assert record.parameters == ["str"]
+    assert "secret@example.com" not in record.getMessage()
+
+
+def test_slow_selects_can_log_their_plan(sqlite, monkeypatch, caplog):
+    monkeypatch.setattr(instrumentation._settings, "database_slow_query_ms", 0)
+    monkeypatch.setattr(instrumentation._settings, "database_slow_query_explain", True)
+
+    with track_queries() as stats, caplog.at_level(logging.WARNING, logger="ava.database"):
+        with sqlite.connect() as conn:
+            conn.execute(text("SELECT * FROM notes WHERE id = :id"), {"id": 1})
+
+    record = next(record for record in caplog.records if record.message.startswith("Slow SELECT"))
+    assert record.plan
+    assert stats.count == 1  # The EXPLAIN itself is not counted
+
+
+def test_failing_explain_is_rolled_back_to_a_savepoint(sqlite, monkeypatch):
+    monkeypatch.setattr(instrumentation._settings, "database_slow_query_ms", 0)
+    monkeypatch.setattr(instrumentation._settings, "database_slow_query_explain", True)
+    savepoints = []
+
+    def reject_explain(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("EXPLAIN"):
+            raise RuntimeError("EXPLAIN failed")
+
+    event.listen(sqlite, "before_cursor_execute", reject_explain)
+    event.listen(sqlite, "savepoint", lambda conn, name: savepoints.append(("savepoint", name)))
+    event.listen(sqlite, "rollback_savepoint", lambda conn, name, context: savepoints.append(("rollback", name)))
+
+    with track_queries() as stats, sqlite.connect() as conn:
+        conn.execute(text("INSERT INTO notes (body) VALUES ('kept')"))
+        conn.execute(text("SELECT * FROM notes"))
+        assert conn.in_transaction() and not conn.in_nested_transaction()
+        conn.commit()
+
+    assert [action for action, _ in savepoints] == ["savepoint", "rollback"]
+    assert stats.count == 2
+    with sqlite.connect() as conn:
+        assert conn.execute(text("SELECT body FROM notes")).scalar_one() == "kept"
+
+
+def test_statement_helpers():
+    assert _operation("  select 1") == "SELECT"
+    assert _operation("INSERT INTO x VALUES (1)") == "INSERT"
+    assert _operation("WITH x AS (SELECT 1) SELECT * FROM x") == "OTHER"
+    assert _parameter_shape({"id": 1, "name": None}) == {"id": "int", "name": "NoneType"}
+    assert _parameter_shape([(1, "a"), (2, "b")]) == "2 x ['int', 'str']"
@@ -0,0 +1,86 @@
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+from twilio.base.exceptions import TwilioRestException
+
+from api.src.infrastructure.external import twilio_client as twilio_module
+from api.src.infrastructure.external.twilio_client import AsyncTwilioClient, _ConnectionTrace, _record_pool_usage
+
+
+def _client(handler):
+    http = httpx.AsyncClient(base_url="https://twilio.test", transport=httpx.MockTransport(handler))
+    return AsyncTwilioClient("AC123", "secret", http=http), http
+
+
+@pytest.mark.asyncio
+async def test_list_incoming_phone_numbers_filters_by_number():
+    seen = {}
+
+    def handler(request):
+        seen["path"] = request.url.path
+        seen["params"] = dict(request.url.params)
+        seen["auth"] = request.headers["authorization"]
+        return httpx.Response(200, json={"incoming_phone_numbers": [{"sid": "PN1", "phone_number": "+33612345678"}]})
+
+    client, http = _client(handler)
+    numbers = await client.list_incoming_phone_numbers(phone_number="+33612345678", limit=1)
+    await http.aclose()
+
+    assert numbers == [{"sid": "PN1", "phone_number": "+33612345678"}]
+    assert seen["path"] == "/2010-04-01/Accounts/AC123/IncomingPhoneNumbers.json"
+    assert seen["params"] == {"PageSize": "1", "PhoneNumber": "+33612345678"}
+    assert seen["auth"] == httpx.BasicAuth("AC123", "secret")._auth_header
+
+
+@pytest.mark.asyncio
+async def test_create_call_posts_form_fields():
+    seen = {}
+
+    def handler(request):
+        seen["method"] = request.method
+        seen["form"] = parse_qs(request.content.decode())
+        return httpx.Response(201, json={"sid": "CA1"})
+
+    client, http = _client(handler)
+    call = await client.create_call(to="+1222", from_="+1333", url="https://example.com/twiml")
+    await http.aclose()
+
+    assert call["sid"] == "CA1"
+    assert seen["method"] == "POST"
+    assert seen["form"] == {
+        "To": ["+1222"],
+        "From": ["+1333"],
+        "Url": ["https://example.com/twiml"],
+        "Method": ["POST"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_errors_are_raised_as_twilio_rest_exceptions():
+    client, http = _client(lambda request: httpx.Response(401, json={"code": 20003, "message": "Authenticate"}))
+
+    with pytest.raises(TwilioRestException) as excinfo:
+        await client.create_message(to="+1222", from_="+1333", body="Hi")
+    await http.aclose()
+
+    assert excinfo.value.status == 401
+    assert excinfo.value.code == 20003
+    assert "authenticate" in str(excinfo.value).lower()
+
+
+@pytest.mark.asyncio
+async def test_pool_usage_counts_new_connections_as_misses():
+    if not twilio_module.METRICS_AVAILABLE:
+        pytest.skip("prometheus_client not installed")
+
+    hits = twilio_module.twilio_pool_hits_metric._value.get()
+    misses = twilio_module.twilio_pool_misses_metric._value.get()
+
+    fresh = _ConnectionTrace()
+    await fresh("connection.connect_tcp.started", {})
+    _record_pool_usage(fresh)
+    _record_pool_usage(_ConnectionTrace())
+
+    assert twilio_module.twilio_pool_misses_metric._value.get() == misses + 1
+    assert twilio_module.twilio_pool_hits_metric._value.get() == hits + 1